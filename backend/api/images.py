@@ -0,0 +1,139 @@
+"""
+Generated image serving
+
+GET/HEAD /images/{path} - 생성 이미지와 파생 이미지 제공 (STORAGE_OUTPUT_DIR)
+
+파일명은 내용 해시(또는 고유 이름)이고 바뀌지 않으므로 `Cache-Control: immutable`과
+긴 max-age로 응답하여 휴대폰/키오스크가 다시 요청하지 않게 합니다.
+- 강한 ETag (내용 해시)와 If-None-Match → 304
+- 단일 Range 요청 → 206 (If-Range가 ETag와 다르면 전체 응답), 범위 밖이면 416
+- 최근 이미지는 메모리 캐시(backend.utils.image_cache)에서 제공
+"""
+
+import asyncio
+import re
+from email.utils import formatdate
+from pathlib import Path
+from typing import Optional, Tuple
+
+from fastapi import APIRouter, Request, Response
+
+from backend.core.config import settings
+from backend.exceptions import ImageNotFoundException
+from backend.utils.image_cache import CachedImage, get_image_cache
+
+router = APIRouter()
+
+_RANGE = re.compile(r"^bytes=(\d*)-(\d*)$")
+
+
+class RangeNotSatisfiable(Exception):
+    """요청 범위가 파일 밖"""
+
+
+@router.api_route("/images/{path:path}", methods=["GET", "HEAD"], include_in_schema=False)
+async def get_image(path: str, request: Request) -> Response:
+    """
+    생성 이미지 제공
+
+    Raises:
+        ImageNotFoundException: 파일이 없거나 제공할 수 없는 경로 (404)
+    """
+    file_path = _resolve(path)
+    cache = get_image_cache()
+    try:
+        image = cache.get(str(file_path))
+        if image is None:
+            image = await asyncio.to_thread(cache.load, str(file_path))
+    except (FileNotFoundError, IsADirectoryError, NotADirectoryError):
+        raise ImageNotFoundException("output", details={"path": path})
+
+    headers = {
+        "ETag": image.etag,
+        "Cache-Control": f"public, max-age={settings.storage.image_max_age_seconds}, immutable",
+        "Last-Modified": formatdate(image.mtime_ns / 1e9, usegmt=True),
+        "Accept-Ranges": "bytes",
+    }
+    if _etag_matches(request.headers.get("if-none-match"), image.etag):
+        return Response(status_code=304, headers=headers)
+
+    size = len(image.content)
+    status_code = 200
+    body = image.content
+    try:
+        byte_range = _requested_range(request, image)
+    except RangeNotSatisfiable:
+        headers["Content-Range"] = f"bytes */{size}"
+        return Response(status_code=416, headers=headers)
+    if byte_range is not None:
+        start, end = byte_range
+        status_code = 206
+        body = image.content[start:end + 1]
+        headers["Content-Range"] = f"bytes {start}-{end}/{size}"
+
+    headers["Content-Length"] = str(len(body))
+    if request.method == "HEAD":
+        body = b""
+    return Response(content=body, status_code=status_code, headers=headers, media_type=image.media_type)
+
+
+def _resolve(path: str) -> Path:
+    """
+    요청 경로를 출력 디렉토리 안의 파일 경로로 변환
+
+    숨김 경로(.staging 등 쓰는 중인 파일)와 상위 디렉토리 참조는 거부합니다.
+
+    Raises:
+        ImageNotFoundException: 제공할 수 없는 경로
+    """
+    parts = [part for part in path.split("/") if part]
+    if not parts or any(part.startswith(".") or "\\" in part for part in parts):
+        raise ImageNotFoundException("output", details={"path": path})
+    return Path(settings.storage.output_dir).joinpath(*parts)
+
+
+def _etag_matches(header: Optional[str], etag: str) -> bool:
+    """If-None-Match/If-Range 값이 ETag와 일치하는지 (약한 비교)"""
+    if not header:
+        return False
+    candidates = [candidate.strip() for candidate in header.split(",")]
+    return "*" in candidates or any(candidate.removeprefix("W/") == etag for candidate in candidates)
+
+
+def _requested_range(request: Request, image: CachedImage) -> Optional[Tuple[int, int]]:
+    """
+    요청한 바이트 범위 (start, end 포함)
+
+    Range가 없거나, 여러 범위이거나, If-Range가 현재 ETag와 다르면 None (전체 응답).
+
+    Raises:
+        RangeNotSatisfiable: 범위가 파일 밖
+    """
+    header = request.headers.get("range")
+    if request.method != "GET" or not header:
+        return None
+    if_range = request.headers.get("if-range")
+    if if_range is not None and if_range.strip() != image.etag:
+        return None
+
+    match = _RANGE.match(header.strip())
+    if not match or match.group(1) == match.group(2) == "":
+        return None
+
+    size = len(image.content)
+    if size == 0:
+        # 빈 파일에는 만족할 수 있는 범위가 없음
+        raise RangeNotSatisfiable()
+    first, last = match.group(1), match.group(2)
+    if first == "":
+        # 마지막 N바이트
+        length = int(last)
+        if length == 0:
+            raise RangeNotSatisfiable()
+        return max(0, size - length), size - 1
+
+    start = int(first)
+    end = min(int(last), size - 1) if last else size - 1
+    if start >= size or start > end:
+        raise RangeNotSatisfiable()
+    return start, end
@@ -1,19 +1,29 @@
 """
 Dashboard API Routes
 
-대시보드 통계 관련 3개 엔드포인트를 제공합니다.
+대시보드 통계 및 런타임 지표 엔드포인트를 제공합니다.
 """
 
 from typing import Optional
 from fastapi import APIRouter, Depends
+from pydantic import BaseModel, Field
 
 from backend.services.statistics_service import StatisticsService
-from backend.core.dependencies import get_statistics_service
+from backend.facefusion_service import FaceFusionService
+from backend.core.dependencies import get_statistics_service, get_facefusion_service
+from backend.core.metrics import metrics
+from backend.utils.image_cache import get_image_cache
 from backend.utils.response import create_success_response
 
 router = APIRouter(prefix="/dashboard")
 
 
+# Request Models
+class SwapperModelRequest(BaseModel):
+    """스와퍼 모델 전환 요청"""
+    model: str = Field(..., description="전환할 스와퍼 모델 (미리 로드된 모델 중 하나)")
+
+
 # 1. GET /dashboard/statistics - 전체 통계 조회
 @router.get("/statistics")
 async def get_statistics(
@@ -50,3 +60,59 @@ async def get_daily_stats(
         data=result,
         message="Daily statistics retrieved successfully"
     )
+
+
+# 3. GET /dashboard/metrics - 런타임 지표 조회
+@router.get("/metrics")
+async def get_metrics(
+    facefusion: FaceFusionService = Depends(get_facefusion_service)
+):
+    """
+    런타임 지표 조회 (관리자)
+
+    결과 캐시 적중률, 이미지 메모리 캐시 적중률(image_cache) 등 서버 시작 이후 누적된 지표를 반환합니다.
+    """
+    result = {
+        **metrics.snapshot(),
+        **facefusion.get_metrics(),
+        "image_cache": get_image_cache().get_status(),
+    }
+    return create_success_response(
+        data=result,
+        message="Metrics retrieved successfully"
+    )
+
+
+# 4. GET /dashboard/models - 스와퍼 모델 상태 조회
+@router.get("/models")
+async def get_models(
+    facefusion: FaceFusionService = Depends(get_facefusion_service)
+):
+    """
+    스와퍼 모델 상태 조회 (관리자)
+
+    사용 중인 모델, 전환 가능한(미리 로드된) 모델과 모델별 추론 시간을 반환합니다.
+    """
+    return create_success_response(
+        data=facefusion.get_models(),
+        message="Swapper models retrieved successfully"
+    )
+
+
+# 5. PUT /dashboard/models/active - 사용 중인 스와퍼 모델 전환
+@router.put("/models/active")
+async def set_active_model(
+    request: SwapperModelRequest,
+    facefusion: FaceFusionService = Depends(get_facefusion_service)
+):
+    """
+    사용 중인 스와퍼 모델 전환 (관리자)
+
+    - **model**: 미리 로드된 스와퍼 모델 (FACEFUSION_FACE_SWAPPER_MODEL, FACEFUSION_FACE_SWAPPER_MODELS)
+    - 재시작 없이 다음 생성부터 적용되며, 진행 중인 생성은 기존 모델로 끝납니다
+    """
+    result = facefusion.set_active_model(request.model)
+    return create_success_response(
+        data=result,
+        message=f"Swapper model switched to {result['active']}"
+    )
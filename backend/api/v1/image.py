@@ -1,12 +1,13 @@
 """
 Image API Routes
 
-이미지 생성 관련 2개 엔드포인트를 제공합니다.
+이미지 생성 관련 3개 엔드포인트를 제공합니다.
 """
 
-from fastapi import APIRouter, Depends, status
+from fastapi import APIRouter, Depends, Request, status
 
 from backend.services.image_service import ImageService
+from backend.core.cancellation import CancelToken, watch_disconnect
 from backend.core.dependencies import get_image_service
 from backend.utils.response import create_success_response
 
@@ -17,6 +18,7 @@ router = APIRouter(prefix="/session")
 @router.post("/{participation_id}/generate-profile")
 async def generate_profile(
     participation_id: int,
+    request: Request,
     service: ImageService = Depends(get_image_service)
 ):
     """
@@ -25,8 +27,11 @@ async def generate_profile(
     - **participation_id**: 참여 ID
     - 이미 업로드된 원본 이미지와 성별 정보를 사용하여 프로필 이미지 생성
     - 성별에 맞는 프로필 중 랜덤 선택
+    - 클라이언트 연결이 끊기거나 취소 요청/기한 초과 시 생성 중단 (409/504)
     """
-    result = await service.generate_profile(participation_id)
+    token = CancelToken()
+    async with watch_disconnect(request, token):
+        result = await service.generate_profile(participation_id, cancel_token=token)
     return create_success_response(
         data=result,
         message="Profile image generated successfully"
@@ -37,6 +42,7 @@ async def generate_profile(
 @router.post("/{participation_id}/generate-talent")
 async def generate_talent(
     participation_id: int,
+    request: Request,
     service: ImageService = Depends(get_image_service)
 ):
     """
@@ -45,9 +51,32 @@ async def generate_talent(
     - **participation_id**: 참여 ID
     - 이미 업로드된 원본 이미지와 성별 정보를 사용하여 장기자랑 이미지 생성
     - 성별에 맞는 장기자랑 중 랜덤 선택
+    - 클라이언트 연결이 끊기거나 취소 요청/기한 초과 시 생성 중단 (409/504)
     """
-    result = await service.generate_talent(participation_id)
+    token = CancelToken()
+    async with watch_disconnect(request, token):
+        result = await service.generate_talent(participation_id, cancel_token=token)
     return create_success_response(
         data=result,
         message="Talent image generated successfully"
     )
+
+
+# 3. POST /session/{participation_id}/cancel-generation - 진행 중인 생성 취소
+@router.post("/{participation_id}/cancel-generation")
+async def cancel_generation(
+    participation_id: int,
+    service: ImageService = Depends(get_image_service)
+):
+    """
+    이미지 생성 취소
+
+    - **participation_id**: 참여 ID
+    - 대기 중인 생성 작업은 실행하지 않고, 실행 중인 생성은 다음 단계에서 중단
+    - 참여자가 자리를 떠나 다음 사람이 기다리지 않도록 키오스크에서 호출
+    """
+    result = await service.cancel_generation(participation_id)
+    return create_success_response(
+        data=result,
+        message="Image generation cancelled"
+    )
@@ -0,0 +1,96 @@
+"""
+Generation Job API Routes
+
+비동기 이미지 생성 작업 관련 4개 엔드포인트를 제공합니다.
+"""
+
+from fastapi import APIRouter, Depends, status
+from fastapi.responses import StreamingResponse
+
+from backend.services.image_service import ImageService
+from backend.services.job_service import get_job_manager
+from backend.core.dependencies import get_image_service
+from backend.utils.response import create_success_response
+
+router = APIRouter(prefix="")
+
+
+# 1. POST /session/{participation_id}/generate-profile/async - 프로필 생성 작업 제출 (화면 #6)
+@router.post(
+    "/session/{participation_id}/generate-profile/async",
+    status_code=status.HTTP_202_ACCEPTED,
+)
+async def submit_profile_job(
+    participation_id: int,
+    service: ImageService = Depends(get_image_service)
+):
+    """
+    프로필 이미지 생성 작업 제출
+
+    - **participation_id**: 참여 ID
+    - 즉시 job_id를 반환하며, 결과는 GET /jobs/{job_id} 또는 SSE로 확인
+    - 대기열이 가득 차면 503 반환
+    """
+    result = await service.submit_generation_job(participation_id, "profile")
+    return create_success_response(
+        data=result,
+        message="Profile generation job accepted"
+    )
+
+
+# 2. POST /session/{participation_id}/generate-talent/async - 장기자랑 생성 작업 제출 (화면 #8)
+@router.post(
+    "/session/{participation_id}/generate-talent/async",
+    status_code=status.HTTP_202_ACCEPTED,
+)
+async def submit_talent_job(
+    participation_id: int,
+    service: ImageService = Depends(get_image_service)
+):
+    """
+    장기자랑 이미지 생성 작업 제출
+
+    - **participation_id**: 참여 ID
+    - 즉시 job_id를 반환하며, 결과는 GET /jobs/{job_id} 또는 SSE로 확인
+    - 대기열이 가득 차면 503 반환
+    """
+    result = await service.submit_generation_job(participation_id, "talent")
+    return create_success_response(
+        data=result,
+        message="Talent generation job accepted"
+    )
+
+
+# 3. GET /jobs/{job_id} - 작업 상태 조회
+@router.get("/jobs/{job_id}")
+async def get_job(job_id: str):
+    """
+    생성 작업 상태 조회
+
+    - **job_id**: 작업 ID
+    - status: queued / running / done / failed
+    - done이면 image_url 포함
+    """
+    job = get_job_manager().get(job_id)
+    return create_success_response(
+        data=job.to_dict(),
+        message="Job retrieved successfully"
+    )
+
+
+# 4. GET /jobs/{job_id}/events - 작업 상태 SSE 스트림
+@router.get("/jobs/{job_id}/events")
+async def stream_job_events(job_id: str):
+    """
+    생성 작업 상태 스트림 (Server-Sent Events)
+
+    - **job_id**: 작업 ID
+    - 상태가 바뀔 때마다 `event: status` 전송, done/failed 후 스트림 종료
+    """
+    manager = get_job_manager()
+    job = manager.get(job_id)
+    return StreamingResponse(
+        manager.stream_events(job),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
@@ -75,6 +75,9 @@ async def upload_image(
 
     - **participation_id**: 참여 ID
     - **image**: 업로드할 이미지 파일 (jpg, jpeg, png)
+
+    얼굴이 없거나 여러 명이거나 너무 작거나 흐린 사진은 422로 거절합니다
+    (details에 얼굴 수, 얼굴 위치, 선명도, 품질 점수 포함).
     """
     result = await service.upload_image(participation_id, image)
     return create_success_response(
@@ -0,0 +1,202 @@
+"""
+Generation cancellation.
+
+이미지 생성 1건의 기한과 취소 상태(CancelToken)를 관리합니다.
+생성 경로(ImageService → FaceFusionService)는 단계 경계마다 token.check()를 호출하고,
+대기(원본 분석, 추론)는 token.guard()로 감싸 취소/기한 초과 시 즉시 반환합니다.
+
+취소 경로:
+- 클라이언트 연결 끊김: generate-* 라우트의 watch_disconnect()
+- 명시적 취소: POST /session/{participation_id}/cancel-generation → CancellationRegistry.cancel()
+- 기한 초과: JOB_GENERATION_TIMEOUT_SECONDS
+- 원본 사진 교체: 재업로드 시 이전 사진으로 미리 시작한 생성 (GenerationJobManager.cancel_superseded)
+
+취소된 생성에 이미 사용된 추론 시간은 inference_wasted_seconds 지표로 집계합니다.
+"""
+
+import asyncio
+import itertools
+import logging
+import time
+from contextlib import asynccontextmanager, contextmanager
+from typing import AsyncIterator, Dict, Iterator, Optional, Set, TypeVar
+
+from fastapi import Request
+
+from backend.core.config import settings
+from backend.core.metrics import metrics
+from backend.exceptions import GenerationCancelledException, GenerationTimeoutException
+from backend.inference.admission import Priority
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# 워커와 공유하는 취소 키 (CancellationBoard, 0은 취소 불가)
+_token_keys = itertools.count(1)
+
+
+class CancelToken:
+    """생성 1건의 기한/취소 상태와 추론 우선순위 (이벤트 루프 안에서만 사용)"""
+
+    def __init__(self, timeout_seconds: Optional[float] = None, priority: str = Priority.INTERACTIVE):
+        """
+        Args:
+            timeout_seconds: 생성 기한 (초, None이면 JOB_GENERATION_TIMEOUT_SECONDS, 0이면 무제한)
+            priority: 추론 슬롯 우선순위 (backend.inference.admission.Priority)
+        """
+        if timeout_seconds is None:
+            timeout_seconds = settings.job.generation_timeout_seconds
+        self.key = next(_token_keys)
+        self.timeout_seconds = timeout_seconds
+        self.deadline: Optional[float] = time.time() + timeout_seconds if timeout_seconds > 0 else None
+        self.reason: Optional[str] = None
+        # 이 생성을 위해 완료된 추론 시간 (취소되면 낭비로 집계)
+        self.inference_seconds = 0.0
+        self.priority = priority
+        self._cancelled = asyncio.Event()
+
+    @property
+    def cancelled(self) -> bool:
+        """취소 또는 기한 초과 여부"""
+        if self.reason is None and self.deadline is not None and time.time() > self.deadline:
+            self.cancel("timeout")
+        return self.reason is not None
+
+    def cancel(self, reason: str = "cancelled") -> bool:
+        """
+        취소 ('cancelled', 'disconnected', 'timeout', 'superseded')
+
+        Returns:
+            이번 호출로 취소되었는지 (이미 취소되었으면 False)
+        """
+        if self.reason is not None:
+            return False
+        self.reason = reason
+        self._cancelled.set()
+        return True
+
+    def remaining(self) -> Optional[float]:
+        """기한까지 남은 시간 (초, 기한 없으면 None)"""
+        if self.deadline is None:
+            return None
+        return max(0.0, self.deadline - time.time())
+
+    def error(self, stage: str) -> Exception:
+        """취소 사유에 맞는 API 예외"""
+        if self.reason == "timeout":
+            return GenerationTimeoutException(self.timeout_seconds, stage)
+        return GenerationCancelledException(self.reason or "cancelled", stage)
+
+    def check(self, stage: str) -> None:
+        """
+        단계 시작 전 확인
+
+        Raises:
+            GenerationCancelledException: 취소됨
+            GenerationTimeoutException: 기한 초과
+        """
+        if self.cancelled:
+            raise self.error(stage)
+
+    async def guard(self, future: "asyncio.Future[T]", stage: str) -> T:
+        """
+        작업 완료를 기다리되 취소/기한 초과 시 즉시 반환
+
+        future는 취소하지 않으므로 호출자가 남은 작업을 처리해야 합니다.
+
+        Raises:
+            GenerationCancelledException: 취소됨
+            GenerationTimeoutException: 기한 초과
+        """
+        while not future.done():
+            self.check(stage)
+            waiter = asyncio.ensure_future(self._cancelled.wait())
+            try:
+                await asyncio.wait(
+                    {future, waiter},
+                    timeout=self.remaining(),
+                    return_when=asyncio.FIRST_COMPLETED,
+                )
+            finally:
+                waiter.cancel()
+        return future.result()
+
+
+class CancellationRegistry:
+    """참여 ID별 진행 중인 생성 (명시적 취소용)"""
+
+    def __init__(self):
+        self._tokens: Dict[int, Set[CancelToken]] = {}
+
+    @contextmanager
+    def track(self, participation_id: int, token: CancelToken) -> Iterator[CancelToken]:
+        """
+        생성 1건 등록 (종료 시 해제, 취소로 끝나면 지표 기록)
+        """
+        self._tokens.setdefault(participation_id, set()).add(token)
+        try:
+            yield token
+        except (GenerationCancelledException, GenerationTimeoutException):
+            record_cancellation(token)
+            raise
+        finally:
+            tokens = self._tokens.get(participation_id)
+            if tokens is not None:
+                tokens.discard(token)
+                if not tokens:
+                    del self._tokens[participation_id]
+
+    def cancel(self, participation_id: int, reason: str = "cancelled") -> int:
+        """
+        참여 ID의 진행 중인 생성 취소
+
+        Returns:
+            취소된 생성 수
+        """
+        tokens = list(self._tokens.get(participation_id, ()))
+        return sum(token.cancel(reason) for token in tokens)
+
+
+def record_cancellation(token: CancelToken) -> None:
+    """취소/기한 초과된 생성 지표 기록 (이미 완료된 추론 시간은 낭비로 집계)"""
+    metrics.increment("generations_timed_out" if token.reason == "timeout" else "generations_cancelled")
+    if token.inference_seconds:
+        metrics.increment("inference_wasted_seconds", token.inference_seconds)
+    logger.info(
+        f"Generation {token.reason or 'cancelled'} "
+        f"(inference already spent: {token.inference_seconds:.2f}s)"
+    )
+
+
+def record_wasted_inference(seconds: float) -> None:
+    """취소된 생성이 워커에서 사용한 추론 시간 기록"""
+    if seconds > 0:
+        metrics.increment("inference_wasted_seconds", seconds)
+
+
+@asynccontextmanager
+async def watch_disconnect(request: Request, token: CancelToken) -> AsyncIterator[CancelToken]:
+    """
+    요청 처리 중 클라이언트 연결이 끊기면 token 취소
+
+    JOB_DISCONNECT_POLL_SECONDS 간격으로 연결 상태를 확인합니다.
+    """
+
+    async def poll() -> None:
+        while not token.cancelled:
+            if await request.is_disconnected():
+                logger.info(f"Client disconnected, cancelling generation: {request.url.path}")
+                token.cancel("disconnected")
+                return
+            await asyncio.sleep(settings.job.disconnect_poll_seconds)
+
+    task = asyncio.ensure_future(poll())
+    try:
+        yield token
+    finally:
+        task.cancel()
+
+
+# 프로세스 전역 취소 레지스트리
+cancellation_registry = CancellationRegistry()
@@ -4,7 +4,7 @@ Application configuration management using Pydantic settings.
 모든 환경변수와 애플리케이션 설정을 중앙에서 관리합니다.
 """
 
-from typing import List
+from typing import Any, Dict, List, Optional
 from pydantic_settings import BaseSettings
 from pydantic import Field
 
@@ -67,6 +67,50 @@ class StorageSettings(BaseSettings):
         default=["jpg", "jpeg", "png"],
         description="Allowed file extensions"
     )
+    min_free_disk_mb: int = Field(
+        default=500,
+        description="Minimum free disk space (MB) in output_dir for the server to report ready"
+    )
+    normalize_uploads: bool = Field(
+        default=True,
+        description="Re-encode uploads once at upload time (EXIF orientation applied, metadata stripped, size capped)"
+    )
+    upload_max_dimension: int = Field(
+        default=2048,
+        description="Longest side (px) of normalized uploads (0 keeps the original size)"
+    )
+    upload_jpeg_quality: int = Field(
+        default=92,
+        description="JPEG quality (1-100) of normalized uploads"
+    )
+    renditions_enabled: bool = Field(
+        default=True,
+        description="Encode named variants (renditions) of every generated image"
+    )
+    renditions: Dict[str, Dict[str, Any]] = Field(
+        default={
+            "mobile": {"format": "jpg", "max_dimension": 1280, "quality": 80, "progressive": True},
+            "thumbnail": {"format": "jpg", "max_dimension": 320, "quality": 75},
+            "print": {"format": "jpg", "quality": 95, "dpi": 300},
+        },
+        description="Rendition name -> options (format jpg/webp, max_dimension, quality, progressive, dpi)"
+    )
+    rendition_workers: int = Field(
+        default=3,
+        description="Threads encoding renditions in parallel"
+    )
+    image_cache_max_bytes: int = Field(
+        default=128 * 1024 * 1024,  # 128MB
+        description="Total size of served images kept in memory by /images"
+    )
+    image_cache_max_file_bytes: int = Field(
+        default=8 * 1024 * 1024,  # 8MB
+        description="Largest image kept in the /images memory cache (larger files are read from disk)"
+    )
+    image_max_age_seconds: int = Field(
+        default=365 * 24 * 3600,
+        description="Cache-Control max-age of /images responses (file names never change, so they are immutable)"
+    )
 
     class Config:
         env_prefix = "STORAGE_"
@@ -87,14 +131,236 @@ class FaceFusionSettings(BaseSettings):
         default="inswapper_128",
         description="Face swapper model to use (e.g., 'inswapper_128', 'blendswap_256')"
     )
+    face_swapper_models: List[str] = Field(
+        default=[],
+        description="Additional face swapper models preloaded in every worker (active model can be switched at runtime)"
+    )
+    processors: List[str] = Field(
+        default=["face_swapper"],
+        description="FaceFusion processors applied in order; anything beyond ['face_swapper'] runs through "
+                    "the image_to_image workflow (no target analysis cache or batching)"
+    )
     execution_providers: List[str] = Field(
         default=["cpu"],
         description="Execution providers for ONNX (e.g., ['cpu'], ['cuda'], ['coreml'])"
     )
+    model_cache_enabled: bool = Field(
+        default=True,
+        description="Save graph-optimized ONNX models and load them on later starts"
+    )
+    model_cache_dir: str = Field(
+        default="./cache/models",
+        description="Directory for optimized ONNX models (keyed by model hash and ONNX Runtime version)"
+    )
+    graph_optimization_level: str = Field(
+        default="all",
+        description="ONNX Runtime graph optimization level: 'disable', 'basic', 'extended' or 'all'"
+    )
+    model_quantization: str = Field(
+        default="none",
+        description="INT8 CPU inference: 'none' (FP32), 'dynamic' (weights only) or 'static' (calibrated on target images)"
+    )
+    quantization_models: List[str] = Field(
+        default=["inswapper_128", "yoloface_8n"],
+        description="Model file names (without .onnx) replaced by INT8 variants when quantization is enabled"
+    )
+    inference_backend: str = Field(
+        default="process",
+        description="Inference worker backend: 'process' (isolated FaceFusion state per worker) or 'thread' (serialized)"
+    )
+    inference_workers: int = Field(
+        default=2,
+        description="Inference worker pool size (each process worker loads its own models)"
+    )
+    execution_thread_count: int = Field(
+        default=4,
+        description="ONNX execution threads per inference worker"
+    )
+    inference_queue_size: int = Field(
+        default=8,
+        description="Maximum number of generations waiting for a worker before rejecting with 503"
+    )
+    inference_batch_size: int = Field(
+        default=4,
+        description="Maximum number of generations run together in one face swapper call (1 disables batching)"
+    )
+    inference_batch_window_ms: float = Field(
+        default=10.0,
+        description="How long the first generation waits for others to join its batch"
+    )
+    inference_background_share: float = Field(
+        default=0.25,
+        description="Share of inference slots background work (speculative generation, target precompute) may use (0-1, at least one slot)"
+    )
+    quality_ladder_enabled: bool = Field(
+        default=False,
+        description="Step generation quality down the quality ladder under load and back up when load drops (opt-in: lowers output quality)"
+    )
+    quality_ladder: List[Dict[str, Any]] = Field(
+        default=[
+            {"output_image_quality": 70},
+            {"output_image_quality": 60, "face_detector_size": "320x320"},
+        ],
+        description="Degraded quality levels 1..N (level 0 is the engine default); each overrides "
+                    "face_swapper_pixel_boost, face_detector_size, face_mask_types and/or output_image_quality"
+    )
+    quality_degrade_load: float = Field(
+        default=1.5,
+        description="Step down one level when in-flight generations reach this multiple of the inference slots"
+    )
+    quality_recover_load: float = Field(
+        default=0.5,
+        description="Step up one level when in-flight generations are at most this multiple of the inference slots (and latency is low)"
+    )
+    quality_degrade_p95_seconds: float = Field(
+        default=10.0,
+        description="Step down one level when the recent p95 generation latency reaches this (0 disables)"
+    )
+    quality_recover_p95_seconds: float = Field(
+        default=5.0,
+        description="Step up only while the recent p95 generation latency is at most this"
+    )
+    quality_hold_seconds: float = Field(
+        default=15.0,
+        description="Minimum time between quality level changes"
+    )
+    quality_window_seconds: float = Field(
+        default=60.0,
+        description="Window of recent generation latencies used for the p95 (reset on each level change)"
+    )
+    source_face_cache_size: int = Field(
+        default=64,
+        description="Number of analysed source (upload) faces kept in memory per worker"
+    )
+    source_max_dimension: int = Field(
+        default=1280,
+        description="Longest side (px) source uploads are decoded at before face analysis (0 disables)"
+    )
+    source_roi_padding: float = Field(
+        default=0.5,
+        description="Padding around the detected source face, as a ratio of the face box, for the embedding crop"
+    )
+    face_check_enabled: bool = Field(
+        default=True,
+        description="Check uploads for a single, sharp, large-enough face and reject unusable photos before generation"
+    )
+    face_check_max_dimension: int = Field(
+        default=640,
+        description="Longest side (px) uploads are decoded at for the upload face check"
+    )
+    face_check_detector_size: str = Field(
+        default="320x320",
+        description="Face detector input size for the upload face check (falls back to the detector's default if the model does not support it)"
+    )
+    face_check_min_face_size: int = Field(
+        default=80,
+        description="Minimum short side (px, original image) of the face box"
+    )
+    face_check_min_sharpness: float = Field(
+        default=30.0,
+        description="Minimum sharpness (variance of Laplacian on the normalized face crop); lower is rejected as blurry (0 disables)"
+    )
+    face_check_secondary_face_ratio: float = Field(
+        default=0.25,
+        description="Other faces smaller than this ratio of the main face area are ignored (bystanders)"
+    )
+    target_asset_cache_dir: str = Field(
+        default="./cache/target_assets",
+        description="Directory for precomputed target image analysis (.npz, shared by workers)"
+    )
+    target_asset_cache_size: int = Field(
+        default=16,
+        description="Number of analysed target images (decoded frame, faces, crop, masks) kept in memory per worker"
+    )
+    target_precompute_enabled: bool = Field(
+        default=True,
+        description="Analyse all profile/talent target images at startup"
+    )
+    result_cache_enabled: bool = Field(
+        default=True,
+        description="Reuse an existing output when the same source and target images are generated again"
+    )
+    result_cache_size: int = Field(
+        default=256,
+        description="Number of generated outputs remembered by the result cache (LRU)"
+    )
+    result_cache_max_bytes: int = Field(
+        default=512 * 1024 * 1024,  # 512MB
+        description="Total size of the generated outputs remembered by the result cache (LRU)"
+    )
+    warmup_enabled: bool = Field(
+        default=True,
+        description="Run a dummy inference at startup so ONNX sessions are loaded before the first user"
+    )
+    warmup_image_path: Optional[str] = Field(
+        default=None,
+        description="Face image used for the warm-up inference (defaults to the first profile target image)"
+    )
+    mock_latency_p50_ms: float = Field(
+        default=2000.0,
+        description="Mock mode: median generation latency (ms)"
+    )
+    mock_latency_p99_ms: float = Field(
+        default=2000.0,
+        description="Mock mode: 99th percentile generation latency (ms, lognormal; equal to p50 for a fixed latency)"
+    )
+    mock_cpu_burn: bool = Field(
+        default=False,
+        description="Mock mode: spend the latency busy on the CPU instead of sleeping"
+    )
+    mock_image_ops: bool = Field(
+        default=True,
+        description="Mock mode: decode, blend and encode images instead of copying the target"
+    )
+    mock_error_rate: float = Field(
+        default=0.0,
+        description="Mock mode: probability (0-1) that a generation fails"
+    )
 
     class Config:
         env_prefix = "FACEFUSION_"
 
+    @property
+    def swapper_models(self) -> List[str]:
+        """워커에 미리 로드하는 스와퍼 모델 (기본 모델 먼저, 중복 제외)"""
+        return list(dict.fromkeys([self.face_swapper_model, *self.face_swapper_models]))
+
+
+class JobSettings(BaseSettings):
+    """비동기 이미지 생성 작업 관련 설정"""
+
+    queue_size: int = Field(
+        default=16,
+        description="Maximum number of queued generation jobs before rejecting with 503"
+    )
+    concurrency: int = Field(
+        default=2,
+        description="Number of generation jobs processed concurrently (match inference workers)"
+    )
+    retention_seconds: int = Field(
+        default=600,
+        description="How long finished job status is kept in memory"
+    )
+    sse_keepalive_seconds: float = Field(
+        default=15.0,
+        description="Interval of SSE keep-alive comments while a job is pending"
+    )
+    speculative_generation: bool = Field(
+        default=False,
+        description="Start profile and talent generation in the background right after image upload"
+    )
+    generation_timeout_seconds: float = Field(
+        default=120.0,
+        description="Deadline for one generation, including queue time (0 disables)"
+    )
+    disconnect_poll_seconds: float = Field(
+        default=0.5,
+        description="How often generate-* requests check whether the client has disconnected"
+    )
+
+    class Config:
+        env_prefix = "JOB_"
+
 
 class SchedulerSettings(BaseSettings):
     """스케줄러 관련 설정"""
@@ -156,6 +422,7 @@ class Settings(BaseSettings):
     cors: CORSSettings = Field(default_factory=CORSSettings)
     storage: StorageSettings = Field(default_factory=StorageSettings)
     facefusion: FaceFusionSettings = Field(default_factory=FaceFusionSettings)
+    job: JobSettings = Field(default_factory=JobSettings)
     scheduler: SchedulerSettings = Field(default_factory=SchedulerSettings)
 
     class Config:
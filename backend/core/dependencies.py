@@ -18,10 +18,19 @@ def get_session_service(db: AsyncSession = Depends(get_db)):
     return SessionService(db)
 
 
-def get_image_service(db: AsyncSession = Depends(get_db)):
+def get_facefusion_service():
+    """프로세스 전역 FaceFusionService 인스턴스 반환 (startup 시 워밍업됨)"""
+    from backend.facefusion_service import get_facefusion_service as _get_service
+    return _get_service()
+
+
+def get_image_service(
+    db: AsyncSession = Depends(get_db),
+    facefusion=Depends(get_facefusion_service),
+):
     """ImageService 인스턴스 반환"""
     from backend.services.image_service import ImageService
-    return ImageService(db)
+    return ImageService(db, facefusion)
 
 
 def get_tracking_service(db: AsyncSession = Depends(get_db)):
@@ -40,3 +49,12 @@ def get_statistics_service(db: AsyncSession = Depends(get_db)):
     """StatisticsService 인스턴스 반환"""
     from backend.services.statistics_service import StatisticsService
     return StatisticsService(db)
+
+
+def get_readiness_service(
+    db: AsyncSession = Depends(get_db),
+    facefusion=Depends(get_facefusion_service),
+):
+    """ReadinessService 인스턴스 반환"""
+    from backend.services.readiness_service import ReadinessService
+    return ReadinessService(db, facefusion)
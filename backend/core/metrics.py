@@ -0,0 +1,140 @@
+"""
+Runtime metrics.
+
+프로세스 메모리에 보관하는 간단한 런타임 지표(카운터, 관측값 히스토그램, 최근 관측값)입니다.
+GET /dashboard/metrics로 조회합니다. 서버를 재시작하면 초기화됩니다.
+"""
+
+import threading
+from collections import deque
+from typing import Deque, Dict, Iterable, List, Optional
+
+# 지표별로 보관하는 최근 관측값 수 (백분위수 계산용)
+RECENT_WINDOW = 200
+
+# 히스토그램 구간 상한 (초, 지연 시간용)
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+
+class Histogram:
+    """구간별 관측 횟수 (구간 상한 이하 누적, 서버 시작 이후 전체)"""
+
+    def __init__(self, buckets: Iterable[float] = LATENCY_BUCKETS):
+        self.bounds = tuple(sorted(buckets))
+        self.counts: List[int] = [0] * (len(self.bounds) + 1)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value: float) -> None:
+        """관측값 기록"""
+        index = len(self.bounds)
+        for position, bound in enumerate(self.bounds):
+            if value <= bound:
+                index = position
+                break
+        self.counts[index] += 1
+        self.count += 1
+        self.sum += value
+
+    def to_dict(self) -> dict:
+        """API 응답용 (buckets: 상한 → 누적 횟수, 마지막은 +Inf)"""
+        buckets = {}
+        cumulative = 0
+        for bound, count in zip(self.bounds + (float("inf"),), self.counts):
+            cumulative += count
+            buckets["+Inf" if bound == float("inf") else f"{bound:g}"] = cumulative
+        return {
+            "count": self.count,
+            "sum": round(self.sum, 4),
+            "mean": round(self.sum / self.count, 4) if self.count else None,
+            "buckets": buckets,
+        }
+
+
+class MetricsRegistry:
+    """스레드 안전 지표 저장소"""
+
+    def __init__(self, window: int = RECENT_WINDOW):
+        self._counters: Dict[str, float] = {}
+        self._recent: Dict[str, Deque[float]] = {}
+        self._histograms: Dict[str, Histogram] = {}
+        self._window = window
+        self._lock = threading.Lock()
+
+    def increment(self, name: str, value: float = 1) -> None:
+        """카운터 증가"""
+        with self._lock:
+            self._counters[name] = self._counters.get(name, 0) + value
+
+    def counter(self, name: str) -> float:
+        """카운터 현재 값"""
+        with self._lock:
+            return self._counters.get(name, 0)
+
+    def ratio(self, numerator: str, denominator_names: tuple) -> float:
+        """카운터 비율 (예: 캐시 적중률, 분모가 0이면 0)"""
+        with self._lock:
+            total = sum(self._counters.get(name, 0) for name in denominator_names)
+            return self._counters.get(numerator, 0) / total if total else 0.0
+
+    def observe(self, name: str, value: float) -> None:
+        """관측값 기록 (예: 지연 시간, 히스토그램에 누적하고 최근 window개는 따로 보관)"""
+        with self._lock:
+            recent = self._recent.get(name)
+            if recent is None:
+                recent = self._recent[name] = deque(maxlen=self._window)
+                self._histograms[name] = Histogram()
+            recent.append(value)
+            self._histograms[name].observe(value)
+
+    def observed(self, prefix: str = "") -> List[str]:
+        """관측값이 있는 지표 이름 (prefix로 시작하는 것만)"""
+        with self._lock:
+            return sorted(name for name in self._recent if name.startswith(prefix))
+
+    def histogram(self, name: str) -> Optional[dict]:
+        """관측값 히스토그램 (관측값이 없으면 None)"""
+        with self._lock:
+            histogram = self._histograms.get(name)
+            return histogram.to_dict() if histogram else None
+
+    def percentiles(self, name: str, quantiles: Iterable[float] = (0.5, 0.95)) -> Dict[str, Optional[float]]:
+        """
+        최근 관측값의 백분위수 (최근접 순위)
+
+        Returns:
+            {"count": n, "p50": ..., "p95": ...} (관측값이 없으면 백분위수는 None)
+        """
+        with self._lock:
+            values = sorted(self._recent.get(name, ()))
+        result: Dict[str, Optional[float]] = {"count": len(values)}
+        for quantile in quantiles:
+            key = f"p{quantile * 100:g}"
+            if not values:
+                result[key] = None
+                continue
+            index = min(len(values) - 1, int(round(quantile * (len(values) - 1))))
+            result[key] = round(values[index], 4)
+        return result
+
+    def snapshot(self) -> dict:
+        """전체 지표 (API 응답용)"""
+        with self._lock:
+            counters = dict(sorted(self._counters.items()))
+            names = sorted(self._recent)
+        return {
+            "counters": counters,
+            "recent": {name: self.percentiles(name) for name in names},
+            "histograms": {name: self.histogram(name) for name in names},
+        }
+
+    def reset(self) -> None:
+        """전체 지표 초기화"""
+        with self._lock:
+            self._counters.clear()
+            self._recent.clear()
+            self._histograms.clear()
+
+
+# 프로세스 전역 지표 저장소
+metrics = MetricsRegistry()
@@ -6,9 +6,16 @@ from backend.exceptions.api_exceptions import (
     InvalidGenderException,
     ImageNotFoundException,
     ImageGenerationFailedException,
+    InferenceQueueFullException,
+    SwapperModelNotLoadedException,
+    JobNotFoundException,
+    JobQueueFullException,
+    GenerationCancelledException,
+    GenerationTimeoutException,
     FileUploadException,
     InvalidFileTypeException,
     FileSizeExceededException,
+    InvalidFaceImageException,
     ProfileNotFoundException,
     TalentNotFoundException,
 )
@@ -19,9 +26,16 @@ __all__ = [
     "InvalidGenderException",
     "ImageNotFoundException",
     "ImageGenerationFailedException",
+    "InferenceQueueFullException",
+    "SwapperModelNotLoadedException",
+    "JobNotFoundException",
+    "JobQueueFullException",
+    "GenerationCancelledException",
+    "GenerationTimeoutException",
     "FileUploadException",
     "InvalidFileTypeException",
     "FileSizeExceededException",
+    "InvalidFaceImageException",
     "ProfileNotFoundException",
     "TalentNotFoundException",
 ]
@@ -54,6 +54,83 @@ class ImageGenerationFailedException(AppException):
         )
 
 
+class InferenceQueueFullException(AppException):
+    """추론 대기열이 가득 찼을 때 발생"""
+
+    def __init__(
+        self,
+        in_flight: int,
+        capacity: int,
+        details: Optional[Dict[str, Any]] = None
+    ):
+        super().__init__(
+            message=f"Inference queue is full ({in_flight}/{capacity}). Please retry shortly",
+            status_code=503,
+            details=details or {"in_flight": in_flight, "capacity": capacity}
+        )
+
+
+# Generation job related exceptions
+class SwapperModelNotLoadedException(AppException):
+    """미리 로드하지 않은 스와퍼 모델로 전환하려 할 때 발생"""
+
+    def __init__(self, model: str, loaded_models: list, details: Optional[Dict[str, Any]] = None):
+        super().__init__(
+            message=f"Face swapper model is not loaded: '{model}'. Loaded models: {', '.join(loaded_models)}",
+            status_code=400,
+            details=details or {"model": model, "loaded_models": loaded_models}
+        )
+
+
+class JobNotFoundException(AppException):
+    """생성 작업을 찾을 수 없을 때 발생"""
+
+    def __init__(self, job_id: str, details: Optional[Dict[str, Any]] = None):
+        super().__init__(
+            message=f"Generation job not found: {job_id}",
+            status_code=404,
+            details=details or {"job_id": job_id}
+        )
+
+
+class JobQueueFullException(AppException):
+    """생성 작업 대기열이 가득 찼을 때 발생"""
+
+    def __init__(
+        self,
+        queued: int,
+        queue_size: int,
+        details: Optional[Dict[str, Any]] = None
+    ):
+        super().__init__(
+            message=f"Generation job queue is full ({queued}/{queue_size}). Please retry shortly",
+            status_code=503,
+            details=details or {"queued": queued, "queue_size": queue_size}
+        )
+
+
+class GenerationCancelledException(AppException):
+    """생성이 취소되었을 때 발생 (취소 요청 또는 클라이언트 연결 끊김)"""
+
+    def __init__(self, reason: str, stage: str, details: Optional[Dict[str, Any]] = None):
+        super().__init__(
+            message=f"Image generation was cancelled ({reason}) before {stage}",
+            status_code=409,
+            details=details or {"reason": reason, "stage": stage}
+        )
+
+
+class GenerationTimeoutException(AppException):
+    """생성 기한을 넘겼을 때 발생"""
+
+    def __init__(self, timeout_seconds: float, stage: str, details: Optional[Dict[str, Any]] = None):
+        super().__init__(
+            message=f"Image generation timed out after {timeout_seconds:g}s before {stage}",
+            status_code=504,
+            details=details or {"timeout_seconds": timeout_seconds, "stage": stage}
+        )
+
+
 # File upload related exceptions
 class FileUploadException(AppException):
     """파일 업로드 실패 시 발생"""
@@ -104,6 +181,17 @@ class FileSizeExceededException(AppException):
         )
 
 
+class InvalidFaceImageException(AppException):
+    """업로드한 사진으로 얼굴 합성을 할 수 없을 때 발생 (얼굴 없음, 여러 명, 작음, 흐림)"""
+
+    def __init__(self, reason: str, details: Optional[Dict[str, Any]] = None):
+        super().__init__(
+            message=f"Unusable face image: {reason}",
+            status_code=422,
+            details=details or {"reason": reason}
+        )
+
+
 # Target related exceptions
 class ProfileNotFoundException(AppException):
     """프로필 타겟을 찾을 수 없을 때 발생"""
@@ -1,19 +1,74 @@
 """
 FaceFusion 실행 서비스
 
-facefusion 모듈을 직접 import하여 실제 얼굴 합성을 수행합니다.
-모델을 메모리에 한 번만 로드하고 재사용하여 효율적으로 처리합니다.
+FaceFusion 추론 워커 풀에 얼굴 합성 작업을 전달하는 비동기 서비스입니다.
+각 워커는 facefusion 모듈과 모델을 한 번만 로드하고 재사용하며
+(backend.inference.engine), 워커 프로세스마다 state를 따로 가지므로
+여러 합성을 동시에 안전하게 처리할 수 있습니다.
+mock 모드에서도 같은 워커 풀에서 모의 엔진(backend.inference.mock_engine)을 실행하므로
+모델 없이 백엔드 전체의 부하/용량 테스트를 할 수 있습니다.
+워커를 사용하는 작업은 PriorityAdmission(backend.inference.admission)에서 슬롯을 받아
+실행하므로, 키오스크 요청은 추측 생성 같은 background 작업보다 먼저 실행됩니다.
+워커는 설정된 스와퍼 모델을 모두 미리 로드하므로, 사용 중인 모델은 set_active_model()로
+재시작 없이 전환합니다 (생성마다 시작 시점의 모델을 작업에 담아 보냄).
+부하가 높으면 QualityLadder(backend.inference.quality)가 품질 단계를 낮추고, 생성마다
+시작 시점의 단계를 작업에 담아 보냅니다.
+프로세스당 하나의 인스턴스만 생성하며, get_facefusion_service()로 접근합니다.
 """
 
-import sys
+import asyncio
+import time
 import logging
+import tempfile
+import threading
+from collections import deque
 from pathlib import Path
-from typing import Optional
+from typing import Dict, List, Optional
 
+from backend.core.cancellation import CancelToken, record_wasted_inference
 from backend.core.config import settings
+from backend.core.metrics import metrics
+from backend.exceptions import (
+    AppException,
+    GenerationCancelledException,
+    GenerationTimeoutException,
+    SwapperModelNotLoadedException,
+)
+from backend.inference.admission import PriorityAdmission, Priority
+from backend.inference.batching import BatchScheduler
+from backend.inference.cancellation import CancellationBoard, SwapCancelled
+from backend.inference.executor import InferenceExecutor
+from backend.inference.face_check import evaluate_face_check
+from backend.inference.quality import QualityLadder
+from backend.inference.result_cache import ResultCache, result_fingerprint
+from backend.inference.stage_timer import StageTimer
+from backend.inference.swap_job import SwapJob, SwapResult
+from backend.inference import worker
+from backend.utils.hashing import get_file_digest_cache
+from backend.utils.lru_cache import LRUCache
 
 logger = logging.getLogger(__name__)
 
+# 최근 추론 결과 중 실패 비율이 이 이상이면 degraded
+DEGRADED_FAILURE_RATIO = 0.5
+# degraded 판정에 필요한 최소 추론 수
+DEGRADED_MIN_SAMPLES = 4
+
+# 단계별 소요 시간 히스토그램 이름 접두사 (stage_seconds.<단계>)
+STAGE_METRIC_PREFIX = "stage_seconds."
+# 스와퍼 모델별 워커 추론 시간 / 얼굴 교체 단계 시간 히스토그램 이름 접두사
+MODEL_METRIC_PREFIX = "model_inference_seconds."
+MODEL_SWAP_METRIC_PREFIX = "model_swap_seconds."
+
+
+class EngineState:
+    """추론 엔진 상태"""
+
+    COLD = "cold"  # 모델 미로드 (워밍업 전/건너뜀)
+    WARMING = "warming"  # 워밍업 진행 중
+    READY = "ready"  # 모델 로드 완료, 추론 정상
+    DEGRADED = "degraded"  # 워밍업 실패 또는 최근 추론 실패가 많음
+
 
 class FaceFusionService:
     """FaceFusion 실행 서비스 클래스"""
@@ -22,157 +77,219 @@ class FaceFusionService:
         """FaceFusion 서비스 초기화"""
         self.mode = settings.facefusion.mode
         self.facefusion_path = Path(settings.facefusion.project_path).resolve()
-        self.face_swapper_model = settings.facefusion.face_swapper_model
-        self.execution_providers = settings.facefusion.execution_providers
-
-        # facefusion 모듈 import를 위한 경로 추가
-        if str(self.facefusion_path) not in sys.path:
-            sys.path.insert(0, str(self.facefusion_path))
-
-        # facefusion 모듈 초기화 (real 모드일 때만)
-        self._facefusion_initialized = False
-        self._state_manager = None
-        self._image_to_image = None
-
-        if self.mode == "real":
-            self._initialize_facefusion()
+        self._warmed_up = False
+        self._state = EngineState.COLD
+        # startup 워밍업이 아직 끝나지 않음 (비활성화되면 cold 상태로도 요청을 받음)
+        self._warmup_pending = settings.facefusion.warmup_enabled
+        # 최근 추론 성공 여부 (degraded 판정용, 취소는 제외)
+        self._recent_outcomes: deque = deque(maxlen=20)
+
+        # 워커에 미리 로드된 스와퍼 모델과 새 생성에 사용할 모델
+        self.swapper_models = settings.facefusion.swapper_models
+        self.active_swapper_model = settings.facefusion.face_swapper_model
+
+        # (원본 이미지, 품질 단계)별 얼굴 분석 작업 (진행 중/완료, 프로필/장기자랑 생성이 공유)
+        self._source_analyses: LRUCache[asyncio.Future] = LRUCache(
+            max_entries=settings.facefusion.source_face_cache_size
+        )
+
+        # 생성 결과 캐시 (같은 원본/타겟 재생성 시 기존 출력 재사용)
+        self.result_cache: Optional[ResultCache] = None
+        if settings.facefusion.result_cache_enabled:
+            self.result_cache = ResultCache(
+                max_bytes=settings.facefusion.result_cache_max_bytes,
+                max_entries=settings.facefusion.result_cache_size,
+                fingerprint=f"{self.mode}-{result_fingerprint(settings.facefusion)}",
+            )
+
+        # 취소된 작업 기록 (워커가 단계 경계에서 확인)
+        self.cancellation = CancellationBoard()
+
+        # 추론 워커 풀 (mock 모드는 워커에서 모의 엔진 실행)
+        self.executor = InferenceExecutor(
+            max_workers=settings.facefusion.inference_workers,
+            queue_size=settings.facefusion.inference_queue_size,
+            backend=settings.facefusion.inference_backend,
+            initializer=worker.init_worker,
+            initargs=(settings.facefusion, True, self.cancellation),
+        )
+        # 동시에 들어온 요청을 모아 스와퍼 모델을 한 번에 실행
+        # (워커가 배치 실행을 지원한다고 보고한 스와퍼 모델만, 모르는 모델은 워커에 바로 전달)
+        self.batcher: Optional[BatchScheduler] = None
+        self._batch_support: Dict[str, bool] = {}
+        if settings.facefusion.inference_batch_size > 1:
+            self.batcher = BatchScheduler(
+                self.executor,
+                max_batch_size=settings.facefusion.inference_batch_size,
+                window_ms=settings.facefusion.inference_batch_window_ms,
+                cancellation=self.cancellation,
+            )
+
+        # 워커 사용 순서 (interactive 요청 우선, background 작업은 슬롯 일부만 사용)
+        self.admission = PriorityAdmission(
+            slots=self.executor.max_workers * (self.batcher.max_batch_size if self.batcher else 1),
+            background_share=settings.facefusion.inference_background_share,
+            queue_size=settings.facefusion.inference_queue_size,
+        )
+        # 부하에 따른 품질 단계 (부하 = 진행 중인 생성 / 추론 슬롯)
+        self.quality = QualityLadder(settings.facefusion, slots=self.admission.slots)
+        # 진행 중인 생성 수 (결과 캐시 조회부터 완료까지)
+        self._active_generations = 0
+        # 원본 분석을 기다리는 생성 (token.key → 원본 경로, promote()용)
+        self._awaiting_analysis: Dict[int, str] = {}
 
         logger.info(f"FaceFusion 서비스 초기화 완료")
         logger.info(f"Mode: {self.mode}")
         logger.info(f"FaceFusion path: {self.facefusion_path}")
-
-    def _initialize_facefusion(self):
-        """FaceFusion 모듈 초기화"""
-        try:
-            logger.info(f"FaceFusion 모듈 import 시작... (path: {self.facefusion_path})")
-
-            # facefusion 모듈 import
-            from facefusion import state_manager
-            from facefusion.workflows import image_to_image
-            from facefusion import logger as ff_logger
-
-            self._state_manager = state_manager
-            self._image_to_image = image_to_image
-
-            logger.info("FaceFusion 모듈 import 성공")
-
-            # FaceFusion 로거 설정 (선택사항)
-            # ff_logger.init('info')
-
-            # 기본 설정 초기화
-            logger.info("FaceFusion 기본 설정 초기화 시작...")
-            self._init_default_state()
-            logger.info("FaceFusion 기본 설정 초기화 완료")
-
-            self._facefusion_initialized = True
-            logger.info("✅ FaceFusion 모듈 초기화 완료")
-
-        except ImportError as e:
-            logger.error(f"❌ FaceFusion 모듈 import 실패: {e}")
-            logger.error(f"PYTHONPATH에 {self.facefusion_path}가 추가되었는지 확인하세요")
-            raise RuntimeError(f"FaceFusion 모듈을 찾을 수 없습니다: {e}")
-        except Exception as e:
-            logger.error(f"❌ FaceFusion 초기화 중 오류: {e}")
-            import traceback
-            logger.error(traceback.format_exc())
-            raise
-
-    def _init_default_state(self):
-        """FaceFusion state manager 기본 설정"""
-        # 프로세서 설정
-        self._state_manager.init_item('processors', ['face_swapper'])
-
-        # Face swapper 모델 설정
-        self._state_manager.init_item('face_swapper_model', self.face_swapper_model)
-
-        # Execution provider 설정
-        self._state_manager.init_item('execution_providers', self.execution_providers)
-        self._state_manager.init_item('execution_device_ids', ['0'])  # CPU 또는 GPU 디바이스 ID (문자열 리스트)
-        self._state_manager.init_item('execution_thread_count', 8)  # 실행 스레드 수
-        self._state_manager.init_item('execution_queue_count', 1)
-
-        # Download 설정 (NSFW 체크 등에 필요)
-        self._state_manager.init_item('download_providers', ['github'])
-        self._state_manager.init_item('download_scope', 'full')
-
-        # Face detector 설정
-        self._state_manager.init_item('face_detector_model', 'yolo_face')
-        self._state_manager.init_item('face_detector_size', '640x640')
-        self._state_manager.init_item('face_detector_score', 0.5)
-        self._state_manager.init_item('face_detector_angles', [0])
-        self._state_manager.init_item('face_detector_margin', [0, 0, 0, 0])
-
-        # Face landmarker 설정
-        self._state_manager.init_item('face_landmarker_model', '2dfan4')
-        self._state_manager.init_item('face_landmarker_score', 0.5)
-
-        # Face selector 설정
-        self._state_manager.init_item('face_selector_mode', 'reference')
-        self._state_manager.init_item('face_selector_order', 'large-small')
-        self._state_manager.init_item('face_selector_age_start', None)
-        self._state_manager.init_item('face_selector_age_end', None)
-        self._state_manager.init_item('face_selector_gender', None)
-        self._state_manager.init_item('face_selector_race', None)
-        self._state_manager.init_item('reference_face_position', 0)
-        self._state_manager.init_item('reference_face_distance', 0.3)
-        self._state_manager.init_item('reference_frame_number', 0)
-
-        # Face masker 설정
-        self._state_manager.init_item('face_mask_types', ['box'])
-        self._state_manager.init_item('face_mask_blur', 0.3)
-        self._state_manager.init_item('face_mask_padding', [0, 0, 0, 0])
-        self._state_manager.init_item('face_mask_regions', [])
-        self._state_manager.init_item('face_mask_areas', [])
-        self._state_manager.init_item('face_occluder_model', 'xseg_1')
-        self._state_manager.init_item('face_parser_model', 'bisenet_resnet_34')
-
-        # Face swapper 추가 설정
-        self._state_manager.init_item('face_swapper_pixel_boost', '128x128')
-        self._state_manager.init_item('face_swapper_weight', 1.0)
-
-        # Memory 설정
-        self._state_manager.init_item('video_memory_strategy', 'strict')
-        self._state_manager.init_item('system_memory_limit', 0)
-
-        # Output 설정
-        self._state_manager.init_item('output_image_quality', 80)
-        self._state_manager.init_item('output_image_scale', 1.0)
-
-        # Temp 설정
-        self._state_manager.init_item('temp_path', '.facefusion')  # Temp 디렉토리 경로
-        self._state_manager.init_item('temp_frame_format', 'jpg')
-        self._state_manager.init_item('keep_temp', False)
-
-        # 기타 필수 설정
-        self._state_manager.init_item('log_level', 'error')
-
-        logger.debug("FaceFusion 기본 설정 완료")
+        logger.info(
+            f"Inference backend: {self.executor.backend} "
+            f"(workers={self.executor.max_workers}, "
+            f"threads/worker={settings.facefusion.execution_thread_count})"
+        )
 
     async def generate_image(
         self,
         source_path: str,
         target_path: str,
-        output_path: str
-    ) -> None:
+        output_path: str,
+        cancel_token: Optional[CancelToken] = None,
+    ) -> dict:
         """
         얼굴 합성 이미지 생성
 
         source_path의 얼굴을 target_path의 이미지에 합성하여 output_path에 저장합니다.
+        cancel_token이 취소되거나 기한이 지나면 대기 중인 작업은 실행하지 않고,
+        실행 중인 작업은 워커가 다음 단계 경계에서 중단합니다.
+        생성 도중 스와퍼 모델이나 품질 단계가 바뀌어도 시작 시점의 설정으로 끝까지 실행합니다.
 
         Args:
             source_path: 원본 이미지 경로 (사용자가 업로드한 이미지)
             target_path: 타겟 이미지 경로 (프로필 또는 탤런트 이미지)
             output_path: 출력 이미지 경로
+            cancel_token: 생성 취소/기한 (없으면 취소 불가)
+
+        Returns:
+            timings (단계별 소요 시간, 초: backend.inference.stage_timer 단계와 result_cache,
+            materialize, analyse_source, queue_wait, inference, total),
+            swapper_model, quality_level (결과 이미지의 품질 단계, 0: 최고 품질)
 
         Raises:
             FileNotFoundError: 입력 파일이 존재하지 않음
+            InferenceQueueFullException: 추론 대기열이 가득 참
+            GenerationCancelledException: 생성이 취소됨
+            GenerationTimeoutException: 생성 기한 초과
             RuntimeError: FaceFusion 실행 실패
         """
-        if self.mode == "mock":
-            logger.warning("Mock mode: Face fusion is disabled, using mock implementation")
-            await self._mock_generate_image(source_path, target_path, output_path)
-            return
+        token = cancel_token or CancelToken(timeout_seconds=0)
+        token.check("result_cache")
+        timer = StageTimer()
+        start_time = time.perf_counter()
+        swapper_model = self.active_swapper_model
+        quality_level = self.quality.select(self._active_generations)
+
+        self._active_generations += 1
+        try:
+            return await self._generate_or_reuse(
+                source_path, target_path, output_path, swapper_model, quality_level, token, timer, start_time
+            )
+        finally:
+            self._active_generations -= 1
+
+    async def _generate_or_reuse(
+        self,
+        source_path: str,
+        target_path: str,
+        output_path: str,
+        swapper_model: str,
+        quality_level: int,
+        token: CancelToken,
+        timer: StageTimer,
+        start_time: float,
+    ) -> dict:
+        """결과 캐시에서 재사용하거나 새로 생성"""
+        # 같은 원본/타겟/모델/설정으로 이 단계 이상의 품질로 생성한 결과가 있으면 재사용
+        found = None
+        with timer.stage("result_cache"):
+            cache_keys = await self._result_cache_keys(source_path, target_path, swapper_model, quality_level)
+            if cache_keys:
+                found = self.result_cache.lookup(cache_keys)
+        if found is not None:
+            cache_key, cached = found
+            with timer.stage("materialize"):
+                await asyncio.to_thread(self.result_cache.materialize, cached, output_path)
+            self.result_cache.store(cache_key, output_path)
+            logger.info(f"✅ Face fusion result reused: {output_path} (from {cached.output_path})")
+            return self._report(timer, start_time, swapper_model, cache_keys.index(cache_key))
+
+        await self._generate_image(
+            source_path, target_path, output_path, swapper_model, quality_level, token, timer
+        )
+
+        if cache_keys:
+            self.result_cache.store(cache_keys[quality_level], output_path)
+        report = self._report(timer, start_time, swapper_model, quality_level)
+        if token.priority == Priority.INTERACTIVE:
+            # 사용자가 기다린 생성만 품질 단계 판단에 사용
+            self.quality.observe(report["timings"]["total"])
+        return report
+
+    @staticmethod
+    def _report(timer: StageTimer, start_time: float, swapper_model: str, quality_level: int) -> dict:
+        """생성 1건의 단계별 시간과 품질 단계를 지표에 누적하고 결과용으로 반환"""
+        timer.add("total", time.perf_counter() - start_time)
+        timings = timer.as_dict()
+        for stage, seconds in timings.items():
+            metrics.observe(f"{STAGE_METRIC_PREFIX}{stage}", seconds)
+        metrics.increment(f"quality_level_used_{quality_level}")
+        return {"timings": timings, "swapper_model": swapper_model, "quality_level": quality_level}
+
+    def relocate_output(self, output_path: str, stored_path: str) -> None:
+        """
+        생성 이미지가 옮겨진 경로를 결과 캐시에 반영
+
+        Args:
+            output_path: generate_image()에 전달한 출력 경로
+            stored_path: 옮겨진 경로 (해시 이름 저장소)
+        """
+        if self.result_cache is not None:
+            self.result_cache.relocate(output_path, stored_path)
 
+    async def _result_cache_keys(
+        self,
+        source_path: str,
+        target_path: str,
+        swapper_model: str,
+        quality_level: int,
+    ) -> List[tuple]:
+        """
+        결과 캐시 후보 키 (0단계부터 quality_level까지, 캐시 비활성화 또는 파일을 읽을 수 없으면 빈 목록)
+        """
+        if self.result_cache is None:
+            return []
+
+        digests = get_file_digest_cache()
+        try:
+            source_digest = await asyncio.to_thread(digests.get, source_path)
+            target_digest = await asyncio.to_thread(digests.get, target_path)
+        except OSError:
+            # 파일 오류는 생성 단계에서 FileNotFoundError로 보고
+            return []
+        return [
+            self.result_cache.key(source_digest, target_digest, swapper_model, level)
+            for level in range(quality_level + 1)
+        ]
+
+    async def _generate_image(
+        self,
+        source_path: str,
+        target_path: str,
+        output_path: str,
+        swapper_model: str,
+        quality_level: int,
+        token: CancelToken,
+        timer: StageTimer,
+    ) -> None:
+        """얼굴 합성 실행 (결과 캐시 미적중)"""
         # 파일 경로 검증
         source_file = Path(source_path)
         target_file = Path(target_path)
@@ -183,6 +300,8 @@ class FaceFusionService:
             source_file = Path.cwd() / source_file
         if not target_file.is_absolute():
             target_file = Path.cwd() / target_file
+        if not output_file.is_absolute():
+            output_file = Path.cwd() / output_file
 
         if not source_file.exists():
             raise FileNotFoundError(f"Source image not found: {source_file}")
@@ -196,72 +315,456 @@ class FaceFusionService:
         logger.info(f"  Source: {source_file}")
         logger.info(f"  Target: {target_file}")
         logger.info(f"  Output: {output_file}")
+        logger.info(f"  Model: {swapper_model} (quality level {quality_level})")
+
+        # 원본 전처리(축소 디코딩/얼굴 영역)와 얼굴 분석은 참여당 한 번만 수행 (결과는 모든 워커가 공유)
+        # (취소되어도 분석은 계속 진행하여 재시도 시 재사용)
+        self._awaiting_analysis[token.key] = str(source_file)
+        try:
+            with timer.stage("analyse_source"):
+                source_metadata = await token.guard(
+                    asyncio.ensure_future(
+                        self.analyse_source(str(source_file), token.priority, quality_level)
+                    ),
+                    "analyse_source",
+                )
+        finally:
+            self._awaiting_analysis.pop(token.key, None)
+        if source_metadata.get("scale", 1.0) < 1.0:
+            logger.info(
+                f"  Source preprocessed: {source_metadata['original_size']} -> "
+                f"{source_metadata['decoded_size']} (scale {source_metadata['scale']}), "
+                f"face ROI {source_metadata.get('roi')}"
+            )
+
+        # 추론은 워커 풀에서 수행 (이벤트 루프 블로킹 방지, 워커별 state 격리, 마이크로 배치)
+        job = SwapJob(
+            source_path=str(source_file),
+            target_path=str(target_file),
+            output_path=str(output_file),
+            cancel_key=token.key,
+            deadline=token.deadline,
+            swapper_model=swapper_model,
+            quality_level=quality_level,
+        )
+        inference_start = time.perf_counter()
+        result = await self._run_inference(job, token)
+        # 워커 밖에서 보낸 시간 (대기열, 배치 수집, 프로세스 간 전달)
+        timer.add("queue_wait", max(0.0, time.perf_counter() - inference_start - result.elapsed))
+        timer.add("inference", result.elapsed)
+        timer.merge(result.timings)
+        logger.info(f"✅ Face fusion completed in {result.elapsed:.2f}s: {output_file}")
+
+    async def _run_inference(self, job: SwapJob, token: CancelToken) -> SwapResult:
+        """
+        워커 풀에서 합성 실행
+
+        취소/기한 초과 시 워커에 알리고 바로 반환합니다. 워커는 다음 단계 경계에서
+        작업을 중단하며, 그때까지 사용한 시간은 낭비된 추론 시간으로 기록합니다.
+        """
+        token.check("inference")
+        future = asyncio.ensure_future(self._submit_inference(job, token))
 
         try:
-            # FaceFusion state 설정
-            logger.info("Setting FaceFusion state...")
-            self._state_manager.set_item('source_paths', [str(source_file)])
-            self._state_manager.set_item('target_path', str(target_file))
-            self._state_manager.set_item('output_path', str(output_file))
-            logger.info("FaceFusion state set successfully")
-
-            # 얼굴 합성 실행
-            import time
-            start_time = time.time()
-
-            logger.info("Starting FaceFusion image_to_image.process()...")
-            error_code = self._image_to_image.process(start_time)
-            logger.info(f"FaceFusion process returned error code: {error_code}")
-
-            if error_code != 0:
-                raise RuntimeError(f"FaceFusion failed with error code: {error_code}")
-
-            # 출력 파일 생성 확인
-            if not output_file.exists():
-                raise RuntimeError(f"Output file not created: {output_file}")
-
-            elapsed = time.time() - start_time
-            logger.info(f"✅ Face fusion completed successfully in {elapsed:.2f}s: {output_file}")
-
-        except Exception as e:
-            logger.error(f"❌ Face fusion failed: {str(e)}")
-            import traceback
-            logger.error(traceback.format_exc())
-            raise RuntimeError(f"Face fusion failed: {str(e)}") from e
-
-    async def _mock_generate_image(
+            result = await token.guard(future, "inference")
+        except (GenerationCancelledException, GenerationTimeoutException):
+            self.cancellation.cancel(job.cancel_key)
+            self.admission.withdraw(token.key)
+            future.add_done_callback(self._record_abandoned_inference)
+            raise
+        except SwapCancelled as e:
+            # 워커가 먼저 기한 초과/취소를 확인한 경우
+            record_wasted_inference(e.elapsed)
+            token.cancel(e.reason)
+            raise token.error(e.stage)
+        except AppException:
+            # 대기열 가득 참 등 요청 거부는 엔진 상태와 무관
+            raise
+        except Exception:
+            self._recent_outcomes.append(False)
+            raise
+
+        if result.batch_supported is not None:
+            self._batch_support[job.swapper_model] = result.batch_supported
+        token.inference_seconds += result.elapsed
+        metrics.observe("inference_seconds", result.elapsed)
+        metrics.observe(f"{MODEL_METRIC_PREFIX}{job.swapper_model}", result.elapsed)
+        if "swap" in result.timings:
+            metrics.observe(f"{MODEL_SWAP_METRIC_PREFIX}{job.swapper_model}", result.timings["swap"])
+        self._recent_outcomes.append(True)
+        if self._state in (EngineState.COLD, EngineState.DEGRADED):
+            # 워밍업을 건너뛰었거나 실패했지만 추론에서 모델이 로드된 경우
+            self._state = EngineState.READY
+        return result
+
+    async def _submit_inference(self, job: SwapJob, token: CancelToken) -> SwapResult:
+        """추론 슬롯을 받은 뒤 워커 풀(또는 배치)에 합성 작업 전달"""
+        async with self.admission.slot(token.priority, key=token.key):
+            if self.batcher and self._batch_support.get(job.swapper_model):
+                return await self.batcher.run(job)
+            return await self.executor.run(worker.run_swap_job, job)
+
+    def promote(self, token: CancelToken) -> None:
+        """
+        생성 우선순위를 interactive로 올림 (사용자가 가져간 추측 생성)
+
+        이미 슬롯을 기다리는 합성 또는 원본 분석도 interactive 대기열로 옮깁니다.
+        """
+        token.priority = Priority.INTERACTIVE
+        self.admission.promote(token.key)
+        source_path = self._awaiting_analysis.get(token.key)
+        if source_path is not None:
+            self.admission.promote(("analyse_source", source_path))
+
+    @staticmethod
+    def _record_abandoned_inference(future: asyncio.Future) -> None:
+        """취소 후 워커에서 끝난 추론이 사용한 시간 기록"""
+        if future.cancelled():
+            return
+        error = future.exception()
+        if error is None:
+            record_wasted_inference(future.result().elapsed)
+        elif isinstance(error, SwapCancelled):
+            record_wasted_inference(error.elapsed)
+
+    async def analyse_source(
         self,
         source_path: str,
-        target_path: str,
-        output_path: str
-    ) -> None:
+        priority: str = Priority.INTERACTIVE,
+        quality_level: int = 0,
+    ) -> dict:
         """
-        모의 이미지 생성 (mock mode)
+        원본 이미지 얼굴 분석 (검출/랜드마크/임베딩)
+
+        결과는 워커에서 업로드 파일 옆 .npz로 저장되어 이후 합성에서 재사용됩니다.
+        검출기 입력 크기가 품질 단계에 따라 다르므로 분석은 품질 단계별로 합니다 (검출기 설정이
+        같은 단계는 워커의 캐시를 공유). 같은 원본/단계의 분석이 진행 중이면 그 결과를 함께 기다리며, interactive 요청이
+        background 분석을 기다리게 되면 그 분석의 우선순위를 올립니다.
+
+        Args:
+            source_path: 원본 이미지 절대 경로
+            priority: 추론 슬롯 우선순위 (새로 분석하는 경우)
+            quality_level: 품질 단계 (새로 분석하는 경우 검출기 입력 크기)
+
+        Returns:
+            분석 메타데이터 (bounding_box, score, original_size, decoded_size, scale, roi)
 
-        실제 FaceFusion을 실행하지 않고 타겟 이미지를 복사합니다.
+        Raises:
+            RuntimeError: 원본 이미지에서 얼굴을 찾지 못함
         """
-        import shutil
-        import asyncio
+        admission_key = ("analyse_source", source_path)
+        analysis_key = (source_path, quality_level)
+        future = self._source_analyses.get(analysis_key)
+        if future is None:
+            future = asyncio.ensure_future(
+                self._run_analysis(source_path, priority, quality_level, admission_key)
+            )
+            future.add_done_callback(self._record_analysis_timings)
+            self._source_analyses.put(analysis_key, future)
+        elif priority == Priority.INTERACTIVE and not future.done():
+            self.admission.promote(admission_key)
 
-        logger.info("Mock mode: Copying target image to output")
+        try:
+            return await asyncio.shield(future)
+        except Exception:
+            # 실패한 분석은 캐시하지 않음 (재업로드/재시도 시 다시 분석)
+            if self._source_analyses.get(analysis_key) is future:
+                self._source_analyses.pop(analysis_key)
+            raise
 
-        target_file = Path(target_path)
-        output_file = Path(output_path)
+    async def _run_analysis(
+        self,
+        source_path: str,
+        priority: str,
+        quality_level: int,
+        admission_key: tuple,
+    ) -> dict:
+        """추론 슬롯을 받은 뒤 워커에서 원본 분석"""
+        async with self.admission.slot(priority, key=admission_key):
+            return await self.executor.run(worker.analyse_source, source_path, quality_level)
+
+    @staticmethod
+    def _record_analysis_timings(future: asyncio.Future) -> None:
+        """워커의 원본 분석 단계 시간을 히스토그램에 누적 (분석 1회당 한 번)"""
+        if future.cancelled() or future.exception() is not None:
+            return
+        for stage, seconds in future.result().get("timings", {}).items():
+            metrics.observe(f"{STAGE_METRIC_PREFIX}{stage}", seconds)
 
-        # 상대 경로를 절대 경로로 변환
-        if not target_file.is_absolute():
-            target_file = Path.cwd() / target_file
+    async def check_face(self, source_path: str) -> dict:
+        """
+        업로드 사진 얼굴 확인 (축소 입력 검출기만 실행, 수십 ms)
 
-        if not target_file.exists():
-            raise FileNotFoundError(f"Target image not found: {target_file}")
+        얼굴 수, 가장 큰 얼굴의 위치/검출 점수/선명도를 측정하여
+        FACEFUSION_FACE_CHECK_* 기준으로 판정합니다.
+
+        Args:
+            source_path: 원본 이미지 절대 경로
+
+        Returns:
+            판정 결과 (accepted, reason, face_count, bounding_box, detector_score,
+            sharpness, quality, original_size, elapsed_ms)
+        """
+        start_time = time.perf_counter()
+        async with self.admission.slot(Priority.INTERACTIVE):
+            measurement = await self.executor.run(worker.check_face, source_path)
+        report = evaluate_face_check(measurement, settings.facefusion)
+        report["elapsed_ms"] = round((time.perf_counter() - start_time) * 1000, 1)
+
+        metrics.observe(f"{STAGE_METRIC_PREFIX}face_check", report["elapsed_ms"] / 1000)
+        metrics.increment(
+            "upload_face_check_accepted" if report["accepted"]
+            else f"upload_face_check_rejected_{report['reason']}"
+        )
+        return report
+
+    async def precompute_targets(self, target_paths: List[str]) -> Dict[str, int]:
+        """
+        타겟 이미지 분석 결과 미리 계산
+
+        타겟 디코딩, 얼굴 검출/랜드마크, 얼굴 정렬과 마스크를 계산하여
+        디스크 캐시에 저장합니다. 이미 최신 캐시가 있는 타겟은 건너뜁니다.
+        워커 하나에서 순서대로 실행하므로 나머지 워커는 요청을 처리할 수 있습니다.
+
+        Args:
+            target_paths: 타겟 이미지 절대 경로 목록
+
+        Returns:
+            통계 (built, cached, failed, pruned)
+        """
+        if self.mode != "real" or not target_paths:
+            return {}
+
+        start_time = time.time()
+        # 사용자 요청보다 뒤에 실행 (background 슬롯)
+        async with self.admission.slot(Priority.BACKGROUND):
+            stats = await self.executor.run(worker.precompute_targets, target_paths)
+        logger.info(
+            f"✅ 타겟 분석 캐시 준비 완료 ({time.time() - start_time:.2f}s): "
+            f"built={stats['built']}, cached={stats['cached']}, "
+            f"failed={stats['failed']}, pruned={stats['pruned']}"
+        )
+        return stats
+
+    def get_metrics(self) -> dict:
+        """추론 관련 런타임 지표"""
+        return {
+            "result_cache": {
+                "enabled": self.result_cache is not None,
+                "entries": len(self.result_cache) if self.result_cache else 0,
+                "bytes": self.result_cache.total_bytes if self.result_cache else 0,
+                "hits": metrics.counter("result_cache_hits"),
+                "misses": metrics.counter("result_cache_misses"),
+                "hit_ratio": metrics.ratio(
+                    "result_cache_hits", ("result_cache_hits", "result_cache_misses")
+                ),
+            },
+            "cancellation": {
+                "cancelled": metrics.counter("generations_cancelled"),
+                "timed_out": metrics.counter("generations_timed_out"),
+                "dropped_before_start": metrics.counter("generation_jobs_dropped"),
+                "wasted_inference_seconds": round(metrics.counter("inference_wasted_seconds"), 3),
+            },
+            "stages": self._latency_summary(STAGE_METRIC_PREFIX),
+            "admission": self.admission.get_status(),
+            "swapper_models": self.get_models(),
+            "quality": self.quality.get_status(),
+        }
+
+    @staticmethod
+    def _latency_summary(prefix: str) -> Dict[str, dict]:
+        """
+        prefix로 시작하는 소요 시간 요약 (전체 횟수/평균, 최근 p50/p95, 구간별 분포는 histograms)
+
+        Returns:
+            접두사를 뗀 이름 → {count, mean, p50, p95}
+        """
+        summary = {}
+        for name in metrics.observed(prefix):
+            histogram = metrics.histogram(name)
+            recent = metrics.percentiles(name)
+            summary[name[len(prefix):]] = {
+                "count": histogram["count"],
+                "mean": histogram["mean"],
+                "p50": recent["p50"],
+                "p95": recent["p95"],
+            }
+        return summary
+
+    def get_models(self) -> dict:
+        """
+        스와퍼 모델 상태
+
+        Returns:
+            active (새 생성에 사용), default (재시작 시 사용), loaded (전환 가능한 모델),
+            latency (모델별 워커 추론 시간 inference와 얼굴 교체 단계 시간 swap),
+            switches (서버 시작 이후 전환 횟수)
+        """
+        inference = self._latency_summary(MODEL_METRIC_PREFIX)
+        swap = self._latency_summary(MODEL_SWAP_METRIC_PREFIX)
+        return {
+            "active": self.active_swapper_model,
+            "default": settings.facefusion.face_swapper_model,
+            "loaded": list(self.swapper_models),
+            "latency": {
+                model: {"inference": inference.get(model), "swap": swap.get(model)}
+                for model in self.swapper_models
+            },
+            "switches": metrics.counter("swapper_model_switches"),
+        }
+
+    def set_active_model(self, model: str) -> dict:
+        """
+        새 생성에 사용할 스와퍼 모델 전환
+
+        모든 워커에 이미 로드된 모델 사이에서만 전환하므로 모델 로드나 재시작이 없습니다.
+        진행 중인 생성은 시작할 때의 모델로 끝나고, 이후 생성부터 새 모델을 사용합니다.
+        전환은 서버 재시작 시 FACEFUSION_FACE_SWAPPER_MODEL로 돌아갑니다.
+
+        Args:
+            model: 스와퍼 모델 이름
+
+        Returns:
+            전환 후 모델 상태 (get_models)
+
+        Raises:
+            SwapperModelNotLoadedException: 미리 로드하지 않은 모델
+        """
+        if model not in self.swapper_models:
+            raise SwapperModelNotLoadedException(model, list(self.swapper_models))
+
+        previous = self.active_swapper_model
+        if model != previous:
+            self.active_swapper_model = model
+            metrics.increment("swapper_model_switches")
+            logger.info(f"스와퍼 모델 전환: {previous} -> {model}")
+        return self.get_models()
+
+    @property
+    def is_warmed_up(self) -> bool:
+        """워밍업 완료 여부"""
+        return self._warmed_up
+
+    @property
+    def engine_state(self) -> str:
+        """
+        추론 엔진 상태 (EngineState)
+
+        준비된 엔진이라도 최근 추론의 실패 비율이 DEGRADED_FAILURE_RATIO 이상이면
+        degraded로 보고합니다.
+        """
+        if self._state != EngineState.READY:
+            return self._state
+        outcomes = list(self._recent_outcomes)
+        if len(outcomes) >= DEGRADED_MIN_SAMPLES:
+            failures = outcomes.count(False)
+            if failures >= len(outcomes) * DEGRADED_FAILURE_RATIO:
+                return EngineState.DEGRADED
+        return EngineState.READY
+
+    def get_status(self) -> dict:
+        """
+        추론 엔진 상태와 용량 (준비 상태 확인용)
+
+        Returns:
+            state, accepting, warmed_up, backend, workers, in_flight, capacity, saturated,
+            latency_seconds (최근 추론 p50/p95), quality_level (새 생성의 품질 단계)
+        """
+        state = self.engine_state
+        in_flight = self.admission.running + self.admission.waiting
+        capacity = self.admission.capacity
+        return {
+            "state": state,
+            # 워밍업을 하지 않는 경우 cold 엔진도 첫 요청에서 모델을 로드하여 처리
+            "accepting": state == EngineState.READY
+            or (state == EngineState.COLD and not self._warmup_pending),
+            "mode": self.mode,
+            "warmed_up": self._warmed_up,
+            "backend": self.executor.backend,
+            "workers": self.executor.max_workers,
+            "in_flight": in_flight,
+            "waiting": self.admission.waiting,
+            "capacity": capacity,
+            "saturated": in_flight >= capacity,
+            "latency_seconds": metrics.percentiles("inference_seconds"),
+            "quality_level": self.quality.level,
+        }
+
+    async def warmup(self, sample_image_path: Optional[str] = None) -> None:
+        """
+        모델 워밍업
+
+        샘플 얼굴 이미지로 모든 워커에서 더미 추론을 실행하여 ONNX 세션
+        (검출기, 랜드마커, 미리 로드하는 모든 스와퍼 모델 등)을 미리 로드합니다. 첫 사용자가 모델 로드 시간을
+        기다리지 않도록 서버 시작 시 호출합니다. 실패해도 서버 시작은 막지 않습니다.
+        모든 워커에 동시에 보내야 하므로 추론 슬롯(admission)을 거치지 않습니다.
+        (워밍업이 끝나기 전 요청은 어차피 같은 모델 로드를 기다려야 함)
+
+        Args:
+            sample_image_path: 얼굴이 포함된 샘플 이미지 경로 (source/target 공용)
+        """
+        try:
+            await self._warmup(sample_image_path)
+        finally:
+            self._warmup_pending = False
+
+    async def _warmup(self, sample_image_path: Optional[str]) -> None:
+        """모든 워커에서 워밍업 실행 및 엔진 상태 갱신"""
+        if self.mode != "real":
+            self._warmed_up = True
+            self._state = EngineState.READY
+            return
+
+        if not sample_image_path:
+            logger.warning("⚠️ 워밍업용 샘플 이미지가 없어 FaceFusion 워밍업을 건너뜁니다.")
+            return
+
+        start_time = time.time()
+        self._state = EngineState.WARMING
+        logger.info(f"FaceFusion 워밍업 시작... (sample: {sample_image_path})")
+
+        with tempfile.TemporaryDirectory(prefix="facefusion_warmup_") as temp_dir:
+            job = SwapJob(
+                source_path=sample_image_path,
+                target_path=sample_image_path,
+                output_path=str(Path(temp_dir) / "warmup.jpg"),
+            )
+            results = await self.executor.broadcast(worker.warmup_worker, job)
+
+        errors = [r for r in results if isinstance(r, BaseException)]
+        if errors:
+            logger.warning(
+                f"⚠️ FaceFusion 워밍업 실패 {len(errors)}/{len(results)} "
+                f"(첫 요청에서 모델이 로드됩니다): {errors[0]}"
+            )
+            self._state = EngineState.DEGRADED
+            return
+
+        self._warmed_up = True
+        self._state = EngineState.READY
+        logger.info(f"✅ FaceFusion 워밍업 완료 ({time.time() - start_time:.2f}s)")
+
+    def shutdown(self) -> None:
+        """추론 워커 풀 종료"""
+        self.executor.shutdown(wait=False)
+
+
+# 프로세스 전역 싱글톤
+_facefusion_service: Optional[FaceFusionService] = None
+_facefusion_service_lock = threading.Lock()
 
-        # 출력 디렉토리 생성
-        output_file.parent.mkdir(parents=True, exist_ok=True)
 
-        # 타겟 이미지 복사 (모의 실행)
-        shutil.copy2(target_file, output_file)
+def get_facefusion_service() -> FaceFusionService:
+    """
+    프로세스 전역 FaceFusionService 인스턴스 반환
 
-        # AI 처리 시뮬레이션
-        await asyncio.sleep(2.0)
+    최초 호출 시 한 번만 생성하며 (워커 풀 생성),
+    이후에는 같은 인스턴스를 재사용합니다.
+    """
+    global _facefusion_service
 
-        logger.info(f"Mock face fusion completed: {output_file}")
+    if _facefusion_service is None:
+        with _facefusion_service_lock:
+            if _facefusion_service is None:
+                _facefusion_service = FaceFusionService()
+    return _facefusion_service
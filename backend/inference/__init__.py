@@ -0,0 +1,10 @@
+"""FaceFusion 추론 실행 인프라 (실행기, 워커 엔진 등)."""
+
+from backend.inference.executor import InferenceExecutor
+from backend.inference.swap_job import SwapJob, SwapResult
+
+__all__ = [
+    "InferenceExecutor",
+    "SwapJob",
+    "SwapResult",
+]
@@ -0,0 +1,205 @@
+"""
+추론 작업 우선순위 승인 (admission)
+
+워커를 사용하는 작업(원본 분석, 합성, 타겟 분석)은 실행 전에 슬롯을 받아야 합니다.
+슬롯 수는 워커가 동시에 처리할 수 있는 작업 수(워커 수 × 배치 크기)이므로 워커 풀
+대기열은 거의 비어 있고, 기다리는 작업의 순서는 여기서 정해집니다.
+
+- interactive: 키오스크 앞 사용자가 기다리는 생성 (generate-* 요청, 사용자가 가져간 추측 생성)
+- background: 사용자가 기다리지 않는 작업 (추측 생성, 타겟 분석 미리 계산)
+
+빈 슬롯은 항상 대기 중인 interactive 작업에 먼저 주고, background 작업은 대기 중인
+interactive 작업이 없을 때 background 몫(FACEFUSION_INFERENCE_BACKGROUND_SHARE)까지만 동시에 실행합니다.
+대기 중인 background 작업은 promote()로 interactive로 올릴 수 있습니다 (추측 생성을
+사용자가 가져간 경우). 대기 시간은 admission_wait_seconds.<우선순위>로 기록합니다.
+"""
+
+import asyncio
+import logging
+import math
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Deque, Dict, Hashable, Optional
+
+from backend.core.metrics import metrics
+from backend.exceptions import InferenceQueueFullException
+
+logger = logging.getLogger(__name__)
+
+
+class Priority:
+    """추론 작업 우선순위"""
+
+    INTERACTIVE = "interactive"
+    BACKGROUND = "background"
+
+    ALL = (INTERACTIVE, BACKGROUND)
+
+
+class _Waiter:
+    """슬롯을 기다리는 작업"""
+
+    def __init__(self, priority: str, key: Optional[Hashable], future: asyncio.Future):
+        self.priority = priority
+        self.key = key
+        self.future = future
+        self.enqueued_at = time.perf_counter()
+
+
+class PriorityAdmission:
+    """우선순위별 추론 슬롯 배분 (이벤트 루프 안에서만 사용)"""
+
+    def __init__(self, slots: int, background_share: float, queue_size: int):
+        """
+        Args:
+            slots: 동시에 실행할 최대 작업 수
+            background_share: background 작업이 동시에 쓸 수 있는 슬롯 비율 (0~1, 최소 1슬롯)
+            queue_size: 슬롯을 기다릴 수 있는 최대 작업 수 (초과 시 503)
+        """
+        self.slots = max(1, slots)
+        self.background_slots = min(
+            self.slots, max(1, math.floor(self.slots * min(max(background_share, 0.0), 1.0)))
+        )
+        self.queue_size = max(0, queue_size)
+        self._running: Dict[str, int] = {priority: 0 for priority in Priority.ALL}
+        self._waiting: Dict[str, Deque[_Waiter]] = {priority: deque() for priority in Priority.ALL}
+
+    @property
+    def running(self) -> int:
+        """실행 중인 작업 수"""
+        return sum(self._running.values())
+
+    @property
+    def waiting(self) -> int:
+        """슬롯을 기다리는 작업 수"""
+        return sum(len(waiters) for waiters in self._waiting.values())
+
+    @property
+    def capacity(self) -> int:
+        """동시에 받을 수 있는 최대 작업 수 (실행 + 대기)"""
+        return self.slots + self.queue_size
+
+    @asynccontextmanager
+    async def slot(self, priority: str, key: Optional[Hashable] = None) -> AsyncIterator[None]:
+        """
+        슬롯을 받아 블록 실행 (끝나면 다음 작업에 슬롯 전달)
+
+        Args:
+            priority: Priority.INTERACTIVE 또는 Priority.BACKGROUND
+            key: promote()/withdraw()에 사용할 작업 키
+
+        Raises:
+            InferenceQueueFullException: 대기 작업 수가 한도를 넘음
+        """
+        priority = await self._acquire(priority, key)
+        try:
+            yield
+        finally:
+            self._running[priority] -= 1
+            self._dispatch()
+
+    def promote(self, key: Hashable) -> bool:
+        """
+        대기 중인 background 작업을 interactive로 올림
+
+        Returns:
+            올린 작업이 있는지
+        """
+        for waiter in self._waiting[Priority.BACKGROUND]:
+            if waiter.key == key:
+                self._waiting[Priority.BACKGROUND].remove(waiter)
+                waiter.priority = Priority.INTERACTIVE
+                self._waiting[Priority.INTERACTIVE].append(waiter)
+                metrics.increment("admission_promoted")
+                self._dispatch()
+                return True
+        return False
+
+    def withdraw(self, key: Hashable) -> bool:
+        """
+        대기 중인 작업 취소 (슬롯을 받지 않고 CancelledError로 끝남)
+
+        Returns:
+            취소한 작업이 있는지
+        """
+        for waiters in self._waiting.values():
+            for waiter in waiters:
+                if waiter.key == key:
+                    waiters.remove(waiter)
+                    waiter.future.cancel()
+                    return True
+        return False
+
+    def get_status(self) -> dict:
+        """우선순위별 실행/대기 수와 최근 대기 시간"""
+        return {
+            "slots": self.slots,
+            "background_slots": self.background_slots,
+            "queue_size": self.queue_size,
+            "running": dict(self._running),
+            "waiting": {priority: len(waiters) for priority, waiters in self._waiting.items()},
+            "wait_seconds": {
+                priority: metrics.percentiles(f"admission_wait_seconds.{priority}")
+                for priority in Priority.ALL
+            },
+            "promoted": metrics.counter("admission_promoted"),
+        }
+
+    async def _acquire(self, priority: str, key: Optional[Hashable]) -> str:
+        """슬롯 받기 (받은 시점의 우선순위 반환)"""
+        if priority not in Priority.ALL:
+            raise ValueError(f"Invalid priority: {priority}")
+
+        # 먼저 기다리는 같은(또는 높은) 우선순위 작업이 없고 슬롯이 비었으면 바로 실행
+        ahead = self._waiting[Priority.INTERACTIVE] if priority == Priority.INTERACTIVE else self.waiting
+        if not ahead and self._can_run(priority):
+            self._running[priority] += 1
+            self._record(priority, 0.0)
+            return priority
+
+        if self.waiting >= self.queue_size:
+            raise InferenceQueueFullException(in_flight=self.running + self.waiting, capacity=self.capacity)
+
+        waiter = _Waiter(priority, key, asyncio.get_running_loop().create_future())
+        self._waiting[priority].append(waiter)
+        try:
+            await waiter.future
+        except asyncio.CancelledError:
+            if waiter.future.done() and not waiter.future.cancelled():
+                # 슬롯을 받은 직후 취소됨 → 다음 작업에 전달
+                self._running[waiter.priority] -= 1
+                self._dispatch()
+            elif waiter in self._waiting[waiter.priority]:
+                self._waiting[waiter.priority].remove(waiter)
+            raise
+        return waiter.priority
+
+    def _can_run(self, priority: str) -> bool:
+        """지금 priority 작업을 실행할 수 있는지"""
+        if self.running >= self.slots:
+            return False
+        if priority == Priority.BACKGROUND:
+            return (
+                not self._waiting[Priority.INTERACTIVE]
+                and self._running[Priority.BACKGROUND] < self.background_slots
+            )
+        return True
+
+    def _dispatch(self) -> None:
+        """빈 슬롯을 대기 작업에 배분 (interactive 먼저)"""
+        for priority in Priority.ALL:
+            waiters = self._waiting[priority]
+            while waiters and self._can_run(priority):
+                waiter = waiters.popleft()
+                if waiter.future.done():
+                    continue
+                self._running[priority] += 1
+                waiter.future.set_result(None)
+                self._record(priority, time.perf_counter() - waiter.enqueued_at)
+
+    @staticmethod
+    def _record(priority: str, wait_seconds: float) -> None:
+        """우선순위별 대기 시간 기록"""
+        metrics.increment(f"admission_admitted_{priority}")
+        metrics.observe(f"admission_wait_seconds.{priority}", wait_seconds)
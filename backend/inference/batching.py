@@ -0,0 +1,131 @@
+"""
+추론 요청 마이크로 배치 스케줄러
+
+여러 키오스크가 거의 동시에 생성을 요청하면, 짧은 대기 시간(window) 동안 또는
+최대 배치 크기만큼 요청을 모아 워커에서 한 번에 실행합니다
+(worker.run_swap_batch → 스와퍼 모델 1회 호출).
+모인 작업은 빈 워커마다 고르게 나누어 보내고(빈 워커당 최대 배치 크기까지), 모든 워커가
+배치를 실행 중이면 워커가 빌 때까지 계속 모읍니다. 부하가 몰릴수록 배치가 커져 코어당
+처리량이 올라가고, 한가할 때 단일 요청은 최대 window만큼만 더 기다립니다.
+배치를 지원하지 않는 스와퍼 모델의 작업은 이 스케줄러를 거치지 않습니다 (FaceFusionService).
+"""
+
+import asyncio
+import logging
+import math
+from typing import List, Optional, Tuple
+
+from backend.inference import worker
+from backend.inference.cancellation import CancellationBoard, SwapCancelled, cancellation_reason
+from backend.inference.executor import InferenceExecutor
+from backend.inference.swap_job import SwapJob, SwapResult
+
+logger = logging.getLogger(__name__)
+
+
+class BatchScheduler:
+    """SwapJob 마이크로 배치 스케줄러 (이벤트 루프 안에서만 사용)"""
+
+    def __init__(
+        self,
+        executor: InferenceExecutor,
+        max_batch_size: int,
+        window_ms: float,
+        cancellation: Optional[CancellationBoard] = None,
+    ):
+        """
+        Args:
+            executor: 추론 워커 풀
+            max_batch_size: 한 번에 실행할 최대 작업 수
+            window_ms: 첫 작업 이후 추가 작업을 기다리는 최대 시간 (밀리초)
+            cancellation: 작업 취소 기록 (취소/기한 초과된 대기 작업은 워커에 보내지 않음)
+        """
+        self.executor = executor
+        self.cancellation = cancellation
+        self.max_batch_size = max(1, max_batch_size)
+        self.window = max(0.0, window_ms) / 1000
+        self._pending: List[Tuple[SwapJob, asyncio.Future]] = []
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._running_batches = 0
+
+    async def run(self, job: SwapJob) -> SwapResult:
+        """
+        작업을 배치에 추가하고 결과 대기
+
+        Raises:
+            InferenceQueueFullException: 추론 대기열이 가득 참
+            RuntimeError: FaceFusion 실행 실패
+        """
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((job, future))
+
+        if len(self._pending) >= self.max_batch_size:
+            self._flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.window, self._flush)
+
+        return await future
+
+    def _flush(self) -> None:
+        """
+        모인 작업을 빈 워커 수만큼의 배치로 나누어 워커에 전달
+
+        빈 워커마다 ceil(대기 작업 수 / 빈 워커 수)개(최대 배치 크기)씩 보내고,
+        남은 작업은 배치가 끝나 워커가 빌 때 보냅니다.
+        """
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+        self._drop_abandoned()
+
+        # 모든 워커가 배치를 실행 중이면 하나가 끝날 때까지 계속 모음
+        idle_workers = self.executor.max_workers - self._running_batches
+        while self._pending and idle_workers > 0:
+            size = min(self.max_batch_size, math.ceil(len(self._pending) / idle_workers))
+            batch = self._pending[:size]
+            self._pending = self._pending[size:]
+            self._running_batches += 1
+            idle_workers -= 1
+            asyncio.ensure_future(self._run_batch(batch))
+
+    def _drop_abandoned(self) -> None:
+        """대기 중에 취소되었거나 기한이 지난 작업을 실행 전에 제외"""
+        pending = []
+        for job, future in self._pending:
+            if future.done():
+                continue
+            reason = cancellation_reason(job, self.cancellation)
+            if reason is not None:
+                future.set_exception(SwapCancelled(reason, "queued", 0.0))
+                continue
+            pending.append((job, future))
+        self._pending = pending
+
+    async def _run_batch(self, batch: List[Tuple[SwapJob, asyncio.Future]]) -> None:
+        """배치 실행 후 작업별 결과 전달"""
+        jobs = [job for job, _ in batch]
+        if len(jobs) > 1:
+            logger.info(f"Running face fusion batch of {len(jobs)} jobs")
+
+        try:
+            results = await self.executor.run(worker.run_swap_batch, jobs)
+        except Exception as e:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        finally:
+            self._running_batches -= 1
+            # 워커가 비었으니 그 사이 모인 작업 전달
+            if self._pending and self._timer is None:
+                self._flush()
+
+        for (_, future), result in zip(batch, results):
+            if future.done():
+                continue
+            if isinstance(result, BaseException):
+                future.set_exception(result)
+            else:
+                future.set_result(result)
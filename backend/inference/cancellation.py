@@ -0,0 +1,71 @@
+"""
+추론 작업 취소 (워커 측)
+
+요청이 취소되거나 기한이 지나면 이벤트 루프 쪽에서 CancellationBoard에 작업 키를
+기록합니다. 워커 프로세스는 파이프라인 단계 경계(준비 → 얼굴 교체 → 인코딩)마다
+기록과 작업 기한(SwapJob.deadline)을 확인하고, 취소된 작업은 남은 단계를 건너뛰고
+SwapCancelled를 결과로 돌려줍니다. 이미 실행 중인 모델 호출은 중단하지 않습니다.
+"""
+
+import multiprocessing
+import time
+from typing import Any, Optional
+
+from backend.inference.swap_job import SwapJob
+
+
+class SwapCancelled(RuntimeError):
+    """단계 경계에서 중단된 합성 작업 (워커 → 이벤트 루프로 전달)"""
+
+    def __init__(self, reason: str, stage: str, elapsed: float):
+        """
+        Args:
+            reason: 'cancelled' 또는 'timeout'
+            stage: 중단된 단계
+            elapsed: 중단 전까지 워커가 사용한 시간 (초)
+        """
+        super().__init__(f"Face fusion {reason} before stage '{stage}' ({elapsed:.2f}s spent)")
+        self.reason = reason
+        self.stage = stage
+        self.elapsed = elapsed
+
+    def __reduce__(self):
+        return (type(self), (self.reason, self.stage, self.elapsed))
+
+
+class CancellationBoard:
+    """프로세스 간 공유 취소 기록 (최근 취소된 작업 키 링 버퍼)"""
+
+    def __init__(self, size: int = 256, context: Optional[Any] = None):
+        """
+        Args:
+            size: 기억할 최근 취소 수 (동시에 진행 중인 작업 수보다 충분히 커야 함)
+            context: multiprocessing 컨텍스트 (워커 풀과 같은 컨텍스트, 기본 spawn)
+        """
+        context = context or multiprocessing.get_context("spawn")
+        self._keys = context.Array("q", max(1, size))
+        self._next = context.Value("i", 0, lock=False)
+
+    def cancel(self, key: int) -> None:
+        """작업 키를 취소로 기록 (0은 무시)"""
+        if not key:
+            return
+        with self._keys.get_lock():
+            self._keys[self._next.value] = key
+            self._next.value = (self._next.value + 1) % len(self._keys)
+
+    def is_cancelled(self, key: int) -> bool:
+        """작업 키가 취소되었는지 확인"""
+        if not key:
+            return False
+        with self._keys.get_lock():
+            return key in self._keys[:]
+
+
+def cancellation_reason(job: SwapJob, board: Optional[CancellationBoard]) -> Optional[str]:
+    """작업 중단 사유 ('timeout', 'cancelled'), 계속 진행하면 None"""
+    if job.deadline is not None and time.time() > job.deadline:
+        return "timeout"
+    if board is not None and board.is_cancelled(job.cancel_key):
+        return "cancelled"
+    return None
@@ -0,0 +1,858 @@
+"""
+FaceFusion 추론 엔진
+
+facefusion 모듈을 import하고 state_manager를 초기화하여 실제 얼굴 합성을 수행하는
+동기 엔진입니다. state_manager가 프로세스 전역이므로 워커 프로세스마다 하나씩 생성하며,
+각 워커는 자신만의 모델과 state를 가집니다.
+
+프로세서가 face_swapper뿐이면(기본) 합성을 image_to_image 워크플로 대신 단계별로 직접 실행합니다.
+(원본 얼굴 분석 → 타겟 디코딩/content analyser/얼굴 선택/정렬/마스크 → 얼굴 교체 → JPEG 인코딩)
+단계를 나누어 원본 얼굴 분석, 타겟 분석처럼 재사용 가능한 중간 결과를 캐시하고, 여러 요청의
+얼굴 교체를 한 번의 모델 호출로 묶습니다. 워크플로와 같은 동작을 유지합니다:
+- 타겟 이미지를 content analyser(NSFW)로 확인하고, 걸린 타겟은 합성하지 않음 (판정은 타겟 분석과 함께 캐시)
+- 교체할 타겟 얼굴은 facefusion select_faces()로 선택 (face_selector_* 설정, 여러 얼굴 교체)
+- 원본 얼굴은 가장 큰 얼굴 (업로드 확인에서 얼굴이 여러 개인 사진은 거절하므로 평균 얼굴과 같음)
+워크플로와 달리 여러 얼굴의 정렬 크롭을 모두 원래 타겟 프레임에서 잘라 두므로, 얼굴이 서로
+겹치는 타겟에서는 결과가 조금 다를 수 있습니다.
+
+FACEFUSION_PROCESSORS에 다른 프로세서(face_enhancer 등)가 있으면 image_to_image 워크플로로
+실행하고, 캐시된 원본 얼굴을 facefusion face store에 미리 등록하여 원본 분석만 재사용합니다
+(타겟 캐시와 배치 실행은 사용하지 않음).
+
+스와퍼 모델은 FACEFUSION_FACE_SWAPPER_MODEL(기본)과 FACEFUSION_FACE_SWAPPER_MODELS를 모두
+미리 로드해 두고, 작업마다 SwapJob.swapper_model로 선택합니다 (재시작 없이 모델 전환).
+품질 단계(SwapJob.quality_level, backend.inference.quality)도 작업마다 state에 적용합니다.
+"""
+
+import sys
+import json
+import time
+import hashlib
+import logging
+import threading
+from dataclasses import replace
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple, Union
+
+import cv2
+import numpy
+
+from backend.core.config import FaceFusionSettings
+from backend.inference.cancellation import CancellationBoard, SwapCancelled, cancellation_reason
+from backend.inference.face_cache import SourceFaceCache
+from backend.inference.face_check import measure_faces
+from backend.inference.face_swap import FaceSwapOps, select_primary_face
+from backend.inference.model_cache import build_model_cache
+from backend.inference.quality import QUALITY_SETTINGS, quality_levels
+from backend.inference.stage_timer import StageTimer
+from backend.inference.target_assets import TargetAsset, TargetAssetCache
+from backend.inference.swap_job import SwapJob, SwapResult
+from backend.utils.image_utils import decode_bounded
+
+logger = logging.getLogger(__name__)
+
+# 얼굴 검출/랜드마크 결과에 영향을 주는 state 설정 (원본/타겟 분석 캐시 지문)
+SOURCE_ANALYSIS_KEYS = (
+    'face_detector_model', 'face_detector_size', 'face_detector_score',
+    'face_detector_angles', 'face_detector_margin',
+    'face_landmarker_model', 'face_landmarker_score',
+)
+
+
+class FaceFusionEngine:
+    """FaceFusion 동기 추론 엔진 (프로세스당 1개)"""
+
+    def __init__(self, config: FaceFusionSettings, cancellation: Optional[CancellationBoard] = None):
+        """
+        Args:
+            config: FaceFusion 설정
+            cancellation: 이벤트 루프와 공유하는 작업 취소 기록 (없으면 기한만 확인)
+        """
+        self.config = config
+        self.cancellation = cancellation
+        self._created_at = time.time()
+        self.facefusion_path = Path(config.project_path).resolve()
+        self.face_swapper_model = config.face_swapper_model
+        # 미리 로드하는 스와퍼 모델 (작업마다 이 중 하나를 사용)
+        self.swapper_models = config.swapper_models
+        # 품질 단계별 state 덮어쓰기 값 (0단계는 기본 설정)
+        self.quality_levels = quality_levels(config)
+        self._quality_base: Dict[str, Any] = {}
+        self._unsupported_quality: Set[Tuple[str, str]] = set()
+        self.execution_providers = config.execution_providers
+        self.execution_thread_count = config.execution_thread_count
+        self.processors = config.processors
+        # face_swapper만 사용하면 단계별 실행, 아니면 image_to_image 워크플로
+        self.staged_pipeline = self.processors == ['face_swapper']
+
+        # facefusion 모듈 import를 위한 경로 추가
+        if str(self.facefusion_path) not in sys.path:
+            sys.path.insert(0, str(self.facefusion_path))
+
+        self._state_manager = None
+        self._face_analyser = None
+        self._face_swapper = None
+        self._content_analyser = None
+        self._face_store = None
+        self._image_to_image = None
+        self._warmed_up = False
+
+        # 원본(업로드) 얼굴 분석 결과 캐시 (프로필/장기자랑 생성이 공유)
+        # 품질 단계마다 검출기 입력 크기가 다를 수 있으므로 분석 설정 지문별로 보관
+        self.source_faces = SourceFaceCache(
+            analyse=self._analyse_source_face,
+            face_type=self._face_type,
+            fingerprint=self._source_fingerprint,
+            capacity=config.source_face_cache_size,
+        )
+
+        # 타겟(프로필/장기자랑) 이미지 분석 결과 캐시 (디스크는 모든 워커 공유)
+        # 정렬 크롭이 스와퍼 모델/품질 단계에 따라 다르므로 따로 보관
+        self.target_assets = TargetAssetCache(
+            cache_dir=config.target_asset_cache_dir,
+            build=self._build_target_asset,
+            fingerprint=self._target_fingerprint,
+            face_type=self._face_type,
+            capacity=config.target_asset_cache_size * len(self.swapper_models) * len(self.quality_levels),
+        )
+        self._swap_ops: Optional[FaceSwapOps] = None
+
+        # 그래프 최적화된 ONNX 모델 캐시 (재시작 시 최적화 생략)
+        self.model_cache = build_model_cache(config)
+
+        # 스레드 백엔드에서는 state_manager를 여러 스레드가 공유하므로 잠금으로 보호
+        self._state_lock = threading.Lock()
+        # 현재 작업의 단계 시간 기록 (캐시 미적중 시 분석 단계도 같은 작업에 기록)
+        self._timer = StageTimer()
+
+        self._initialize_facefusion()
+
+    def _initialize_facefusion(self):
+        """FaceFusion 모듈 초기화"""
+        try:
+            logger.info(f"FaceFusion 모듈 import 시작... (path: {self.facefusion_path})")
+
+            # facefusion 모듈 import
+            from facefusion import state_manager, face_analyser, inference_manager, content_analyser, face_store
+            from facefusion.core import common_pre_check, processors_pre_check
+            from facefusion.processors.core import get_processors_modules
+
+            self._state_manager = state_manager
+            self._face_analyser = face_analyser
+            self._content_analyser = content_analyser
+            self._face_store = face_store
+            if not self.staged_pipeline:
+                from facefusion.workflows import image_to_image
+                self._image_to_image = image_to_image
+
+            logger.info("FaceFusion 모듈 import 성공")
+
+            # 모델 세션 생성 전에 최적화 모델 캐시 연결
+            if self.model_cache:
+                self.model_cache.install(inference_manager)
+
+            # 기본 설정 초기화
+            logger.info("FaceFusion 기본 설정 초기화 시작...")
+            self._init_default_state()
+            self._quality_base = {key: self._state_manager.get_item(key) for key in QUALITY_SETTINGS}
+            logger.info("FaceFusion 기본 설정 초기화 완료")
+
+            # 모델 파일 확인 (없으면 다운로드)
+            if not common_pre_check() or not processors_pre_check():
+                raise RuntimeError("FaceFusion model pre-check failed")
+
+            self._face_swapper = get_processors_modules(['face_swapper'])[0]
+            self._pre_check_swapper_models()
+            self._swap_ops = FaceSwapOps(state_manager, self._face_swapper)
+
+            logger.info("✅ FaceFusion 모듈 초기화 완료")
+
+        except ImportError as e:
+            logger.error(f"❌ FaceFusion 모듈 import 실패: {e}")
+            logger.error(f"PYTHONPATH에 {self.facefusion_path}가 추가되었는지 확인하세요")
+            raise RuntimeError(f"FaceFusion 모듈을 찾을 수 없습니다: {e}")
+        except Exception as e:
+            logger.error(f"❌ FaceFusion 초기화 중 오류: {e}")
+            import traceback
+            logger.error(traceback.format_exc())
+            raise
+
+    def _pre_check_swapper_models(self) -> None:
+        """추가 스와퍼 모델 파일 확인 (없으면 다운로드, 세션은 워밍업에서 로드)"""
+        for model in self.swapper_models[1:]:
+            self._state_manager.set_item('face_swapper_model', model)
+            try:
+                checked = self._face_swapper.pre_check()
+            except Exception as e:
+                raise RuntimeError(f"Unknown face swapper model: {model} ({e})")
+            if not checked:
+                raise RuntimeError(f"Face swapper model pre-check failed: {model}")
+        self._state_manager.set_item('face_swapper_model', self.face_swapper_model)
+
+    def _use_swapper_model(self, model: str) -> None:
+        """
+        state의 스와퍼 모델 설정 (_state_lock 안에서 호출)
+
+        Raises:
+            RuntimeError: 미리 로드하지 않은 모델
+        """
+        if model not in self.swapper_models:
+            raise RuntimeError(f"Face swapper model is not loaded: {model}")
+        if self._state_manager.get_item('face_swapper_model') != model:
+            self._state_manager.set_item('face_swapper_model', model)
+
+    def _job_model(self, job: SwapJob) -> str:
+        """작업의 스와퍼 모델"""
+        return job.swapper_model or self.face_swapper_model
+
+    def _use_quality(self, level: int) -> None:
+        """
+        품질 단계의 state 설정 (_state_lock 안에서, 스와퍼 모델 설정 후 호출)
+
+        모델이 지원하지 않는 pixel boost/검출기 크기는 기본값을 사용합니다.
+
+        Raises:
+            RuntimeError: 설정에 없는 단계
+        """
+        if not 0 <= level < len(self.quality_levels):
+            raise RuntimeError(f"Unknown quality level: {level}")
+        overrides = self.quality_levels[level]
+        for key in QUALITY_SETTINGS:
+            value = overrides.get(key, self._quality_base[key])
+            if key in overrides and not self._quality_supported(key, value):
+                value = self._quality_base[key]
+            if self._state_manager.get_item(key) != value:
+                self._state_manager.set_item(key, value)
+
+    def _quality_supported(self, key: str, value: Any) -> bool:
+        """현재 검출기/스와퍼 모델이 품질 단계 값을 지원하는지 (지원하지 않으면 한 번 경고)"""
+        supported = None
+        try:
+            if key == 'face_detector_size':
+                from facefusion.choices import face_detector_set
+                supported = face_detector_set.get(self._state_manager.get_item('face_detector_model'))
+            elif key == 'face_swapper_pixel_boost':
+                from facefusion.processors.choices import face_swapper_set
+                supported = face_swapper_set.get(self._state_manager.get_item('face_swapper_model'))
+        except ImportError:
+            return True
+        if supported is None or value in supported:
+            return True
+
+        warning_key = (key, str(value))
+        if warning_key not in self._unsupported_quality:
+            self._unsupported_quality.add(warning_key)
+            logger.warning(f"⚠️ 품질 단계의 {key}={value}를 지원하지 않아 기본값을 사용합니다 (지원: {supported})")
+        return False
+
+    def supports_batching(self, model: str) -> bool:
+        """스와퍼 모델의 배치 실행 지원 여부 (로드되지 않은 모델이거나 워크플로 실행이면 False)"""
+        if not self.staged_pipeline:
+            return False
+        with self._state_lock:
+            try:
+                self._use_swapper_model(model)
+            except RuntimeError:
+                return False
+            return self._swap_ops.supports_batching
+
+    def _init_default_state(self):
+        """FaceFusion state manager 기본 설정"""
+        # 프로세서 설정
+        self._state_manager.init_item('processors', self.processors)
+
+        # Face swapper 모델 설정
+        self._state_manager.init_item('face_swapper_model', self.face_swapper_model)
+
+        # Execution provider 설정
+        self._state_manager.init_item('execution_providers', self.execution_providers)
+        self._state_manager.init_item('execution_device_ids', ['0'])  # CPU 또는 GPU 디바이스 ID (문자열 리스트)
+        self._state_manager.init_item('execution_thread_count', self.execution_thread_count)  # 워커당 실행 스레드 수
+        self._state_manager.init_item('execution_queue_count', 1)
+
+        # Download 설정 (NSFW 체크 등에 필요)
+        self._state_manager.init_item('download_providers', ['github'])
+        self._state_manager.init_item('download_scope', 'full')
+
+        # Face detector 설정
+        self._state_manager.init_item('face_detector_model', 'yolo_face')
+        self._state_manager.init_item('face_detector_size', '640x640')
+        self._state_manager.init_item('face_detector_score', 0.5)
+        self._state_manager.init_item('face_detector_angles', [0])
+        self._state_manager.init_item('face_detector_margin', [0, 0, 0, 0])
+
+        # Face landmarker 설정
+        self._state_manager.init_item('face_landmarker_model', '2dfan4')
+        self._state_manager.init_item('face_landmarker_score', 0.5)
+
+        # Face selector 설정
+        self._state_manager.init_item('face_selector_mode', 'reference')
+        self._state_manager.init_item('face_selector_order', 'large-small')
+        self._state_manager.init_item('face_selector_age_start', None)
+        self._state_manager.init_item('face_selector_age_end', None)
+        self._state_manager.init_item('face_selector_gender', None)
+        self._state_manager.init_item('face_selector_race', None)
+        self._state_manager.init_item('reference_face_position', 0)
+        self._state_manager.init_item('reference_face_distance', 0.3)
+        self._state_manager.init_item('reference_frame_number', 0)
+
+        # Face masker 설정
+        self._state_manager.init_item('face_mask_types', ['box'])
+        self._state_manager.init_item('face_mask_blur', 0.3)
+        self._state_manager.init_item('face_mask_padding', [0, 0, 0, 0])
+        self._state_manager.init_item('face_mask_regions', [])
+        self._state_manager.init_item('face_mask_areas', [])
+        self._state_manager.init_item('face_occluder_model', 'xseg_1')
+        self._state_manager.init_item('face_parser_model', 'bisenet_resnet_34')
+
+        # Face swapper 추가 설정
+        self._state_manager.init_item('face_swapper_pixel_boost', '128x128')
+        self._state_manager.init_item('face_swapper_weight', 1.0)
+
+        # Memory 설정
+        self._state_manager.init_item('video_memory_strategy', 'strict')
+        self._state_manager.init_item('system_memory_limit', 0)
+
+        # Output 설정
+        self._state_manager.init_item('output_image_quality', 80)
+        self._state_manager.init_item('output_image_scale', 1.0)
+
+        # Temp 설정
+        self._state_manager.init_item('temp_path', '.facefusion')  # Temp 디렉토리 경로
+        self._state_manager.init_item('temp_frame_format', 'jpg')
+        self._state_manager.init_item('keep_temp', False)
+
+        # 기타 필수 설정
+        self._state_manager.init_item('log_level', 'error')
+
+        logger.debug("FaceFusion 기본 설정 완료")
+
+    @property
+    def is_warmed_up(self) -> bool:
+        """워밍업 완료 여부"""
+        return self._warmed_up
+
+    def warmup(self, job: SwapJob) -> SwapResult:
+        """
+        더미 추론으로 ONNX 세션 로드 (미리 로드하는 모든 스와퍼 모델)
+
+        이미 워밍업된 엔진이면 바로 반환합니다.
+
+        Args:
+            job: 샘플 이미지를 source/target으로 사용하는 작업
+
+        Returns:
+            마지막 모델의 합성 결과
+        """
+        if self._warmed_up:
+            return SwapResult(output_path=job.output_path, elapsed=0.0)
+
+        for model in self.swapper_models:
+            result = self.process(replace(job, swapper_model=model, quality_level=0))
+            logger.info(f"스와퍼 모델 로드 완료: {model} ({result.elapsed:.2f}s)")
+        self._warmed_up = True
+
+        if self.model_cache:
+            logger.info(self.model_cache.format_report(time.time() - self._created_at))
+        return result
+
+    def process(self, job: SwapJob) -> SwapResult:
+        """
+        얼굴 합성 실행
+
+        Args:
+            job: 합성 작업 (source, target, output 경로)
+
+        Returns:
+            합성 결과
+
+        Raises:
+            RuntimeError: FaceFusion 실행 실패
+        """
+        result = self.process_batch([job])[0]
+        if isinstance(result, BaseException):
+            raise result
+        return result
+
+    def process_batch(self, jobs: List[SwapJob]) -> List[Union[SwapResult, RuntimeError]]:
+        """
+        여러 얼굴 합성을 한 번에 실행
+
+        원본 얼굴/타겟 분석(캐시)과 인코딩은 작업별로, 스와퍼 모델은 모든 작업의 (교체할 얼굴별)
+        크롭을 쌓아 한 번에 실행합니다. 모델이 배치를 지원하지 않으면 작업별로, 스와퍼 모델이나
+        품질 단계가 다른 작업(전환 직후)은 나누어 실행합니다. 워크플로 실행(다른 프로세서 사용)이면
+        작업별로 image_to_image를 실행합니다. 취소되었거나 기한이 지난 작업은 단계 경계에서 빠지고
+        SwapCancelled가 결과가 됩니다.
+
+        Args:
+            jobs: 합성 작업 목록
+
+        Returns:
+            작업별 합성 결과 또는 실패 예외 (jobs 순서)
+        """
+        if not self.staged_pipeline:
+            return [self._process_with_workflow(job) for job in jobs]
+
+        variants = [(self._job_model(job), job.quality_level) for job in jobs]
+        if len(set(variants)) > 1:
+            return self._process_by_variant(jobs, variants)
+        model, quality_level = variants[0]
+        if len(jobs) > 1 and not self.supports_batching(model):
+            return [result for job in jobs for result in self.process_batch([job])]
+
+        results: List[Union[SwapResult, RuntimeError, None]] = [None] * len(jobs)
+        timers = [StageTimer() for _ in jobs]
+
+        with self._state_lock:
+            start_time = time.time()
+            try:
+                self._use_swapper_model(model)
+                self._use_quality(quality_level)
+            except RuntimeError as e:
+                return [self._failure(e) for _ in jobs]
+
+            # 1. 원본 얼굴 / 타겟 프레임·얼굴·정렬 크롭·마스크 (캐시)
+            prepared = []
+            for index, job in enumerate(jobs):
+                results[index] = self._abandoned(job, "prepare", start_time)
+                if results[index] is not None:
+                    continue
+                self._timer = timer = timers[index]
+                try:
+                    with timer.stage("source_face"):
+                        source_face, source_metadata = self.source_faces.get(job.source_path)
+
+                    # 일부 스와퍼 모델(blendswap 등)은 state의 source 이미지를 직접 읽음 (배치 대상 아님)
+                    # 원본 얼굴 좌표는 전처리된 ROI 이미지 기준
+                    source_image_path = source_metadata.get("roi_path", job.source_path)
+                    self._state_manager.set_item('source_paths', [source_image_path])
+                    self._state_manager.set_item('target_path', job.target_path)
+                    self._state_manager.set_item('output_path', job.output_path)
+
+                    with timer.stage("target_face"):
+                        target = self.target_assets.get(job.target_path)
+                    if target.content_flagged:
+                        raise RuntimeError(f"Target image rejected by content analyser: {job.target_path}")
+                    prepared.append((index, job, source_face, target))
+                except Exception as e:
+                    results[index] = self._failure(e)
+
+            # 2. 얼굴 교체 (모든 작업의 교체할 얼굴을 모아 스와퍼 모델 1회 호출)
+            prepared = self._drop_abandoned(prepared, "swap", start_time, results)
+            swap_start = time.perf_counter()
+            try:
+                swapped = iter(self._swap_ops.forward_batch([
+                    (source_face, target_face, crop.crop_frame)
+                    for _, _, source_face, target in prepared
+                    for target_face, crop in zip(target.faces, target.crops)
+                ]))
+                swapped_crops = [[next(swapped) for _ in target.crops] for *_, target in prepared]
+                for index, *_ in prepared:
+                    timers[index].add("swap", time.perf_counter() - swap_start)
+            except Exception as e:
+                for index, *_ in prepared:
+                    results[index] = self._failure(e)
+                prepared, swapped_crops = [], []
+            # 배치 실행이 실패해 개별 실행으로 전환한 경우도 반영
+            batch_supported = self._swap_ops.supports_batching
+
+            # 3. 합성 및 인코딩 (캐시된 프레임은 다른 작업과 공유하므로 복사본에 합성)
+            for (index, job, source_face, target), job_crops in zip(prepared, swapped_crops):
+                results[index] = self._abandoned(job, "encode", start_time)
+                if results[index] is not None:
+                    continue
+                timer = timers[index]
+                try:
+                    with timer.stage("paste"):
+                        output_frame = target.frame.copy()
+                        for target_face, crop, swapped_crop in zip(target.faces, target.crops, job_crops):
+                            output_frame = self._swap_ops.paste(target_face, crop, swapped_crop, output_frame)
+                    with timer.stage("encode"):
+                        self._write_image(job.output_path, output_frame)
+                    results[index] = SwapResult(
+                        output_path=job.output_path,
+                        elapsed=time.time() - start_time,
+                        timings=timer.as_dict(),
+                        batch_supported=batch_supported,
+                    )
+                except Exception as e:
+                    results[index] = self._failure(e)
+
+        elapsed = time.time() - start_time
+        succeeded = sum(isinstance(result, SwapResult) for result in results)
+        if len(jobs) > 1:
+            logger.info(f"✅ Face fusion batch completed in {elapsed:.2f}s ({succeeded}/{len(jobs)} succeeded)")
+        elif succeeded:
+            logger.info(f"✅ Face fusion completed successfully in {elapsed:.2f}s: {jobs[0].output_path}")
+        return results
+
+    def _process_with_workflow(self, job: SwapJob) -> Union[SwapResult, RuntimeError]:
+        """
+        image_to_image 워크플로로 합성 (face_swapper 외 프로세서 사용 시)
+
+        캐시된 원본 얼굴을 face store에 등록하므로 워크플로는 원본 얼굴을 다시 분석하지 않습니다.
+        content analyser 확인과 얼굴 선택은 워크플로가 처리합니다.
+        """
+        timer = StageTimer()
+        with self._state_lock:
+            start_time = time.time()
+            abandoned = self._abandoned(job, "prepare", start_time)
+            if abandoned is not None:
+                return abandoned
+            self._timer = timer
+            try:
+                self._use_swapper_model(self._job_model(job))
+                self._use_quality(job.quality_level)
+                with timer.stage("source_face"):
+                    source_face, source_metadata = self.source_faces.get(job.source_path)
+
+                # 원본 얼굴 좌표는 전처리된 ROI 이미지 기준 (face store 키는 프레임 내용 해시)
+                source_image_path = source_metadata.get("roi_path", job.source_path)
+                self._face_store.clear_static_faces()
+                self._face_store.set_static_faces(self._read_static_image(source_image_path), [source_face])
+                self._state_manager.set_item('source_paths', [source_image_path])
+                self._state_manager.set_item('target_path', job.target_path)
+                self._state_manager.set_item('output_path', job.output_path)
+
+                with timer.stage("workflow"):
+                    error_code = self._image_to_image.process(start_time)
+                if error_code != 0:
+                    raise RuntimeError(f"FaceFusion failed with error code: {error_code}")
+                if not Path(job.output_path).exists():
+                    raise RuntimeError(f"Output file not created: {job.output_path}")
+            except Exception as e:
+                return self._failure(e)
+
+        elapsed = time.time() - start_time
+        logger.info(f"✅ Face fusion completed successfully in {elapsed:.2f}s: {job.output_path}")
+        return SwapResult(
+            output_path=job.output_path,
+            elapsed=elapsed,
+            timings=timer.as_dict(),
+            batch_supported=False,
+        )
+
+    def _process_by_variant(
+        self,
+        jobs: List[SwapJob],
+        variants: List[Tuple[str, int]],
+    ) -> List[Union[SwapResult, RuntimeError]]:
+        """(스와퍼 모델, 품질 단계)별로 나누어 실행 (결과는 jobs 순서)"""
+        results: List[Union[SwapResult, RuntimeError, None]] = [None] * len(jobs)
+        for variant in dict.fromkeys(variants):
+            indices = [index for index, job_variant in enumerate(variants) if job_variant == variant]
+            for index, result in zip(indices, self.process_batch([jobs[index] for index in indices])):
+                results[index] = result
+        return results
+
+    def _abandoned(self, job: SwapJob, stage: str, start_time: float) -> Optional[SwapCancelled]:
+        """단계 시작 전 작업 취소/기한 확인 (중단할 작업이면 결과용 예외 반환)"""
+        reason = cancellation_reason(job, self.cancellation)
+        if reason is None:
+            return None
+        logger.info(f"Face fusion {reason} before {stage}: {job.output_path}")
+        return SwapCancelled(reason, stage, time.time() - start_time)
+
+    def _drop_abandoned(self, prepared: list, stage: str, start_time: float, results: list) -> list:
+        """준비된 작업 중 중단할 작업의 결과를 기록하고 나머지 반환"""
+        remaining = []
+        for item in prepared:
+            index, job = item[0], item[1]
+            results[index] = self._abandoned(job, stage, start_time)
+            if results[index] is None:
+                remaining.append(item)
+        return remaining
+
+    @staticmethod
+    def _failure(error: Exception) -> RuntimeError:
+        """합성 실패 로그 및 작업 결과용 예외 생성"""
+        logger.error(f"❌ Face fusion failed: {str(error)}")
+        import traceback
+        logger.error("".join(traceback.format_exception(type(error), error, error.__traceback__)))
+        failure = RuntimeError(f"Face fusion failed: {str(error)}")
+        failure.__cause__ = error
+        return failure
+
+    def analyse_source(self, source_path: str, quality_level: int = 0) -> dict:
+        """
+        원본 이미지 얼굴 분석 (캐시에 저장)
+
+        Args:
+            source_path: 원본 이미지 경로
+            quality_level: 품질 단계 (검출기 입력 크기 등)
+
+        Returns:
+            분석 메타데이터 (bounding_box, score, original_size, decoded_size, scale, roi)와
+            이번 호출의 단계별 시간 (timings)
+
+        Raises:
+            RuntimeError: 원본 이미지에서 얼굴을 찾지 못함
+        """
+        with self._state_lock:
+            self._use_quality(quality_level)
+            self._timer = timer = StageTimer()
+            with timer.stage("source_face"):
+                _, metadata = self.source_faces.get(source_path)
+        return {**metadata, "timings": timer.as_dict()}
+
+    def check_face(self, source_path: str) -> dict:
+        """
+        업로드 얼굴 확인용 빠른 검출 (축소 디코딩, 축소 입력 크기 검출기만 실행)
+
+        Returns:
+            측정값 (backend.inference.face_check.measure_faces)
+
+        Raises:
+            RuntimeError: 이미지 디코딩 실패
+        """
+        try:
+            frame, scale, original_size = decode_bounded(source_path, self.config.face_check_max_dimension)
+        except RuntimeError:
+            return {"faces": [], "unreadable": True}
+        with self._state_lock:
+            detections = self._detect_faces_fast(frame)
+        return measure_faces(frame, detections, scale, original_size)
+
+    def _detect_faces_fast(self, vision_frame: numpy.ndarray) -> List[Tuple[Any, float]]:
+        """
+        검출기만 face_check_detector_size 입력으로 실행 (랜드마크/임베딩 생략)
+
+        검출 모델이 해당 크기를 지원하지 않으면 기본 크기로 실행하고, face_detector 모듈이
+        없는 FaceFusion 버전에서는 전체 얼굴 분석 결과를 사용합니다.
+
+        Returns:
+            (프레임 좌표 얼굴 박스, 검출 점수) 목록
+        """
+        try:
+            from facefusion import face_detector
+            from facefusion.choices import face_detector_set
+        except ImportError:
+            faces = self._face_analyser.get_many_faces([vision_frame])
+            return [(face.bounding_box, face.score_set.get('detector', 0.0)) for face in faces]
+
+        detector_size = self._state_manager.get_item('face_detector_size')
+        supported_sizes = face_detector_set.get(self._state_manager.get_item('face_detector_model'), [])
+        check_size = self.config.face_check_detector_size
+        self._state_manager.set_item(
+            'face_detector_size', check_size if check_size in supported_sizes else detector_size
+        )
+        try:
+            bounding_boxes, face_scores, _ = face_detector.detect_faces(vision_frame)
+        finally:
+            self._state_manager.set_item('face_detector_size', detector_size)
+
+        if not bounding_boxes:
+            return []
+        # 검출기 원시 출력은 겹치는 박스를 포함하므로 NMS 적용
+        boxes = [[float(x1), float(y1), float(x2 - x1), float(y2 - y1)] for x1, y1, x2, y2 in bounding_boxes]
+        scores = [float(score) for score in face_scores]
+        keep = cv2.dnn.NMSBoxes(boxes, scores, self._state_manager.get_item('face_detector_score'), 0.4)
+        return [(bounding_boxes[index], scores[index]) for index in numpy.array(keep).flatten()]
+
+    def precompute_targets(self, target_paths: Iterable[str]) -> Dict[str, int]:
+        """
+        타겟 이미지 분석 결과를 미리 계산하여 디스크 캐시에 저장
+
+        미리 로드하는 스와퍼 모델과 품질 단계 조합 중 분석 설정 지문이 다른 조합마다 계산합니다.
+
+        Returns:
+            통계 (built, cached, failed, pruned, 모든 조합 합계)
+        """
+        target_paths = list(target_paths)
+        totals = {"built": 0, "cached": 0, "failed": 0, "pruned": 0}
+        keep: Set[str] = set()
+        with self._state_lock:
+            self._timer = StageTimer()
+            variants: Dict[str, Tuple[str, int]] = {}
+            for model in self.swapper_models:
+                for quality_level in range(len(self.quality_levels)):
+                    self._use_swapper_model(model)
+                    self._use_quality(quality_level)
+                    variants.setdefault(self._target_fingerprint(), (model, quality_level))
+
+            for index, (model, quality_level) in enumerate(variants.values()):
+                self._use_swapper_model(model)
+                self._use_quality(quality_level)
+                stats = self.target_assets.precompute(
+                    target_paths,
+                    keep=keep,
+                    # 모든 조합의 캐시 파일을 확인한 뒤 마지막에 한 번만 정리
+                    prune=index == len(variants) - 1 and totals["failed"] == 0,
+                )
+                for key, value in stats.items():
+                    totals[key] += value
+        return totals
+
+    def calibrate(self, image_paths: Iterable[str]) -> int:
+        """
+        캐시를 거치지 않고 검출/랜드마크/정렬/교체를 실행 (양자화 보정용 입력 기록)
+
+        각 이미지의 가장 큰 얼굴을 원본과 타겟으로 모두 사용합니다.
+
+        Returns:
+            얼굴이 검출된 이미지 수
+        """
+        processed = 0
+        with self._state_lock:
+            # 양자화 대상은 기본 스와퍼 모델, 기본 품질
+            self._use_swapper_model(self.face_swapper_model)
+            self._use_quality(0)
+            for image_path in image_paths:
+                try:
+                    frame = self._read_image(image_path)
+                    face = self._detect_primary_face(frame)
+                    if face is None:
+                        logger.warning(f"⚠️ 보정 이미지에서 얼굴을 찾지 못했습니다: {image_path}")
+                        continue
+                    target_crop = self._swap_ops.prepare_target(frame, face)
+                    self._swap_ops.forward(face, face, target_crop.crop_frame)
+                    processed += 1
+                except Exception as e:
+                    logger.warning(f"⚠️ 보정 실패 ({image_path}): {e}")
+        return processed
+
+    def _build_target_asset(self, target_path: str, digest: str) -> TargetAsset:
+        """타겟 이미지 디코딩, content analyser 확인, 얼굴 검출/선택, 얼굴별 정렬 및 교체 전 마스크 계산"""
+        target_frame = self._read_image(target_path)
+        with self._timer.stage("content_analysis"):
+            content_flagged = bool(self._content_analyser.analyse_image(target_path))
+        with self._timer.stage("face_analysis"):
+            faces: List[Any] = self._face_analyser.get_many_faces([target_frame])
+            target_faces = self._swap_ops.select_target_faces(target_frame, faces)
+        if not target_faces:
+            raise RuntimeError(f"No face detected in target image: {target_path}")
+
+        with self._timer.stage("target_masks"):
+            crops = [self._swap_ops.prepare_target(target_frame, face) for face in target_faces]
+        return TargetAsset(
+            digest=digest,
+            frame=target_frame,
+            faces=target_faces,
+            crops=crops,
+            content_flagged=content_flagged,
+        )
+
+    def _source_fingerprint(self) -> str:
+        """원본 얼굴 분석 결과에 영향을 주는 설정의 지문 (검출기 설정, 원본 전처리)"""
+        return self._settings_fingerprint(
+            SOURCE_ANALYSIS_KEYS,
+            source_max_dimension=self.config.source_max_dimension,
+            source_roi_padding=self.config.source_roi_padding,
+        )
+
+    def _target_fingerprint(self) -> str:
+        """타겟 분석 결과에 영향을 주는 설정의 지문 (설정이 바뀌면 캐시를 다시 계산)"""
+        keys = SOURCE_ANALYSIS_KEYS + (
+            'face_selector_mode', 'face_selector_order', 'face_selector_age_start', 'face_selector_age_end',
+            'face_selector_gender', 'face_selector_race', 'reference_face_position', 'reference_face_distance',
+            'face_swapper_model', 'face_swapper_pixel_boost',
+            'face_mask_types', 'face_mask_blur', 'face_mask_padding', 'face_occluder_model',
+        )
+        return self._settings_fingerprint(keys)
+
+    def _settings_fingerprint(self, keys: Tuple[str, ...], **extra: Any) -> str:
+        """state 설정값(과 추가 값)의 지문"""
+        values = {key: self._state_manager.get_item(key) for key in keys}
+        # 양자화된 검출기는 검출 결과가 달라질 수 있음
+        values['model_quantization'] = self.config.model_quantization
+        values.update(extra)
+        encoded = json.dumps(values, sort_keys=True, default=str).encode()
+        return hashlib.sha1(encoded).hexdigest()[:12]
+
+    def _analyse_source_face(self, source_path: str, fingerprint: str) -> Tuple[Any, dict]:
+        """
+        원본 이미지 전처리 후 가장 큰 얼굴을 검출하고 임베딩 계산
+
+        1. 긴 변을 source_max_dimension 이하로 축소 디코딩 (카메라 해상도와 무관한 비용)
+        2. 축소 프레임에서 가장 큰 얼굴 검출
+        3. 얼굴 주변 여백 영역(ROI)만 잘라 다시 검출/랜드마크/임베딩 계산
+           (검출기 입력에서 얼굴이 크게 보여 랜드마크가 정확해짐)
+
+        얼굴 좌표는 ROI 기준이므로 ROI 이미지를 원본 옆 .<분석 설정 지문>.roi.jpg로 저장하고, 원본 프레임을
+        직접 읽는 스와퍼 모델(blendswap 등)은 이 파일을 사용합니다.
+
+        Returns:
+            (ROI 기준 Face, 메타데이터: 원본 좌표 bounding_box/roi, 크기, 배율 등)
+        """
+        source_frame, scale, original_size = decode_bounded(source_path, self.config.source_max_dimension)
+        coarse_face = self._detect_primary_face(source_frame)
+        if coarse_face is None:
+            raise RuntimeError(f"No face detected in source image: {source_path}")
+
+        left, top, right, bottom = self._face_roi(coarse_face.bounding_box, source_frame.shape)
+        roi_frame = source_frame[top:bottom, left:right]
+        source_face = self._detect_primary_face(roi_frame)
+        if source_face is None:
+            # ROI에서 다시 검출되지 않으면 축소 프레임 전체 기준 결과 사용
+            left, top, roi_frame, source_face = 0, 0, source_frame, coarse_face
+
+        roi_path = str(SourceFaceCache.roi_path(source_path, fingerprint))
+        if not cv2.imwrite(roi_path, roi_frame, [cv2.IMWRITE_JPEG_QUALITY, 95]):
+            raise RuntimeError(f"Failed to write source ROI image: {roi_path}")
+
+        def to_original(box: Iterable[float]) -> List[float]:
+            x1, y1, x2, y2 = box
+            return [round(float(v) / scale, 1) for v in (x1 + left, y1 + top, x2 + left, y2 + top)]
+
+        roi_height, roi_width = roi_frame.shape[:2]
+        metadata = {
+            "bounding_box": to_original(source_face.bounding_box),
+            "score": float(source_face.score_set.get('detector', 0.0)),
+            "original_size": list(original_size),
+            "decoded_size": [source_frame.shape[1], source_frame.shape[0]],
+            "scale": round(scale, 4),
+            "roi": to_original((0, 0, roi_width, roi_height)),
+            "roi_path": roi_path,
+        }
+        return source_face, metadata
+
+    def _face_roi(self, bounding_box: Any, frame_shape: Tuple[int, ...]) -> Tuple[int, int, int, int]:
+        """얼굴 박스에 source_roi_padding 비율만큼 여백을 더한 영역 (프레임 안으로 제한)"""
+        x1, y1, x2, y2 = (float(v) for v in bounding_box)
+        padding = self.config.source_roi_padding * max(x2 - x1, y2 - y1)
+        height, width = frame_shape[:2]
+        return (
+            max(0, int(x1 - padding)),
+            max(0, int(y1 - padding)),
+            min(width, int(numpy.ceil(x2 + padding))),
+            min(height, int(numpy.ceil(y2 + padding))),
+        )
+
+    def _detect_primary_face(self, vision_frame: numpy.ndarray) -> Optional[Any]:
+        """프레임에서 가장 큰 얼굴 반환"""
+        with self._timer.stage("face_analysis"):
+            faces = self._face_analyser.get_many_faces([vision_frame])
+        return select_primary_face(faces)
+
+    @staticmethod
+    def _face_type() -> type:
+        """FaceFusion Face namedtuple 클래스 (버전에 따라 types 또는 typing 모듈)"""
+        try:
+            from facefusion.types import Face
+        except ImportError:
+            from facefusion.typing import Face
+        return Face
+
+    @staticmethod
+    def _read_static_image(image_path: str) -> numpy.ndarray:
+        """facefusion 워크플로가 읽는 것과 같은 프레임 (face store 키가 같도록 facefusion으로 디코딩)"""
+        from facefusion.vision import read_static_image
+
+        vision_frame = read_static_image(image_path)
+        if vision_frame is None:
+            raise RuntimeError(f"Failed to read image: {image_path}")
+        return vision_frame
+
+    @staticmethod
+    def _read_image(image_path: str) -> numpy.ndarray:
+        """이미지 디코딩"""
+        vision_frame = cv2.imread(image_path, cv2.IMREAD_COLOR)
+        if vision_frame is None:
+            raise RuntimeError(f"Failed to read image: {image_path}")
+        return vision_frame
+
+    def _write_image(self, output_path: str, vision_frame: numpy.ndarray) -> None:
+        """출력 이미지 JPEG 인코딩 및 저장"""
+        quality = int(self._state_manager.get_item('output_image_quality'))
+        if not cv2.imwrite(output_path, vision_frame, [cv2.IMWRITE_JPEG_QUALITY, quality]):
+            raise RuntimeError(f"Output file not created: {output_path}")
@@ -0,0 +1,234 @@
+"""
+추론 전용 실행기
+
+FaceFusion 추론은 수 초 동안 CPU를 점유하는 동기 코드이므로, 이벤트 루프가 아닌
+전용 워커에서 실행합니다. 대기열 한도를 넘으면 즉시 거절하여 요청이 무한히
+쌓이지 않도록 합니다.
+
+백엔드:
+- process: 워커 프로세스 풀 (워커마다 독립된 모델과 state_manager, 동시 실행 가능)
+- thread: 현재 프로세스의 스레드 풀 (state_manager를 공유하므로 실행은 직렬화됨)
+"""
+
+import asyncio
+import functools
+import logging
+import multiprocessing
+import os
+import threading
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable, Optional, Tuple
+
+from backend.exceptions import InferenceQueueFullException
+
+logger = logging.getLogger(__name__)
+
+# broadcast 작업이 다른 워커를 기다리는 최대 시간 (초, 워커 기동 + 워밍업 시간 포함)
+BROADCAST_WAIT_SECONDS = 600.0
+
+# 워커 프로세스의 broadcast 동기화 barrier (워커 초기화 시 설정)
+_broadcast_barrier: Optional[Any] = None
+
+
+def _init_process(
+    barrier: Any,
+    initializer: Optional[Callable[..., None]],
+    initargs: Tuple[Any, ...],
+) -> None:
+    """워커 프로세스 초기화 (broadcast barrier 보관 후 사용자 initializer 실행)"""
+    global _broadcast_barrier
+
+    _broadcast_barrier = barrier
+    if initializer is not None:
+        initializer(*initargs)
+
+
+def _run_broadcast(fn: Callable[..., Any], args: Tuple[Any, ...], timeout: float) -> Tuple[int, Any]:
+    """
+    broadcast 작업 실행 후 다른 워커가 모두 자기 작업을 받을 때까지 대기
+
+    대기하는 동안 이 워커는 다음 broadcast 작업을 가져가지 않으므로, 워커 수만큼의 작업이
+    서로 다른 워커에 하나씩 배정됩니다. fn이 실패해도 barrier에는 도착합니다.
+
+    Returns:
+        (워커 pid, fn 반환값)
+    """
+    error: Optional[BaseException] = None
+    result = None
+    try:
+        result = fn(*args)
+    except BaseException as e:
+        error = e
+    try:
+        _broadcast_barrier.wait(timeout)
+    except threading.BrokenBarrierError:
+        pass
+    if error is not None:
+        raise error
+    return os.getpid(), result
+
+
+class InferenceExecutor:
+    """추론 작업 실행기 (워커 수 + 대기열 한도)"""
+
+    def __init__(
+        self,
+        max_workers: int,
+        queue_size: int,
+        backend: str = "thread",
+        initializer: Optional[Callable[..., None]] = None,
+        initargs: Tuple[Any, ...] = (),
+    ):
+        """
+        Args:
+            max_workers: 동시에 실행할 추론 작업 수 (프로세스 백엔드에서는 워커 프로세스 수)
+            queue_size: 실행 대기 가능한 최대 작업 수
+            backend: 'process' 또는 'thread'
+            initializer: 워커 초기화 함수 (프로세스 백엔드: 워커마다 1회, 스레드 백엔드: 현재 프로세스에서 1회)
+            initargs: initializer 인자
+        """
+        if backend not in ("process", "thread"):
+            raise ValueError(f"Invalid inference backend: {backend}. Must be 'process' or 'thread'")
+
+        self.max_workers = max(1, max_workers)
+        self.queue_size = max(0, queue_size)
+        self.backend = backend
+        self._initializer = initializer
+        self._initargs = initargs
+        # broadcast 작업을 워커마다 하나씩 배정하기 위한 barrier (프로세스 백엔드)
+        self._barrier = (
+            multiprocessing.get_context("spawn").Barrier(self.max_workers)
+            if backend == "process" else None
+        )
+
+        if backend == "thread" and initializer is not None:
+            initializer(*initargs)
+
+        self._executor = self._create_executor()
+        # 깨진 풀 재생성 직렬화 (같은 풀에서 실패한 작업들이 각자 재생성하지 않도록)
+        self._rebuild_lock = threading.Lock()
+        # 실행 중 + 대기 중인 작업 수 (이벤트 루프 스레드에서만 변경)
+        self._pending = 0
+
+    def _create_executor(self) -> Executor:
+        """백엔드에 맞는 concurrent.futures 실행기 생성"""
+        if self.backend == "process":
+            # fork는 부모의 스레드/ONNX 세션 상태를 복제하므로 spawn 사용
+            return ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_process,
+                initargs=(self._barrier, self._initializer, self._initargs),
+            )
+        return ThreadPoolExecutor(
+            max_workers=self.max_workers,
+            thread_name_prefix="inference",
+        )
+
+    @property
+    def in_flight(self) -> int:
+        """실행 중이거나 대기 중인 작업 수"""
+        return self._pending
+
+    @property
+    def capacity(self) -> int:
+        """동시에 받을 수 있는 최대 작업 수"""
+        return self.max_workers + self.queue_size
+
+    async def run(self, fn: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        """
+        동기 함수를 추론 워커에서 실행하고 결과를 기다림
+
+        프로세스 백엔드에서는 fn과 인자가 pickle 가능해야 합니다 (모듈 수준 함수).
+
+        Args:
+            fn: 실행할 동기 함수
+            *args, **kwargs: fn 인자
+
+        Returns:
+            fn의 반환값
+
+        Raises:
+            InferenceQueueFullException: 대기열이 가득 참
+        """
+        if self._pending >= self.capacity:
+            raise InferenceQueueFullException(
+                in_flight=self._pending,
+                capacity=self.capacity,
+            )
+
+        self._pending += 1
+        pool = self._executor
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(
+                pool, functools.partial(fn, *args, **kwargs)
+            )
+        except BrokenProcessPool:
+            # 워커 프로세스가 비정상 종료됨 (OOM 등) -> 다음 요청을 위해 풀 재생성
+            self._replace_broken_pool(pool)
+            raise RuntimeError("Inference worker crashed")
+        finally:
+            self._pending -= 1
+
+    def _replace_broken_pool(self, pool: Executor) -> None:
+        """
+        깨진 풀을 새 풀로 교체
+
+        같은 풀에서 동시에 실패한 작업들 중 처음 하나만 교체하고, 이미 교체된 뒤 도착한
+        실패는 새 풀을 건드리지 않습니다.
+        """
+        with self._rebuild_lock:
+            if self._executor is not pool:
+                return
+            logger.error("❌ Inference worker pool is broken, recreating...")
+            pool.shutdown(wait=False, cancel_futures=True)
+            self._executor = self._create_executor()
+
+    async def broadcast(self, fn: Callable[..., Any], *args: Any) -> list:
+        """
+        모든 워커에서 같은 작업을 한 번씩 실행 (워밍업 등)
+
+        ProcessPoolExecutor는 작업을 먼저 비는 워커에 배정하므로, 워커 수만큼 제출해도
+        한 워커가 여러 개를 가져가고 다른 워커는 하나도 받지 못할 수 있습니다. 프로세스
+        백엔드에서는 각 작업이 실행 후 barrier에서 나머지 작업이 모두 다른 워커에 배정될
+        때까지 기다리므로, 워커마다 정확히 한 번 실행됩니다. 스레드 백엔드는 엔진을 공유하므로
+        한 번만 실행합니다.
+
+        Returns:
+            워커별 fn 반환값 또는 예외
+
+        Raises:
+            InferenceQueueFullException: 대기열이 가득 참
+        """
+        if self._barrier is None:
+            return await asyncio.gather(self.run(fn, *args), return_exceptions=True)
+
+        # 일부만 제출되면 제출된 작업이 barrier에서 오래 기다리므로 미리 확인
+        if self._pending + self.max_workers > self.capacity:
+            raise InferenceQueueFullException(
+                in_flight=self._pending,
+                capacity=self.capacity,
+            )
+
+        self._barrier.reset()
+        outcomes = await asyncio.gather(
+            *[
+                self.run(_run_broadcast, fn, args, BROADCAST_WAIT_SECONDS)
+                for _ in range(self.max_workers)
+            ],
+            return_exceptions=True,
+        )
+        pids = [outcome[0] for outcome in outcomes if isinstance(outcome, tuple)]
+        if len(set(pids)) < len(pids):
+            # barrier 대기 시간 초과 (다른 작업으로 오래 사용 중이거나 기동 실패한 워커)
+            logger.warning(
+                f"⚠️ broadcast가 일부 워커에 전달되지 않았습니다 ({len(set(pids))}/{self.max_workers} workers)"
+            )
+        return [outcome[1] if isinstance(outcome, tuple) else outcome for outcome in outcomes]
+
+    def shutdown(self, wait: bool = True) -> None:
+        """실행기 종료"""
+        logger.info("Shutting down inference executor...")
+        self._executor.shutdown(wait=wait, cancel_futures=True)
@@ -0,0 +1,185 @@
+"""
+얼굴 분석 결과 캐시
+
+FaceFusion Face(namedtuple: bounding_box, landmark_set, embedding 등)를 .npz로
+저장/복원하고, 업로드된 원본 이미지의 얼굴 분석 결과를 재사용합니다.
+
+원본 이미지 하나로 프로필/장기자랑 두 번 합성하므로, 얼굴 검출/랜드마크/임베딩을
+참여당 한 번만 계산하여 메모리(LRU)와 업로드 파일 옆 .npz에 보관합니다.
+.npz는 여러 워커 프로세스가 공유합니다. 분석 결과는 검출기 설정(품질 단계에 따라 입력 크기가
+바뀜)에 따라 달라지므로 캐시 키와 파일 이름에 분석 설정 지문을 포함합니다.
+"""
+
+import json
+import logging
+import os
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional, Tuple
+
+import numpy
+
+from backend.utils.lru_cache import LRUCache
+
+logger = logging.getLogger(__name__)
+
+SOURCE_FACE_SUFFIX = ".face.npz"
+SOURCE_ROI_SUFFIX = ".roi.jpg"
+
+
+def _pack_value(value: Any, arrays: Dict[str, numpy.ndarray]) -> dict:
+    """Face 필드 값을 JSON 설명자로 변환 (배열은 arrays에 따로 저장)"""
+    if value is None:
+        return {"t": "none"}
+    if isinstance(value, dict):
+        return {"t": "dict", "items": {key: _pack_value(item, arrays) for key, item in value.items()}}
+    if isinstance(value, range):
+        return {"t": "range", "v": [value.start, value.stop]}
+    if isinstance(value, str):
+        return {"t": "str", "v": value}
+    if isinstance(value, numpy.ndarray):
+        key = f"a{len(arrays)}"
+        arrays[key] = value
+        return {"t": "array", "k": key}
+    if isinstance(value, (numpy.generic, int, float, bool)):
+        return {"t": "scalar", "v": value.item() if isinstance(value, numpy.generic) else value}
+    # 리스트/튜플 등은 배열로 저장
+    key = f"a{len(arrays)}"
+    arrays[key] = numpy.asarray(value)
+    return {"t": "array", "k": key}
+
+
+def _unpack_value(descriptor: dict, arrays: Any) -> Any:
+    """JSON 설명자를 Face 필드 값으로 복원"""
+    kind = descriptor["t"]
+    if kind == "none":
+        return None
+    if kind == "dict":
+        return {key: _unpack_value(item, arrays) for key, item in descriptor["items"].items()}
+    if kind == "range":
+        return range(*descriptor["v"])
+    if kind in ("str", "scalar"):
+        return descriptor["v"]
+    return numpy.array(arrays[descriptor["k"]])
+
+
+def pack_face(face: Any, arrays: Dict[str, numpy.ndarray]) -> dict:
+    """
+    Face namedtuple을 직렬화
+
+    Args:
+        face: FaceFusion Face
+        arrays: 배열이 저장될 딕셔너리 (np.savez 인자, 여러 얼굴이 공유 가능)
+
+    Returns:
+        JSON 직렬화 가능한 필드 설명자
+    """
+    return {name: _pack_value(getattr(face, name), arrays) for name in face._fields}
+
+
+def unpack_face(face_type: type, descriptor: dict, arrays: Any) -> Any:
+    """pack_face()로 저장된 얼굴을 Face namedtuple로 복원"""
+    values = {name: _unpack_value(descriptor[name], arrays) for name in face_type._fields}
+    return face_type(**values)
+
+
+def atomic_savez(path: Path, **arrays: Any) -> None:
+    """임시 파일에 저장 후 rename (동시에 읽는 다른 워커가 반쯤 쓴 파일을 보지 않도록)"""
+    temp_path = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    with open(temp_path, "wb") as f:
+        numpy.savez(f, **arrays)
+    os.replace(temp_path, path)
+
+
+class SourceFaceCache:
+    """업로드 원본 이미지의 얼굴 분석 결과 캐시 (메모리 LRU + 업로드 파일 옆 .npz)"""
+
+    def __init__(
+        self,
+        analyse: Callable[[str, str], Tuple[Any, dict]],
+        face_type: Callable[[], type],
+        fingerprint: Callable[[], str],
+        capacity: int,
+    ):
+        """
+        Args:
+            analyse: (원본 이미지 경로, 분석 설정 지문) -> (Face, 메타데이터) 분석 함수
+            face_type: Face namedtuple 클래스를 반환하는 함수 (facefusion 버전별 위치가 다름)
+            fingerprint: 현재 분석 설정 지문을 반환하는 함수
+            capacity: 메모리에 보관할 최대 얼굴 수
+        """
+        self._analyse = analyse
+        self._face_type = face_type
+        self._fingerprint = fingerprint
+        self._memory: LRUCache[Tuple[Any, dict]] = LRUCache(max_entries=capacity)
+
+    @staticmethod
+    def cache_path(source_path: str, fingerprint: str) -> Path:
+        """원본 이미지와 분석 설정에 대응하는 .npz 경로"""
+        return Path(f"{source_path}.{fingerprint}{SOURCE_FACE_SUFFIX}")
+
+    @staticmethod
+    def roi_path(source_path: str, fingerprint: str) -> Path:
+        """원본 이미지와 분석 설정에 대응하는 전처리(축소/얼굴 영역) 이미지 경로"""
+        return Path(f"{source_path}.{fingerprint}{SOURCE_ROI_SUFFIX}")
+
+    def get(self, source_path: str) -> Tuple[Any, dict]:
+        """
+        원본 이미지의 얼굴과 분석 메타데이터 반환 (없으면 분석 후 저장)
+
+        Raises:
+            RuntimeError: 원본 이미지에서 얼굴을 찾지 못함
+        """
+        stat = os.stat(source_path)
+        fingerprint = self._fingerprint()
+        key = (source_path, stat.st_mtime_ns, stat.st_size, fingerprint)
+
+        cached = self._memory.get(key)
+        if cached is not None and self._has_roi_image(cached[1]):
+            return cached
+
+        cached = self._load(source_path, fingerprint, stat.st_mtime_ns)
+        if cached is None:
+            cached = self._analyse(source_path, fingerprint)
+            self._save(source_path, fingerprint, stat.st_mtime_ns, *cached)
+
+        self._memory.put(key, cached)
+        return cached
+
+    @staticmethod
+    def _has_roi_image(metadata: dict) -> bool:
+        """얼굴 좌표 기준인 전처리(ROI) 이미지가 남아 있는지 (없으면 다시 분석)"""
+        return "roi_path" not in metadata or os.path.exists(metadata["roi_path"])
+
+    def _load(self, source_path: str, fingerprint: str, mtime_ns: int) -> Optional[Tuple[Any, dict]]:
+        """디스크 캐시 로드 (원본이 바뀌었거나 손상되었으면 None)"""
+        path = self.cache_path(source_path, fingerprint)
+        if not path.exists():
+            return None
+
+        try:
+            with numpy.load(path, allow_pickle=False) as data:
+                manifest = json.loads(str(data["manifest"]))
+                if manifest.get("source_mtime_ns") != mtime_ns:
+                    return None
+                face = unpack_face(self._face_type(), manifest["face"], data)
+            metadata = manifest.get("metadata", {})
+            if not self._has_roi_image(metadata):
+                return None
+            return face, metadata
+        except Exception as e:
+            logger.warning(f"⚠️ 얼굴 캐시 로드 실패, 다시 분석합니다 ({path}): {e}")
+            return None
+
+    def _save(self, source_path: str, fingerprint: str, mtime_ns: int, face: Any, metadata: dict) -> None:
+        """디스크 캐시 저장 (실패해도 합성은 계속 진행)"""
+        path = self.cache_path(source_path, fingerprint)
+        try:
+            arrays: Dict[str, numpy.ndarray] = {}
+            manifest = {
+                "source_mtime_ns": mtime_ns,
+                "face": pack_face(face, arrays),
+                "metadata": metadata,
+            }
+            atomic_savez(path, manifest=numpy.array(json.dumps(manifest)), **arrays)
+        except Exception as e:
+            logger.warning(f"⚠️ 얼굴 캐시 저장 실패 ({path}): {e}")
@@ -0,0 +1,142 @@
+"""
+업로드 얼굴 확인
+
+업로드 직후 축소 디코딩한 사진에서 검출기만 실행하여 (랜드마크/임베딩 생략) 얼굴 수,
+얼굴 위치, 선명도를 측정하고, 합성이 실패하거나 결과가 나쁠 사진(얼굴 없음, 여러 명,
+너무 작음, 흐림)을 생성 전에 거절합니다.
+
+- measure_faces(): 워커에서 검출 결과와 프레임으로 측정값 계산
+- evaluate_face_check(): 이벤트 루프에서 설정 기준으로 판정
+"""
+
+from typing import Iterable, List, Optional, Sequence, Tuple
+
+import cv2
+import numpy
+
+from backend.core.config import FaceFusionSettings
+
+# 선명도 측정 시 얼굴 크롭의 짧은 변 (px, 얼굴 크기와 무관하게 비교)
+SHARPNESS_CROP_SIZE = 128
+# 이 선명도 이상이면 선명도 점수 1.0
+SHARPNESS_REFERENCE = 300.0
+
+
+def face_sharpness(vision_frame: numpy.ndarray, bounding_box: Sequence[float]) -> float:
+    """
+    얼굴 영역 선명도 (짧은 변을 SHARPNESS_CROP_SIZE로 맞춘 흑백 크롭의 라플라시안 분산)
+
+    Args:
+        vision_frame: BGR 프레임
+        bounding_box: 프레임 좌표 얼굴 박스 (x1, y1, x2, y2)
+    """
+    height, width = vision_frame.shape[:2]
+    x1, y1, x2, y2 = (int(round(float(v))) for v in bounding_box)
+    x1, y1 = max(0, x1), max(0, y1)
+    x2, y2 = min(width, x2), min(height, y2)
+    if x2 - x1 < 2 or y2 - y1 < 2:
+        return 0.0
+
+    crop = cv2.cvtColor(vision_frame[y1:y2, x1:x2], cv2.COLOR_BGR2GRAY)
+    ratio = SHARPNESS_CROP_SIZE / min(crop.shape[:2])
+    size = (max(1, round(crop.shape[1] * ratio)), max(1, round(crop.shape[0] * ratio)))
+    crop = cv2.resize(crop, size, interpolation=cv2.INTER_AREA if ratio < 1 else cv2.INTER_LINEAR)
+    return float(cv2.Laplacian(crop, cv2.CV_64F).var())
+
+
+def measure_faces(
+    vision_frame: numpy.ndarray,
+    detections: Iterable[Tuple[Sequence[float], float]],
+    scale: float,
+    original_size: Tuple[int, int],
+) -> dict:
+    """
+    검출 결과 측정값 (워커에서 호출)
+
+    Args:
+        vision_frame: 검출에 사용한 (축소) 프레임
+        detections: (프레임 좌표 얼굴 박스, 검출 점수) 목록
+        scale: 원본 대비 프레임 배율
+        original_size: 원본 (너비, 높이)
+
+    Returns:
+        faces (원본 좌표 bounding_box, score, 큰 얼굴 순), sharpness (가장 큰 얼굴),
+        original_size, decoded_size (디코딩 실패 시 워커는 {"faces": [], "unreadable": True} 반환)
+    """
+    detections = sorted(detections, key=lambda item: _area(item[0]), reverse=True)
+    faces = [
+        {
+            "bounding_box": [round(float(v) / scale, 1) for v in box],
+            "score": round(float(score), 4),
+        }
+        for box, score in detections
+    ]
+    return {
+        "faces": faces,
+        "sharpness": round(face_sharpness(vision_frame, detections[0][0]), 2) if detections else None,
+        "original_size": list(original_size),
+        "decoded_size": [vision_frame.shape[1], vision_frame.shape[0]],
+    }
+
+
+def evaluate_face_check(measurement: dict, config: FaceFusionSettings) -> dict:
+    """
+    측정값 판정 (이벤트 루프에서 호출)
+
+    가장 큰 얼굴 대비 FACEFUSION_FACE_CHECK_SECONDARY_FACE_RATIO 미만인 얼굴(뒤에 지나가는
+    사람 등)은 세지 않습니다. 선명도를 측정하지 않은 경우(sharpness None, 모의 엔진)에는
+    흐림 판정을 하지 않고 품질은 검출 점수만 반영합니다.
+
+    Returns:
+        accepted, reason (거절 사유: unreadable, no_face, multiple_faces, face_too_small, blurry,
+        통과하면 None), face_count, bounding_box, detector_score,
+        sharpness, quality (0~1: 검출 점수 × 선명도 점수)
+    """
+    faces: List[dict] = measurement.get("faces", [])
+    primary: Optional[dict] = faces[0] if faces else None
+    primary_area = _area(primary["bounding_box"]) if primary else 0.0
+    face_count = sum(
+        1 for face in faces
+        if _area(face["bounding_box"]) >= primary_area * config.face_check_secondary_face_ratio
+    )
+    sharpness = measurement.get("sharpness")
+
+    quality = 0.0
+    if primary:
+        sharpness_score = 1.0 if sharpness is None else min(1.0, sharpness / SHARPNESS_REFERENCE)
+        quality = round(primary["score"] * sharpness_score, 3)
+
+    reason = None
+    if measurement.get("unreadable"):
+        reason = "unreadable"
+    elif face_count == 0:
+        reason = "no_face"
+    elif face_count > 1:
+        reason = "multiple_faces"
+    elif _short_side(primary["bounding_box"]) < config.face_check_min_face_size:
+        reason = "face_too_small"
+    elif sharpness is not None and sharpness < config.face_check_min_sharpness:
+        reason = "blurry"
+
+    return {
+        "accepted": reason is None,
+        "reason": reason,
+        "face_count": face_count,
+        "bounding_box": primary["bounding_box"] if primary else None,
+        "detector_score": primary["score"] if primary else None,
+        "sharpness": measurement.get("sharpness"),
+        "quality": quality,
+        "original_size": measurement.get("original_size"),
+    }
+
+
+def _area(box: Sequence[float]) -> float:
+    """박스 넓이"""
+    x1, y1, x2, y2 = (float(v) for v in box)
+    return max(0.0, x2 - x1) * max(0.0, y2 - y1)
+
+
+def _short_side(box: Sequence[float]) -> float:
+    """박스 짧은 변"""
+    x1, y1, x2, y2 = (float(v) for v in box)
+    return min(x2 - x1, y2 - y1)
@@ -0,0 +1,243 @@
+"""
+FaceFusion 얼굴 교체 연산
+
+facefusion face_swapper의 swap_face()를 단계별로 나눈 연산입니다.
+교체할 타겟 얼굴 선택은 image_to_image 워크플로와 같은 facefusion select_faces()로 하므로
+face_selector_* 설정(mode, order, 나이/성별/인종 필터, reference 거리)을 따릅니다.
+타겟 얼굴 정렬(warp)과 교체 전 마스크(box, occlusion)는 타겟 이미지에만 의존하므로
+미리 계산해 캐시할 수 있고, 교체(forward)와 교체 후 마스크(area, region)만
+요청마다 실행합니다. 여러 요청의 교체(forward)는 모델이 동적 배치 차원을 지원하면
+한 번의 ONNX 호출로 묶어 실행합니다. 스와퍼 모델은 state의 face_swapper_model을 따르므로
+엔진이 작업마다 설정합니다. facefusion 내부 API 의존은 이 모듈에 모아 둡니다.
+"""
+
+import logging
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import cv2
+import numpy
+
+logger = logging.getLogger(__name__)
+
+# 원본 얼굴 임베딩 대신 state의 원본 이미지를 직접 읽는 모델 (요청 간 배치 불가)
+SOURCE_FRAME_MODEL_TYPES = ("blendswap", "uniface")
+
+@dataclass
+class TargetCrop:
+    """정렬된 타겟 얼굴 크롭과 교체 전 마스크"""
+
+    crop_frame: numpy.ndarray
+    affine_matrix: numpy.ndarray
+    masks: List[numpy.ndarray]
+
+
+class FaceSwapOps:
+    """face_swapper 단계별 연산 (워커 프로세스 내 state_manager 설정을 따름)"""
+
+    def __init__(self, state_manager: Any, face_swapper: Any):
+        """
+        Args:
+            state_manager: facefusion.state_manager 모듈
+            face_swapper: face_swapper 프로세서 모듈
+        """
+        from facefusion import face_helper, face_masker
+        from facefusion.processors.pixel_boost import explode_pixel_boost, implode_pixel_boost
+        from facefusion.vision import unpack_resolution
+
+        try:
+            from facefusion.face_selector import select_faces
+        except ImportError:
+            select_faces = None
+            logger.warning("⚠️ facefusion에 face_selector.select_faces가 없어 타겟의 가장 큰 얼굴만 교체합니다")
+
+        self._state_manager = state_manager
+        self._face_swapper = face_swapper
+        self._face_helper = face_helper
+        self._face_masker = face_masker
+        self._implode_pixel_boost = implode_pixel_boost
+        self._explode_pixel_boost = explode_pixel_boost
+        self._unpack_resolution = unpack_resolution
+        self._select_faces = select_faces
+        # 스와퍼 모델별 배치 지원 여부 (여러 모델을 미리 로드해 전환하므로 모델마다 확인)
+        self._batch_supported: Dict[str, bool] = {}
+
+    def _model_geometry(self) -> Tuple[Any, Tuple[int, int], Tuple[int, int]]:
+        """(얼굴 템플릿, 모델 입력 크기, pixel boost 크기)"""
+        model_options = self._face_swapper.get_model_options()
+        pixel_boost_size = self._unpack_resolution(
+            self._state_manager.get_item('face_swapper_pixel_boost')
+        )
+        return model_options.get('template'), model_options.get('size'), pixel_boost_size
+
+    def select_target_faces(self, vision_frame: numpy.ndarray, faces: List[Any]) -> List[Any]:
+        """
+        교체할 타겟 얼굴 목록 (face_selector_mode 'many'이면 여러 개)
+
+        이미지 타겟은 참조 프레임도 타겟 자신이므로 reference 모드는 타겟에서
+        reference_face_position 얼굴과 닮은 얼굴을 고릅니다.
+
+        Args:
+            vision_frame: 타겟 프레임
+            faces: vision_frame에서 검출한 모든 얼굴 (select_faces가 없는 버전에서 사용)
+        """
+        if self._select_faces is None:
+            primary_face = select_primary_face(faces)
+            return [primary_face] if primary_face is not None else []
+        return list(self._select_faces(vision_frame, vision_frame))
+
+    def prepare_target(self, vision_frame: numpy.ndarray, target_face: Any) -> TargetCrop:
+        """타겟 얼굴 정렬 및 교체 전 마스크 계산 (캐시 대상)"""
+        model_template, _, pixel_boost_size = self._model_geometry()
+        crop_frame, affine_matrix = self._face_helper.warp_face_by_face_landmark_5(
+            vision_frame, target_face.landmark_set.get('5/68'), model_template, pixel_boost_size
+        )
+
+        mask_types = self._state_manager.get_item('face_mask_types')
+        masks = []
+        if 'box' in mask_types:
+            masks.append(self._face_masker.create_box_mask(
+                crop_frame,
+                self._state_manager.get_item('face_mask_blur'),
+                self._state_manager.get_item('face_mask_padding'),
+            ))
+        if 'occlusion' in mask_types:
+            masks.append(self._face_masker.create_occlusion_mask(crop_frame))
+
+        return TargetCrop(crop_frame=crop_frame, affine_matrix=affine_matrix, masks=masks)
+
+    def forward(self, source_face: Any, target_face: Any, crop_frame: numpy.ndarray) -> numpy.ndarray:
+        """pixel boost 타일별로 스와퍼 모델 실행"""
+        _, model_size, pixel_boost_size = self._model_geometry()
+        pixel_boost_total = pixel_boost_size[0] // model_size[0]
+
+        swapped_tiles = []
+        for tile in self._implode_pixel_boost(crop_frame, pixel_boost_total, model_size):
+            tile = self._face_swapper.prepare_crop_frame(tile)
+            tile = self._face_swapper.forward_swap_face(source_face, target_face, tile)
+            swapped_tiles.append(self._face_swapper.normalize_crop_frame(tile))
+        return self._explode_pixel_boost(swapped_tiles, pixel_boost_total, model_size, pixel_boost_size)
+
+    @property
+    def supports_batching(self) -> bool:
+        """현재 스와퍼 모델을 여러 요청에 걸쳐 배치 실행할 수 있는지 여부"""
+        model = self._state_manager.get_item('face_swapper_model')
+        if model not in self._batch_supported:
+            self._batch_supported[model] = self._detect_batch_support()
+        return self._batch_supported[model]
+
+    def _detect_batch_support(self) -> bool:
+        """모델 입력의 배치 차원이 동적인지 확인"""
+        model_type = self._face_swapper.get_model_options().get('type')
+        if model_type in SOURCE_FRAME_MODEL_TYPES:
+            return False
+        try:
+            session = self._face_swapper.get_inference_pool().get('face_swapper')
+            return all(
+                not isinstance(model_input.shape[0], int)
+                for model_input in session.get_inputs()
+            )
+        except Exception as e:
+            logger.warning(f"⚠️ 스와퍼 배치 지원 여부 확인 실패, 개별 실행합니다: {e}")
+            return False
+
+    def forward_batch(
+        self,
+        items: Sequence[Tuple[Any, Any, numpy.ndarray]],
+    ) -> List[numpy.ndarray]:
+        """
+        여러 (원본 얼굴, 타겟 얼굴, 정렬 크롭)의 교체를 한 번의 모델 호출로 실행
+
+        모든 크롭의 pixel boost 타일을 쌓아 실행합니다. 배치를 지원하지 않는 모델이거나
+        배치 실행이 실패하면 개별 실행으로 대체합니다.
+
+        Returns:
+            교체된 크롭 목록 (items 순서)
+        """
+        if not items:
+            return []
+        if len(items) == 1 or not self.supports_batching:
+            return [self.forward(*item) for item in items]
+
+        _, model_size, pixel_boost_size = self._model_geometry()
+        pixel_boost_total = pixel_boost_size[0] // model_size[0]
+
+        sources: List[numpy.ndarray] = []
+        tiles: List[numpy.ndarray] = []
+        for source_face, _, crop_frame in items:
+            source_embedding = self._face_swapper.prepare_source_embedding(source_face)
+            for tile in self._implode_pixel_boost(crop_frame, pixel_boost_total, model_size):
+                sources.append(source_embedding)
+                tiles.append(self._face_swapper.prepare_crop_frame(tile))
+
+        try:
+            session = self._face_swapper.get_inference_pool().get('face_swapper')
+            inputs = {}
+            for model_input in session.get_inputs():
+                if model_input.name == 'source':
+                    inputs[model_input.name] = numpy.concatenate(sources)
+                if model_input.name == 'target':
+                    inputs[model_input.name] = numpy.concatenate(tiles)
+            outputs = session.run(None, inputs)[0]
+        except Exception as e:
+            logger.warning(f"⚠️ 스와퍼 배치 실행 실패, 개별 실행으로 전환합니다: {e}")
+            self._batch_supported[self._state_manager.get_item('face_swapper_model')] = False
+            return [self.forward(*item) for item in items]
+
+        tiles_per_item = pixel_boost_total * pixel_boost_total
+        swapped_crops = []
+        for index in range(len(items)):
+            item_outputs = outputs[index * tiles_per_item:(index + 1) * tiles_per_item]
+            swapped_tiles = [self._face_swapper.normalize_crop_frame(tile) for tile in item_outputs]
+            swapped_crops.append(self._explode_pixel_boost(
+                swapped_tiles, pixel_boost_total, model_size, pixel_boost_size
+            ))
+        return swapped_crops
+
+    def paste(
+        self,
+        target_face: Any,
+        target_crop: TargetCrop,
+        swapped_crop: numpy.ndarray,
+        vision_frame: numpy.ndarray,
+    ) -> numpy.ndarray:
+        """교체 후 마스크 계산 및 원래 프레임에 붙여넣기"""
+        crop_masks = list(target_crop.masks)
+        mask_types = self._state_manager.get_item('face_mask_types')
+
+        if 'area' in mask_types:
+            face_landmark_68 = cv2.transform(
+                target_face.landmark_set.get('68').reshape(1, -1, 2), target_crop.affine_matrix
+            ).reshape(-1, 2)
+            crop_masks.append(self._face_masker.create_area_mask(
+                swapped_crop, face_landmark_68, self._state_manager.get_item('face_mask_areas')
+            ))
+        if 'region' in mask_types:
+            crop_masks.append(self._face_masker.create_region_mask(
+                swapped_crop, self._state_manager.get_item('face_mask_regions')
+            ))
+
+        crop_mask = self._combine_masks(crop_masks, swapped_crop)
+        return self._face_helper.paste_back(
+            vision_frame, swapped_crop, crop_mask, target_crop.affine_matrix
+        )
+
+    @staticmethod
+    def _combine_masks(crop_masks: List[numpy.ndarray], crop_frame: numpy.ndarray) -> numpy.ndarray:
+        """마스크 교집합 (마스크가 없으면 전체 영역)"""
+        if not crop_masks:
+            return numpy.ones(crop_frame.shape[:2], dtype=numpy.float32)
+        return numpy.minimum.reduce(crop_masks).clip(0, 1)
+
+
+def select_primary_face(faces: List[Any]) -> Optional[Any]:
+    """가장 큰 얼굴 반환 (face_selector_order 'large-small'의 첫 번째)"""
+    if not faces:
+        return None
+    return max(faces, key=face_area)
+
+
+def face_area(face: Any) -> float:
+    """얼굴 bounding box 면적"""
+    x1, y1, x2, y2 = face.bounding_box
+    return float((x2 - x1) * (y2 - y1))
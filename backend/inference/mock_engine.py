@@ -0,0 +1,292 @@
+"""
+모의 추론 엔진 (mock mode)
+
+FaceFusion 체크아웃과 모델 없이 백엔드 전체의 용량 테스트를 할 수 있도록
+FaceFusionEngine과 같은 인터페이스로 실제와 비슷한 부하를 만듭니다.
+
+- 지연 시간: p50/p99로 지정한 로그정규 분포에서 작업마다 추출
+- CPU 부하: 지연 시간 동안 sleep 대신 실제로 CPU를 사용 (선택)
+- 이미지 처리: 원본 축소 디코딩, 타겟 디코딩, 원본을 타겟 중앙에 블렌딩, JPEG 인코딩
+- 오류 주입: 지정한 확률로 합성 실패
+
+워커 풀, 마이크로 배치, 결과 캐시 등 나머지 경로는 real 모드와 동일하게 실행됩니다.
+"""
+
+import math
+import random
+import time
+import logging
+from typing import Iterable, List, Optional, Union
+
+import cv2
+import numpy
+
+from backend.core.config import FaceFusionSettings
+from backend.inference.cancellation import CancellationBoard, SwapCancelled, cancellation_reason
+from backend.inference.face_check import measure_faces
+from backend.inference.quality import quality_levels
+from backend.inference.stage_timer import StageTimer
+from backend.inference.swap_job import SwapJob, SwapResult
+from backend.utils.image_utils import decode_bounded
+
+logger = logging.getLogger(__name__)
+
+# 표준정규분포 99번째 백분위수
+_Z_99 = 2.3263478740408408
+
+
+class LatencyModel:
+    """p50/p99로 지정하는 로그정규 지연 시간 분포"""
+
+    def __init__(self, p50_ms: float, p99_ms: float, rng: random.Random):
+        """
+        Args:
+            p50_ms: 중앙값 (ms)
+            p99_ms: 99번째 백분위수 (ms, p50 이하이면 항상 p50)
+            rng: 난수 생성기
+        """
+        self.mu = math.log(max(p50_ms, 0.001) / 1000)
+        self.sigma = max(0.0, math.log(max(p99_ms, p50_ms, 0.001) / max(p50_ms, 0.001)) / _Z_99)
+        self._rng = rng
+
+    def sample(self) -> float:
+        """지연 시간 추출 (초)"""
+        return math.exp(self._rng.normalvariate(self.mu, self.sigma)) if self.sigma else math.exp(self.mu)
+
+
+class MockFaceFusionEngine:
+    """FaceFusion 없이 실제와 비슷한 부하를 만드는 모의 엔진 (프로세스당 1개)"""
+
+    def __init__(self, config: FaceFusionSettings, cancellation: Optional[CancellationBoard] = None):
+        """
+        Args:
+            config: FaceFusion 설정 (mock_* 항목 사용)
+            cancellation: 이벤트 루프와 공유하는 작업 취소 기록
+        """
+        self.config = config
+        self.cancellation = cancellation
+        self._rng = random.Random()
+        self.latency = LatencyModel(config.mock_latency_p50_ms, config.mock_latency_p99_ms, self._rng)
+        self._warmed_up = False
+        # real 엔진처럼 미리 로드한 스와퍼 모델만 사용 가능
+        self.swapper_models = config.swapper_models
+        # 품질 단계 중 모의 엔진은 JPEG 품질만 적용
+        self.quality_levels = quality_levels(config)
+        logger.info(
+            f"Mock inference engine: p50={config.mock_latency_p50_ms}ms, "
+            f"p99={config.mock_latency_p99_ms}ms, cpu_burn={config.mock_cpu_burn}, "
+            f"image_ops={config.mock_image_ops}, error_rate={config.mock_error_rate}"
+        )
+
+    @property
+    def is_warmed_up(self) -> bool:
+        """워밍업 완료 여부"""
+        return self._warmed_up
+
+    def warmup(self, job: SwapJob) -> SwapResult:
+        """모의 엔진은 로드할 모델이 없으므로 바로 완료"""
+        self._warmed_up = True
+        return SwapResult(output_path=job.output_path, elapsed=0.0)
+
+    def process(self, job: SwapJob) -> SwapResult:
+        """
+        모의 얼굴 합성 실행
+
+        Raises:
+            RuntimeError: 주입된 합성 실패 또는 이미지 처리 실패
+        """
+        result = self.process_batch([job])[0]
+        if isinstance(result, BaseException):
+            raise result
+        return result
+
+    def process_batch(self, jobs: List[SwapJob]) -> List[Union[SwapResult, RuntimeError]]:
+        """
+        여러 모의 합성 실행
+
+        real 엔진처럼 배치는 한 번의 모델 호출로 보고, 지연 시간은 배치 내 가장 긴 작업
+        기준으로 한 번만 소모합니다. 취소/기한 확인도 real 엔진과 같은 단계 경계
+        (준비 → 얼굴 교체 → 인코딩)에서 합니다.
+
+        Returns:
+            작업별 합성 결과 또는 실패 예외 (jobs 순서)
+        """
+        start_time = time.time()
+        budget = max(self.latency.sample() for _ in jobs)
+        timers = [StageTimer() for _ in jobs]
+
+        outputs = []
+        for job, timer in zip(jobs, timers):
+            try:
+                outputs.append(self._abandoned(job, "prepare", start_time))
+                if outputs[-1] is not None:
+                    continue
+                model = job.swapper_model or self.config.face_swapper_model
+                if model not in self.swapper_models:
+                    raise RuntimeError(f"Face swapper model is not loaded: {model}")
+                if not 0 <= job.quality_level < len(self.quality_levels):
+                    raise RuntimeError(f"Unknown quality level: {job.quality_level}")
+                if self._rng.random() < self.config.mock_error_rate:
+                    raise RuntimeError("Simulated face fusion failure")
+                outputs[-1] = self._compose(job, timer) if self.config.mock_image_ops else None
+            except Exception as e:
+                outputs[-1] = self._failure(e)
+
+        for index, job in enumerate(jobs):
+            if not isinstance(outputs[index], RuntimeError):
+                outputs[index] = self._abandoned(job, "swap", start_time) or outputs[index]
+
+        if not all(isinstance(output, RuntimeError) for output in outputs):
+            swap_start = time.perf_counter()
+            self._spend(budget - (time.time() - start_time))
+            for timer in timers:
+                timer.add("swap", time.perf_counter() - swap_start)
+
+        results: List[Union[SwapResult, RuntimeError]] = []
+        for job, output, timer in zip(jobs, outputs, timers):
+            if isinstance(output, RuntimeError):
+                results.append(output)
+                continue
+            cancelled = self._abandoned(job, "encode", start_time)
+            if cancelled is not None:
+                results.append(cancelled)
+                continue
+            try:
+                with timer.stage("encode"):
+                    if output is None:
+                        self._copy_target(job)
+                    else:
+                        self._write_image(job.output_path, output, self._output_quality(job))
+                results.append(SwapResult(
+                    output_path=job.output_path,
+                    elapsed=time.time() - start_time,
+                    timings=timer.as_dict(),
+                    batch_supported=True,
+                ))
+            except Exception as e:
+                results.append(self._failure(e))
+
+        logger.info(f"✅ Mock face fusion completed in {time.time() - start_time:.2f}s ({len(jobs)} job(s))")
+        return results
+
+    def analyse_source(self, source_path: str, quality_level: int = 0) -> dict:
+        """
+        모의 원본 분석 (축소 디코딩 후 중앙 영역을 얼굴로 간주, 품질 단계 무관)
+
+        Returns:
+            분석 메타데이터 (bounding_box, score, original_size, decoded_size, scale, roi)와
+            단계별 시간 (timings)
+        """
+        timer = StageTimer()
+        with timer.stage("source_face"):
+            frame, scale, original_size = decode_bounded(source_path, self.config.source_max_dimension)
+        width, height = original_size
+        return {
+            "bounding_box": [width * 0.25, height * 0.25, width * 0.75, height * 0.75],
+            "score": 1.0,
+            "original_size": list(original_size),
+            "decoded_size": [frame.shape[1], frame.shape[0]],
+            "scale": round(scale, 4),
+            "roi": [0.0, 0.0, float(width), float(height)],
+            "timings": timer.as_dict(),
+        }
+
+    def check_face(self, source_path: str) -> dict:
+        """
+        모의 업로드 얼굴 확인 (중앙 영역을 얼굴로 간주)
+
+        중앙 영역이 실제 얼굴이 아니므로 선명도는 측정하지 않습니다 (흐림으로 거절하지 않음).
+        읽을 수 없는 파일과 얼굴 크기 판정은 real 엔진과 같습니다.
+
+        Returns:
+            측정값 (backend.inference.face_check.measure_faces, sharpness는 None)
+        """
+        try:
+            frame, scale, original_size = decode_bounded(source_path, self.config.face_check_max_dimension)
+        except RuntimeError:
+            return {"faces": [], "unreadable": True}
+        height, width = frame.shape[:2]
+        box = [width * 0.25, height * 0.25, width * 0.75, height * 0.75]
+        measurement = measure_faces(frame, [(box, 1.0)], scale, original_size)
+        measurement["sharpness"] = None
+        return measurement
+
+    def precompute_targets(self, target_paths: Iterable[str]) -> dict:
+        """모의 엔진은 타겟 분석 캐시가 없음"""
+        return {"built": 0, "cached": 0, "failed": 0, "pruned": 0}
+
+    def _abandoned(self, job: SwapJob, stage: str, start_time: float) -> Optional[SwapCancelled]:
+        """단계 시작 전 작업 취소/기한 확인"""
+        reason = cancellation_reason(job, self.cancellation)
+        if reason is None:
+            return None
+        return SwapCancelled(reason, stage, time.time() - start_time)
+
+    def _compose(self, job: SwapJob, timer: StageTimer) -> numpy.ndarray:
+        """원본 중앙 영역을 타겟 중앙에 타원 마스크로 블렌딩"""
+        with timer.stage("source_face"):
+            source_frame, _, _ = decode_bounded(job.source_path, self.config.source_max_dimension)
+        with timer.stage("target_face"):
+            target_frame = cv2.imread(job.target_path, cv2.IMREAD_COLOR)
+        if target_frame is None:
+            raise RuntimeError(f"Failed to read image: {job.target_path}")
+
+        with timer.stage("paste"):
+            return self._blend(source_frame, target_frame)
+
+    @staticmethod
+    def _blend(source_frame: numpy.ndarray, target_frame: numpy.ndarray) -> numpy.ndarray:
+        """원본 중앙 영역을 타겟 중앙에 타원 마스크로 합성"""
+        height, width = target_frame.shape[:2]
+        size = (max(1, width // 2), max(1, height // 2))
+        source_height, source_width = source_frame.shape[:2]
+        face = source_frame[source_height // 4: source_height * 3 // 4, source_width // 4: source_width * 3 // 4]
+        face = cv2.resize(face, size, interpolation=cv2.INTER_AREA)
+
+        mask = numpy.zeros((size[1], size[0]), dtype=numpy.float32)
+        cv2.ellipse(mask, (size[0] // 2, size[1] // 2), (size[0] // 2, size[1] // 2), 0, 0, 360, 1.0, -1)
+        mask = cv2.GaussianBlur(mask, (0, 0), max(1.0, min(size) / 16))[..., None]
+
+        top, left = (height - size[1]) // 2, (width - size[0]) // 2
+        region = target_frame[top:top + size[1], left:left + size[0]].astype(numpy.float32)
+        blended = region * (1 - mask) + face.astype(numpy.float32) * mask
+        target_frame[top:top + size[1], left:left + size[0]] = blended.astype(numpy.uint8)
+        return target_frame
+
+    def _spend(self, seconds: float) -> None:
+        """남은 지연 시간 소모 (CPU 사용 또는 sleep)"""
+        if seconds <= 0:
+            return
+        if not self.config.mock_cpu_burn:
+            time.sleep(seconds)
+            return
+
+        deadline = time.perf_counter() + seconds
+        buffer = numpy.random.default_rng().random((256, 256), dtype=numpy.float32)
+        while time.perf_counter() < deadline:
+            numpy.sqrt(buffer * buffer + 1.0, out=buffer)
+
+    @staticmethod
+    def _copy_target(job: SwapJob) -> None:
+        """이미지 처리 없이 타겟 파일을 출력으로 복사"""
+        import shutil
+
+        shutil.copy2(job.target_path, job.output_path)
+
+    def _output_quality(self, job: SwapJob) -> int:
+        """작업 품질 단계의 JPEG 품질 (real 엔진 기본 80)"""
+        return int(self.quality_levels[job.quality_level].get('output_image_quality', 80))
+
+    @staticmethod
+    def _write_image(output_path: str, vision_frame: numpy.ndarray, quality: int) -> None:
+        """출력 이미지 JPEG 인코딩 및 저장"""
+        if not cv2.imwrite(output_path, vision_frame, [cv2.IMWRITE_JPEG_QUALITY, quality]):
+            raise RuntimeError(f"Output file not created: {output_path}")
+
+    @staticmethod
+    def _failure(error: Exception) -> RuntimeError:
+        """합성 실패 로그 및 작업 결과용 예외 생성"""
+        logger.error(f"❌ Mock face fusion failed: {str(error)}")
+        failure = RuntimeError(f"Face fusion failed: {str(error)}")
+        failure.__cause__ = error
+        return failure
@@ -0,0 +1,299 @@
+"""
+최적화된 ONNX 모델 캐시
+
+facefusion은 프로세스가 시작될 때마다 스와퍼, 검출기, 랜드마커, 오클루더 모델을 로드하며
+ONNX Runtime 그래프 최적화를 다시 수행합니다. 이 모듈은 facefusion의
+inference_manager.create_inference_session을 감싸서, 최적화된 그래프를 캐시 디렉토리에
+저장하고 다음 시작부터는 최적화 없이 바로 로드합니다.
+
+캐시 키는 원본 모델 파일 해시 + ONNX Runtime 버전 + 최적화 수준 + execution provider이므로
+모델이나 런타임이 바뀌면 자동으로 다시 생성합니다.
+
+INT8 양자화(FACEFUSION_MODEL_QUANTIZATION)가 설정되면 대상 모델 대신 양자화된 변형을
+로드합니다 (backend.inference.quantization).
+"""
+
+import json
+import logging
+import os
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from backend.core.config import FaceFusionSettings
+from backend.inference.quantization import QUANTIZATION_MODES, quantize_dynamic_model
+from backend.utils.hashing import file_sha256
+
+logger = logging.getLogger(__name__)
+
+MANIFEST_NAME = "manifest.json"
+
+GRAPH_OPTIMIZATION_LEVELS = ("disable", "basic", "extended", "all")
+
+
+class OptimizedModelCache:
+    """그래프 최적화된 ONNX 모델 디스크 캐시 (워커 프로세스마다 1개, 디렉토리는 공유)"""
+
+    def __init__(
+        self,
+        cache_dir: str,
+        optimization_level: str = "all",
+        intra_op_threads: int = 0,
+        enabled: bool = True,
+        quantization: str = "none",
+        quantization_models: Optional[List[str]] = None,
+    ):
+        """
+        Args:
+            cache_dir: 최적화/양자화 모델 저장 디렉토리
+            optimization_level: 그래프 최적화 수준 (disable, basic, extended, all)
+            intra_op_threads: 세션당 연산 스레드 수 (0이면 ONNX Runtime 기본값)
+            enabled: 최적화 모델 저장/재사용 여부 (False면 양자화 모델 선택만 수행)
+            quantization: INT8 양자화 방식 (none, dynamic, static)
+            quantization_models: 양자화할 모델 파일 이름 (.onnx 제외)
+        """
+        if optimization_level not in GRAPH_OPTIMIZATION_LEVELS:
+            raise ValueError(
+                f"Unknown graph optimization level: {optimization_level} "
+                f"(expected one of {', '.join(GRAPH_OPTIMIZATION_LEVELS)})"
+            )
+        if quantization not in QUANTIZATION_MODES:
+            raise ValueError(
+                f"Unknown model quantization: {quantization} "
+                f"(expected one of {', '.join(QUANTIZATION_MODES)})"
+            )
+
+        self.cache_dir = Path(cache_dir).resolve()
+        self.optimization_level = optimization_level
+        self.intra_op_threads = intra_op_threads
+        self.enabled = enabled
+        self.quantization = quantization
+        self.quantization_models = set(quantization_models or [])
+        self.report: List[dict] = []
+        # 양자화 대상이지만 INT8 변형을 사용하지 못해 FP32로 로드한 모델
+        self.fp32_fallbacks: List[str] = []
+
+    def install(self, inference_manager: Any) -> None:
+        """
+        facefusion inference_manager의 세션 생성 함수를 캐시 사용 버전으로 교체
+
+        이미 로드된 세션에는 영향이 없으므로 모델을 사용하기 전에 호출해야 합니다.
+        """
+        original = inference_manager.create_inference_session
+        if getattr(original, "_model_cache", None) is self:
+            return
+
+        create_providers = getattr(inference_manager, "create_inference_session_providers", None)
+        if create_providers is None:
+            logger.warning("⚠️ 이 facefusion 버전은 최적화 모델 캐시를 지원하지 않습니다.")
+            return
+
+        def create_inference_session(model_path: str, execution_device_id: str, execution_providers: List[str]):
+            model_path = self.resolve_model(model_path)
+            if not self.enabled:
+                return original(model_path, execution_device_id, execution_providers)
+            try:
+                providers = create_providers(execution_device_id, execution_providers)
+                return self.create_session(model_path, providers, execution_providers)
+            except Exception as e:
+                logger.warning(f"⚠️ 최적화 모델 캐시 사용 실패, 원본 모델을 로드합니다 ({model_path}): {e}")
+                return original(model_path, execution_device_id, execution_providers)
+
+        create_inference_session._model_cache = self
+        inference_manager.create_inference_session = create_inference_session
+
+    def quantized_path(self, model_path: str, quantization: str) -> Path:
+        """원본 모델에 대응하는 양자화 모델 경로 (원본 해시 포함)"""
+        digest = self._model_digest(model_path, self._read_manifest())
+        return self.cache_dir / f"{Path(model_path).stem}-{digest[:16]}-int8-{quantization}.onnx"
+
+    def resolve_model(self, model_path: str) -> str:
+        """
+        실제로 로드할 모델 경로 (양자화 대상이면 INT8 변형)
+
+        dynamic 변형은 없으면 만들고, static 변형은 보정 스크립트로 미리 만들어야 합니다.
+        양자화 모델을 사용할 수 없으면 원본 모델 경로를 반환합니다.
+        """
+        if self.quantization == "none" or Path(model_path).stem not in self.quantization_models:
+            return model_path
+
+        try:
+            quantized_path = self.quantized_path(model_path, self.quantization)
+            if quantized_path.exists():
+                return str(quantized_path)
+
+            if self.quantization == "static":
+                logger.warning(
+                    f"⚠️ 정적 양자화 모델이 없어 FP32 모델을 사용합니다 ({Path(model_path).stem}). "
+                    f"python backend/scripts/quantize_models.py 로 보정 후 생성하세요."
+                )
+                self.fp32_fallbacks.append(Path(model_path).stem)
+                return model_path
+
+            start_time = time.time()
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            quantize_dynamic_model(model_path, quantized_path)
+            logger.info(
+                f"INT8 동적 양자화 모델 생성 ({time.time() - start_time:.2f}s): {quantized_path.name}"
+            )
+            return str(quantized_path)
+        except Exception as e:
+            logger.warning(f"⚠️ 모델 양자화 실패, FP32 모델을 사용합니다 ({model_path}): {e}")
+            self.fp32_fallbacks.append(Path(model_path).stem)
+            return model_path
+
+    def create_session(self, model_path: str, providers: Any, provider_names: List[str]) -> Any:
+        """
+        최적화 모델로 InferenceSession 생성 (없으면 최적화 후 저장)
+
+        Args:
+            model_path: 원본 .onnx 경로
+            providers: InferenceSession providers 인자
+            provider_names: 캐시 키에 사용할 execution provider 이름
+        """
+        import onnxruntime
+
+        start_time = time.time()
+        manifest = self._read_manifest()
+        key = self._cache_key(model_path, provider_names, manifest)
+        cached_path = self.cache_dir / f"{key}.onnx"
+        entry = manifest.setdefault("models", {}).get(key, {})
+
+        if cached_path.exists():
+            # 이미 최적화된 그래프이므로 다시 최적화하지 않음
+            session = onnxruntime.InferenceSession(
+                str(cached_path),
+                sess_options=self._session_options("disable"),
+                providers=providers,
+            )
+            load_seconds = time.time() - start_time
+            self._record(model_path, "cache", load_seconds, entry.get("optimize_seconds"))
+            return session
+
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        temp_path = cached_path.with_name(f".{cached_path.name}.{os.getpid()}.tmp")
+        options = self._session_options(self.optimization_level)
+        options.optimized_model_filepath = str(temp_path)
+        session = onnxruntime.InferenceSession(model_path, sess_options=options, providers=providers)
+        os.replace(temp_path, cached_path)
+
+        optimize_seconds = time.time() - start_time
+        manifest = self._read_manifest()
+        manifest.setdefault("models", {})[key] = {
+            "source": model_path,
+            "optimization_level": self.optimization_level,
+            "optimize_seconds": round(optimize_seconds, 3),
+        }
+        self._write_manifest(manifest)
+        self._record(model_path, "optimized", optimize_seconds, None)
+        return session
+
+    def _session_options(self, level: str) -> Any:
+        """ONNX Runtime 세션 옵션"""
+        import onnxruntime
+
+        levels = {
+            "disable": onnxruntime.GraphOptimizationLevel.ORT_DISABLE_ALL,
+            "basic": onnxruntime.GraphOptimizationLevel.ORT_ENABLE_BASIC,
+            "extended": onnxruntime.GraphOptimizationLevel.ORT_ENABLE_EXTENDED,
+            "all": onnxruntime.GraphOptimizationLevel.ORT_ENABLE_ALL,
+        }
+        options = onnxruntime.SessionOptions()
+        options.graph_optimization_level = levels[level]
+        if self.intra_op_threads > 0:
+            options.intra_op_num_threads = self.intra_op_threads
+        return options
+
+    def _cache_key(self, model_path: str, provider_names: List[str], manifest: dict) -> str:
+        """원본 모델 해시 + ORT 버전 + 최적화 수준 + provider"""
+        import onnxruntime
+
+        digest = self._model_digest(model_path, manifest)
+        providers = "+".join(provider_names) or "default"
+        return (
+            f"{Path(model_path).stem}-{digest[:16]}-ort{onnxruntime.__version__}"
+            f"-{self.optimization_level}-{providers}"
+        )
+
+    def _model_digest(self, model_path: str, manifest: dict) -> str:
+        """모델 파일 해시 (수정 시각/크기가 같으면 manifest에 기록된 값 재사용)"""
+        stat = os.stat(model_path)
+        digests = manifest.setdefault("digests", {})
+        known = digests.get(model_path)
+        if known and known["mtime_ns"] == stat.st_mtime_ns and known["size"] == stat.st_size:
+            return known["sha256"]
+
+        digest = file_sha256(model_path)
+        digests[model_path] = {"mtime_ns": stat.st_mtime_ns, "size": stat.st_size, "sha256": digest}
+        self._write_manifest(manifest)
+        return digest
+
+    def _read_manifest(self) -> dict:
+        """manifest.json 읽기 (없거나 손상되었으면 빈 manifest)"""
+        path = self.cache_dir / MANIFEST_NAME
+        try:
+            return json.loads(path.read_text(encoding="utf-8"))
+        except (FileNotFoundError, ValueError):
+            return {}
+
+    def _write_manifest(self, manifest: dict) -> None:
+        """manifest.json 원자적 저장 (여러 워커가 동시에 쓸 수 있음)"""
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            path = self.cache_dir / MANIFEST_NAME
+            temp_path = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+            temp_path.write_text(json.dumps(manifest, indent=2), encoding="utf-8")
+            os.replace(temp_path, path)
+        except OSError as e:
+            logger.warning(f"⚠️ 모델 캐시 manifest 저장 실패: {e}")
+
+    def _record(
+        self,
+        model_path: str,
+        source: str,
+        load_seconds: float,
+        optimize_seconds: Optional[float],
+    ) -> None:
+        """모델 로드 시간 기록"""
+        entry: Dict[str, Any] = {
+            "model": Path(model_path).stem,
+            "source": source,
+            "load_seconds": round(load_seconds, 3),
+        }
+        if optimize_seconds is not None:
+            entry["saved_seconds"] = round(max(0.0, optimize_seconds - load_seconds), 3)
+        self.report.append(entry)
+        logger.info(
+            f"모델 로드 ({source}): {entry['model']} {load_seconds:.2f}s"
+            + (f", 절약 {entry['saved_seconds']:.2f}s" if "saved_seconds" in entry else "")
+        )
+
+    def format_report(self, total_seconds: Optional[float] = None) -> str:
+        """시작 시간 리포트 문자열"""
+        lines = ["모델 로드 리포트:"]
+        for entry in self.report:
+            saved = f"{entry['saved_seconds']:.2f}s" if "saved_seconds" in entry else "-"
+            lines.append(
+                f"  {entry['model']:<24} {entry['source']:<10} "
+                f"load {entry['load_seconds']:.2f}s  saved {saved}"
+            )
+        total_saved = sum(entry.get("saved_seconds", 0.0) for entry in self.report)
+        summary = f"  총 절약 {total_saved:.2f}s"
+        if total_seconds is not None:
+            summary += f" (엔진 준비 {total_seconds:.2f}s)"
+        lines.append(summary)
+        return "\n".join(lines)
+
+
+def build_model_cache(config: FaceFusionSettings) -> Optional[OptimizedModelCache]:
+    """설정에 따라 OptimizedModelCache 생성 (캐시와 양자화가 모두 꺼져 있으면 None)"""
+    if not config.model_cache_enabled and config.model_quantization == "none":
+        return None
+    return OptimizedModelCache(
+        cache_dir=config.model_cache_dir,
+        optimization_level=config.graph_optimization_level,
+        intra_op_threads=config.execution_thread_count,
+        enabled=config.model_cache_enabled,
+        quantization=config.model_quantization,
+        quantization_models=config.quantization_models,
+    )
@@ -0,0 +1,158 @@
+"""
+부하 적응형 품질 단계 (quality ladder)
+
+키오스크 여러 대가 동시에 생성하면 사용자를 오래 기다리게 하는 대신 품질을 조금 낮춰
+처리합니다. 0단계는 엔진 기본 설정이고, 1..N단계는 FACEFUSION_QUALITY_LADDER의 설정
+(QUALITY_SETTINGS 중 일부)으로 state를 덮어씁니다.
+
+- QualityLadder: 이벤트 루프에서 부하(진행 중인 생성 / 추론 슬롯)와 최근 생성 지연 시간 p95로
+  단계 결정 (내릴 때와 올릴 때 기준이 다르고, 단계 변경 후 일정 시간 유지)
+- quality_levels(): 워커에서 단계별 state 덮어쓰기 값 조회
+
+생성마다 시작 시점의 단계를 작업(SwapJob.quality_level)에 담아 보내므로 단계가 바뀌어도
+진행 중인 생성은 영향을 받지 않습니다.
+"""
+
+import logging
+import math
+import time
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional, Tuple
+
+from backend.core.config import FaceFusionSettings
+from backend.core.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+# 품질 단계가 덮어쓸 수 있는 FaceFusion state 항목
+QUALITY_SETTINGS = (
+    'face_swapper_pixel_boost',
+    'face_detector_size',
+    'face_mask_types',
+    'output_image_quality',
+)
+
+
+def quality_levels(config: FaceFusionSettings) -> List[Dict[str, Any]]:
+    """
+    단계별 state 덮어쓰기 값 (0단계는 빈 dict, QUALITY_SETTINGS 외 항목은 제외)
+
+    Returns:
+        단계 번호 순서의 덮어쓰기 값 목록
+    """
+    levels: List[Dict[str, Any]] = [{}]
+    for overrides in config.quality_ladder:
+        unknown = set(overrides) - set(QUALITY_SETTINGS)
+        if unknown:
+            logger.warning(f"⚠️ 품질 단계에서 지원하지 않는 설정을 무시합니다: {sorted(unknown)}")
+        levels.append({key: value for key, value in overrides.items() if key in QUALITY_SETTINGS})
+    return levels
+
+
+class QualityLadder:
+    """부하에 따른 품질 단계 결정 (이벤트 루프 안에서만 사용)"""
+
+    def __init__(self, config: FaceFusionSettings, slots: int):
+        """
+        Args:
+            config: FaceFusion 설정 (quality_* 항목 사용)
+            slots: 추론 슬롯 수 (부하 = 진행 중인 생성 / 슬롯)
+        """
+        self.enabled = config.quality_ladder_enabled
+        self.max_level = len(config.quality_ladder) if self.enabled else 0
+        self.slots = max(1, slots)
+        self.degrade_load = config.quality_degrade_load
+        self.recover_load = config.quality_recover_load
+        self.degrade_p95_seconds = config.quality_degrade_p95_seconds
+        self.recover_p95_seconds = config.quality_recover_p95_seconds
+        self.hold_seconds = config.quality_hold_seconds
+        self.window_seconds = config.quality_window_seconds
+
+        self._level = 0
+        self._changed_at = -math.inf
+        # 현재 단계에서 끝난 생성의 (완료 시각, 지연 시간)
+        self._latencies: Deque[Tuple[float, float]] = deque(maxlen=500)
+        self._last_load = 0.0
+
+        if self.max_level:
+            logger.info(
+                f"품질 단계 사용: 현재 {self._level}단계, 최저 {self.max_level}단계 "
+                f"(degrade load>={self.degrade_load}, p95>={self.degrade_p95_seconds}s)"
+            )
+        else:
+            logger.info("품질 단계 사용 안 함: 항상 0단계(최고 품질)로 생성")
+
+    @property
+    def level(self) -> int:
+        """현재 품질 단계 (0: 최고 품질)"""
+        return self._level
+
+    def observe(self, seconds: float) -> None:
+        """사용자가 기다린 생성 1건의 지연 시간 기록 (결과 캐시 적중 제외)"""
+        self._latencies.append((time.monotonic(), seconds))
+
+    def select(self, in_flight: int) -> int:
+        """
+        부하를 반영해 단계를 갱신하고 새 생성에 사용할 단계 반환
+
+        부하 또는 p95가 degrade 기준 이상이면 한 단계 내리고, 부하와 p95가 모두 recover 기준
+        이하이면 한 단계 올립니다. 단계 변경 후 hold_seconds 동안은 바꾸지 않습니다.
+
+        Args:
+            in_flight: 진행 중인 생성 수 (이번 생성 제외)
+        """
+        self._last_load = in_flight / self.slots
+        if self.max_level == 0:
+            return self._level
+
+        now = time.monotonic()
+        if now - self._changed_at < self.hold_seconds:
+            return self._level
+
+        p95 = self.p95_seconds(now)
+        overloaded = self._last_load >= self.degrade_load or (
+            self.degrade_p95_seconds > 0 and p95 is not None and p95 >= self.degrade_p95_seconds
+        )
+        relaxed = self._last_load <= self.recover_load and (
+            p95 is None or p95 <= self.recover_p95_seconds
+        )
+
+        if overloaded and self._level < self.max_level:
+            self._change(self._level + 1, now, p95)
+        elif not overloaded and relaxed and self._level > 0:
+            self._change(self._level - 1, now, p95)
+        return self._level
+
+    def p95_seconds(self, now: Optional[float] = None) -> Optional[float]:
+        """현재 단계에서 최근 window_seconds 동안 끝난 생성의 p95 지연 시간 (없으면 None)"""
+        now = time.monotonic() if now is None else now
+        while self._latencies and now - self._latencies[0][0] > self.window_seconds:
+            self._latencies.popleft()
+        if not self._latencies:
+            return None
+        values = sorted(seconds for _, seconds in self._latencies)
+        return values[min(len(values) - 1, math.ceil(len(values) * 0.95) - 1)]
+
+    def get_status(self) -> dict:
+        """현재 단계, 마지막 부하, 최근 p95와 단계별 사용 횟수"""
+        p95 = self.p95_seconds()
+        return {
+            "enabled": self.enabled,
+            "level": self._level,
+            "max_level": self.max_level,
+            "load": round(self._last_load, 3),
+            "p95_seconds": round(p95, 4) if p95 is not None else None,
+            "changes": metrics.counter("quality_level_changes"),
+            "generations": {
+                level: metrics.counter(f"quality_level_used_{level}") for level in range(self.max_level + 1)
+            },
+        }
+
+    def _change(self, level: int, now: float, p95: Optional[float]) -> None:
+        """단계 변경 (이전 단계의 지연 시간은 새 단계 판단에 쓰지 않음)"""
+        p95_text = "-" if p95 is None else f"{p95:.2f}s"
+        logger.info(f"품질 단계 변경: {self._level} -> {level} (load={self._last_load:.2f}, p95={p95_text})")
+        self._level = level
+        self._changed_at = now
+        self._latencies.clear()
+        metrics.increment("quality_level_changes")
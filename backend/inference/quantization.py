@@ -0,0 +1,129 @@
+"""
+INT8 모델 양자화
+
+CPU 추론용으로 스와퍼/검출기 모델의 INT8 변형을 만듭니다.
+
+- dynamic: 가중치만 INT8로 변환 (보정 데이터 불필요, 첫 로드 시 자동 생성)
+- static: 가중치와 활성값을 INT8(QDQ)로 변환. 타겟 이미지로 실제 모델 입력을 기록하여
+  보정합니다 (scripts/quantize_models.py).
+
+양자화된 모델은 최적화 모델 캐시 디렉토리에 원본 모델 해시와 함께 저장되며,
+OptimizedModelCache가 FACEFUSION_MODEL_QUANTIZATION 설정에 따라 대신 로드합니다.
+"""
+
+import logging
+import os
+from collections import defaultdict
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional
+
+import numpy
+
+logger = logging.getLogger(__name__)
+
+QUANTIZATION_MODES = ("none", "dynamic", "static")
+
+
+def quantize_dynamic_model(model_path: str, output_path: Path) -> None:
+    """가중치 INT8 동적 양자화"""
+    from onnxruntime.quantization import QuantType, quantize_dynamic
+
+    temp_path = output_path.with_name(f".{output_path.name}.{os.getpid()}.tmp")
+    quantize_dynamic(model_path, str(temp_path), weight_type=QuantType.QInt8)
+    os.replace(temp_path, output_path)
+
+
+def quantize_static_model(
+    model_path: str,
+    output_path: Path,
+    calibration_feeds: List[Dict[str, numpy.ndarray]],
+) -> None:
+    """
+    가중치/활성값 INT8 정적 양자화 (QDQ, 채널별 가중치)
+
+    Args:
+        model_path: 원본 .onnx 경로
+        output_path: 양자화 모델 저장 경로
+        calibration_feeds: 보정용 모델 입력 목록 (FeedRecorder로 기록)
+
+    Raises:
+        ValueError: 보정 데이터가 없음
+    """
+    from onnxruntime.quantization import (
+        CalibrationDataReader,
+        QuantFormat,
+        QuantType,
+        quantize_static,
+    )
+
+    if not calibration_feeds:
+        raise ValueError(f"No calibration data recorded for {Path(model_path).stem}")
+
+    class _FeedReader(CalibrationDataReader):
+        def __init__(self, feeds: List[Dict[str, numpy.ndarray]]):
+            self._feeds = iter(feeds)
+
+        def get_next(self) -> Optional[Dict[str, numpy.ndarray]]:
+            return next(self._feeds, None)
+
+    temp_path = output_path.with_name(f".{output_path.name}.{os.getpid()}.tmp")
+    quantize_static(
+        model_path,
+        str(temp_path),
+        _FeedReader(calibration_feeds),
+        quant_format=QuantFormat.QDQ,
+        per_channel=True,
+        activation_type=QuantType.QUInt8,
+        weight_type=QuantType.QInt8,
+    )
+    os.replace(temp_path, output_path)
+
+
+class _RecordingSession:
+    """InferenceSession 입력을 기록하는 프록시"""
+
+    def __init__(self, session: Any, feeds: List[Dict[str, numpy.ndarray]], max_feeds: int):
+        self._session = session
+        self._feeds = feeds
+        self._max_feeds = max_feeds
+
+    def run(self, output_names: Any, input_feed: Dict[str, Any], *args: Any, **kwargs: Any) -> Any:
+        if len(self._feeds) < self._max_feeds:
+            self._feeds.append({name: numpy.array(value) for name, value in input_feed.items()})
+        return self._session.run(output_names, input_feed, *args, **kwargs)
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._session, name)
+
+
+class FeedRecorder:
+    """정적 양자화 보정을 위해 지정한 모델의 실제 입력을 기록"""
+
+    def __init__(self, model_names: Iterable[str], max_feeds: int = 128):
+        """
+        Args:
+            model_names: 기록할 모델 파일 이름 (.onnx 제외)
+            max_feeds: 모델당 최대 기록 수
+        """
+        self.model_names = set(model_names)
+        self.max_feeds = max_feeds
+        self.feeds: Dict[str, List[Dict[str, numpy.ndarray]]] = defaultdict(list)
+        self.model_paths: Dict[str, str] = {}
+
+    def install(self, inference_manager: Any) -> None:
+        """
+        facefusion 세션 생성 함수를 감싸 기록용 세션을 반환
+
+        모델 세션이 만들어지기 전에 (엔진 생성 직후) 호출해야 합니다.
+        """
+        original = inference_manager.create_inference_session
+
+        def create_inference_session(model_path: str, *args: Any):
+            session = original(model_path, *args)
+            model_name = Path(model_path).stem
+            if model_name not in self.model_names:
+                return session
+            self.model_paths[model_name] = model_path
+            return _RecordingSession(session, self.feeds[model_name], self.max_feeds)
+
+        inference_manager.create_inference_session = create_inference_session
@@ -0,0 +1,144 @@
+"""
+생성 결과 캐시
+
+같은 원본 사진과 같은 타겟으로 다시 생성하면(키오스크 재시도, 재생성) 전체 합성을
+다시 실행하는 대신 기존 출력 파일을 재사용합니다. 키는 (원본 내용 해시, 타겟 내용 해시,
+스와퍼 모델, 품질 단계, 관련 설정 지문)이며, 적중 시 새 출력 경로에 하드 링크(불가하면 복사)합니다.
+
+출력 파일이 삭제되거나 바뀌었으면 (예: 데이터 정리 스케줄러) 해당 항목은 무효입니다.
+생성 이미지가 저장소로 옮겨지면 relocate()로 항목 경로를 바꿉니다.
+캐시는 출력 파일 크기 합계(와 항목 수) 기준 LRU이며, 항목이 제거되어도 출력 파일은 삭제하지 않습니다.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import shutil
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Optional, Sequence, Tuple
+
+from backend.core.config import FaceFusionSettings
+from backend.core.metrics import metrics
+from backend.utils.lru_cache import LRUCache
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class CachedResult:
+    """캐시된 출력 파일 (수정 시각/크기로 변경 여부 확인)"""
+
+    output_path: str
+    mtime_ns: int
+    size: int
+
+
+def result_fingerprint(config: FaceFusionSettings) -> str:
+    """합성 결과에 영향을 주는 설정의 지문 (스와퍼 모델은 실행 중 바뀌므로 키에 따로 포함)"""
+    values = {
+        "execution_providers": config.execution_providers,
+        "processors": config.processors,
+        "model_quantization": config.model_quantization,
+        "quantization_models": config.quantization_models if config.model_quantization != "none" else [],
+    }
+    return hashlib.sha1(json.dumps(values, sort_keys=True).encode()).hexdigest()[:12]
+
+
+class ResultCache:
+    """(원본 해시, 타겟 해시, 스와퍼 모델, 품질 단계, 설정 지문) → 출력 파일 LRU 캐시"""
+
+    def __init__(self, max_bytes: int, fingerprint: str, max_entries: Optional[int] = None):
+        """
+        Args:
+            max_bytes: 캐시한 출력 파일의 최대 총 크기 (바이트)
+            fingerprint: 현재 설정 지문 (result_fingerprint)
+            max_entries: 최대 항목 수 (None이면 제한 없음)
+        """
+        self.fingerprint = fingerprint
+        self._entries: LRUCache[CachedResult] = LRUCache(
+            max_entries=max_entries,
+            max_weight=max_bytes,
+            weigher=lambda entry: entry.size,
+        )
+
+    def key(self, source_digest: str, target_digest: str, swapper_model: str, quality_level: int) -> tuple:
+        """캐시 키"""
+        return (source_digest, target_digest, swapper_model, quality_level, self.fingerprint)
+
+    def lookup(self, keys: Sequence[tuple]) -> Optional[Tuple[tuple, CachedResult]]:
+        """
+        후보 키를 순서대로 조회하여 처음 찾은 항목 반환 (적중/실패 카운터는 한 번 기록)
+
+        출력 파일이 없어졌거나 바뀌었으면 항목을 제거하고 다음 후보를 조회합니다.
+
+        Args:
+            keys: 후보 키 (먼저 조회할 키부터, 예: 높은 품질 단계부터)
+
+        Returns:
+            (찾은 키, 항목) 또는 None
+        """
+        found = None
+        for key in keys:
+            entry = self._entries.get(key)
+            if entry is None:
+                continue
+            if not self._is_valid(entry):
+                self._entries.pop(key)
+                continue
+            found = (key, entry)
+            break
+
+        metrics.increment("result_cache_hits" if found else "result_cache_misses")
+        return found
+
+    def store(self, key: tuple, output_path: str) -> None:
+        """생성된 출력 파일 등록"""
+        try:
+            stat = os.stat(output_path)
+        except OSError:
+            return
+        self._entries.put(key, CachedResult(output_path, stat.st_mtime_ns, stat.st_size))
+
+    def relocate(self, old_path: str, new_path: str) -> int:
+        """
+        출력 파일이 옮겨졌을 때 해당 항목이 새 경로를 가리키도록 변경 (예: 해시 이름 저장소로 이동)
+
+        Returns:
+            변경한 항목 수
+        """
+        moved = 0
+        for key, entry in self._entries.items():
+            if entry.output_path == old_path:
+                self.store(key, new_path)
+                moved += 1
+        return moved
+
+    def materialize(self, entry: CachedResult, output_path: str) -> None:
+        """캐시된 출력 파일을 새 출력 경로에 생성 (하드 링크, 불가하면 복사)"""
+        output_file = Path(output_path)
+        output_file.parent.mkdir(parents=True, exist_ok=True)
+        if output_file.exists():
+            output_file.unlink()
+        try:
+            os.link(entry.output_path, output_file)
+        except OSError:
+            shutil.copy2(entry.output_path, output_file)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def total_bytes(self) -> int:
+        """캐시한 출력 파일의 총 크기"""
+        return self._entries.total_weight
+
+    @staticmethod
+    def _is_valid(entry: CachedResult) -> bool:
+        """출력 파일이 등록 당시 그대로인지 확인"""
+        try:
+            stat = os.stat(entry.output_path)
+        except OSError:
+            return False
+        return stat.st_mtime_ns == entry.mtime_ns and stat.st_size == entry.size
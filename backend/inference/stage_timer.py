@@ -0,0 +1,52 @@
+"""
+파이프라인 단계별 소요 시간
+
+합성 1건이 어느 단계에서 시간을 쓰는지 기록합니다. 워커 프로세스에서 기록한 값은
+SwapResult.timings로 이벤트 루프에 전달되고, FaceFusionService가 이벤트 루프 쪽 단계
+(결과 캐시, 원본 분석 대기, 워커 대기)와 합쳐 stage_seconds.<단계> 히스토그램에 누적하고
+생성 결과(timings)에 포함합니다.
+
+워커 단계:
+- source_face: 원본 얼굴 조회 (캐시 미적중 시 분석 포함)
+- target_face: 타겟 분석 조회 (캐시 미적중 시 디코딩/얼굴 분석/정렬/마스크 포함)
+- face_analysis: 얼굴 검출 + 랜드마크 + 임베딩 (FaceFusion이 한 번에 실행, 위 두 단계 안에서 측정)
+- target_masks: 타겟 정렬 크롭과 교체 전 마스크 (target_face 안에서 측정)
+- swap: 스와퍼 모델 호출 (배치면 배치 전체 호출 시간)
+- paste: 교체 후 마스크 계산과 원본 프레임에 합성
+- encode: JPEG 인코딩 및 저장
+
+face_analysis, target_masks는 상위 단계와 겹치므로 단계 합계가 전체 시간보다 클 수 있습니다.
+"""
+
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator
+
+
+class StageTimer:
+    """단계별 소요 시간 누적 (같은 단계를 여러 번 측정하면 합산)"""
+
+    def __init__(self):
+        self.stages: Dict[str, float] = {}
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        """블록 실행 시간을 name 단계에 누적 (예외가 나도 기록)"""
+        start_time = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(name, time.perf_counter() - start_time)
+
+    def add(self, name: str, seconds: float) -> None:
+        """측정한 시간을 name 단계에 누적"""
+        self.stages[name] = self.stages.get(name, 0.0) + seconds
+
+    def merge(self, stages: Dict[str, float]) -> None:
+        """다른 곳에서 측정한 단계 시간 합치기 (예: 워커 결과)"""
+        for name, seconds in stages.items():
+            self.add(name, seconds)
+
+    def as_dict(self) -> Dict[str, float]:
+        """단계별 시간 (초, 밀리초 단위 반올림)"""
+        return {name: round(seconds, 4) for name, seconds in self.stages.items()}
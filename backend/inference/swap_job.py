@@ -0,0 +1,37 @@
+"""
+얼굴 합성 작업/결과 데이터 클래스
+
+워커 프로세스로 전달되므로 pickle 가능한 단순 값만 담습니다.
+"""
+
+from dataclasses import dataclass, field
+from typing import Dict, Optional
+
+
+@dataclass
+class SwapJob:
+    """얼굴 합성 작업"""
+
+    source_path: str
+    target_path: str
+    output_path: str
+    # 취소 확인용 키 (CancellationBoard, 0이면 취소 불가)
+    cancel_key: int = 0
+    # 작업 기한 (epoch 초, 지나면 워커가 단계 경계에서 중단)
+    deadline: Optional[float] = None
+    # 사용할 스와퍼 모델 (미리 로드된 모델 중 하나, None이면 FACEFUSION_FACE_SWAPPER_MODEL)
+    swapper_model: Optional[str] = None
+    # 품질 단계 (backend.inference.quality, 0이면 엔진 기본 설정)
+    quality_level: int = 0
+
+
+@dataclass
+class SwapResult:
+    """얼굴 합성 결과"""
+
+    output_path: str
+    elapsed: float
+    # 단계별 소요 시간 (초, backend.inference.stage_timer)
+    timings: Dict[str, float] = field(default_factory=dict)
+    # 작업의 스와퍼 모델을 여러 작업에 걸쳐 배치 실행할 수 있는지 (None이면 알 수 없음)
+    batch_supported: Optional[bool] = None
@@ -0,0 +1,211 @@
+"""
+타겟 이미지 분석 결과 캐시
+
+target_profile/target_talent 타겟 이미지는 고정된 소수의 카탈로그이므로,
+디코딩된 프레임, content analyser 판정, 교체할 얼굴(랜드마크 포함), 얼굴별 정렬 크롭과
+교체 전 마스크를 미리 계산해 둡니다 (서버 시작 시 또는 scripts/precompute_targets.py).
+
+캐시 키는 타겟 파일 내용 해시 + 분석 설정 지문이므로, 타겟 이미지나
+검출기/마스크 설정이 바뀌면 자동으로 다시 계산합니다.
+디스크(.npz, 모든 워커 공유) + 메모리(LRU, 워커별) 2단 캐시입니다.
+"""
+
+import json
+import logging
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set
+
+import numpy
+
+from backend.inference.face_cache import atomic_savez, pack_face, unpack_face
+from backend.inference.face_swap import TargetCrop
+from backend.utils.hashing import FileDigestCache
+from backend.utils.lru_cache import LRUCache
+
+logger = logging.getLogger(__name__)
+
+TARGET_ASSET_SUFFIX = ".npz"
+
+
+@dataclass
+class TargetAsset:
+    """타겟 이미지 분석 결과"""
+
+    digest: str
+    frame: numpy.ndarray
+    # 교체할 얼굴 (face_selector 설정으로 선택, 교체 순서)과 얼굴별 정렬 크롭/마스크
+    faces: List[Any]
+    crops: List[TargetCrop]
+    # content analyser(NSFW) 판정 (True이면 합성하지 않음)
+    content_flagged: bool = False
+
+    @property
+    def nbytes(self) -> int:
+        """메모리 사용량 (프레임/크롭/마스크 기준)"""
+        return self.frame.nbytes + sum(
+            crop.crop_frame.nbytes + sum(mask.nbytes for mask in crop.masks)
+            for crop in self.crops
+        )
+
+
+class TargetAssetCache:
+    """타겟 이미지 분석 결과 캐시 (메모리 LRU + 디스크 .npz)"""
+
+    def __init__(
+        self,
+        cache_dir: str,
+        build: Callable[[str, str], TargetAsset],
+        fingerprint: Callable[[], str],
+        face_type: Callable[[], type],
+        capacity: int,
+    ):
+        """
+        Args:
+            cache_dir: .npz 저장 디렉토리
+            build: (타겟 경로, 내용 해시) -> TargetAsset 분석 함수
+            fingerprint: 현재 분석 설정 지문을 반환하는 함수
+            face_type: Face namedtuple 클래스를 반환하는 함수
+            capacity: 메모리에 보관할 최대 타겟 수
+        """
+        self.cache_dir = Path(cache_dir).resolve()
+        self._build = build
+        self._fingerprint = fingerprint
+        self._face_type = face_type
+        self._memory: LRUCache[TargetAsset] = LRUCache(max_entries=capacity)
+        self._digests = FileDigestCache()
+
+    def cache_key(self, target_path: str) -> str:
+        """타겟 이미지의 캐시 키 (내용 해시 + 설정 지문)"""
+        return f"{self._digests.get(target_path)}_{self._fingerprint()}"
+
+    def cache_path(self, key: str) -> Path:
+        """캐시 키에 대응하는 .npz 경로"""
+        return self.cache_dir / f"{key}{TARGET_ASSET_SUFFIX}"
+
+    def get(self, target_path: str) -> TargetAsset:
+        """
+        타겟 이미지 분석 결과 반환 (없으면 분석 후 저장)
+
+        Raises:
+            RuntimeError: 타겟 이미지에서 얼굴을 찾지 못함
+        """
+        key = self.cache_key(target_path)
+
+        asset = self._memory.get(key)
+        if asset is not None:
+            return asset
+
+        asset = self._load(key)
+        if asset is None:
+            asset = self._build(target_path, key.split("_", 1)[0])
+            self._save(key, target_path, asset)
+
+        self._memory.put(key, asset)
+        return asset
+
+    def precompute(
+        self,
+        target_paths: Iterable[str],
+        keep: Optional[Set[str]] = None,
+        prune: bool = True,
+    ) -> Dict[str, int]:
+        """
+        타겟 이미지들을 미리 분석하여 디스크 캐시에 저장
+
+        이미 캐시된 타겟은 건너뛰고, 현재 카탈로그에 없는 오래된 캐시 파일은 삭제합니다.
+
+        Args:
+            target_paths: 타겟 이미지 경로 목록
+            keep: 유지할 캐시 파일 이름 (다른 설정 지문으로 먼저 계산한 파일, 이번 파일도 추가됨)
+            prune: keep에 없는 캐시 파일 삭제 여부
+
+        Returns:
+            통계 (built, cached, failed, pruned)
+        """
+        stats = {"built": 0, "cached": 0, "failed": 0, "pruned": 0}
+        keep = keep if keep is not None else set()
+
+        for target_path in target_paths:
+            try:
+                key = self.cache_key(target_path)
+                keep.add(self.cache_path(key).name)
+                if self.cache_path(key).exists():
+                    stats["cached"] += 1
+                    continue
+
+                start_time = time.time()
+                asset = self._build(target_path, key.split("_", 1)[0])
+                self._save(key, target_path, asset)
+                stats["built"] += 1
+                logger.info(f"타겟 분석 캐시 생성 ({time.time() - start_time:.2f}s): {target_path}")
+            except Exception as e:
+                stats["failed"] += 1
+                logger.warning(f"⚠️ 타겟 분석 실패 ({target_path}): {e}")
+
+        # 실패한 타겟이 있으면 판단이 불완전하므로 정리하지 않음
+        if prune and stats["failed"] == 0 and self.cache_dir.exists():
+            for path in self.cache_dir.glob(f"*{TARGET_ASSET_SUFFIX}"):
+                if path.name not in keep:
+                    path.unlink(missing_ok=True)
+                    stats["pruned"] += 1
+
+        return stats
+
+    def _load(self, key: str) -> Optional[TargetAsset]:
+        """디스크 캐시 로드 (없거나 손상되었으면 None)"""
+        path = self.cache_path(key)
+        if not path.exists():
+            return None
+
+        try:
+            face_type = self._face_type()
+            with numpy.load(path, allow_pickle=False) as data:
+                manifest = json.loads(str(data["manifest"]))
+                faces = [unpack_face(face_type, face, data) for face in manifest["faces"]]
+                crops = [
+                    TargetCrop(
+                        crop_frame=numpy.array(data[f"crop_frame{i}"]),
+                        affine_matrix=numpy.array(data[f"affine_matrix{i}"]),
+                        masks=[numpy.array(data[f"mask{i}_{j}"]) for j in range(mask_count)],
+                    )
+                    for i, mask_count in enumerate(manifest["mask_counts"])
+                ]
+                return TargetAsset(
+                    digest=manifest["digest"],
+                    frame=numpy.array(data["frame"]),
+                    faces=faces,
+                    crops=crops,
+                    content_flagged=manifest["content_flagged"],
+                )
+        except Exception as e:
+            logger.warning(f"⚠️ 타겟 분석 캐시 로드 실패, 다시 분석합니다 ({path}): {e}")
+            return None
+
+    def _save(self, key: str, target_path: str, asset: TargetAsset) -> None:
+        """디스크 캐시 저장 (실패해도 합성은 계속 진행)"""
+        path = self.cache_path(key)
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            arrays: Dict[str, numpy.ndarray] = {}
+            manifest = {
+                "target_path": target_path,
+                "digest": asset.digest,
+                "faces": [pack_face(face, arrays) for face in asset.faces],
+                "mask_counts": [len(crop.masks) for crop in asset.crops],
+                "content_flagged": asset.content_flagged,
+            }
+            for i, crop in enumerate(asset.crops):
+                arrays[f"crop_frame{i}"] = crop.crop_frame
+                arrays[f"affine_matrix{i}"] = crop.affine_matrix
+                for j, mask in enumerate(crop.masks):
+                    arrays[f"mask{i}_{j}"] = mask
+            atomic_savez(
+                path,
+                manifest=numpy.array(json.dumps(manifest)),
+                frame=asset.frame,
+                **arrays,
+            )
+        except Exception as e:
+            logger.warning(f"⚠️ 타겟 분석 캐시 저장 실패 ({path}): {e}")
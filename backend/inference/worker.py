@@ -0,0 +1,101 @@
+"""
+추론 워커 진입점
+
+InferenceExecutor가 워커(프로세스 또는 스레드)에서 호출하는 모듈 수준 함수입니다.
+프로세스 백엔드에서는 spawn된 각 워커 프로세스가 init_worker()로 자신만의
+FaceFusionEngine을 생성하므로 state_manager가 워커 간에 공유되지 않습니다.
+mock 모드에서는 같은 인터페이스의 MockFaceFusionEngine을 사용합니다.
+"""
+
+import os
+import logging
+from dataclasses import replace
+from pathlib import Path
+from typing import Dict, List, Optional, Union
+
+from backend.core.config import FaceFusionSettings
+from backend.inference.cancellation import CancellationBoard
+from backend.inference.engine import FaceFusionEngine
+from backend.inference.mock_engine import MockFaceFusionEngine
+from backend.inference.swap_job import SwapJob, SwapResult
+
+logger = logging.getLogger(__name__)
+
+# 워커 전역 엔진 (프로세스당 1개)
+_engine: Optional[Union[FaceFusionEngine, MockFaceFusionEngine]] = None
+
+
+def init_worker(
+    config: FaceFusionSettings,
+    configure_logging: bool = True,
+    cancellation: Optional[CancellationBoard] = None,
+) -> None:
+    """
+    워커 초기화 (ProcessPoolExecutor initializer)
+
+    Args:
+        config: FaceFusion 설정
+        configure_logging: spawn된 프로세스의 로깅 설정 여부
+        cancellation: 이벤트 루프와 공유하는 작업 취소 기록
+    """
+    global _engine
+
+    if configure_logging:
+        logging.basicConfig(
+            level=logging.INFO,
+            format="%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+        )
+
+    if _engine is None:
+        logger.info(f"추론 워커 초기화 (pid={os.getpid()}, mode={config.mode})")
+        _engine = create_engine(config, cancellation)
+
+
+def create_engine(
+    config: FaceFusionSettings,
+    cancellation: Optional[CancellationBoard] = None,
+) -> Union[FaceFusionEngine, MockFaceFusionEngine]:
+    """설정 모드에 맞는 추론 엔진 생성 (mock: 모의 엔진, real: FaceFusion)"""
+    if config.mode == "mock":
+        return MockFaceFusionEngine(config, cancellation)
+    return FaceFusionEngine(config, cancellation)
+
+
+def _get_engine() -> Union[FaceFusionEngine, MockFaceFusionEngine]:
+    """현재 워커의 엔진 반환"""
+    if _engine is None:
+        raise RuntimeError("Inference worker is not initialized")
+    return _engine
+
+
+def run_swap_job(job: SwapJob) -> SwapResult:
+    """얼굴 합성 작업 실행"""
+    return _get_engine().process(job)
+
+
+def run_swap_batch(jobs: List[SwapJob]) -> List[Union[SwapResult, RuntimeError]]:
+    """얼굴 합성 작업 묶음 실행 (작업별 결과 또는 실패 예외)"""
+    return _get_engine().process_batch(jobs)
+
+
+def analyse_source(source_path: str, quality_level: int = 0) -> dict:
+    """원본 이미지 얼굴 분석 (결과는 업로드 파일 옆 캐시에 저장되어 모든 워커가 공유)"""
+    return _get_engine().analyse_source(source_path, quality_level)
+
+
+def check_face(source_path: str) -> dict:
+    """업로드 얼굴 확인용 빠른 검출 (측정값만 반환, 판정은 이벤트 루프에서)"""
+    return _get_engine().check_face(source_path)
+
+
+def precompute_targets(target_paths: List[str]) -> Dict[str, int]:
+    """타겟 이미지 분석 결과 미리 계산 (디스크 캐시는 모든 워커가 공유)"""
+    return _get_engine().precompute_targets(target_paths)
+
+
+def warmup_worker(job: SwapJob) -> SwapResult:
+    """워커 워밍업 (이미 워밍업된 워커는 즉시 반환)"""
+    # 여러 워커가 동시에 워밍업하므로 출력 파일명을 워커별로 구분
+    output_file = Path(job.output_path)
+    worker_output = output_file.with_name(f"{output_file.stem}_{os.getpid()}{output_file.suffix}")
+    return _get_engine().warmup(replace(job, output_path=str(worker_output)))
@@ -4,14 +4,16 @@
 리팩토링된 Clean Architecture 기반 FastAPI 애플리케이션
 """
 
+import asyncio
 import logging
-from fastapi import FastAPI
+from fastapi import Depends, FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.staticfiles import StaticFiles
 from fastapi.exceptions import RequestValidationError
+from fastapi.responses import JSONResponse
 from sqlalchemy.exc import SQLAlchemyError
 
 from backend.core.config import settings
+from backend.core.dependencies import get_readiness_service
 from backend.database import init_db
 from backend.middleware.error_handler import (
     app_exception_handler,
@@ -21,7 +23,10 @@ from backend.middleware.error_handler import (
 )
 from backend.exceptions import AppException
 from backend.api.v1 import api_router
+from backend.api import images
 from backend.scheduler import run_cleanup_on_startup, run_daily_cleanup
+from backend.facefusion_service import get_facefusion_service
+from backend.services.job_service import get_job_manager
 
 # 로깅 설정
 logging.basicConfig(
@@ -53,8 +58,8 @@ app.add_exception_handler(RequestValidationError, validation_exception_handler)
 app.add_exception_handler(SQLAlchemyError, database_exception_handler)
 app.add_exception_handler(Exception, general_exception_handler)
 
-# 정적 파일 서빙 (생성된 이미지)
-app.mount("/images", StaticFiles(directory=settings.storage.output_dir), name="images")
+# 생성된 이미지 서빙 (immutable 캐시 헤더, ETag/Range, 메모리 캐시)
+app.include_router(images.router)
 
 # API 라우터 등록
 app.include_router(api_router, prefix=settings.api_prefix)
@@ -82,6 +87,78 @@ async def health_check():
     }
 
 
+@app.get("/ready")
+async def readiness_check(readiness=Depends(get_readiness_service)):
+    """
+    준비 상태 확인
+
+    추론 엔진 상태(cold/warming/ready/degraded), 진행 중인 생성 수, 최근 추론 지연 시간
+    (p50/p95), DB 연결, output_dir 여유 공간을 보고합니다.
+    생성 요청을 받을 수 있으면 200, 아니면 503을 반환합니다.
+    """
+    report = await readiness.check()
+    return JSONResponse(
+        status_code=200 if report["ready"] else 503,
+        content={
+            "status": "ready" if report["ready"] else "not_ready",
+            "version": settings.app_version,
+            **report,
+        },
+    )
+
+
+async def _resolve_warmup_image():
+    """워밍업에 사용할 얼굴 이미지 경로 (설정값 우선, 없으면 첫 번째 프로필 타겟)"""
+    from backend.database import AsyncSessionLocal
+    from backend.repositories.profile_repo import ProfileRepository
+    from backend.utils.file_handler import FileHandler
+
+    if settings.facefusion.warmup_image_path:
+        return settings.facefusion.warmup_image_path
+
+    async with AsyncSessionLocal() as session:
+        profiles = await ProfileRepository(session).get_all_profiles()
+
+    if not profiles:
+        return None
+    return FileHandler().get_absolute_path(profiles[0].target_image_path)
+
+
+async def _resolve_target_images():
+    """모든 프로필/장기자랑 타겟 이미지 절대 경로 (중복 제거)"""
+    from backend.database import AsyncSessionLocal
+    from backend.repositories.profile_repo import ProfileRepository
+    from backend.repositories.talent_repo import TalentRepository
+    from backend.utils.file_handler import FileHandler
+
+    async with AsyncSessionLocal() as session:
+        profiles = await ProfileRepository(session).get_all_profiles()
+        talents = await TalentRepository(session).get_all_talents()
+
+    file_handler = FileHandler()
+    paths = [file_handler.get_absolute_path(t.target_image_path) for t in [*profiles, *talents]]
+    return list(dict.fromkeys(paths))
+
+
+async def _prepare_inference():
+    """FaceFusion 엔진 생성 및 워밍업 (프로세스당 1회), 타겟 분석 결과 미리 계산"""
+    facefusion = get_facefusion_service()
+    if settings.facefusion.warmup_enabled:
+        try:
+            sample_image_path = await _resolve_warmup_image()
+        except Exception as e:
+            logger.warning(f"⚠️ 워밍업용 샘플 이미지를 찾지 못했습니다: {e}")
+            sample_image_path = None
+        await facefusion.warmup(sample_image_path)
+
+    # 타겟 이미지 분석 결과 미리 계산 (타겟이 바뀐 경우에만 다시 계산)
+    if settings.facefusion.target_precompute_enabled:
+        try:
+            await facefusion.precompute_targets(await _resolve_target_images())
+        except Exception as e:
+            logger.warning(f"⚠️ 타겟 분석 캐시 준비 실패 (요청 시 계산합니다): {e}")
+
+
 # 시작/종료 이벤트
 @app.on_event("startup")
 async def startup_event():
@@ -96,13 +173,19 @@ async def startup_event():
     await init_db()
     logger.info("Database initialized successfully")
 
+    # FaceFusion 엔진 워밍업과 타겟 분석은 백그라운드에서 진행
+    # (진행 상황은 /ready의 engine.state로 확인, 준비 전 요청은 첫 추론에서 모델 로드)
+    asyncio.create_task(_prepare_inference())
+
+    # 비동기 이미지 생성 작업 워커 시작
+    get_job_manager().start()
+
     # 스케줄러가 활성화된 경우에만 실행
     if settings.scheduler.enabled:
         # 초기 데이터 정리
         await run_cleanup_on_startup()
 
         # 일일 정리 스케줄러를 백그라운드 태스크로 시작
-        import asyncio
         asyncio.create_task(run_daily_cleanup())
     else:
         logger.info("⏸️  데이터 정리 스케줄러가 비활성화되어 있습니다.")
@@ -114,6 +197,8 @@ async def startup_event():
 async def shutdown_event():
     """애플리케이션 종료 시 실행"""
     logger.info("Shutting down application...")
+    await get_job_manager().stop()
+    get_facefusion_service().shutdown()
 
 
 # 개발 서버 실행
@@ -0,0 +1,38 @@
+"""Add StoredFile table
+
+Revision ID: 3b9e1d4c7a20
+Revises: 7c23eac95081
+Create Date: 2026-10-17 10:12:41.503217
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3b9e1d4c7a20'
+down_revision: Union[str, Sequence[str], None] = '7c23eac95081'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('stored_file',
+    sa.Column('store', sa.String(length=20), nullable=False, comment="'upload'(원본 사진) 또는 'output'(생성 이미지) 저장소"),
+    sa.Column('digest', sa.String(length=64), nullable=False, comment='파일 내용의 SHA-256 (16진수, 파일명)'),
+    sa.Column('extension', sa.String(length=10), nullable=False, comment='파일 확장자 (소문자)'),
+    sa.Column('size_bytes', sa.Integer(), nullable=False, comment='파일 크기 (바이트)'),
+    sa.Column('ref_count', sa.Integer(), nullable=False, comment='파일을 가리키는 경로 수 (0이면 삭제 대상)'),
+    sa.Column('created_at', sa.DateTime(), nullable=False, comment='처음 저장한 시각'),
+    sa.PrimaryKeyConstraint('store', 'digest')
+    )
+    op.create_index(op.f('ix_stored_file_ref_count'), 'stored_file', ['ref_count'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_stored_file_ref_count'), table_name='stored_file')
+    op.drop_table('stored_file')
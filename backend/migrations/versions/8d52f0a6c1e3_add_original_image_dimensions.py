@@ -0,0 +1,31 @@
+"""Add original image dimensions to Participation
+
+Revision ID: 8d52f0a6c1e3
+Revises: 3b9e1d4c7a20
+Create Date: 2026-10-17 14:36:08.911752
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8d52f0a6c1e3'
+down_revision: Union[str, Sequence[str], None] = '3b9e1d4c7a20'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('participation', sa.Column('original_image_width', sa.Integer(), nullable=True, comment='원본 사진 너비 (px, EXIF 방향 적용 후)'))
+    op.add_column('participation', sa.Column('original_image_height', sa.Integer(), nullable=True, comment='원본 사진 높이 (px, EXIF 방향 적용 후)'))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table('participation') as batch_op:
+        batch_op.drop_column('original_image_height')
+        batch_op.drop_column('original_image_width')
@@ -1,17 +1,19 @@
 """
 데이터베이스 모델 패키지
 
-DBML 설계에 따른 5개 테이블:
+DBML 설계에 따른 6개 테이블:
 - Participation: 사용자 체험 세션 (10일 후 삭제)
 - TargetProfile: 프로필 타겟 정보
 - TargetTalent: 장기자랑 타겟 정보
 - PrintLog: 인쇄 기록
 - ParticipationHistory: 참여 이력 (영구 보관)
+- StoredFile: 해시 이름 저장소 파일과 참조 수
 """
 
 from .participation import Participation
 from .participation_history import ParticipationHistory
 from .print_log import PrintLog
+from .stored_file import StoredFile
 from .target_profile import TargetProfile
 from .target_talent import TargetTalent
 
@@ -21,4 +23,5 @@ __all__ = [
     "TargetTalent",
     "PrintLog",
     "ParticipationHistory",
+    "StoredFile",
 ]
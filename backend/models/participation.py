@@ -32,7 +32,13 @@ class Participation(Base):
 
     # 원본 이미지
     original_image_path = Column(
-        String(512), nullable=True, comment="키오스크에서 촬영한 원본 사진 경로"
+        String(512), nullable=True, comment="키오스크에서 촬영한 원본 사진 경로 (업로드 시 정규화된 JPEG)"
+    )
+    original_image_width = Column(
+        Integer, nullable=True, comment="원본 사진 너비 (px, EXIF 방향 적용 후)"
+    )
+    original_image_height = Column(
+        Integer, nullable=True, comment="원본 사진 높이 (px, EXIF 방향 적용 후)"
     )
 
     # 선택된 타겟 (Foreign Keys)
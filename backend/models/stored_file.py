@@ -0,0 +1,45 @@
+"""
+저장 파일 모델
+
+해시 이름 저장소(backend.utils.content_store)에 저장된 파일의 참조 수를 저장합니다.
+"""
+
+from datetime import datetime
+
+from sqlalchemy import Column, DateTime, Integer, String
+
+from backend.database import Base
+
+
+class StoredFile(Base):
+    """
+    저장 파일 테이블
+
+    같은 내용의 파일은 저장소마다 한 번만 저장하고, 파일을 가리키는 참여 세션 경로 수를
+    ref_count로 추적합니다. ref_count가 0이 된 파일은 데이터 정리 스케줄러가 삭제합니다.
+    """
+
+    __tablename__ = "stored_file"
+
+    # 저장소 ('upload' 또는 'output')
+    store = Column(
+        String(20), primary_key=True, comment="'upload'(원본 사진) 또는 'output'(생성 이미지) 저장소"
+    )
+
+    # 파일 내용 해시 (파일명)
+    digest = Column(String(64), primary_key=True, comment="파일 내용의 SHA-256 (16진수, 파일명)")
+
+    extension = Column(String(10), nullable=False, comment="파일 확장자 (소문자)")
+    size_bytes = Column(Integer, nullable=False, comment="파일 크기 (바이트)")
+
+    # 참조 수
+    ref_count = Column(
+        Integer, default=0, nullable=False, index=True, comment="파일을 가리키는 경로 수 (0이면 삭제 대상)"
+    )
+
+    created_at = Column(
+        DateTime, default=datetime.utcnow, nullable=False, comment="처음 저장한 시각"
+    )
+
+    def __repr__(self) -> str:
+        return f"<StoredFile(store='{self.store}', digest='{self.digest[:12]}', refs={self.ref_count})>"
@@ -8,6 +8,7 @@ from .participation_history_repo import ParticipationHistoryRepository
 from .participation_repo import ParticipationRepository
 from .print_log_repo import PrintLogRepository
 from .profile_repo import ProfileRepository
+from .stored_file_repo import StoredFileRepository
 from .talent_repo import TalentRepository
 
 __all__ = [
@@ -16,4 +17,5 @@ __all__ = [
     "TalentRepository",
     "PrintLogRepository",
     "ParticipationHistoryRepository",
+    "StoredFileRepository",
 ]
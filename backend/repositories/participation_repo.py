@@ -47,6 +47,22 @@ class ParticipationRepository(BaseRepository[Participation]):
         result = await self.db.execute(query)
         return result.scalar_one_or_none()
 
+    async def get_original_image_path(self, participation_id: int) -> Optional[str]:
+        """
+        현재 원본 이미지 경로 조회 (세션에 로드된 객체와 무관하게 DB 값을 읽음)
+
+        Args:
+            participation_id: 참여 ID
+
+        Returns:
+            원본 이미지 경로 또는 None
+        """
+        query = select(Participation.original_image_path).where(
+            Participation.participation_id == participation_id
+        )
+        result = await self.db.execute(query)
+        return result.scalar_one_or_none()
+
     async def get_by_uuid(
         self, uuid: str, load_relations: bool = False
     ) -> Optional[Participation]:
@@ -0,0 +1,141 @@
+"""
+저장 파일 Repository
+
+StoredFile 모델에 대한 데이터 접근 로직 (참조 수 증감은 한 번의 UPDATE로 처리)
+"""
+
+from typing import List, Optional
+
+from sqlalchemy import delete, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from backend.models.stored_file import StoredFile
+from backend.repositories.base import BaseRepository
+
+
+class StoredFileRepository(BaseRepository[StoredFile]):
+    """저장 파일 Repository"""
+
+    def __init__(self, db: AsyncSession):
+        super().__init__(StoredFile, db)
+
+    async def get(self, store: str, digest: str) -> Optional[StoredFile]:
+        """
+        저장소와 해시로 조회
+
+        Args:
+            store: 'upload' 또는 'output'
+            digest: 파일 내용 해시
+
+        Returns:
+            StoredFile 또는 None
+        """
+        return await self.db.get(StoredFile, (store, digest))
+
+    async def add_reference(
+        self, store: str, digest: str, extension: str, size_bytes: int
+    ) -> int:
+        """
+        참조 수 1 증가 (처음 저장하는 파일이면 레코드 생성)
+
+        Args:
+            store: 'upload' 또는 'output'
+            digest: 파일 내용 해시
+            extension: 파일 확장자
+            size_bytes: 파일 크기
+
+        Returns:
+            증가한 뒤의 참조 수
+        """
+        if await self._increment(store, digest):
+            return (await self._ref_count(store, digest)) or 0
+
+        try:
+            # 다른 세션이 먼저 만들었으면 savepoint만 되돌리고 증가
+            async with self.db.begin_nested():
+                self.db.add(StoredFile(
+                    store=store,
+                    digest=digest,
+                    extension=extension,
+                    size_bytes=size_bytes,
+                    ref_count=1,
+                ))
+            return 1
+        except IntegrityError:
+            await self._increment(store, digest)
+            return (await self._ref_count(store, digest)) or 0
+
+    async def release(self, store: str, digest: str) -> Optional[int]:
+        """
+        참조 수 1 감소 (0 미만으로는 내려가지 않음, 레코드와 파일은 삭제하지 않음)
+
+        Args:
+            store: 'upload' 또는 'output'
+            digest: 파일 내용 해시
+
+        Returns:
+            감소한 뒤의 참조 수 (레코드가 없으면 None)
+        """
+        await self.db.execute(
+            update(StoredFile)
+            .where(
+                StoredFile.store == store,
+                StoredFile.digest == digest,
+                StoredFile.ref_count > 0,
+            )
+            .values(ref_count=StoredFile.ref_count - 1)
+        )
+        return await self._ref_count(store, digest)
+
+    async def get_unreferenced(self, limit: int = 1000) -> List[StoredFile]:
+        """
+        참조 수가 0인 파일 조회 (오래된 순)
+
+        Args:
+            limit: 가져올 최대 개수
+
+        Returns:
+            StoredFile 리스트
+        """
+        result = await self.db.execute(
+            select(StoredFile)
+            .where(StoredFile.ref_count <= 0)
+            .order_by(StoredFile.created_at)
+            .limit(limit)
+        )
+        return list(result.scalars().all())
+
+    async def delete_if_unreferenced(self, store: str, digest: str) -> bool:
+        """
+        참조 수가 여전히 0이면 레코드 삭제
+
+        Returns:
+            삭제했는지 (그 사이 다시 참조되었으면 False)
+        """
+        result = await self.db.execute(
+            delete(StoredFile).where(
+                StoredFile.store == store,
+                StoredFile.digest == digest,
+                StoredFile.ref_count <= 0,
+            )
+        )
+        return result.rowcount > 0
+
+    async def _increment(self, store: str, digest: str) -> bool:
+        """참조 수 1 증가 (레코드가 있었는지 반환)"""
+        result = await self.db.execute(
+            update(StoredFile)
+            .where(StoredFile.store == store, StoredFile.digest == digest)
+            .values(ref_count=StoredFile.ref_count + 1)
+        )
+        return result.rowcount > 0
+
+    async def _ref_count(self, store: str, digest: str) -> Optional[int]:
+        """현재 참조 수 (레코드가 없으면 None)"""
+        result = await self.db.execute(
+            select(StoredFile.ref_count).where(
+                StoredFile.store == store, StoredFile.digest == digest
+            )
+        )
+        return result.scalar_one_or_none()
@@ -1,7 +1,8 @@
 """
 백그라운드 스케줄러
 
-10일이 지난 Participation 데이터를 자동으로 삭제합니다.
+10일이 지난 Participation 데이터를 자동으로 삭제하고,
+더 이상 참조되지 않는 원본/생성 이미지 파일을 정리합니다.
 """
 
 import asyncio
@@ -13,6 +14,7 @@ from sqlalchemy import delete, select
 from backend.core.config import settings
 from backend.database import AsyncSessionLocal
 from backend.models.participation import Participation
+from backend.services.storage_service import StorageService
 
 logger = logging.getLogger(__name__)
 
@@ -22,6 +24,7 @@ async def cleanup_old_participations():
     10일이 지난 Participation 데이터 삭제
 
     개인정보 보호를 위해 10일 이상 된 참여 데이터를 삭제합니다.
+    삭제하는 세션의 원본/생성 이미지 참조를 해제하고, 참조가 없어진 파일을 삭제합니다.
     ParticipationHistory는 유지되므로 통계 분석은 계속 가능합니다.
     """
     if not settings.scheduler.enabled:
@@ -39,20 +42,33 @@ async def cleanup_old_participations():
             )
             old_participations = list(result.scalars().all())
 
+            storage = StorageService(session)
             if not old_participations:
                 logger.info("삭제할 오래된 참여 데이터가 없습니다.")
-                return
-
-            # 삭제 실행
-            deleted_count = len(old_participations)
-            await session.execute(
-                delete(Participation).where(Participation.created_at < cutoff_date)
-            )
-            await session.commit()
-
+            else:
+                # 이미지 참조 해제
+                for participation in old_participations:
+                    await storage.release(participation.original_image_path)
+                    await storage.release(participation.generated_profile_image_path)
+                    await storage.release(participation.generated_talent_image_path)
+
+                # 삭제 실행
+                deleted_count = len(old_participations)
+                await session.execute(
+                    delete(Participation).where(Participation.created_at < cutoff_date)
+                )
+                await session.commit()
+
+                logger.info(
+                    f"✅ {deleted_count}개의 10일 이상 된 참여 데이터가 삭제되었습니다. "
+                    f"(기준일: {cutoff_date.strftime('%Y-%m-%d')})"
+                )
+
+            # 참조가 없는 파일 삭제 (재업로드/재생성으로 교체된 이미지 포함)
+            removed = await storage.collect_garbage()
             logger.info(
-                f"✅ {deleted_count}개의 10일 이상 된 참여 데이터가 삭제되었습니다. "
-                f"(기준일: {cutoff_date.strftime('%Y-%m-%d')})"
+                f"🧹 저장 파일 정리: {removed['files']}개 ({removed['bytes']} bytes), "
+                f"임시 파일 {removed['staging']}개 삭제"
             )
 
     except Exception as e:
@@ -41,6 +41,8 @@ class ParticipationResponse(BaseModel):
     consent_agreed: bool = Field(..., description="동의 여부")
     gender: str = Field(..., description="사용자 성별")
     original_image_path: str = Field(..., description="원본 이미지 경로")
+    original_image_width: Optional[int] = Field(None, description="원본 이미지 너비 (px)")
+    original_image_height: Optional[int] = Field(None, description="원본 이미지 높이 (px)")
     selected_profile_id: Optional[int] = Field(None, description="선택된 프로필 ID")
     selected_talent_id: Optional[int] = Field(None, description="선택된 장기자랑 ID")
     generated_profile_image_path: Optional[str] = Field(
@@ -0,0 +1,193 @@
+"""
+INT8 양자화 벤치마크 스크립트
+
+양자화 방식(none, dynamic, static)별로 별도 프로세스에서 엔진을 띄워 모든 타겟 이미지에
+같은 원본 얼굴을 합성하고, 지연 시간과 FP32(none) 결과 대비 유사도(PSNR, SSIM)를
+비교합니다. 행사별로 속도/품질 절충을 고를 때 사용합니다.
+양자화 모델을 사용하지 못해 FP32로 실행된 방식(보정 전 static 등)은 표에서 제외하고
+종료 코드 1로 끝납니다.
+
+사용 예:
+    python backend/scripts/benchmark_quantization.py --source face.jpg --repeats 5
+"""
+
+import argparse
+import asyncio
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context
+from pathlib import Path
+from typing import Dict, List
+
+import cv2
+import numpy
+
+# 프로젝트 루트를 sys.path에 추가
+project_root = Path(__file__).resolve().parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from backend.core.config import settings
+from backend.inference.swap_job import SwapJob
+from backend.scripts.precompute_targets import collect_target_paths
+
+
+def run_mode(mode: str, source_path: str, target_paths: List[str], work_dir: str, repeats: int) -> Dict:
+    """
+    양자화 방식 하나로 모든 타겟 합성 (새 프로세스에서 실행)
+
+    원본/타겟 분석 캐시를 방식별 디렉토리에 따로 두어 서로 영향을 주지 않습니다.
+    """
+    from backend.inference.engine import FaceFusionEngine
+
+    mode_dir = Path(work_dir) / mode
+    mode_dir.mkdir(parents=True, exist_ok=True)
+    source_copy = mode_dir / f"source{Path(source_path).suffix}"
+    shutil.copy2(source_path, source_copy)
+
+    config = settings.facefusion.model_copy(update={
+        "model_quantization": mode,
+        "target_asset_cache_dir": str(mode_dir / "assets"),
+    })
+
+    start_time = time.time()
+    engine = FaceFusionEngine(config)
+    startup_seconds = time.time() - start_time
+
+    cold: List[float] = []
+    warm: List[float] = []
+    outputs: List[str] = []
+    for index, target_path in enumerate(target_paths):
+        output_path = str(mode_dir / f"output_{index}.jpg")
+        job = SwapJob(source_path=str(source_copy), target_path=target_path, output_path=output_path)
+
+        # 첫 실행: 모델 로드/타겟 분석 포함
+        job_start = time.time()
+        engine.process(job)
+        cold.append(time.time() - job_start)
+        outputs.append(output_path)
+
+        for _ in range(repeats):
+            job_start = time.time()
+            engine.process(job)
+            warm.append(time.time() - job_start)
+
+    return {
+        "mode": mode,
+        "startup_seconds": startup_seconds,
+        "cold": cold,
+        "warm": warm,
+        "outputs": outputs,
+        # INT8 변형 대신 FP32로 로드한 모델 (이 방식의 결과는 FP32와 같음)
+        "fp32_fallbacks": sorted(set(engine.model_cache.fp32_fallbacks)) if engine.model_cache else [],
+    }
+
+
+def psnr(reference: numpy.ndarray, image: numpy.ndarray) -> float:
+    """PSNR (dB, 동일 이미지는 OpenCV 상한값 361)"""
+    return float(cv2.PSNR(reference, image))
+
+
+def ssim(reference: numpy.ndarray, image: numpy.ndarray) -> float:
+    """그레이스케일 SSIM (가우시안 윈도우)"""
+    c1, c2 = (0.01 * 255) ** 2, (0.03 * 255) ** 2
+    x = cv2.cvtColor(reference, cv2.COLOR_BGR2GRAY).astype(numpy.float64)
+    y = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY).astype(numpy.float64)
+
+    def blur(value: numpy.ndarray) -> numpy.ndarray:
+        return cv2.GaussianBlur(value, (11, 11), 1.5)
+
+    mu_x, mu_y = blur(x), blur(y)
+    sigma_x = blur(x * x) - mu_x ** 2
+    sigma_y = blur(y * y) - mu_y ** 2
+    sigma_xy = blur(x * y) - mu_x * mu_y
+    ssim_map = ((2 * mu_x * mu_y + c1) * (2 * sigma_xy + c2)) / (
+        (mu_x ** 2 + mu_y ** 2 + c1) * (sigma_x + sigma_y + c2)
+    )
+    return float(ssim_map.mean())
+
+
+def percentile(values: List[float], ratio: float) -> float:
+    """백분위수 (최근접 순위)"""
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(ratio * (len(ordered) - 1))))]
+
+
+def main():
+    """메인 실행 함수"""
+    parser = argparse.ArgumentParser(description="Benchmark INT8 quantized FaceFusion models")
+    parser.add_argument("--source", help="Source face image (defaults to the first target image)")
+    parser.add_argument("--modes", default="none,dynamic,static", help="Comma separated quantization modes")
+    parser.add_argument("--repeats", type=int, default=3, help="Timed runs per target after the first run")
+    parser.add_argument("--keep", action="store_true", help="Keep generated images")
+    args = parser.parse_args()
+
+    modes = [mode.strip() for mode in args.modes.split(",") if mode.strip()]
+    if "none" not in modes:
+        modes.insert(0, "none")
+
+    target_paths = asyncio.run(collect_target_paths())
+    if not target_paths:
+        print("❌ 타겟 이미지가 없습니다 (seed_data.py 실행 필요)")
+        sys.exit(1)
+    source_path = args.source or target_paths[0]
+
+    work_dir = tempfile.mkdtemp(prefix="quantization_benchmark_")
+    results: Dict[str, Dict] = {}
+    try:
+        for mode in modes:
+            print(f"▶ {mode} 실행 중... (타겟 {len(target_paths)}개 x {1 + args.repeats}회)")
+            # 모델/state가 프로세스 전역이므로 방식마다 새 프로세스에서 실행
+            with ProcessPoolExecutor(max_workers=1, mp_context=get_context("spawn")) as pool:
+                results[mode] = pool.submit(
+                    run_mode, mode, source_path, target_paths, work_dir, args.repeats
+                ).result()
+
+        reference = [cv2.imread(path) for path in results["none"]["outputs"]]
+
+        print("\n" + "=" * 86)
+        print(
+            f"{'mode':<9} {'startup':>9} {'first':>9} {'p50':>9} {'p95':>9} "
+            f"{'speedup':>9} {'PSNR(dB)':>10} {'SSIM':>8}"
+        )
+        print("-" * 86)
+        baseline = statistics.median(results["none"]["warm"] or results["none"]["cold"])
+        skipped: Dict[str, List[str]] = {}
+        for mode in modes:
+            result = results[mode]
+            if mode != "none" and result["fp32_fallbacks"]:
+                skipped[mode] = result["fp32_fallbacks"]
+                print(f"{mode:<9} 건너뜀 (양자화 모델 없음, FP32로 실행됨)")
+                continue
+            latencies = result["warm"] or result["cold"]
+            p50 = statistics.median(latencies)
+            images = [cv2.imread(path) for path in result["outputs"]]
+            psnrs = [psnr(ref, img) for ref, img in zip(reference, images)]
+            ssims = [ssim(ref, img) for ref, img in zip(reference, images)]
+            print(
+                f"{mode:<9} {result['startup_seconds']:>8.2f}s {statistics.mean(result['cold']):>8.3f}s "
+                f"{p50:>8.3f}s {percentile(latencies, 0.95):>8.3f}s {baseline / p50:>8.2f}x "
+                f"{statistics.mean(psnrs):>10.2f} {statistics.mean(ssims):>8.4f}"
+            )
+        print("=" * 86)
+        print("PSNR/SSIM은 FP32(none) 결과 대비 값입니다 (none은 자기 자신과 비교).")
+        for mode, models in skipped.items():
+            print(
+                f"❌ {mode}: {', '.join(models)} 모델의 INT8 변형을 사용하지 못해 FP32로 실행되었으므로 "
+                f"결과에서 제외했습니다"
+                + (" (python backend/scripts/quantize_models.py 로 보정 후 다시 실행)" if mode == "static" else "")
+            )
+        if args.keep:
+            print(f"생성 이미지: {work_dir}")
+        if skipped:
+            sys.exit(1)
+    finally:
+        if not args.keep:
+            shutil.rmtree(work_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
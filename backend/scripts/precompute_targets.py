@@ -0,0 +1,62 @@
+"""
+타겟 이미지 분석 캐시 생성 스크립트
+
+TargetProfile과 TargetTalent의 모든 타겟 이미지에 대해 디코딩 프레임, 얼굴,
+랜드마크, 정렬 크롭과 마스크를 미리 계산하여 FACEFUSION_TARGET_ASSET_CACHE_DIR에
+저장합니다. 타겟 이미지를 교체하거나 추가한 뒤 서버 시작 전에 실행하면
+시작 시 미리 계산을 건너뛸 수 있습니다.
+"""
+
+import asyncio
+import sys
+from pathlib import Path
+
+# 프로젝트 루트를 sys.path에 추가
+project_root = Path(__file__).resolve().parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from backend.core.config import settings
+from backend.database import AsyncSessionLocal
+from backend.inference import worker
+from backend.repositories.profile_repo import ProfileRepository
+from backend.repositories.talent_repo import TalentRepository
+from backend.utils.file_handler import FileHandler
+
+
+async def collect_target_paths():
+    """모든 프로필/장기자랑 타겟 이미지 절대 경로"""
+    async with AsyncSessionLocal() as session:
+        profiles = await ProfileRepository(session).get_all_profiles()
+        talents = await TalentRepository(session).get_all_talents()
+
+    file_handler = FileHandler()
+    paths = [file_handler.get_absolute_path(t.target_image_path) for t in [*profiles, *talents]]
+    return list(dict.fromkeys(paths))
+
+
+def main():
+    """메인 실행 함수"""
+    print("=" * 50)
+    print("타겟 이미지 분석 캐시 생성 시작")
+    print("=" * 50)
+
+    target_paths = asyncio.run(collect_target_paths())
+    print(f"타겟 이미지 {len(target_paths)}개")
+
+    worker.init_worker(settings.facefusion)
+    stats = worker.precompute_targets(target_paths)
+
+    print("\n" + "=" * 50)
+    print(
+        f"✅ 생성 {stats['built']}개, 기존 {stats['cached']}개, "
+        f"실패 {stats['failed']}개, 정리 {stats['pruned']}개"
+    )
+    print(f"캐시 위치: {Path(settings.facefusion.target_asset_cache_dir).resolve()}")
+    print("=" * 50)
+
+    if stats["failed"]:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+"""
+INT8 양자화 모델 생성 스크립트
+
+모든 프로필/장기자랑 타겟 이미지로 검출기와 스와퍼를 FP32로 실행하며 실제 모델 입력을
+기록하고, 이를 보정 데이터로 정적(static) 양자화 모델을 만듭니다. 동적(dynamic)
+양자화 모델도 함께 만듭니다. 결과는 FACEFUSION_MODEL_CACHE_DIR에 저장되며,
+FACEFUSION_MODEL_QUANTIZATION=static|dynamic 설정 시 사용됩니다.
+"""
+
+import argparse
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+# 프로젝트 루트를 sys.path에 추가
+project_root = Path(__file__).resolve().parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from backend.core.config import settings
+from backend.inference.engine import FaceFusionEngine
+from backend.inference.model_cache import OptimizedModelCache
+from backend.inference.quantization import (
+    FeedRecorder,
+    quantize_dynamic_model,
+    quantize_static_model,
+)
+from backend.scripts.precompute_targets import collect_target_paths
+
+
+def main():
+    """메인 실행 함수"""
+    parser = argparse.ArgumentParser(description="Create INT8 quantized FaceFusion models")
+    parser.add_argument(
+        "--modes",
+        default="static,dynamic",
+        help="Comma separated quantization modes to build (static, dynamic)",
+    )
+    parser.add_argument(
+        "--max-feeds",
+        type=int,
+        default=128,
+        help="Maximum calibration inputs recorded per model",
+    )
+    args = parser.parse_args()
+    modes = [mode.strip() for mode in args.modes.split(",") if mode.strip()]
+
+    print("=" * 50)
+    print("INT8 양자화 모델 생성 시작")
+    print("=" * 50)
+
+    target_paths = asyncio.run(collect_target_paths())
+    print(f"보정 이미지(타겟) {len(target_paths)}개")
+
+    # 보정은 FP32 원본 모델로 실행
+    config = settings.facefusion.model_copy(update={
+        "model_quantization": "none",
+        "model_cache_enabled": False,
+    })
+    engine = FaceFusionEngine(config)
+
+    from facefusion import inference_manager
+
+    recorder = FeedRecorder(config.quantization_models, max_feeds=args.max_feeds)
+    recorder.install(inference_manager)
+
+    processed = engine.calibrate(target_paths)
+    print(f"보정 실행 완료: 얼굴 검출 {processed}/{len(target_paths)}")
+
+    model_cache = OptimizedModelCache(config.model_cache_dir)
+    model_cache.cache_dir.mkdir(parents=True, exist_ok=True)
+    failed = 0
+
+    for model_name in config.quantization_models:
+        model_path = recorder.model_paths.get(model_name)
+        if model_path is None:
+            print(f"⚠️ {model_name}: 보정 중 사용되지 않은 모델이라 건너뜁니다")
+            continue
+
+        for mode in modes:
+            output_path = model_cache.quantized_path(model_path, mode)
+            start_time = time.time()
+            try:
+                if mode == "static":
+                    quantize_static_model(model_path, output_path, recorder.feeds[model_name])
+                else:
+                    quantize_dynamic_model(model_path, output_path)
+            except Exception as e:
+                failed += 1
+                print(f"❌ {model_name} ({mode}): {e}")
+                continue
+
+            size_ratio = output_path.stat().st_size / Path(model_path).stat().st_size
+            print(
+                f"✅ {model_name} ({mode}): {output_path.name} "
+                f"[보정 입력 {len(recorder.feeds[model_name]) if mode == 'static' else '-'}, "
+                f"크기 {size_ratio:.0%}, {time.time() - start_time:.1f}s]"
+            )
+
+    print("\n" + "=" * 50)
+    print(f"양자화 모델 위치: {model_cache.cache_dir}")
+    print("=" * 50)
+
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -5,6 +5,9 @@ from backend.services.image_service import ImageService
 from backend.services.tracking_service import TrackingService
 from backend.services.print_service import PrintService
 from backend.services.statistics_service import StatisticsService
+from backend.services.job_service import GenerationJobManager
+from backend.services.readiness_service import ReadinessService
+from backend.services.storage_service import StorageService
 
 __all__ = [
     "SessionService",
@@ -12,4 +15,7 @@ __all__ = [
     "TrackingService",
     "PrintService",
     "StatisticsService",
+    "GenerationJobManager",
+    "ReadinessService",
+    "StorageService",
 ]
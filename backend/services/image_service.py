@@ -5,6 +5,9 @@ Image Service
 """
 
 import random
+import asyncio
+import logging
+from typing import Optional
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from backend.repositories.participation_repo import ParticipationRepository
@@ -12,52 +15,228 @@ from backend.repositories.participation_history_repo import ParticipationHistory
 from backend.repositories.profile_repo import ProfileRepository
 from backend.repositories.talent_repo import TalentRepository
 from backend.exceptions import (
+    AppException,
     SessionNotFoundException,
     ImageGenerationFailedException,
     ProfileNotFoundException,
     TalentNotFoundException,
 )
 from backend.utils.file_handler import FileHandler
-from backend.facefusion_service import FaceFusionService
+from backend.facefusion_service import FaceFusionService, get_facefusion_service
+from backend.core.cancellation import CancelToken, cancellation_registry
+from backend.core.config import settings
+from backend.services.job_service import JobStatus, get_job_manager
+from backend.services.storage_service import StorageService
+
+logger = logging.getLogger(__name__)
 
 
 class ImageService:
     """이미지 생성 서비스"""
 
-    def __init__(self, db: AsyncSession):
+    def __init__(self, db: AsyncSession, facefusion: Optional[FaceFusionService] = None):
         self.db = db
         self.participation_repo = ParticipationRepository(db)
         self.history_repo = ParticipationHistoryRepository(db)
         self.profile_repo = ProfileRepository(db)
         self.talent_repo = TalentRepository(db)
         self.file_handler = FileHandler()
-        self.facefusion = FaceFusionService()
+        self.storage = StorageService(db, self.file_handler)
+        self.facefusion = facefusion or get_facefusion_service()
 
-    async def generate_profile(self, participation_id: int) -> dict:
+    async def _get_ready_participation(self, participation_id: int):
         """
-        프로필 이미지 생성 (화면 #6)
+        이미지 생성이 가능한 세션 조회
+
+        Raises:
+            SessionNotFoundException: 세션을 찾을 수 없음
+            ImageGenerationFailedException: 원본 이미지 또는 성별이 설정되지 않음
+        """
+        participation = await self.participation_repo.get_by_id(participation_id)
+        if not participation:
+            raise SessionNotFoundException(participation_id)
+
+        if not participation.original_image_path or not participation.gender:
+            raise ImageGenerationFailedException(
+                "Original image or gender not set"
+            )
+
+        return participation
+
+    async def submit_generation_job(self, participation_id: int, image_type: str) -> dict:
+        """
+        비동기 이미지 생성 작업 제출 (화면 #6, #8)
+
+        세션을 검증한 뒤 작업을 대기열에 넣고 즉시 반환합니다.
 
         Args:
             participation_id: 참여 ID
+            image_type: 'profile' 또는 'talent'
 
         Returns:
-            생성된 프로필 이미지 정보
+            제출된 작업 정보 (job_id, status)
+
+        Raises:
+            SessionNotFoundException: 세션을 찾을 수 없음
+            ImageGenerationFailedException: 원본 이미지 또는 성별이 설정되지 않음
+            JobQueueFullException: 작업 대기열이 가득 참
+        """
+        participation = await self._get_ready_participation(participation_id)
+
+        job_manager = get_job_manager()
+        job = None
+        if settings.job.speculative_generation:
+            job = job_manager.claim(participation_id, image_type, participation.original_image_path)
+        if job is None:
+            job = job_manager.submit(
+                participation_id,
+                image_type,
+                source_image_path=participation.original_image_path,
+            )
+        return job.to_dict()
+
+    async def cancel_generation(self, participation_id: int) -> dict:
+        """
+        진행 중인 이미지 생성 취소
+
+        대기 중인 생성 작업은 실행하지 않고, 실행 중인 생성(동기 요청, 비동기 작업)은
+        다음 단계 경계에서 중단합니다.
+
+        Args:
+            participation_id: 참여 ID
+
+        Returns:
+            취소 결과 (대기/실행 중이던 작업 수, 동기 생성 요청 수)
 
         Raises:
             SessionNotFoundException: 세션을 찾을 수 없음
-            ImageGenerationFailedException: 이미지 생성 실패
-            ProfileNotFoundException: 매칭 가능한 프로필이 없음
         """
-        # 세션 조회
         participation = await self.participation_repo.get_by_id(participation_id)
         if not participation:
             raise SessionNotFoundException(participation_id)
 
-        # 원본 이미지 및 성별 확인
-        if not participation.original_image_path or not participation.gender:
-            raise ImageGenerationFailedException(
-                "Original image or gender not set"
+        cancelled_jobs = get_job_manager().cancel(participation_id)
+        cancelled_requests = cancellation_registry.cancel(participation_id)
+        logger.info(
+            f"Generation cancelled for participation {participation_id} "
+            f"(jobs={cancelled_jobs}, requests={cancelled_requests})"
+        )
+        return {
+            "participation_id": participation_id,
+            "cancelled_jobs": cancelled_jobs,
+            "cancelled_requests": cancelled_requests,
+        }
+
+    async def _claim_speculative_result(
+        self,
+        participation,
+        image_type: str,
+        token: CancelToken,
+    ) -> Optional[dict]:
+        """
+        업로드 직후 미리 시작한 생성 작업의 결과 가져오기
+
+        작업이 아직 실행 중이면 완료까지 기다립니다 (token 취소/기한 초과 시 중단).
+        추측 생성이 꺼져 있거나, 작업이 없거나, 실패했으면 None (직접 생성).
+        """
+        if not settings.job.speculative_generation:
+            return None
+
+        job = get_job_manager().claim(
+            participation.participation_id,
+            image_type,
+            participation.original_image_path,
+        )
+        if job is None:
+            return None
+
+        await token.guard(asyncio.ensure_future(job.wait()), "speculative_result")
+        if job.status != JobStatus.DONE:
+            logger.warning(f"⚠️ 추측 생성 작업 실패, 다시 생성합니다 ({job.job_id}): {job.error}")
+            return None
+        return job.result
+
+    async def _check_source_unchanged(self, participation, token: CancelToken) -> None:
+        """
+        생성에 사용한 원본 이미지가 아직 현재 원본인지 확인
+
+        생성 중에 사진을 다시 올렸으면 이전 사진의 결과가 새 사진의 결과를 덮어쓰지
+        않도록 token을 'superseded'로 취소합니다.
+
+        Raises:
+            GenerationCancelledException: 원본 이미지가 바뀜
+        """
+        current_path = await self.participation_repo.get_original_image_path(
+            participation.participation_id
+        )
+        if current_path != participation.original_image_path:
+            logger.info(
+                f"Original image changed during generation, dropping result "
+                f"(participation={participation.participation_id})"
             )
+            token.cancel("superseded")
+            token.check("save")
+
+    async def _store_output(self, output_path: str, previous_path: Optional[str]) -> str:
+        """
+        생성 이미지를 저장소로 옮기고 파생 이미지(모바일, 썸네일, 인쇄용) 생성 후 이전 생성 이미지 참조 해제
+
+        결과 캐시 항목도 저장소 경로를 가리키도록 바꿔 재생성 시 계속 재사용합니다.
+
+        Returns:
+            DB에 저장할 생성 이미지 경로
+        """
+        generated_path, stored_path = await self.storage.store_output(output_path)
+        self.facefusion.relocate_output(output_path, stored_path)
+        await self.storage.create_renditions(generated_path)
+        await self.storage.prime_image_cache(generated_path)
+        await self.storage.release(previous_path)
+        return generated_path
+
+    async def generate_profile(
+        self,
+        participation_id: int,
+        reuse_speculative: bool = True,
+        cancel_token: Optional[CancelToken] = None,
+    ) -> dict:
+        """
+        프로필 이미지 생성 (화면 #6)
+
+        Args:
+            participation_id: 참여 ID
+            reuse_speculative: 업로드 직후 미리 시작한 생성 작업이 있으면 그 결과 사용
+            cancel_token: 생성 취소/기한 (없으면 JOB_GENERATION_TIMEOUT_SECONDS 기한)
+
+        Returns:
+            생성된 프로필 이미지 정보 (renditions: 파생 이미지 URL, timings: 단계별 소요 시간,
+            swapper_model, quality_level: 사용한 품질 단계)
+
+        Raises:
+            SessionNotFoundException: 세션을 찾을 수 없음
+            ImageGenerationFailedException: 이미지 생성 실패
+            ProfileNotFoundException: 매칭 가능한 프로필이 없음
+            GenerationCancelledException: 생성이 취소됨
+            GenerationTimeoutException: 생성 기한 초과
+        """
+        token = cancel_token or CancelToken()
+        with cancellation_registry.track(participation_id, token):
+            return await self._generate_profile(participation_id, reuse_speculative, token)
+
+    async def _generate_profile(
+        self,
+        participation_id: int,
+        reuse_speculative: bool,
+        token: CancelToken,
+    ) -> dict:
+        """프로필 이미지 생성 (단계마다 취소/기한 확인)"""
+        # 세션 조회 (원본 이미지 및 성별 확인)
+        participation = await self._get_ready_participation(participation_id)
+
+        # 미리 생성된 결과가 있으면 그대로 사용
+        if reuse_speculative:
+            result = await self._claim_speculative_result(participation, "profile", token)
+            if result:
+                return result
 
         # 성별에 맞는 프로필 목록 조회
         profiles = await self.profile_repo.get_by_gender(participation.gender)
@@ -67,12 +246,8 @@ class ImageService:
         # 랜덤 선택
         selected_profile = random.choice(profiles)
 
-        # 파일명 생성
-        filename = self.file_handler.generate_output_filename(
-            "profile",
-            participation_id
-        )
-        output_path = self.file_handler.get_output_path(filename)
+        # 임시 출력 경로 (생성 후 해시 이름 저장소로 이동)
+        output_path = self.file_handler.get_output_staging_path()
 
         # FaceFusion 실행
         try:
@@ -84,16 +259,28 @@ class ImageService:
                 selected_profile.target_image_path
             )
 
-            await self.facefusion.generate_image(
+            report = await self.facefusion.generate_image(
                 source_path=source_abs_path,
                 target_path=target_abs_path,
-                output_path=output_path
+                output_path=output_path,
+                cancel_token=token,
             )
+        except AppException:
+            raise
         except Exception as e:
             raise ImageGenerationFailedException(str(e))
 
+        # 생성 중 취소되었거나 원본 사진이 바뀌었으면 결과를 저장하지 않음
+        # (출력은 결과 캐시로 재시도 시 재사용)
+        token.check("save")
+        await self._check_source_unchanged(participation, token)
+
+        # 생성 이미지 저장 (같은 결과는 한 번만 저장) 및 이전 결과 참조 해제
+        generated_path = await self._store_output(
+            output_path, participation.generated_profile_image_path
+        )
+
         # DB 업데이트
-        generated_path = f"/output/{filename}"
         updated = await self.participation_repo.update(
             participation_id,
             {
@@ -113,34 +300,57 @@ class ImageService:
             "selected_profile_id": selected_profile.profile_id,
             "selected_profile_name": selected_profile.profile_name,
             "generated_profile_image_path": generated_path,
-            "image_url": self.file_handler.get_image_url(filename),
+            "image_url": self.file_handler.get_stored_image_url(generated_path),
+            "renditions": self.storage.get_rendition_urls(generated_path),
+            "timings": report["timings"],
+            "swapper_model": report["swapper_model"],
+            "quality_level": report["quality_level"],
         }
 
-    async def generate_talent(self, participation_id: int) -> dict:
+    async def generate_talent(
+        self,
+        participation_id: int,
+        reuse_speculative: bool = True,
+        cancel_token: Optional[CancelToken] = None,
+    ) -> dict:
         """
         장기자랑 이미지 생성 (화면 #8)
 
         Args:
             participation_id: 참여 ID
+            reuse_speculative: 업로드 직후 미리 시작한 생성 작업이 있으면 그 결과 사용
+            cancel_token: 생성 취소/기한 (없으면 JOB_GENERATION_TIMEOUT_SECONDS 기한)
 
         Returns:
-            생성된 장기자랑 이미지 정보
+            생성된 장기자랑 이미지 정보 (renditions: 파생 이미지 URL, timings: 단계별 소요 시간,
+            swapper_model, quality_level: 사용한 품질 단계)
 
         Raises:
             SessionNotFoundException: 세션을 찾을 수 없음
             ImageGenerationFailedException: 이미지 생성 실패
             TalentNotFoundException: 매칭 가능한 장기자랑이 없음
+            GenerationCancelledException: 생성이 취소됨
+            GenerationTimeoutException: 생성 기한 초과
         """
-        # 세션 조회
-        participation = await self.participation_repo.get_by_id(participation_id)
-        if not participation:
-            raise SessionNotFoundException(participation_id)
-
-        # 원본 이미지 및 성별 확인
-        if not participation.original_image_path or not participation.gender:
-            raise ImageGenerationFailedException(
-                "Original image or gender not set"
-            )
+        token = cancel_token or CancelToken()
+        with cancellation_registry.track(participation_id, token):
+            return await self._generate_talent(participation_id, reuse_speculative, token)
+
+    async def _generate_talent(
+        self,
+        participation_id: int,
+        reuse_speculative: bool,
+        token: CancelToken,
+    ) -> dict:
+        """장기자랑 이미지 생성 (단계마다 취소/기한 확인)"""
+        # 세션 조회 (원본 이미지 및 성별 확인)
+        participation = await self._get_ready_participation(participation_id)
+
+        # 미리 생성된 결과가 있으면 그대로 사용
+        if reuse_speculative:
+            result = await self._claim_speculative_result(participation, "talent", token)
+            if result:
+                return result
 
         # 성별에 맞는 장기자랑 목록 조회
         talents = await self.talent_repo.get_by_gender(participation.gender)
@@ -150,12 +360,8 @@ class ImageService:
         # 랜덤 선택
         selected_talent = random.choice(talents)
 
-        # 파일명 생성
-        filename = self.file_handler.generate_output_filename(
-            "talent",
-            participation_id
-        )
-        output_path = self.file_handler.get_output_path(filename)
+        # 임시 출력 경로 (생성 후 해시 이름 저장소로 이동)
+        output_path = self.file_handler.get_output_staging_path()
 
         # FaceFusion 실행
         try:
@@ -167,16 +373,28 @@ class ImageService:
                 selected_talent.target_image_path
             )
 
-            await self.facefusion.generate_image(
+            report = await self.facefusion.generate_image(
                 source_path=source_abs_path,
                 target_path=target_abs_path,
-                output_path=output_path
+                output_path=output_path,
+                cancel_token=token,
             )
+        except AppException:
+            raise
         except Exception as e:
             raise ImageGenerationFailedException(str(e))
 
+        # 생성 중 취소되었거나 원본 사진이 바뀌었으면 결과를 저장하지 않음
+        # (출력은 결과 캐시로 재시도 시 재사용)
+        token.check("save")
+        await self._check_source_unchanged(participation, token)
+
+        # 생성 이미지 저장 (같은 결과는 한 번만 저장) 및 이전 결과 참조 해제
+        generated_path = await self._store_output(
+            output_path, participation.generated_talent_image_path
+        )
+
         # DB 업데이트
-        generated_path = f"/output/{filename}"
         updated = await self.participation_repo.update(
             participation_id,
             {
@@ -196,5 +414,9 @@ class ImageService:
             "selected_talent_id": selected_talent.talent_id,
             "selected_talent_name": selected_talent.talent_name,
             "generated_talent_image_path": generated_path,
-            "image_url": self.file_handler.get_image_url(filename),
+            "image_url": self.file_handler.get_stored_image_url(generated_path),
+            "renditions": self.storage.get_rendition_urls(generated_path),
+            "timings": report["timings"],
+            "swapper_model": report["swapper_model"],
+            "quality_level": report["quality_level"],
         }
@@ -0,0 +1,515 @@
+"""
+Generation Job Service
+
+이미지 생성을 비동기 작업(Job)으로 처리합니다.
+
+작업을 제출하면 즉시 job_id를 반환하고, 백그라운드 워커가 제한된 대기열에서
+작업을 꺼내 ImageService로 생성합니다. 클라이언트는 GET /jobs/{job_id} 폴링 또는
+SSE 스트림으로 queued → running → done/failed/cancelled 상태를 확인합니다.
+작업 상태는 프로세스 메모리에만 보관합니다.
+
+생성 기한(JOB_GENERATION_TIMEOUT_SECONDS)은 제출 시점부터 계산합니다. 취소되었거나
+기한이 지난 작업은 대기열에서 꺼낼 때 실행하지 않고 버립니다.
+
+추측 생성(JOB_SPECULATIVE_GENERATION)이 켜져 있으면 업로드 직후 프로필/장기자랑
+작업을 미리 제출하고, 이후 생성 요청은 claim()으로 그 작업의 결과를 가져갑니다.
+추측 생성은 background 우선순위로 대기열과 추론 슬롯에서 사용자 요청보다 뒤에 실행되며,
+사용자가 가져가면 interactive로 올라갑니다. 사진을 다시 올리면 이전 사진으로 제출된
+추측 생성 중 아무도 가져가지 않은 작업은 취소합니다 (cancel_superseded()).
+"""
+
+import asyncio
+import json
+import logging
+import time
+import uuid
+from collections import deque
+from dataclasses import dataclass, field
+from typing import AsyncIterator, Deque, Dict, List, Optional
+
+from backend.core.cancellation import CancelToken, record_cancellation
+from backend.core.config import settings
+from backend.core.metrics import metrics
+from backend.database import AsyncSessionLocal
+from backend.exceptions import (
+    AppException,
+    GenerationCancelledException,
+    GenerationTimeoutException,
+    JobNotFoundException,
+    JobQueueFullException,
+)
+from backend.inference.admission import Priority
+
+logger = logging.getLogger(__name__)
+
+
+class JobStatus:
+    """작업 상태 값"""
+
+    QUEUED = "queued"
+    RUNNING = "running"
+    DONE = "done"
+    FAILED = "failed"
+    CANCELLED = "cancelled"
+
+    FINISHED = (DONE, FAILED, CANCELLED)
+
+
+@dataclass
+class GenerationJob:
+    """이미지 생성 작업"""
+
+    participation_id: int
+    image_type: str
+    source_image_path: Optional[str] = None
+    speculative: bool = False
+    claimed: bool = False
+    job_id: str = field(default_factory=lambda: uuid.uuid4().hex)
+    status: str = JobStatus.QUEUED
+    result: Optional[dict] = None
+    error: Optional[str] = None
+    created_at: float = field(default_factory=time.time)
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+    cancel_token: CancelToken = field(default_factory=CancelToken, repr=False)
+    _changed: asyncio.Event = field(default_factory=asyncio.Event, repr=False)
+    _done: asyncio.Event = field(default_factory=asyncio.Event, repr=False)
+
+    @property
+    def is_finished(self) -> bool:
+        """완료(성공/실패) 여부"""
+        return self.status in JobStatus.FINISHED
+
+    def changed_event(self) -> asyncio.Event:
+        """다음 상태 변경 시 set되는 이벤트"""
+        return self._changed
+
+    def set_status(self, status: str) -> None:
+        """상태 변경 및 대기 중인 구독자 알림"""
+        self.status = status
+        if status == JobStatus.RUNNING:
+            self.started_at = time.time()
+        elif status in JobStatus.FINISHED:
+            self.finished_at = time.time()
+            self._done.set()
+
+        changed, self._changed = self._changed, asyncio.Event()
+        changed.set()
+
+    async def wait(self) -> None:
+        """작업 완료까지 대기"""
+        await self._done.wait()
+
+    def to_dict(self) -> dict:
+        """API 응답용 딕셔너리"""
+        return {
+            "job_id": self.job_id,
+            "participation_id": self.participation_id,
+            "image_type": self.image_type,
+            "status": self.status,
+            "speculative": self.speculative,
+            "result": self.result,
+            "image_url": self.result.get("image_url") if self.result else None,
+            "quality_level": self.result.get("quality_level") if self.result else None,
+            "error": self.error,
+            "created_at": self.created_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+        }
+
+
+class GenerationJobManager:
+    """이미지 생성 작업 관리자 (프로세스당 1개)"""
+
+    def __init__(
+        self,
+        queue_size: int,
+        concurrency: int,
+        retention_seconds: int,
+    ):
+        """
+        Args:
+            queue_size: 대기열 최대 길이 (초과 시 503)
+            concurrency: 동시에 실행할 작업 수
+            retention_seconds: 완료된 작업 상태 보관 시간
+        """
+        self.queue_size = max(1, queue_size)
+        self.concurrency = max(1, concurrency)
+        self.retention_seconds = retention_seconds
+        self._jobs: Dict[str, GenerationJob] = {}
+        # 우선순위별 대기 작업 (제출 순서, interactive 작업을 먼저 꺼냄)
+        self._waiting: Dict[str, Deque[GenerationJob]] = {priority: deque() for priority in Priority.ALL}
+        # 대기 작업이 생기면 set (start()에서 생성)
+        self._job_available: Optional[asyncio.Event] = None
+        self._workers: List[asyncio.Task] = []
+
+    @property
+    def queued(self) -> int:
+        """대기 중인 작업 수"""
+        return sum(len(jobs) for jobs in self._waiting.values())
+
+    def start(self) -> None:
+        """백그라운드 워커 시작 (startup 이벤트에서 호출)"""
+        if self._workers:
+            return
+
+        self._job_available = asyncio.Event()
+        if self.queued:
+            self._job_available.set()
+        self._workers = [
+            asyncio.create_task(self._worker_loop(), name=f"generation-job-worker-{i}")
+            for i in range(self.concurrency)
+        ]
+        logger.info(
+            f"Generation job workers started "
+            f"(concurrency={self.concurrency}, queue_size={self.queue_size})"
+        )
+
+    async def stop(self) -> None:
+        """백그라운드 워커 종료 (shutdown 이벤트에서 호출)"""
+        for task in self._workers:
+            task.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+
+    def submit(
+        self,
+        participation_id: int,
+        image_type: str,
+        source_image_path: Optional[str] = None,
+        speculative: bool = False,
+    ) -> GenerationJob:
+        """
+        생성 작업 제출
+
+        같은 참여 ID/이미지 타입(/원본 이미지)의 작업이 이미 대기 중이거나 실행 중이면
+        그 작업을 반환합니다.
+
+        Args:
+            participation_id: 참여 ID
+            image_type: 'profile' 또는 'talent'
+            source_image_path: 작업 제출 시점의 원본 이미지 경로 (재업로드 구분용)
+            speculative: 업로드 직후 미리 제출하는 추측 생성 작업 여부
+
+        Returns:
+            제출된 (또는 기존) 작업
+
+        Raises:
+            JobQueueFullException: 대기열이 가득 참
+        """
+        if self._job_available is None:
+            raise RuntimeError("GenerationJobManager is not started")
+
+        self._prune_finished()
+
+        active = self.find_active(participation_id, image_type, source_image_path)
+        if active:
+            if not speculative and not active.claimed:
+                active.claimed = True
+                self._promote(active)
+            return active
+
+        job = GenerationJob(
+            participation_id=participation_id,
+            image_type=image_type,
+            source_image_path=source_image_path,
+            speculative=speculative,
+            claimed=not speculative,
+            cancel_token=CancelToken(priority=Priority.BACKGROUND if speculative else Priority.INTERACTIVE),
+        )
+        if self.queued >= self.queue_size:
+            raise JobQueueFullException(
+                queued=self.queued,
+                queue_size=self.queue_size,
+            )
+
+        self._enqueue(job)
+        self._jobs[job.job_id] = job
+        logger.info(
+            f"Generation job queued: {job.job_id} ({image_type}, participation={participation_id}"
+            f"{', speculative' if speculative else ''})"
+        )
+        return job
+
+    def claim(
+        self,
+        participation_id: int,
+        image_type: str,
+        source_image_path: str,
+    ) -> Optional[GenerationJob]:
+        """
+        추측 생성 작업 가져가기
+
+        같은 원본 이미지로 미리 제출된, 아직 아무도 가져가지 않은 작업(대기/실행/성공)을
+        반환합니다. 한 작업은 한 번만 가져갈 수 있으므로 이후 요청은 새로 생성합니다.
+
+        Args:
+            participation_id: 참여 ID
+            image_type: 'profile' 또는 'talent'
+            source_image_path: 현재 원본 이미지 경로
+
+        Returns:
+            가져간 작업 또는 None
+        """
+        self._prune_finished()
+
+        candidates = [
+            job
+            for job in self._jobs.values()
+            if job.speculative
+            and not job.claimed
+            and job.participation_id == participation_id
+            and job.image_type == image_type
+            and job.source_image_path == source_image_path
+            and job.status not in (JobStatus.FAILED, JobStatus.CANCELLED)
+        ]
+        if not candidates:
+            return None
+
+        job = max(candidates, key=lambda candidate: candidate.created_at)
+        job.claimed = True
+        self._promote(job)
+        logger.info(f"Speculative generation job claimed: {job.job_id} ({job.status})")
+        return job
+
+    def cancel(self, participation_id: int) -> int:
+        """
+        참여 ID의 대기/실행 중인 작업 취소
+
+        대기 중인 작업은 바로 cancelled 상태가 되어 실행되지 않고, 실행 중인 작업은
+        다음 단계 경계에서 중단됩니다.
+
+        Returns:
+            취소된 작업 수
+        """
+        cancelled = 0
+        for job in list(self._jobs.values()):
+            if job.participation_id != participation_id or job.is_finished:
+                continue
+            if job.cancel_token.cancel("cancelled"):
+                cancelled += 1
+            if job.status == JobStatus.QUEUED:
+                self._drop(job)
+        return cancelled
+
+    def cancel_superseded(self, participation_id: int, source_image_path: str) -> int:
+        """
+        다른 원본 이미지로 제출된 추측 생성 작업 취소 (사진을 다시 올렸을 때)
+
+        아무도 가져가지 않은 추측 생성 작업만 취소합니다. 대기 중인 작업은 바로
+        cancelled 상태가 되고, 실행 중인 작업은 다음 단계 경계에서 중단됩니다.
+
+        Args:
+            participation_id: 참여 ID
+            source_image_path: 새 원본 이미지 경로
+
+        Returns:
+            취소된 작업 수
+        """
+        cancelled = 0
+        for job in list(self._jobs.values()):
+            if (
+                job.participation_id != participation_id
+                or not job.speculative
+                or job.claimed
+                or job.is_finished
+                or job.source_image_path == source_image_path
+            ):
+                continue
+            if job.cancel_token.cancel("superseded"):
+                cancelled += 1
+            if job.status == JobStatus.QUEUED:
+                self._drop(job)
+
+        if cancelled:
+            logger.info(
+                f"Superseded speculative generation jobs cancelled: {cancelled} "
+                f"(participation={participation_id})"
+            )
+        return cancelled
+
+    def get(self, job_id: str) -> GenerationJob:
+        """
+        작업 조회
+
+        Raises:
+            JobNotFoundException: 작업을 찾을 수 없음
+        """
+        job = self._jobs.get(job_id)
+        if not job:
+            raise JobNotFoundException(job_id)
+        return job
+
+    def find_active(
+        self,
+        participation_id: int,
+        image_type: str,
+        source_image_path: Optional[str] = None,
+    ) -> Optional[GenerationJob]:
+        """
+        대기 중이거나 실행 중인 작업 조회 (취소되어 중단을 기다리는 작업 제외)
+
+        source_image_path를 주면 같은 원본 이미지(또는 원본을 모르는) 작업만 찾습니다.
+        """
+        for job in self._jobs.values():
+            if (
+                job.participation_id == participation_id
+                and job.image_type == image_type
+                and not job.is_finished
+                and not job.cancel_token.cancelled
+                and (
+                    source_image_path is None
+                    or job.source_image_path in (None, source_image_path)
+                )
+            ):
+                return job
+        return None
+
+    async def stream_events(self, job: GenerationJob) -> AsyncIterator[str]:
+        """
+        작업 상태를 SSE(Server-Sent Events) 형식으로 스트리밍
+
+        상태가 바뀔 때마다 status 이벤트를 보내고, 완료되면 스트림을 종료합니다.
+        프록시 타임아웃 방지를 위해 주기적으로 keep-alive 주석을 보냅니다.
+        """
+        keepalive = settings.job.sse_keepalive_seconds
+        last_status = None
+
+        while True:
+            changed = job.changed_event()
+
+            if job.status != last_status:
+                last_status = job.status
+                yield f"event: status\ndata: {json.dumps(job.to_dict(), ensure_ascii=False)}\n\n"
+
+            if job.is_finished:
+                return
+
+            try:
+                await asyncio.wait_for(changed.wait(), timeout=keepalive)
+            except asyncio.TimeoutError:
+                yield ": keep-alive\n\n"
+
+    def _enqueue(self, job: GenerationJob) -> None:
+        """작업을 우선순위(job.cancel_token.priority)에 맞는 대기열 끝에 추가"""
+        self._waiting[job.cancel_token.priority].append(job)
+        self._job_available.set()
+
+    def _dequeue(self) -> Optional[GenerationJob]:
+        """다음 실행할 작업 꺼내기 (interactive 먼저, 없으면 None)"""
+        for priority in Priority.ALL:
+            if self._waiting[priority]:
+                return self._waiting[priority].popleft()
+        return None
+
+    def _withdraw(self, job: GenerationJob) -> None:
+        """대기열에서 작업 제거 (없으면 무시)"""
+        waiting = self._waiting[job.cancel_token.priority]
+        if job in waiting:
+            waiting.remove(job)
+
+    def _promote(self, job: GenerationJob) -> None:
+        """사용자가 기다리게 된 추측 생성 작업을 interactive로 올림"""
+        if job.is_finished or job.cancel_token.priority == Priority.INTERACTIVE:
+            return
+
+        # 순환 참조 방지를 위한 지연 임포트
+        from backend.facefusion_service import get_facefusion_service
+
+        # 대기열은 token 우선순위로 나뉘므로 올리기 전에 뺌
+        queued = job.status == JobStatus.QUEUED
+        self._withdraw(job)
+        get_facefusion_service().promote(job.cancel_token)
+        if queued:
+            # interactive 대기열 끝으로 옮김 (같은 작업이 두 번 대기하지 않음)
+            self._enqueue(job)
+        logger.info(f"Speculative generation job promoted to interactive: {job.job_id}")
+
+    async def _worker_loop(self) -> None:
+        """대기열에서 작업을 꺼내 실행 (취소/기한 초과된 작업은 버림)"""
+        while True:
+            job = self._dequeue()
+            if job is None:
+                self._job_available.clear()
+                await self._job_available.wait()
+                continue
+            if job.cancel_token.cancelled:
+                self._drop(job)
+                continue
+            await self._run_job(job)
+
+    def _drop(self, job: GenerationJob) -> None:
+        """실행 전 작업 버리기 (취소 또는 기한 초과)"""
+        self._withdraw(job)
+        record_cancellation(job.cancel_token)
+        metrics.increment("generation_jobs_dropped")
+        job.error = job.cancel_token.error("start").message
+        job.set_status(JobStatus.CANCELLED)
+        logger.info(f"Generation job dropped before start: {job.job_id} ({job.cancel_token.reason})")
+
+    async def _run_job(self, job: GenerationJob) -> None:
+        """작업 1건 실행 (요청과 별도의 DB 세션 사용)"""
+        # 순환 참조 방지를 위한 지연 임포트
+        from backend.facefusion_service import get_facefusion_service
+        from backend.services.image_service import ImageService
+
+        job.set_status(JobStatus.RUNNING)
+
+        async with AsyncSessionLocal() as session:
+            service = ImageService(session, get_facefusion_service())
+            try:
+                if job.image_type == "profile":
+                    result = await service.generate_profile(
+                        job.participation_id, reuse_speculative=False, cancel_token=job.cancel_token
+                    )
+                else:
+                    result = await service.generate_talent(
+                        job.participation_id, reuse_speculative=False, cancel_token=job.cancel_token
+                    )
+                await session.commit()
+                job.result = result
+                job.set_status(JobStatus.DONE)
+
+            except (GenerationCancelledException, GenerationTimeoutException) as e:
+                await session.rollback()
+                job.error = e.message
+                job.set_status(JobStatus.CANCELLED)
+
+            except AppException as e:
+                await session.rollback()
+                job.error = e.message
+                job.set_status(JobStatus.FAILED)
+
+            except Exception as e:
+                await session.rollback()
+                logger.error(f"❌ Generation job {job.job_id} failed: {e}")
+                job.error = str(e)
+                job.set_status(JobStatus.FAILED)
+
+    def _prune_finished(self) -> None:
+        """보관 시간이 지난 완료 작업 삭제"""
+        cutoff = time.time() - self.retention_seconds
+        expired = [
+            job_id
+            for job_id, job in self._jobs.items()
+            if job.is_finished and job.finished_at < cutoff
+        ]
+        for job_id in expired:
+            del self._jobs[job_id]
+
+
+# 프로세스 전역 싱글톤
+_job_manager: Optional[GenerationJobManager] = None
+
+
+def get_job_manager() -> GenerationJobManager:
+    """프로세스 전역 GenerationJobManager 인스턴스 반환"""
+    global _job_manager
+
+    if _job_manager is None:
+        _job_manager = GenerationJobManager(
+            queue_size=settings.job.queue_size,
+            concurrency=settings.job.concurrency,
+            retention_seconds=settings.job.retention_seconds,
+        )
+    return _job_manager
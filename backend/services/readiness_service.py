@@ -0,0 +1,102 @@
+"""
+Readiness Service
+
+서버가 생성 요청을 받을 준비가 되었는지 확인합니다 (GET /ready).
+/health가 프로세스 생존만 보고하는 것과 달리 추론 엔진 상태(cold/warming/ready/degraded),
+진행 중인 생성 수와 용량, 최근 추론 지연 시간, DB 연결, output_dir 여유 공간을 보고하여
+Electron 앱과 로드 밸런서가 실제 용량에 따라 사용자를 보내거나 대기시킬 수 있게 합니다.
+"""
+
+import asyncio
+import logging
+import shutil
+import time
+from pathlib import Path
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from backend.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# DB 연결 확인 제한 시간 (초)
+DB_CHECK_TIMEOUT_SECONDS = 2.0
+
+
+class ReadinessService:
+    """준비 상태 확인 서비스"""
+
+    def __init__(self, db: AsyncSession, facefusion):
+        self.db = db
+        self.facefusion = facefusion
+
+    async def check(self) -> dict:
+        """
+        준비 상태 확인
+
+        추론 엔진이 요청을 받을 수 있고(ready, 워밍업을 하지 않는 경우 cold 포함)
+        대기열이 가득 차지 않았으며, DB에 연결되고
+        output_dir 여유 공간이 STORAGE_MIN_FREE_DISK_MB 이상이면 준비된 것으로 봅니다.
+
+        Returns:
+            준비 상태 (ready, engine, database, disk)
+        """
+        engine = self.facefusion.get_status()
+        database = await self._check_database()
+        disk = await asyncio.to_thread(self._check_disk)
+
+        ready = (
+            engine["accepting"]
+            and not engine["saturated"]
+            and database["reachable"]
+            and disk["ok"]
+        )
+        return {
+            "ready": ready,
+            "engine": engine,
+            "database": database,
+            "disk": disk,
+        }
+
+    async def _check_database(self) -> dict:
+        """DB 연결 확인 (SELECT 1)"""
+        start_time = time.perf_counter()
+        try:
+            await asyncio.wait_for(self.db.execute(text("SELECT 1")), DB_CHECK_TIMEOUT_SECONDS)
+        except Exception as e:
+            logger.warning(f"⚠️ Readiness DB check failed: {e!r}")
+            try:
+                await self.db.rollback()
+            except Exception:
+                pass
+            return {
+                "reachable": False,
+                "latency_ms": round((time.perf_counter() - start_time) * 1000, 1),
+                "error": type(e).__name__,
+            }
+        return {
+            "reachable": True,
+            "latency_ms": round((time.perf_counter() - start_time) * 1000, 1),
+        }
+
+    @staticmethod
+    def _check_disk() -> dict:
+        """output_dir 여유 공간 확인"""
+        output_dir = Path(settings.storage.output_dir)
+        min_free_mb = settings.storage.min_free_disk_mb
+        try:
+            output_dir.mkdir(parents=True, exist_ok=True)
+            usage = shutil.disk_usage(output_dir)
+        except OSError as e:
+            logger.warning(f"⚠️ Readiness disk check failed: {e!r}")
+            return {"ok": False, "path": str(output_dir), "error": type(e).__name__}
+
+        free_mb = usage.free / (1024 * 1024)
+        return {
+            "ok": free_mb >= min_free_mb,
+            "path": str(output_dir),
+            "free_mb": round(free_mb, 1),
+            "total_mb": round(usage.total / (1024 * 1024), 1),
+            "min_free_mb": min_free_mb,
+        }
@@ -4,18 +4,29 @@ Session Service
 세션 관리 비즈니스 로직을 처리합니다.
 """
 
-from typing import Optional
+import logging
+from typing import Optional, Tuple
 from sqlalchemy.ext.asyncio import AsyncSession
 from fastapi import UploadFile
 
 from backend.repositories.participation_repo import ParticipationRepository
 from backend.repositories.participation_history_repo import ParticipationHistoryRepository
+from backend.core.config import settings
 from backend.exceptions import (
+    AppException,
     SessionNotFoundException,
     InvalidGenderException,
+    InvalidFaceImageException,
+    JobQueueFullException,
 )
+from backend.facefusion_service import get_facefusion_service
+from backend.services.job_service import get_job_manager
+from backend.services.storage_service import StorageService
+from backend.utils.content_store import StagedFile
 from backend.utils.file_handler import FileHandler
 
+logger = logging.getLogger(__name__)
+
 
 class SessionService:
     """세션 관리 서비스"""
@@ -25,6 +36,7 @@ class SessionService:
         self.participation_repo = ParticipationRepository(db)
         self.history_repo = ParticipationHistoryRepository(db)
         self.file_handler = FileHandler()
+        self.storage = StorageService(db, self.file_handler)
 
     async def create_session(self, consent_agreed: bool) -> dict:
         """
@@ -108,12 +120,14 @@ class SessionService:
             image: 업로드된 이미지 파일
 
         Returns:
-            업로드 결과
+            업로드 결과 (original_image_width/height: 정규화된 사진 크기,
+            face_check: 얼굴 확인 결과, 확인하지 않았으면 None)
 
         Raises:
             SessionNotFoundException: 세션을 찾을 수 없음
             InvalidFileTypeException: 지원하지 않는 파일 형식
             FileSizeExceededException: 파일 크기 초과
+            InvalidFaceImageException: 읽을 수 없거나, 얼굴이 없거나 여러 명이거나 작거나 흐린 사진
         """
         # 세션 조회
         participation = await self.participation_repo.get_by_id(participation_id)
@@ -123,23 +137,105 @@ class SessionService:
         # 파일 검증
         self.file_handler.validate_file(image)
 
-        # 파일 저장
-        file_path = await self.file_handler.save_upload_file(
-            image,
-            prefix="original"
-        )
+        # 임시 파일로 받기
+        staged = await self.file_handler.receive_upload_file(image)
+
+        try:
+            # 정규화 (이후 얼굴 확인, 합성, 이미지 제공은 정규화된 파일만 읽음)
+            staged, image_size = await self._normalize_upload(staged)
+
+            # 합성할 수 없는 사진은 생성 전에 거절 (실패할 추론에 CPU를 쓰지 않음)
+            face_check = await self._check_face(staged)
+        except BaseException:
+            await self.file_handler.discard_staged_file(staged)
+            raise
+
+        # 파일 저장 (같은 사진은 한 번만 저장) 및 이전 사진 참조 해제
+        file_path = await self.storage.store_upload(staged)
+        await self.storage.release(participation.original_image_path)
 
         # DB 업데이트
+        width, height = image_size or (None, None)
         updated = await self.participation_repo.update(
             participation_id,
-            {"original_image_path": file_path}
+            {
+                "original_image_path": file_path,
+                "original_image_width": width,
+                "original_image_height": height,
+            }
         )
 
+        # 이전 사진으로 미리 시작한 생성은 취소 (새 사진의 결과를 덮어쓰지 않도록)
+        get_job_manager().cancel_superseded(participation_id, updated.original_image_path)
+
+        # 추측 생성: 성별이 정해져 있으면 프로필/장기자랑 생성을 미리 시작
+        if settings.job.speculative_generation and updated.gender:
+            # 백그라운드 작업은 별도 DB 세션을 사용하므로 먼저 커밋
+            await self.db.commit()
+            self._start_speculative_generation(participation_id, updated.original_image_path)
+
         return {
             "participation_id": updated.participation_id,
             "original_image_path": updated.original_image_path,
+            "original_image_width": updated.original_image_width,
+            "original_image_height": updated.original_image_height,
+            "face_check": face_check,
         }
 
+    async def _normalize_upload(self, staged: StagedFile) -> Tuple[StagedFile, Optional[Tuple[int, int]]]:
+        """
+        업로드 사진 정규화 (FileHandler.normalize_upload_file)
+
+        Raises:
+            InvalidFaceImageException: 이미지로 읽을 수 없는 파일 (reason: unreadable)
+        """
+        try:
+            return await self.file_handler.normalize_upload_file(staged)
+        except RuntimeError as e:
+            logger.info(f"Upload rejected: unreadable image ({e})")
+            raise InvalidFaceImageException("unreadable")
+
+    async def _check_face(self, staged: StagedFile) -> Optional[dict]:
+        """
+        업로드 사진 얼굴 확인 (저장소로 옮기기 전의 임시 파일)
+
+        확인 자체가 실패하면 (대기열 가득 참, 워커 오류) 업로드를 막지 않고 건너뜁니다.
+
+        Raises:
+            InvalidFaceImageException: 합성할 수 없는 사진
+        """
+        if not settings.facefusion.face_check_enabled:
+            return None
+
+        try:
+            report = await get_facefusion_service().check_face(str(staged.path))
+        except (AppException, RuntimeError) as e:
+            logger.warning(f"⚠️ Upload face check skipped: {e}")
+            return None
+
+        if not report["accepted"]:
+            logger.info(f"Upload rejected by face check: {report['reason']} ({report})")
+            raise InvalidFaceImageException(report["reason"], details=report)
+        return report
+
+    def _start_speculative_generation(self, participation_id: int, source_image_path: str) -> None:
+        """프로필/장기자랑 생성 작업 미리 제출 (대기열이 가득 차면 건너뜀)"""
+        job_manager = get_job_manager()
+        for image_type in ("profile", "talent"):
+            try:
+                job_manager.submit(
+                    participation_id,
+                    image_type,
+                    source_image_path=source_image_path,
+                    speculative=True,
+                )
+            except JobQueueFullException:
+                logger.info(
+                    f"Generation job queue is full, skipping speculative {image_type} "
+                    f"(participation={participation_id})"
+                )
+                return
+
     async def get_result(self, participation_id: int) -> dict:
         """
         결과 조회 (화면 #7-1, #9-1)
@@ -163,21 +259,21 @@ class SessionService:
         # 프로필 결과
         profile_result = None
         if participation.generated_profile_image_path:
-            filename = participation.generated_profile_image_path.split("/")[-1]
             profile_result = {
                 "selected_profile_name": participation.selected_profile.profile_name if participation.selected_profile else None,
                 "generated_profile_image_path": participation.generated_profile_image_path,
-                "image_url": self.file_handler.get_image_url(filename),
+                "image_url": self.file_handler.get_stored_image_url(participation.generated_profile_image_path),
+                "renditions": self.storage.get_rendition_urls(participation.generated_profile_image_path),
             }
 
         # 장기자랑 결과
         talent_result = None
         if participation.generated_talent_image_path:
-            filename = participation.generated_talent_image_path.split("/")[-1]
             talent_result = {
                 "selected_talent_name": participation.selected_talent.talent_name if participation.selected_talent else None,
                 "generated_talent_image_path": participation.generated_talent_image_path,
-                "image_url": self.file_handler.get_image_url(filename),
+                "image_url": self.file_handler.get_stored_image_url(participation.generated_talent_image_path),
+                "renditions": self.storage.get_rendition_urls(participation.generated_talent_image_path),
             }
 
         return {
@@ -213,6 +309,8 @@ class SessionService:
             "gender": participation.gender,
             "generated_profile_image_path": participation.generated_profile_image_path,
             "generated_talent_image_path": participation.generated_talent_image_path,
+            "profile_renditions": self.storage.get_rendition_urls(participation.generated_profile_image_path),
+            "talent_renditions": self.storage.get_rendition_urls(participation.generated_talent_image_path),
             "selected_profile_name": participation.selected_profile.profile_name if participation.selected_profile else None,
             "selected_talent_name": participation.selected_talent.talent_name if participation.selected_talent else None,
         }
@@ -0,0 +1,248 @@
+"""
+Storage Service
+
+해시 이름 저장소(backend.utils.content_store)의 파일 저장과 참조 수 관리를 처리합니다.
+
+- 저장: 임시 파일을 저장소로 옮기고 참조 수 1 증가 (같은 내용이 이미 있으면 파일은 하나만 유지)
+- 해제: 참여 세션이 더 이상 가리키지 않는 경로의 참조 수 1 감소
+- 정리: 참조 수가 0인 파일과 오래된 임시 파일 삭제 (데이터 정리 스케줄러)
+- 파생 이미지: 생성 이미지의 용도별 rendition 생성 (backend.utils.renditions)
+- 제공 캐시: 방금 생성한 이미지를 /images 메모리 캐시에 미리 등록 (backend.utils.image_cache)
+
+파일 이동/삭제와 참조 수 변경은 프로세스 안에서 하나의 잠금으로 직렬화하여, 정리 중인
+파일을 같은 내용의 새 업로드가 다시 참조하는 경우에도 파일이 사라지지 않게 합니다.
+"""
+
+import asyncio
+import logging
+import time
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from backend.core.config import settings
+from backend.core.metrics import metrics
+from backend.repositories.stored_file_repo import StoredFileRepository
+from backend.utils.content_store import ContentStore, StagedFile
+from backend.utils.file_handler import FileHandler
+from backend.utils.hashing import get_file_digest_cache
+from backend.utils.image_cache import get_image_cache
+from backend.utils.image_utils import decode_bounded
+from backend.utils.renditions import get_rendition_executor, rendition_specs, write_rendition
+
+logger = logging.getLogger(__name__)
+
+UPLOAD_STORE = "upload"
+OUTPUT_STORE = "output"
+
+# 이보다 오래된 임시 파일은 정리 시 삭제 (취소된 생성의 출력, 중단된 업로드)
+STAGING_MAX_AGE_SECONDS = 24 * 3600
+
+# 저장소 파일 이동/삭제와 참조 수 변경 직렬화
+_store_lock = asyncio.Lock()
+
+
+class StorageService:
+    """해시 이름 저장소 서비스"""
+
+    def __init__(self, db: AsyncSession, file_handler: Optional[FileHandler] = None):
+        self.db = db
+        self.stored_file_repo = StoredFileRepository(db)
+        self.file_handler = file_handler or FileHandler()
+        self.stores: Dict[str, ContentStore] = {
+            UPLOAD_STORE: self.file_handler.upload_store,
+            OUTPUT_STORE: self.file_handler.output_store,
+        }
+        self.rendition_specs = rendition_specs(settings.storage)
+
+    async def store_upload(self, staged: StagedFile) -> str:
+        """
+        업로드 임시 파일을 원본 사진 저장소에 저장
+
+        Args:
+            staged: FileHandler.receive_upload_file()로 받은 임시 파일
+
+        Returns:
+            DB에 저장할 상대 경로
+        """
+        return await self._store(UPLOAD_STORE, staged)
+
+    async def store_output(self, staging_path: str) -> Tuple[str, str]:
+        """
+        생성 이미지 임시 파일을 생성 이미지 저장소에 저장
+
+        Args:
+            staging_path: FileHandler.get_output_staging_path() 경로 (생성 완료된 파일)
+
+        Returns:
+            (DB에 저장할 상대 경로, 저장된 파일의 전체 경로)
+        """
+        store = self.stores[OUTPUT_STORE]
+        staged = await asyncio.to_thread(store.stage, staging_path, "jpg")
+        relative_path = await self._store(OUTPUT_STORE, staged)
+        return relative_path, str(store.path(staged.digest, staged.extension))
+
+    async def create_renditions(self, relative_path: str) -> None:
+        """
+        생성 이미지의 파생 이미지(rendition) 생성
+
+        원본을 한 번 디코딩한 뒤 rendition별 크기 조정/인코딩을 rendition 스레드 풀에서
+        병렬로 실행합니다. 이미 있는 rendition(같은 내용의 이전 생성)은 건너뛰고,
+        실패한 rendition은 경고만 남깁니다 (원본은 그대로 제공).
+
+        Args:
+            relative_path: store_output()이 반환한 상대 경로
+        """
+        store = self.stores[OUTPUT_STORE]
+        parsed = store.parse(relative_path)
+        if parsed is None:
+            return
+        digest, extension = parsed
+        pending = [
+            spec for spec in self.rendition_specs
+            if not store.rendition_path(digest, spec.name, spec.format).exists()
+        ]
+        if not pending:
+            return
+
+        loop = asyncio.get_running_loop()
+        executor = get_rendition_executor(settings.storage)
+        start_time = time.perf_counter()
+        try:
+            frame, _, _ = await loop.run_in_executor(
+                executor, decode_bounded, str(store.path(digest, extension)), 0
+            )
+        except RuntimeError as e:
+            logger.warning(f"⚠️ 파생 이미지를 만들 수 없습니다: {e}")
+            return
+
+        results = await asyncio.gather(
+            *(
+                loop.run_in_executor(
+                    executor,
+                    write_rendition,
+                    frame,
+                    spec,
+                    store.rendition_path(digest, spec.name, spec.format),
+                    store.staging_path(spec.format),
+                )
+                for spec in pending
+            ),
+            return_exceptions=True,
+        )
+        for spec, result in zip(pending, results):
+            if isinstance(result, BaseException):
+                logger.warning(f"⚠️ 파생 이미지 '{spec.name}' 생성 실패: {result}")
+        metrics.observe("rendition_seconds", time.perf_counter() - start_time)
+
+    def get_rendition_urls(self, relative_path: Optional[str]) -> Dict[str, str]:
+        """
+        생성 이미지의 파생 이미지 URL (있는 것만, 이전 방식의 파일명이면 빈 dict)
+
+        Args:
+            relative_path: DB에 저장된 생성 이미지 경로
+
+        Returns:
+            rendition 이름 → 이미지 접근 URL
+        """
+        store = self.stores[OUTPUT_STORE]
+        parsed = store.parse(relative_path)
+        if parsed is None:
+            return {}
+        digest, _ = parsed
+        return {
+            spec.name: self.file_handler.get_stored_image_url(
+                store.relative_rendition_path(digest, spec.name, spec.format)
+            )
+            for spec in self.rendition_specs
+            if store.rendition_path(digest, spec.name, spec.format).exists()
+        }
+
+    async def prime_image_cache(self, relative_path: str) -> None:
+        """
+        생성 이미지와 파생 이미지를 /images 메모리 캐시에 등록
+
+        QR 스캔 직후 휴대폰과 키오스크가 같은 이미지를 요청하므로 첫 요청부터 디스크를 읽지 않게 합니다.
+
+        Args:
+            relative_path: store_output()이 반환한 상대 경로
+        """
+        store = self.stores[OUTPUT_STORE]
+        parsed = store.parse(relative_path)
+        if parsed is None:
+            return
+        digest, extension = parsed
+        await asyncio.to_thread(get_image_cache().prime, self._served_paths(store, digest, extension))
+
+    async def release(self, relative_path: Optional[str]) -> None:
+        """
+        경로의 참조 해제 (참조 수 1 감소, 파일은 정리 시 삭제)
+
+        저장소 경로가 아니면 (이전 방식의 파일명, 빈 값) 아무것도 하지 않습니다.
+
+        Args:
+            relative_path: DB에 저장되어 있던 상대 경로
+        """
+        for name, store in self.stores.items():
+            parsed = store.parse(relative_path)
+            if parsed is None:
+                continue
+            async with _store_lock:
+                ref_count = await self.stored_file_repo.release(name, parsed[0])
+            if ref_count is None:
+                logger.warning(f"⚠️ 참조 기록이 없는 저장 파일: {relative_path}")
+            return
+
+    async def collect_garbage(self, limit: int = 1000) -> Dict[str, int]:
+        """
+        참조 수가 0인 파일과 오래된 임시 파일 삭제
+
+        레코드 삭제를 커밋한 뒤 파일을 삭제하므로, 호출자는 진행 중인 변경을 먼저 커밋해야 합니다.
+
+        Args:
+            limit: 한 번에 삭제할 최대 파일 수
+
+        Returns:
+            삭제한 파일 수 (files, bytes, staging)
+        """
+        removed = {"files": 0, "bytes": 0, "staging": 0}
+        async with _store_lock:
+            unreferenced = []
+            for stored in await self.stored_file_repo.get_unreferenced(limit):
+                if await self.stored_file_repo.delete_if_unreferenced(stored.store, stored.digest):
+                    unreferenced.append((stored.store, stored.digest, stored.extension, stored.size_bytes))
+            await self.db.commit()
+
+            for name, digest, extension, size_bytes in unreferenced:
+                store = self.stores.get(name)
+                if store is None:
+                    continue
+                get_image_cache().discard(self._served_paths(store, digest, extension))
+                if await asyncio.to_thread(store.remove, digest, extension):
+                    removed["files"] += 1
+                    removed["bytes"] += size_bytes
+
+        for store in self.stores.values():
+            removed["staging"] += await asyncio.to_thread(store.sweep_staging, STAGING_MAX_AGE_SECONDS)
+        return removed
+
+    def _served_paths(self, store: ContentStore, digest: str, extension: str) -> List[str]:
+        """저장 파일과 파생 이미지의 절대 경로 (/images 캐시 키)"""
+        return [str(store.path(digest, extension))] + [
+            str(store.rendition_path(digest, spec.name, spec.format)) for spec in self.rendition_specs
+        ]
+
+    async def _store(self, name: str, staged: StagedFile) -> str:
+        """임시 파일을 저장소로 옮기고 참조 수 1 증가 (실패하면 임시 파일 삭제)"""
+        store = self.stores[name]
+        try:
+            async with _store_lock:
+                await self.stored_file_repo.add_reference(name, staged.digest, staged.extension, staged.size)
+                stored_path = await asyncio.to_thread(store.put, staged)
+        except BaseException:
+            await asyncio.to_thread(staged.path.unlink, missing_ok=True)
+            raise
+
+        # 결과 캐시 키 계산 시 파일을 다시 읽지 않도록 해시 등록
+        get_file_digest_cache().prime(str(stored_path), staged.digest)
+        return store.relative_path(staged.digest, staged.extension)
@@ -0,0 +1,150 @@
+"""
+Content-addressed file store.
+
+파일을 내용 해시(SHA-256)로 이름 붙여 `{root}/{해시[0:2]}/{해시[2:4]}/{해시}.{확장자}`에
+저장합니다. 디렉토리 하나에 파일이 수만 개 쌓이지 않고 (조회, 목록, 백업이 느려지지 않음),
+같은 내용은 한 번만 저장되며, 해시만 알면 디렉토리를 찾지 않고 바로 경로를 계산합니다.
+
+파일은 먼저 `{root}/.staging/`에 쓰고(StagedFile) 해시를 구한 뒤 최종 경로로 원자적으로
+이동하므로, 저장소의 파일은 한 번 저장되면 바뀌지 않습니다. 파생 이미지(rendition)는
+같은 디렉토리에 `{해시}.{이름}.{확장자}`로 저장되어 원본과 함께 삭제됩니다. 참조 수(DB)는
+backend.services.storage_service.StorageService가 관리합니다.
+"""
+
+import os
+import re
+import time
+import uuid
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Optional, Tuple
+
+from backend.utils.hashing import file_sha256
+
+# 쓰는 중이거나 저장소로 옮기기 전인 파일 디렉토리
+STAGING_DIR = ".staging"
+
+_STORED_NAME = re.compile(r"^([0-9a-f]{2})/([0-9a-f]{2})/([0-9a-f]{64})\.([a-z0-9]+)$")
+
+
+@dataclass(frozen=True)
+class StagedFile:
+    """저장소로 옮기기 전의 파일"""
+
+    path: Path
+    digest: str
+    size: int
+    extension: str
+
+
+class ContentStore:
+    """해시 이름 파일 저장소 (디렉토리 1개)"""
+
+    def __init__(self, root: str, path_prefix: str):
+        """
+        Args:
+            root: 저장소 디렉토리
+            path_prefix: DB에 저장하는 상대 경로 prefix (예: /output)
+        """
+        self.root = Path(root)
+        self.staging_dir = self.root / STAGING_DIR
+        self.path_prefix = path_prefix.rstrip("/")
+        self.staging_dir.mkdir(parents=True, exist_ok=True)
+
+    def staging_path(self, extension: str) -> Path:
+        """새 임시 파일 경로"""
+        return self.staging_dir / f"{uuid.uuid4().hex}.{extension}"
+
+    def path(self, digest: str, extension: str) -> Path:
+        """해시의 저장 경로"""
+        return self.root / self._name(digest, extension)
+
+    def relative_path(self, digest: str, extension: str) -> str:
+        """DB에 저장하는 상대 경로 (예: /output/ab/cd/abcd....jpg)"""
+        return f"{self.path_prefix}/{self._name(digest, extension)}"
+
+    def rendition_path(self, digest: str, name: str, extension: str) -> Path:
+        """해시 파일의 파생 이미지(rendition) 경로 (같은 디렉토리의 <해시>.<이름>.<확장자>)"""
+        return self.root / self._name(digest, f"{name}.{extension}")
+
+    def relative_rendition_path(self, digest: str, name: str, extension: str) -> str:
+        """파생 이미지의 상대 경로"""
+        return f"{self.path_prefix}/{self._name(digest, f'{name}.{extension}')}"
+
+    def parse(self, relative_path: Optional[str]) -> Optional[Tuple[str, str]]:
+        """
+        상대 경로에서 (해시, 확장자) 추출
+
+        Returns:
+            (해시, 확장자) 또는 None (이 저장소의 경로가 아님, 예: 이전 방식의 파일명)
+        """
+        if not relative_path or not relative_path.startswith(f"{self.path_prefix}/"):
+            return None
+        match = _STORED_NAME.match(relative_path[len(self.path_prefix) + 1:])
+        if not match or match.group(3)[:4] != match.group(1) + match.group(2):
+            return None
+        return match.group(3), match.group(4)
+
+    def stage(self, path: str, extension: str) -> StagedFile:
+        """이미 쓴 임시 파일의 해시 계산 (스레드에서 실행)"""
+        staged_path = Path(path)
+        return StagedFile(
+            path=staged_path,
+            digest=file_sha256(str(staged_path)),
+            size=staged_path.stat().st_size,
+            extension=extension,
+        )
+
+    def put(self, staged: StagedFile) -> Path:
+        """
+        임시 파일을 저장소로 이동 (같은 내용이 이미 있으면 임시 파일만 삭제, 스레드에서 실행)
+
+        Returns:
+            저장 경로
+        """
+        stored = self.path(staged.digest, staged.extension)
+        if stored.exists():
+            staged.path.unlink(missing_ok=True)
+            return stored
+        stored.parent.mkdir(parents=True, exist_ok=True)
+        os.replace(staged.path, stored)
+        return stored
+
+    def remove(self, digest: str, extension: str) -> bool:
+        """
+        저장된 파일과 파생 이미지 삭제 (스레드에서 실행)
+
+        Returns:
+            저장된 파일을 삭제했는지
+        """
+        stored = self.path(digest, extension)
+        for rendition in stored.parent.glob(f"{digest}.*.*"):
+            rendition.unlink(missing_ok=True)
+        try:
+            stored.unlink()
+            return True
+        except FileNotFoundError:
+            return False
+
+    def sweep_staging(self, max_age_seconds: float) -> int:
+        """
+        오래된 임시 파일 삭제 (취소된 생성의 출력 등, 스레드에서 실행)
+
+        Returns:
+            삭제한 파일 수
+        """
+        cutoff = time.time() - max_age_seconds
+        removed = 0
+        for entry in os.scandir(self.staging_dir):
+            try:
+                if entry.is_file() and entry.stat().st_mtime < cutoff:
+                    os.unlink(entry.path)
+                    removed += 1
+            except FileNotFoundError:
+                continue
+        return removed
+
+    @staticmethod
+    def _name(digest: str, extension: str) -> str:
+        """저장소 안의 상대 경로 (해시 앞 4자리로 2단계 분할)"""
+        return f"{digest[:2]}/{digest[2:4]}/{digest}.{extension}"
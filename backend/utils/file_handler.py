@@ -2,13 +2,15 @@
 File upload and storage handler.
 
 파일 업로드, 저장, 검증을 처리하는 유틸리티 클래스입니다.
+업로드는 청크 단위로 읽으면서 크기 제한 확인, SHA-256 계산, 임시 파일 쓰기를 합니다
+(파일 I/O는 스레드에서 실행). 원본 사진과 생성 이미지는 해시 이름 저장소
+(backend.utils.content_store)에 저장되며, 참조 수는 StorageService가 관리합니다.
 """
 
-import os
-import uuid
-from datetime import datetime
+import asyncio
+import hashlib
 from pathlib import Path
-from typing import Optional, Tuple
+from typing import Any, BinaryIO, Optional, Tuple
 
 from fastapi import UploadFile
 
@@ -18,6 +20,14 @@ from backend.exceptions import (
     FileSizeExceededException,
     FileUploadException,
 )
+from backend.utils.content_store import ContentStore, StagedFile
+from backend.utils.image_utils import encode_normalized_jpeg, read_image_size
+
+# 업로드를 읽고 쓰는 단위 (업로드 1건의 최대 메모리 사용량)
+UPLOAD_CHUNK_SIZE = 256 * 1024  # 256KB
+
+# 생성 이미지 DB 경로 prefix (/images로 제공)
+OUTPUT_PATH_PREFIX = "/output"
 
 
 class FileHandler:
@@ -33,6 +43,10 @@ class FileHandler:
         self.upload_dir.mkdir(parents=True, exist_ok=True)
         self.output_dir.mkdir(parents=True, exist_ok=True)
 
+        # 해시 이름 저장소 (DB 경로: /{upload_dir}/ab/cd/<해시>.jpg, /output/ab/cd/<해시>.jpg)
+        self.upload_store = ContentStore(settings.storage.upload_dir, f"/{settings.storage.upload_dir}")
+        self.output_store = ContentStore(settings.storage.output_dir, OUTPUT_PATH_PREFIX)
+
     def validate_file(self, file: UploadFile) -> None:
         """
         파일 유효성 검증
@@ -52,78 +66,147 @@ class FileHandler:
                 allowed_types=self.allowed_extensions
             )
 
-        # 파일 크기 검증 (실제 크기 확인을 위해 content-length 헤더 사용)
-        # Note: UploadFile은 file-like object이므로 실제 크기는 읽어야 알 수 있음
-        # 여기서는 간단히 확장자만 검증하고, 실제 저장 시 크기 확인
+        # 파일 크기 검증 (multipart 파서가 알려준 크기, 없으면 저장하면서 확인)
+        if file.size is not None and file.size > self.max_file_size:
+            raise FileSizeExceededException(
+                file_size=file.size,
+                max_size=self.max_file_size
+            )
 
-    async def save_upload_file(
-        self,
-        file: UploadFile,
-        prefix: str = "original"
-    ) -> str:
+    async def receive_upload_file(self, file: UploadFile) -> StagedFile:
         """
-        업로드된 파일을 저장
+        업로드된 파일을 원본 사진 저장소의 임시 파일로 받기
+
+        UPLOAD_CHUNK_SIZE 단위로 읽어 임시 파일에 쓰고, 크기 제한을 넘는 즉시 중단합니다.
+        읽으면서 계산한 SHA-256은 저장소 파일명이 되므로 파일을 다시 읽지 않습니다.
+        저장소로 옮기기(StorageService.store_upload) 전에 얼굴 확인 등을 할 수 있으며,
+        사용하지 않을 임시 파일은 discard_staged_file()로 삭제합니다.
 
         Args:
             file: 업로드된 파일
-            prefix: 파일명 prefix
 
         Returns:
-            저장된 파일의 경로
+            임시 파일 (경로, 해시, 크기, 확장자)
 
         Raises:
+            FileSizeExceededException: 파일 크기 초과 (file_size는 중단 시점까지 읽은 크기)
             FileUploadException: 파일 저장 실패
         """
         try:
-            # 파일명 생성
             file_ext = self._get_file_extension(file.filename)
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            unique_id = uuid.uuid4().hex[:8]
-            filename = f"{prefix}_{timestamp}_{unique_id}.{file_ext}"
+            temp_path = self.upload_store.staging_path(file_ext)
+            digest, size = await self._stream_to_file(file, temp_path)
+            return StagedFile(path=temp_path, digest=digest, size=size, extension=file_ext)
+
+        except (InvalidFileTypeException, FileSizeExceededException):
+            raise
+        except Exception as e:
+            raise FileUploadException(reason=str(e))
+
+    async def _stream_to_file(self, file: UploadFile, temp_path: Path) -> Tuple[str, int]:
+        """
+        업로드를 청크 단위로 임시 파일에 쓰기 (실패하면 임시 파일 삭제)
 
-            # 저장 경로
-            file_path = self.upload_dir / filename
+        Returns:
+            (파일 내용의 SHA-256 (16진수), 파일 크기)
 
-            # 파일 저장
-            content = await file.read()
+        Raises:
+            FileSizeExceededException: 파일 크기 초과
+        """
+        digest = hashlib.sha256()
+        size = 0
+        handle = await asyncio.to_thread(open, temp_path, "wb")
+        try:
+            while True:
+                chunk = await file.read(UPLOAD_CHUNK_SIZE)
+                if not chunk:
+                    break
+                size += len(chunk)
+                if size > self.max_file_size:
+                    raise FileSizeExceededException(
+                        file_size=size,
+                        max_size=self.max_file_size
+                    )
+                await asyncio.to_thread(self._write_chunk, handle, digest, chunk)
+            await asyncio.to_thread(handle.close)
+        except BaseException:
+            await asyncio.to_thread(self._discard_file, handle, temp_path)
+            raise
+        return digest.hexdigest(), size
 
-            # 파일 크기 검증
-            if len(content) > self.max_file_size:
-                raise FileSizeExceededException(
-                    file_size=len(content),
-                    max_size=self.max_file_size
-                )
+    @staticmethod
+    def _write_chunk(handle: BinaryIO, digest: Any, chunk: bytes) -> None:
+        """청크 해시 갱신 및 쓰기 (스레드에서 실행)"""
+        digest.update(chunk)
+        handle.write(chunk)
 
-            with open(file_path, "wb") as f:
-                f.write(content)
+    @staticmethod
+    def _discard_file(handle: BinaryIO, temp_path: Path) -> None:
+        """임시 파일 닫기 및 삭제 (스레드에서 실행)"""
+        handle.close()
+        temp_path.unlink(missing_ok=True)
 
-            # 상대 경로 반환
-            return f"/{settings.storage.upload_dir}/{filename}"
+    async def normalize_upload_file(self, staged: StagedFile) -> Tuple[StagedFile, Optional[Tuple[int, int]]]:
+        """
+        업로드 임시 파일을 표준 JPEG으로 다시 인코딩 (스레드에서 실행)
 
-        except (InvalidFileTypeException, FileSizeExceededException):
+        EXIF 방향 적용, 메타데이터 제거, 긴 변 STORAGE_UPLOAD_MAX_DIMENSION 제한,
+        STORAGE_UPLOAD_JPEG_QUALITY 품질로 인코딩합니다. 이후 얼굴 확인, 합성, 이미지 제공은
+        모두 정규화된 파일을 사용합니다. 정규화가 꺼져 있으면 받은 파일을 그대로 사용합니다.
+
+        Args:
+            staged: receive_upload_file()로 받은 임시 파일 (성공하면 삭제)
+
+        Returns:
+            (정규화된 임시 파일, (너비, 높이)), 정규화가 꺼져 있으면 크기는 헤더에서 읽은 값 (없으면 None)
+
+        Raises:
+            RuntimeError: 이미지 디코딩 실패 (받은 임시 파일은 그대로 둠)
+        """
+        if not settings.storage.normalize_uploads:
+            return staged, await asyncio.to_thread(read_image_size, str(staged.path))
+        return await asyncio.to_thread(self._normalize_file, staged)
+
+    def _normalize_file(self, staged: StagedFile) -> Tuple[StagedFile, Tuple[int, int]]:
+        """표준 JPEG 인코딩 후 새 임시 파일에 쓰기 (스레드에서 실행)"""
+        data, size = encode_normalized_jpeg(
+            str(staged.path),
+            settings.storage.upload_max_dimension,
+            settings.storage.upload_jpeg_quality,
+        )
+        temp_path = self.upload_store.staging_path("jpg")
+        try:
+            temp_path.write_bytes(data)
+        except BaseException:
+            temp_path.unlink(missing_ok=True)
             raise
-        except Exception as e:
-            raise FileUploadException(reason=str(e))
+        staged.path.unlink(missing_ok=True)
+
+        normalized = StagedFile(
+            path=temp_path,
+            digest=hashlib.sha256(data).hexdigest(),
+            size=len(data),
+            extension="jpg",
+        )
+        return normalized, size
 
-    def generate_output_filename(
-        self,
-        image_type: str,
-        participation_id: int
-    ) -> str:
+    async def discard_staged_file(self, staged: StagedFile) -> None:
         """
-        생성된 이미지 파일명 생성
+        저장소로 옮기지 않을 임시 파일 삭제
 
         Args:
-            image_type: 이미지 타입 ('profile' 또는 'talent')
-            participation_id: 참여 ID
+            staged: receive_upload_file()로 받은 임시 파일
+        """
+        await asyncio.to_thread(staged.path.unlink, missing_ok=True)
+
+    def get_output_staging_path(self) -> str:
+        """
+        생성 이미지를 쓸 임시 파일 경로 (StorageService.store_output으로 저장소에 이동)
 
         Returns:
-            생성될 파일명
+            전체 파일 경로
         """
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        unique_id = uuid.uuid4().hex[:8]
-        filename = f"{image_type}_{timestamp}_{unique_id}.jpg"
-        return filename
+        return str(self.output_store.staging_path("jpg"))
 
     def get_output_path(self, filename: str) -> str:
         """
@@ -166,6 +249,22 @@ class FileHandler:
         """
         return f"{request_host}/images/{filename}"
 
+    def get_stored_image_url(self, relative_path: str, request_host: str = "http://localhost:8000") -> str:
+        """
+        DB에 저장된 생성 이미지 경로의 URL 생성
+
+        Args:
+            relative_path: 생성 이미지 경로 (예: /output/ab/cd/<해시>.jpg, 이전 방식 /output/file.jpg)
+            request_host: 요청 호스트
+
+        Returns:
+            이미지 접근 URL
+        """
+        prefix = f"{OUTPUT_PATH_PREFIX}/"
+        if relative_path.startswith(prefix):
+            return self.get_image_url(relative_path[len(prefix):], request_host)
+        return self.get_image_url(relative_path.split("/")[-1], request_host)
+
     def _get_file_extension(self, filename: Optional[str]) -> str:
         """
         파일 확장자 추출
@@ -0,0 +1,67 @@
+"""
+File hashing utilities.
+
+파일 내용 해시(SHA-256) 계산 및 (경로, 수정 시각, 크기) 기준 메모이제이션을 제공합니다.
+"""
+
+import hashlib
+import os
+from typing import Optional
+
+from backend.utils.lru_cache import LRUCache
+
+HASH_CHUNK_SIZE = 1024 * 1024  # 1MB
+
+
+def file_sha256(path: str) -> str:
+    """
+    파일 내용의 SHA-256 해시 계산
+
+    Args:
+        path: 파일 경로
+
+    Returns:
+        16진수 해시 문자열
+    """
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class FileDigestCache:
+    """파일 해시 메모이제이션 (파일이 바뀌면 수정 시각/크기가 달라져 다시 계산)"""
+
+    def __init__(self, capacity: int = 1024):
+        self._digests: LRUCache[str] = LRUCache(max_entries=capacity)
+
+    def get(self, path: str) -> str:
+        """파일 해시 반환 (캐시에 없으면 계산)"""
+        key = self._key(path)
+        digest = self._digests.get(key)
+        if digest is None:
+            digest = file_sha256(path)
+            self._digests.put(key, digest)
+        return digest
+
+    def prime(self, path: str, digest: str) -> None:
+        """이미 알고 있는 해시 등록 (예: 업로드 중 계산한 해시)"""
+        self._digests.put(self._key(path), digest)
+
+    @staticmethod
+    def _key(path: str) -> tuple:
+        stat = os.stat(path)
+        return (os.path.abspath(path), stat.st_mtime_ns, stat.st_size)
+
+
+_default_digest_cache: Optional[FileDigestCache] = None
+
+
+def get_file_digest_cache() -> FileDigestCache:
+    """프로세스 전역 FileDigestCache 반환"""
+    global _default_digest_cache
+
+    if _default_digest_cache is None:
+        _default_digest_cache = FileDigestCache()
+    return _default_digest_cache
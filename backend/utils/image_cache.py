@@ -0,0 +1,120 @@
+"""
+Served image cache.
+
+/images로 제공하는 생성 이미지를 메모리에 보관하는 용량(바이트) 기준 LRU 캐시입니다.
+QR 스캔 후 휴대폰과 키오스크가 같은 몇 장을 반복해서 받으므로 최근 생성 이미지는
+디스크를 읽지 않고 제공합니다. 저장 파일은 내용 해시 이름이라 바뀌지 않으므로 적중 시
+디스크를 확인하지 않고, 데이터 정리로 삭제하는 파일은 StorageService가 discard()로 뺍니다.
+"""
+
+import hashlib
+import logging
+import mimetypes
+import os
+from dataclasses import dataclass
+from typing import Iterable, Optional
+
+from backend.core.config import settings
+from backend.core.metrics import metrics
+from backend.utils.lru_cache import LRUCache
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class CachedImage:
+    """제공할 이미지 (내용, 강한 ETag, 미디어 타입, 수정 시각)"""
+
+    content: bytes
+    etag: str
+    media_type: str
+    mtime_ns: int
+
+
+class ImageCache:
+    """경로 → 이미지 내용 LRU 캐시 (총 바이트 수 제한)"""
+
+    def __init__(self, max_bytes: int, max_file_bytes: int):
+        """
+        Args:
+            max_bytes: 캐시 최대 총 크기 (바이트)
+            max_file_bytes: 캐시할 파일 최대 크기 (이보다 크면 매번 디스크에서 읽음)
+        """
+        self.max_bytes = max_bytes
+        self.max_file_bytes = min(max_file_bytes, max_bytes)
+        self._entries: LRUCache[CachedImage] = LRUCache(
+            max_weight=max_bytes,
+            weigher=lambda entry: len(entry.content),
+        )
+
+    def get(self, path: str) -> Optional[CachedImage]:
+        """
+        캐시된 이미지 조회 (적중/실패 카운터 기록, 디스크를 읽지 않음)
+
+        Returns:
+            캐시된 이미지, 캐시에 없으면 None (load()로 읽기)
+        """
+        entry = self._entries.get(path)
+        metrics.increment("image_cache_hits" if entry is not None else "image_cache_misses")
+        return entry
+
+    def load(self, path: str) -> CachedImage:
+        """
+        파일을 읽어 캐시에 등록 (max_file_bytes 이하만, 스레드에서 실행)
+
+        Raises:
+            FileNotFoundError: 파일이 없음
+        """
+        with open(path, "rb") as f:
+            mtime_ns = os.fstat(f.fileno()).st_mtime_ns
+            content = f.read()
+        entry = CachedImage(
+            content=content,
+            etag=f'"{hashlib.sha256(content).hexdigest()[:32]}"',
+            media_type=mimetypes.guess_type(path)[0] or "application/octet-stream",
+            mtime_ns=mtime_ns,
+        )
+        if len(content) <= self.max_file_bytes:
+            self._entries.put(path, entry)
+        return entry
+
+    def prime(self, paths: Iterable[str]) -> None:
+        """방금 생성한 이미지 미리 등록 (없는 파일은 건너뜀, 스레드에서 실행)"""
+        for path in paths:
+            try:
+                self.load(path)
+            except OSError as e:
+                logger.debug(f"Image cache prime skipped: {path} ({e})")
+
+    def discard(self, paths: Iterable[str]) -> None:
+        """삭제한 파일의 항목 제거"""
+        for path in paths:
+            self._entries.pop(path)
+
+    def get_status(self) -> dict:
+        """항목 수, 사용 용량과 적중률"""
+        return {
+            "entries": len(self._entries),
+            "bytes": self._entries.total_weight,
+            "max_bytes": self.max_bytes,
+            "hits": metrics.counter("image_cache_hits"),
+            "misses": metrics.counter("image_cache_misses"),
+            "hit_ratio": round(
+                metrics.ratio("image_cache_hits", ("image_cache_hits", "image_cache_misses")), 4
+            ),
+        }
+
+
+_default_image_cache: Optional[ImageCache] = None
+
+
+def get_image_cache() -> ImageCache:
+    """프로세스 전역 ImageCache 반환 (STORAGE_IMAGE_CACHE_* 설정)"""
+    global _default_image_cache
+
+    if _default_image_cache is None:
+        _default_image_cache = ImageCache(
+            max_bytes=settings.storage.image_cache_max_bytes,
+            max_file_bytes=settings.storage.image_cache_max_file_bytes,
+        )
+    return _default_image_cache
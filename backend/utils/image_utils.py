@@ -0,0 +1,176 @@
+"""
+Image decoding utilities.
+
+카메라 원본처럼 큰 이미지를 필요한 해상도까지만 디코딩합니다.
+JPEG/PNG 헤더에서 크기를 먼저 읽고, JPEG은 OpenCV 축소 디코딩(1/2, 1/4, 1/8)으로
+전체 해상도 프레임을 메모리에 만들지 않습니다.
+업로드 정규화(encode_normalized_jpeg)도 같은 디코딩을 사용합니다.
+"""
+
+import struct
+from typing import Optional, Tuple
+
+import cv2
+import numpy
+
+# JPEG SOF 마커 (DHT/JPG/DAC 제외한 C0-CF)
+_JPEG_SOF_MARKERS = {0xC0, 0xC1, 0xC2, 0xC3, 0xC5, 0xC6, 0xC7, 0xC9, 0xCA, 0xCB, 0xCD, 0xCE, 0xCF}
+_PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+# EXIF Orientation 태그와 90도 회전(너비/높이가 바뀌는) 방향 값
+_EXIF_ORIENTATION_TAG = 0x0112
+_ROTATED_ORIENTATIONS = {5, 6, 7, 8}
+
+# 축소 배율 → OpenCV 축소 디코딩 플래그 (큰 배율부터)
+_REDUCED_DECODE_FLAGS = (
+    (8, cv2.IMREAD_REDUCED_COLOR_8),
+    (4, cv2.IMREAD_REDUCED_COLOR_4),
+    (2, cv2.IMREAD_REDUCED_COLOR_2),
+)
+
+
+def read_image_size(path: str) -> Optional[Tuple[int, int]]:
+    """
+    이미지 헤더에서 (너비, 높이) 읽기 (JPEG, PNG)
+
+    JPEG은 EXIF 방향(Orientation 5~8, 90도 회전)을 적용한 크기, 즉 OpenCV가 디코딩한
+    프레임과 같은 크기를 반환합니다.
+
+    Args:
+        path: 이미지 파일 경로
+
+    Returns:
+        (너비, 높이), 지원하지 않는 형식이거나 헤더가 손상/잘렸으면 None
+    """
+    try:
+        with open(path, "rb") as f:
+            header = f.read(24)
+            if header.startswith(_PNG_SIGNATURE) and header[12:16] == b"IHDR":
+                width, height = struct.unpack(">II", header[16:24])
+                return width, height
+            if header[:2] != b"\xff\xd8":
+                return None
+
+            f.seek(2)
+            orientation = 1
+            while True:
+                marker = f.read(2)
+                if len(marker) < 2 or marker[0] != 0xFF:
+                    return None
+                # 마커 앞 채움 바이트(0xFF) 건너뛰기
+                while marker[1] == 0xFF:
+                    next_byte = f.read(1)
+                    if not next_byte:
+                        return None
+                    marker = marker[1:] + next_byte
+                if marker[1] in (0xD8, 0x01) or 0xD0 <= marker[1] <= 0xD7:
+                    continue
+                if marker[1] == 0xD9:
+                    return None
+
+                segment_length = struct.unpack(">H", f.read(2))[0]
+                if segment_length < 2:
+                    return None
+                if marker[1] in _JPEG_SOF_MARKERS:
+                    height, width = struct.unpack(">xHH", f.read(5))
+                    return (height, width) if orientation in _ROTATED_ORIENTATIONS else (width, height)
+                if marker[1] == 0xE1 and orientation == 1:
+                    segment = f.read(segment_length - 2)
+                    orientation = _exif_orientation(segment)
+                    continue
+                f.seek(segment_length - 2, 1)
+    except (OSError, struct.error):
+        return None
+
+
+def _exif_orientation(segment: bytes) -> int:
+    """APP1 세그먼트의 EXIF Orientation 값 (없거나 손상되었으면 1)"""
+    if not segment.startswith(b"Exif\x00\x00"):
+        return 1
+    tiff = segment[6:]
+    byte_order = {b"II": "<", b"MM": ">"}.get(tiff[:2])
+    if byte_order is None or len(tiff) < 8:
+        return 1
+    try:
+        ifd_offset = struct.unpack(f"{byte_order}I", tiff[4:8])[0]
+        entry_count = struct.unpack(f"{byte_order}H", tiff[ifd_offset:ifd_offset + 2])[0]
+        for index in range(entry_count):
+            entry = ifd_offset + 2 + index * 12
+            tag, value_type = struct.unpack(f"{byte_order}HH", tiff[entry:entry + 4])
+            if tag == _EXIF_ORIENTATION_TAG and value_type == 3:
+                return struct.unpack(f"{byte_order}H", tiff[entry + 8:entry + 10])[0]
+    except struct.error:
+        return 1
+    return 1
+
+
+def decode_bounded(path: str, max_dimension: int) -> Tuple[numpy.ndarray, float, Tuple[int, int]]:
+    """
+    긴 변이 max_dimension 이하가 되도록 이미지 디코딩
+
+    JPEG은 목표 크기 이상을 유지하는 가장 큰 축소 디코딩 배율을 사용하고, 남은 차이는
+    INTER_AREA로 줄입니다. OpenCV는 EXIF 방향대로 회전하여 디코딩하므로 배율은
+    긴 변끼리의 비율로 계산합니다.
+
+    Args:
+        path: 이미지 파일 경로
+        max_dimension: 긴 변 최대 픽셀 (0 이하이면 원본 크기 그대로 디코딩)
+
+    Returns:
+        (BGR 프레임, 원본 대비 배율(<=1), 원본 (너비, 높이))
+
+    Raises:
+        RuntimeError: 이미지 디코딩 실패
+    """
+    original_size = read_image_size(path)
+
+    flag = cv2.IMREAD_COLOR
+    if max_dimension > 0 and original_size:
+        long_side = max(original_size)
+        for factor, reduced_flag in _REDUCED_DECODE_FLAGS:
+            if long_side // factor >= max_dimension:
+                flag = reduced_flag
+                break
+
+    frame = cv2.imread(path, flag)
+    if frame is None and flag != cv2.IMREAD_COLOR:
+        frame = cv2.imread(path, cv2.IMREAD_COLOR)
+    if frame is None:
+        raise RuntimeError(f"Failed to read image: {path}")
+
+    if original_size is None:
+        original_size = (frame.shape[1], frame.shape[0])
+
+    long_side = max(frame.shape[:2])
+    if 0 < max_dimension < long_side:
+        ratio = max_dimension / long_side
+        size = (max(1, round(frame.shape[1] * ratio)), max(1, round(frame.shape[0] * ratio)))
+        frame = cv2.resize(frame, size, interpolation=cv2.INTER_AREA)
+
+    scale = max(frame.shape[:2]) / max(original_size)
+    return frame, scale, original_size
+
+
+def encode_normalized_jpeg(path: str, max_dimension: int, quality: int) -> Tuple[bytes, Tuple[int, int]]:
+    """
+    업로드 이미지를 표준 형식으로 다시 인코딩
+
+    한 번 디코딩하면서 EXIF 방향을 적용하고 긴 변을 max_dimension 이하로 줄인 뒤
+    JPEG으로 인코딩합니다. OpenCV는 EXIF 등 메타데이터를 쓰지 않으므로 결과에는
+    화소 데이터만 남습니다 (같은 입력은 항상 같은 바이트).
+
+    Args:
+        path: 이미지 파일 경로
+        max_dimension: 긴 변 최대 픽셀 (0 이하이면 크기 유지)
+        quality: JPEG 품질 (1~100)
+
+    Returns:
+        (JPEG 바이트, (너비, 높이))
+
+    Raises:
+        RuntimeError: 이미지 디코딩 또는 인코딩 실패
+    """
+    frame, _, _ = decode_bounded(path, max_dimension)
+    ok, buffer = cv2.imencode(".jpg", frame, [cv2.IMWRITE_JPEG_QUALITY, quality])
+    if not ok:
+        raise RuntimeError(f"Failed to encode image: {path}")
+    return buffer.tobytes(), (frame.shape[1], frame.shape[0])
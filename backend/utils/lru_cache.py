@@ -0,0 +1,106 @@
+"""
+LRU cache utility.
+
+개수 또는 용량(가중치) 한도를 가진 스레드 안전 LRU 캐시입니다.
+"""
+
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Generic, Hashable, Optional, TypeVar
+
+V = TypeVar("V")
+
+
+class LRUCache(Generic[V]):
+    """최근 사용 순서 기반 캐시 (가장 오래 사용되지 않은 항목부터 제거)"""
+
+    def __init__(
+        self,
+        max_entries: Optional[int] = None,
+        max_weight: Optional[int] = None,
+        weigher: Optional[Callable[[V], int]] = None,
+        on_evict: Optional[Callable[[Hashable, V], None]] = None,
+    ):
+        """
+        Args:
+            max_entries: 최대 항목 수 (None이면 제한 없음)
+            max_weight: 최대 총 가중치 (예: 바이트 수, None이면 제한 없음)
+            weigher: 항목 가중치 계산 함수 (max_weight 사용 시 필요)
+            on_evict: 항목이 제거될 때 호출되는 콜백
+        """
+        self.max_entries = max_entries
+        self.max_weight = max_weight
+        self._weigher = weigher or (lambda value: 1)
+        self._on_evict = on_evict
+        self._items: "OrderedDict[Hashable, V]" = OrderedDict()
+        self._weights: dict = {}
+        self._total_weight = 0
+        self._lock = threading.RLock()
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def __contains__(self, key: Hashable) -> bool:
+        with self._lock:
+            return key in self._items
+
+    @property
+    def total_weight(self) -> int:
+        """현재 총 가중치"""
+        return self._total_weight
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """항목 조회 (조회된 항목은 최근 사용으로 갱신)"""
+        with self._lock:
+            if key not in self._items:
+                return default
+            self._items.move_to_end(key)
+            return self._items[key]
+
+    def put(self, key: Hashable, value: V) -> None:
+        """항목 저장 후 한도를 넘으면 오래된 항목 제거"""
+        weight = self._weigher(value)
+        with self._lock:
+            if self.max_weight is not None and weight > self.max_weight:
+                # 단일 항목이 전체 한도보다 크면 캐시하지 않음
+                self.pop(key)
+                return
+
+            if key in self._items:
+                self._total_weight -= self._weights[key]
+            self._items[key] = value
+            self._items.move_to_end(key)
+            self._weights[key] = weight
+            self._total_weight += weight
+            self._evict()
+
+    def pop(self, key: Hashable, default: Any = None) -> Any:
+        """항목 제거 후 반환 (제거 콜백은 호출하지 않음)"""
+        with self._lock:
+            if key not in self._items:
+                return default
+            self._total_weight -= self._weights.pop(key)
+            return self._items.pop(key)
+
+    def items(self) -> list:
+        """(키, 값) 목록 스냅샷 (오래된 순, 사용 순서는 갱신하지 않음)"""
+        with self._lock:
+            return list(self._items.items())
+
+    def clear(self) -> None:
+        """전체 항목 제거"""
+        with self._lock:
+            self._items.clear()
+            self._weights.clear()
+            self._total_weight = 0
+
+    def _evict(self) -> None:
+        """한도를 넘는 동안 가장 오래된 항목 제거"""
+        while self._items and (
+            (self.max_entries is not None and len(self._items) > self.max_entries)
+            or (self.max_weight is not None and self._total_weight > self.max_weight)
+        ):
+            key, value = self._items.popitem(last=False)
+            self._total_weight -= self._weights.pop(key)
+            if self._on_evict:
+                self._on_evict(key, value)
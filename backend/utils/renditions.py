@@ -0,0 +1,154 @@
+"""
+Generated image renditions.
+
+생성 이미지 1장에서 용도별 파생 이미지(rendition)를 만듭니다. 원본을 한 번 디코딩한 뒤
+rendition마다 크기 조정과 인코딩을 전용 스레드 풀에서 병렬로 실행합니다 (OpenCV는
+크기 조정/인코딩 중 GIL을 놓음).
+
+rendition은 STORAGE_RENDITIONS에 이름별로 정의합니다:
+- format: 'jpg' 또는 'webp'
+- max_dimension: 긴 변 최대 픽셀 (0이면 원본 크기)
+- quality: 인코딩 품질 (1~100)
+- progressive: progressive JPEG 여부 (jpg만)
+- dpi: JPEG 헤더(JFIF)에 기록할 해상도 (jpg만, 0이면 기록하지 않음)
+"""
+
+import logging
+import os
+import struct
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import List, Optional
+
+import cv2
+import numpy
+
+from backend.core.config import StorageSettings
+
+logger = logging.getLogger(__name__)
+
+RENDITION_FORMATS = ("jpg", "webp")
+
+
+@dataclass(frozen=True)
+class RenditionSpec:
+    """rendition 1종 정의"""
+
+    name: str
+    format: str = "jpg"
+    max_dimension: int = 0
+    quality: int = 85
+    progressive: bool = False
+    dpi: int = 0
+
+
+def rendition_specs(config: StorageSettings) -> List[RenditionSpec]:
+    """
+    설정의 rendition 정의 목록 (꺼져 있으면 빈 목록, 잘못된 정의는 경고 후 제외)
+
+    Returns:
+        RenditionSpec 목록 (설정 순서)
+    """
+    if not config.renditions_enabled:
+        return []
+
+    specs = []
+    for name, options in config.renditions.items():
+        try:
+            spec = RenditionSpec(name=name, **options)
+        except TypeError as e:
+            logger.warning(f"⚠️ rendition '{name}' 설정을 무시합니다: {e}")
+            continue
+        if spec.format not in RENDITION_FORMATS or not name.isalnum():
+            logger.warning(f"⚠️ rendition '{name}' 설정을 무시합니다: format={spec.format}")
+            continue
+        specs.append(spec)
+    return specs
+
+
+def encode_rendition(frame: numpy.ndarray, spec: RenditionSpec) -> bytes:
+    """
+    프레임을 rendition 정의대로 크기 조정 및 인코딩
+
+    Args:
+        frame: 원본 BGR 프레임 (읽기만 함)
+        spec: rendition 정의
+
+    Returns:
+        인코딩된 이미지 바이트
+
+    Raises:
+        RuntimeError: 인코딩 실패
+    """
+    long_side = max(frame.shape[:2])
+    if 0 < spec.max_dimension < long_side:
+        ratio = spec.max_dimension / long_side
+        size = (max(1, round(frame.shape[1] * ratio)), max(1, round(frame.shape[0] * ratio)))
+        frame = cv2.resize(frame, size, interpolation=cv2.INTER_AREA)
+
+    if spec.format == "webp":
+        params = [cv2.IMWRITE_WEBP_QUALITY, spec.quality]
+    else:
+        params = [cv2.IMWRITE_JPEG_QUALITY, spec.quality, cv2.IMWRITE_JPEG_OPTIMIZE, 1]
+        if spec.progressive:
+            params += [cv2.IMWRITE_JPEG_PROGRESSIVE, 1]
+
+    ok, buffer = cv2.imencode(f".{spec.format}", frame, params)
+    if not ok:
+        raise RuntimeError(f"Failed to encode rendition: {spec.name}")
+    data = buffer.tobytes()
+    if spec.format == "jpg" and spec.dpi > 0:
+        data = set_jpeg_dpi(data, spec.dpi)
+    return data
+
+
+def set_jpeg_dpi(data: bytes, dpi: int) -> bytes:
+    """
+    JPEG JFIF 헤더의 해상도(DPI) 설정 (인쇄 크기 계산용, JFIF 헤더가 없으면 그대로 반환)
+
+    Args:
+        data: JPEG 바이트 (SOI 바로 뒤에 APP0 JFIF 세그먼트)
+        dpi: 가로/세로 해상도
+
+    Returns:
+        해상도를 기록한 JPEG 바이트
+    """
+    if data[2:4] != b"\xff\xe0" or data[6:11] != b"JFIF\x00":
+        return data
+    # APP0: 마커(2) 길이(2) 'JFIF\0'(5) 버전(2) 단위(1) X 해상도(2) Y 해상도(2)
+    return data[:13] + struct.pack(">BHH", 1, dpi, dpi) + data[18:]
+
+
+def write_rendition(frame: numpy.ndarray, spec: RenditionSpec, path: Path, temp_path: Path) -> int:
+    """
+    rendition을 임시 파일에 쓴 뒤 최종 경로로 원자적으로 이동 (스레드에서 실행)
+
+    Returns:
+        파일 크기 (바이트)
+    """
+    data = encode_rendition(frame, spec)
+    try:
+        temp_path.write_bytes(data)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        os.replace(temp_path, path)
+    except BaseException:
+        temp_path.unlink(missing_ok=True)
+        raise
+    return len(data)
+
+
+_rendition_executor: Optional[ThreadPoolExecutor] = None
+
+
+def get_rendition_executor(config: StorageSettings) -> ThreadPoolExecutor:
+    """프로세스 전역 rendition 인코딩 스레드 풀 반환"""
+    global _rendition_executor
+
+    if _rendition_executor is None:
+        _rendition_executor = ThreadPoolExecutor(
+            max_workers=max(1, config.rendition_workers),
+            thread_name_prefix="rendition",
+        )
+    return _rendition_executor
+
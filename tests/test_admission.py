@@ -0,0 +1,144 @@
+"""PriorityAdmission 순서/background 몫 테스트"""
+
+import asyncio
+
+import pytest
+
+from backend.exceptions import InferenceQueueFullException
+from backend.inference.admission import Priority, PriorityAdmission
+
+
+class Job:
+    """슬롯을 받으면 started에 이름을 기록하고 release될 때까지 슬롯을 잡고 있는 작업"""
+
+    def __init__(self, admission: PriorityAdmission, started: list, name: str, priority: str, key=None):
+        self.release = asyncio.Event()
+        self.task = asyncio.ensure_future(self._run(admission, started, name, priority, key))
+
+    async def _run(self, admission, started, name, priority, key):
+        async with admission.slot(priority, key=key):
+            started.append(name)
+            await self.release.wait()
+
+
+async def settle():
+    for _ in range(5):
+        await asyncio.sleep(0)
+
+
+async def test_background_share_is_capped():
+    admission = PriorityAdmission(slots=4, background_share=0.5, queue_size=8)
+    started = []
+    jobs = [Job(admission, started, f"b{i}", Priority.BACKGROUND) for i in range(4)]
+    await settle()
+
+    assert admission.background_slots == 2
+    assert started == ["b0", "b1"]
+    assert admission.waiting == 2
+
+    jobs[0].release.set()
+    await settle()
+    assert started == ["b0", "b1", "b2"]
+
+    for job in jobs:
+        job.release.set()
+    await asyncio.gather(*(job.task for job in jobs))
+
+
+async def test_background_gets_at_least_one_slot():
+    admission = PriorityAdmission(slots=2, background_share=0.0, queue_size=4)
+    assert admission.background_slots == 1
+
+
+async def test_interactive_waiters_go_first():
+    admission = PriorityAdmission(slots=1, background_share=1.0, queue_size=8)
+    started = []
+    first = Job(admission, started, "first", Priority.INTERACTIVE)
+    await settle()
+    background = Job(admission, started, "background", Priority.BACKGROUND)
+    await settle()
+    interactive = Job(admission, started, "interactive", Priority.INTERACTIVE)
+    await settle()
+
+    first.release.set()
+    await settle()
+    assert started == ["first", "interactive"]
+
+    interactive.release.set()
+    await settle()
+    assert started == ["first", "interactive", "background"]
+
+    background.release.set()
+    await asyncio.gather(first.task, background.task, interactive.task)
+
+
+async def test_interactive_runs_beside_background_share():
+    admission = PriorityAdmission(slots=2, background_share=0.5, queue_size=8)
+    started = []
+    jobs = [
+        Job(admission, started, "b0", Priority.BACKGROUND),
+        Job(admission, started, "b1", Priority.BACKGROUND),
+        Job(admission, started, "i0", Priority.INTERACTIVE),
+    ]
+    await settle()
+
+    assert started == ["b0", "i0"]
+
+    for job in jobs:
+        job.release.set()
+    await asyncio.gather(*(job.task for job in jobs))
+
+
+async def test_promote_moves_background_waiter_ahead():
+    admission = PriorityAdmission(slots=1, background_share=1.0, queue_size=8)
+    started = []
+    running = Job(admission, started, "running", Priority.INTERACTIVE)
+    await settle()
+    background = Job(admission, started, "background", Priority.BACKGROUND)
+    speculative = Job(admission, started, "speculative", Priority.BACKGROUND, key="token")
+    await settle()
+
+    assert admission.promote("token")
+    assert not admission.promote("unknown")
+
+    running.release.set()
+    await settle()
+    assert started == ["running", "speculative"]
+
+    speculative.release.set()
+    background.release.set()
+    await asyncio.gather(running.task, background.task, speculative.task)
+    assert started == ["running", "speculative", "background"]
+
+
+async def test_withdraw_cancels_waiter():
+    admission = PriorityAdmission(slots=1, background_share=1.0, queue_size=8)
+    started = []
+    running = Job(admission, started, "running", Priority.INTERACTIVE)
+    await settle()
+    waiting = Job(admission, started, "waiting", Priority.INTERACTIVE, key="token")
+    await settle()
+
+    assert admission.withdraw("token")
+    with pytest.raises(asyncio.CancelledError):
+        await waiting.task
+
+    running.release.set()
+    await running.task
+    assert started == ["running"]
+    assert admission.running == 0
+
+
+async def test_full_queue_is_rejected():
+    admission = PriorityAdmission(slots=1, background_share=1.0, queue_size=1)
+    started = []
+    jobs = [Job(admission, started, f"i{i}", Priority.INTERACTIVE) for i in range(2)]
+    await settle()
+
+    with pytest.raises(InferenceQueueFullException):
+        async with admission.slot(Priority.INTERACTIVE):
+            pass
+
+    for job in jobs:
+        job.release.set()
+    await asyncio.gather(*(job.task for job in jobs))
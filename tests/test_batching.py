@@ -0,0 +1,81 @@
+"""BatchScheduler 배치 분할 테스트"""
+
+import asyncio
+
+from backend.inference.batching import BatchScheduler
+from backend.inference.cancellation import SwapCancelled
+from backend.inference.swap_job import SwapJob, SwapResult
+
+
+class FakeExecutor:
+    """배치 크기를 기록하고 잠시 뒤 작업별 결과를 돌려주는 워커 풀"""
+
+    def __init__(self, max_workers: int, delay: float = 0.02):
+        self.max_workers = max_workers
+        self.delay = delay
+        self.batches = []
+        self.running = 0
+        self.peak_running = 0
+
+    async def run(self, fn, jobs):
+        self.batches.append(len(jobs))
+        self.running += 1
+        self.peak_running = max(self.peak_running, self.running)
+        try:
+            await asyncio.sleep(self.delay)
+        finally:
+            self.running -= 1
+        return [SwapResult(output_path=job.output_path, elapsed=0.0) for job in jobs]
+
+
+def make_jobs(count: int):
+    return [SwapJob(source_path="s.jpg", target_path="t.jpg", output_path=f"{i}.jpg") for i in range(count)]
+
+
+async def test_spreads_pending_jobs_across_idle_workers():
+    executor = FakeExecutor(max_workers=2)
+    scheduler = BatchScheduler(executor, max_batch_size=4, window_ms=10)
+
+    results = await asyncio.gather(*[scheduler.run(job) for job in make_jobs(3)])
+
+    assert executor.batches == [2, 1]
+    assert [result.output_path for result in results] == ["0.jpg", "1.jpg", "2.jpg"]
+
+
+async def test_full_batch_does_not_oversubscribe_workers():
+    executor = FakeExecutor(max_workers=2)
+    scheduler = BatchScheduler(executor, max_batch_size=4, window_ms=10)
+    jobs = make_jobs(11)
+
+    results = await asyncio.gather(*[scheduler.run(job) for job in jobs])
+
+    assert executor.peak_running <= executor.max_workers
+    assert max(executor.batches) <= 4
+    assert sum(executor.batches) == len(jobs)
+    assert [result.output_path for result in results] == [job.output_path for job in jobs]
+
+
+async def test_single_job_waits_for_window():
+    executor = FakeExecutor(max_workers=1, delay=0.0)
+    scheduler = BatchScheduler(executor, max_batch_size=4, window_ms=30)
+    loop = asyncio.get_running_loop()
+
+    start = loop.time()
+    await scheduler.run(make_jobs(1)[0])
+
+    assert executor.batches == [1]
+    assert loop.time() - start >= 0.025
+
+
+async def test_queued_job_past_deadline_is_not_sent():
+    executor = FakeExecutor(max_workers=1)
+    scheduler = BatchScheduler(executor, max_batch_size=4, window_ms=5)
+    expired = SwapJob(source_path="s.jpg", target_path="t.jpg", output_path="late.jpg", deadline=1.0)
+
+    outcomes = await asyncio.gather(
+        scheduler.run(expired), scheduler.run(make_jobs(1)[0]), return_exceptions=True
+    )
+
+    assert isinstance(outcomes[0], SwapCancelled)
+    assert outcomes[1].output_path == "0.jpg"
+    assert executor.batches == [1]
@@ -0,0 +1,171 @@
+"""
+생성 취소/기한 테스트
+
+CancelToken, CancellationRegistry, 연결 끊김 감시, 워커 측 CancellationBoard와
+대기열에서 취소/기한 초과된 작업을 버리는 동작을 검증합니다.
+"""
+
+import asyncio
+import time
+
+import pytest
+
+from backend.core.cancellation import CancelToken, CancellationRegistry, watch_disconnect
+from backend.core.config import settings
+from backend.exceptions import GenerationCancelledException, GenerationTimeoutException
+from backend.inference.cancellation import CancellationBoard, cancellation_reason
+from backend.inference.swap_job import SwapJob
+from backend.services.job_service import GenerationJobManager, JobStatus
+
+
+class FakeRequest:
+    """is_disconnected()가 지정한 횟수 이후 True를 반환하는 요청"""
+
+    def __init__(self, connected_polls: int):
+        self.connected_polls = connected_polls
+        self.url = type("URL", (), {"path": "/session/1/generate-profile"})()
+
+    async def is_disconnected(self) -> bool:
+        self.connected_polls -= 1
+        return self.connected_polls < 0
+
+
+async def test_token_cancel_raises_cancelled():
+    token = CancelToken(timeout_seconds=0)
+
+    assert token.cancel("disconnected") is True
+    assert token.cancel("cancelled") is False
+
+    with pytest.raises(GenerationCancelledException) as exc_info:
+        token.check("inference")
+    assert exc_info.value.status_code == 409
+    assert exc_info.value.details == {"reason": "disconnected", "stage": "inference"}
+
+
+async def test_token_deadline_raises_timeout():
+    token = CancelToken(timeout_seconds=5)
+    token.deadline = time.time() - 1
+
+    with pytest.raises(GenerationTimeoutException) as exc_info:
+        token.check("source analysis")
+    assert exc_info.value.status_code == 504
+    assert token.reason == "timeout"
+
+
+async def test_token_without_deadline_never_times_out():
+    token = CancelToken(timeout_seconds=0)
+
+    assert token.deadline is None
+    assert token.remaining() is None
+    assert not token.cancelled
+
+
+async def test_guard_returns_result():
+    token = CancelToken(timeout_seconds=5)
+    future = asyncio.get_running_loop().create_future()
+    asyncio.get_running_loop().call_later(0.01, future.set_result, "ok")
+
+    assert await token.guard(future, "inference") == "ok"
+
+
+async def test_guard_returns_on_cancel_without_cancelling_work():
+    token = CancelToken(timeout_seconds=5)
+    future = asyncio.get_running_loop().create_future()
+    asyncio.get_running_loop().call_later(0.01, token.cancel, "cancelled")
+
+    with pytest.raises(GenerationCancelledException):
+        await asyncio.wait_for(token.guard(future, "inference"), timeout=1)
+    assert not future.cancelled()
+
+
+async def test_guard_returns_at_deadline():
+    token = CancelToken(timeout_seconds=0.02)
+    future = asyncio.get_running_loop().create_future()
+
+    with pytest.raises(GenerationTimeoutException):
+        await asyncio.wait_for(token.guard(future, "inference"), timeout=1)
+
+
+async def test_registry_cancels_tracked_tokens_only():
+    registry = CancellationRegistry()
+    first, second, other = CancelToken(0), CancelToken(0), CancelToken(0)
+
+    with registry.track(1, first), registry.track(1, second), registry.track(2, other):
+        assert registry.cancel(1) == 2
+        assert registry.cancel(1) == 0
+
+    assert first.reason == second.reason == "cancelled"
+    assert other.reason is None
+    assert registry.cancel(1) == 0
+    assert registry._tokens == {}
+
+
+async def test_watch_disconnect_cancels_token(monkeypatch):
+    monkeypatch.setattr(settings.job, "disconnect_poll_seconds", 0.01)
+    token = CancelToken(timeout_seconds=5)
+
+    async with watch_disconnect(FakeRequest(connected_polls=2), token):
+        with pytest.raises(GenerationCancelledException):
+            await asyncio.wait_for(
+                token.guard(asyncio.get_running_loop().create_future(), "inference"),
+                timeout=1,
+            )
+
+    assert token.reason == "disconnected"
+
+
+def test_board_records_recent_keys():
+    board = CancellationBoard(size=2)
+    board.cancel(0)
+    board.cancel(11)
+    board.cancel(12)
+
+    assert board.is_cancelled(11) and board.is_cancelled(12)
+    assert not board.is_cancelled(0)
+
+    # 링 버퍼가 가득 차면 가장 오래된 키부터 잊음
+    board.cancel(13)
+    assert not board.is_cancelled(11)
+    assert board.is_cancelled(13)
+
+
+def test_cancellation_reason_checks_deadline_then_board():
+    board = CancellationBoard(size=4)
+    job = SwapJob("s.jpg", "t.jpg", "o.jpg", cancel_key=5)
+
+    assert cancellation_reason(job, board) is None
+    board.cancel(5)
+    assert cancellation_reason(job, board) == "cancelled"
+    job.deadline = time.time() - 1
+    assert cancellation_reason(job, board) == "timeout"
+    assert cancellation_reason(SwapJob("s.jpg", "t.jpg", "o.jpg"), None) is None
+
+
+async def test_cancelled_queued_job_is_dropped_without_running(monkeypatch):
+    manager = GenerationJobManager(queue_size=4, concurrency=1, retention_seconds=60)
+    ran = []
+
+    async def fake_run_job(job):
+        ran.append(job.job_id)
+        job.set_status(JobStatus.DONE)
+
+    monkeypatch.setattr(manager, "_run_job", fake_run_job)
+    # 워커는 다음 await에서야 실행되므로 아래 작업들은 모두 대기열에 쌓임
+    manager.start()
+    cancelled = manager.submit(1, "profile")
+    expired = manager.submit(2, "profile")
+    expired.cancel_token.deadline = time.time() - 1
+    kept = manager.submit(3, "profile")
+
+    assert manager.cancel(1) == 1
+    assert cancelled.status == JobStatus.CANCELLED
+
+    try:
+        await asyncio.wait_for(kept.wait(), timeout=1)
+        await asyncio.wait_for(expired.wait(), timeout=1)
+    finally:
+        await manager.stop()
+
+    assert ran == [kept.job_id]
+    assert expired.status == JobStatus.CANCELLED
+    assert expired.cancel_token.reason == "timeout"
@@ -0,0 +1,164 @@
+"""ContentStore / StoredFileRepository 테스트"""
+
+import asyncio
+import hashlib
+
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import sessionmaker
+
+from backend.database import Base
+from backend.models.stored_file import StoredFile
+from backend.repositories.stored_file_repo import StoredFileRepository
+from backend.utils.content_store import ContentStore
+
+DIGEST = hashlib.sha256(b"content").hexdigest()
+
+
+@pytest.fixture
+def store(tmp_path):
+    return ContentStore(str(tmp_path / "output"), "/output")
+
+
+def stage_bytes(store: ContentStore, data: bytes, extension: str = "jpg"):
+    path = store.staging_path(extension)
+    path.write_bytes(data)
+    return store.stage(str(path), extension)
+
+
+def test_parse_round_trips_relative_path(store):
+    relative = store.relative_path(DIGEST, "jpg")
+
+    assert relative == f"/output/{DIGEST[:2]}/{DIGEST[2:4]}/{DIGEST}.jpg"
+    assert store.parse(relative) == (DIGEST, "jpg")
+
+
+@pytest.mark.parametrize(
+    "relative_path",
+    [
+        None,
+        "",
+        "/output/legacy_name.jpg",
+        f"/uploads/{DIGEST[:2]}/{DIGEST[2:4]}/{DIGEST}.jpg",
+        f"/output/{DIGEST[:2]}/ff/{DIGEST}.jpg",
+        f"/output/{DIGEST[:2]}/{DIGEST[2:4]}/{DIGEST[:63]}.jpg",
+        f"/output/{DIGEST[:2]}/{DIGEST[2:4]}/{DIGEST.upper()}.jpg",
+        f"/output/{DIGEST[:2]}/{DIGEST[2:4]}/{DIGEST}.mobile.jpg",
+        f"/output/{DIGEST[:2]}/{DIGEST[2:4]}/../{DIGEST}.jpg",
+    ],
+)
+def test_parse_rejects_foreign_paths(store, relative_path):
+    assert store.parse(relative_path) is None
+
+
+def test_put_moves_staged_file_to_hashed_path(store):
+    staged = stage_bytes(store, b"content")
+
+    stored = store.put(staged)
+
+    assert staged.digest == DIGEST
+    assert staged.size == len(b"content")
+    assert stored == store.path(DIGEST, "jpg")
+    assert stored.read_bytes() == b"content"
+    assert not staged.path.exists()
+
+
+def test_put_same_content_keeps_existing_file(store):
+    first = store.put(stage_bytes(store, b"content"))
+    mtime = first.stat().st_mtime_ns
+    duplicate = stage_bytes(store, b"content")
+
+    assert store.put(duplicate) == first
+    assert first.stat().st_mtime_ns == mtime
+    assert not duplicate.path.exists()
+    assert list(store.staging_dir.iterdir()) == []
+
+
+def test_remove_deletes_file_and_renditions(store):
+    stored = store.put(stage_bytes(store, b"content"))
+    rendition = store.rendition_path(DIGEST, "thumbnail", "jpg")
+    rendition.write_bytes(b"thumbnail")
+    other = store.put(stage_bytes(store, b"other"))
+
+    assert store.remove(DIGEST, "jpg")
+    assert not stored.exists()
+    assert not rendition.exists()
+    assert other.exists()
+    assert not store.remove(DIGEST, "jpg")
+
+
+@pytest.fixture
+async def session_factory(tmp_path):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'test.db'}")
+    async with engine.begin() as connection:
+        await connection.run_sync(Base.metadata.create_all, tables=[StoredFile.__table__])
+    yield sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    await engine.dispose()
+
+
+async def add_reference(session_factory, digest: str = DIGEST) -> int:
+    async with session_factory() as session:
+        ref_count = await StoredFileRepository(session).add_reference("output", digest, "jpg", 7)
+        await session.commit()
+        return ref_count
+
+
+async def test_concurrent_first_references_are_all_counted(session_factory):
+    counts = await asyncio.gather(*[add_reference(session_factory) for _ in range(5)])
+
+    assert sorted(counts) == [1, 2, 3, 4, 5]
+    async with session_factory() as session:
+        stored = await StoredFileRepository(session).get("output", DIGEST)
+        assert stored.ref_count == 5
+        assert stored.size_bytes == 7
+
+
+async def test_first_reference_created_by_another_session_is_incremented(session_factory):
+    async with session_factory() as session:
+        repository = StoredFileRepository(session)
+        increment = repository._increment
+        raced = []
+
+        async def racing_increment(store: str, digest: str) -> bool:
+            # 레코드가 없다고 확인한 직후 다른 세션이 먼저 만든 경우
+            if not raced:
+                raced.append(await add_reference(session_factory))
+                return False
+            return await increment(store, digest)
+
+        repository._increment = racing_increment
+        assert await repository.add_reference("output", DIGEST, "jpg", 7) == 2
+        await session.commit()
+
+    assert raced == [1]
+    async with session_factory() as session:
+        assert (await StoredFileRepository(session).get("output", DIGEST)).ref_count == 2
+
+
+async def test_release_stops_at_zero(session_factory):
+    await add_reference(session_factory)
+    async with session_factory() as session:
+        repository = StoredFileRepository(session)
+        assert await repository.release("output", DIGEST) == 0
+        assert await repository.release("output", DIGEST) == 0
+        assert await repository.release("output", "missing") is None
+        await session.commit()
+
+
+async def test_delete_if_unreferenced_skips_rereferenced_file(session_factory):
+    await add_reference(session_factory)
+    async with session_factory() as session:
+        repository = StoredFileRepository(session)
+        await repository.release("output", DIGEST)
+        await session.commit()
+        assert [stored.digest for stored in await repository.get_unreferenced()] == [DIGEST]
+
+    # 정리 전에 다시 참조되면 삭제하지 않음
+    await add_reference(session_factory)
+    async with session_factory() as session:
+        repository = StoredFileRepository(session)
+        assert not await repository.delete_if_unreferenced("output", DIGEST)
+        assert await repository.release("output", DIGEST) == 0
+        assert await repository.delete_if_unreferenced("output", DIGEST)
+        await session.commit()
+        assert await repository.get("output", DIGEST) is None
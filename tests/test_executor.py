@@ -0,0 +1,60 @@
+"""InferenceExecutor broadcast 테스트"""
+
+import asyncio
+import os
+import time
+
+from backend.inference.executor import InferenceExecutor
+
+
+async def test_process_broadcast_reaches_every_worker():
+    executor = InferenceExecutor(max_workers=3, queue_size=4, backend="process")
+    try:
+        for _ in range(2):
+            pids = await executor.broadcast(os.getpid)
+            assert len(pids) == 3
+            assert len(set(pids)) == 3
+            assert os.getpid() not in pids
+    finally:
+        executor.shutdown()
+
+
+async def test_thread_broadcast_runs_once():
+    calls = []
+    executor = InferenceExecutor(max_workers=2, queue_size=4, backend="thread")
+    try:
+        results = await executor.broadcast(calls.append, "warmup")
+    finally:
+        executor.shutdown()
+
+    assert calls == ["warmup"]
+    assert results == [None]
+
+
+
+async def test_broken_pool_is_rebuilt_once(monkeypatch):
+    executor = InferenceExecutor(max_workers=2, queue_size=4, backend="process")
+    created = []
+    create_executor = executor._create_executor
+
+    def counting_create_executor():
+        created.append(create_executor())
+        return created[-1]
+
+    monkeypatch.setattr(executor, "_create_executor", counting_create_executor)
+    try:
+        broken = executor._executor
+        outcomes = await asyncio.gather(
+            executor.run(os._exit, 1),
+            executor.run(time.sleep, 5),
+            executor.run(os._exit, 1),
+            return_exceptions=True,
+        )
+
+        assert all(isinstance(outcome, RuntimeError) for outcome in outcomes)
+        # 늦게 도착한 실패가 새로 만든 풀을 다시 교체하지 않음
+        assert len(created) == 1
+        assert executor._executor is created[0] is not broken
+        assert await executor.run(os.getpid) != os.getpid()
+    finally:
+        executor.shutdown()
@@ -0,0 +1,140 @@
+"""
+업로드 얼굴 확인 테스트
+
+측정값(measure_faces)과 거절 사유별 판정(evaluate_face_check), 모의 엔진의 확인 결과를 검증합니다.
+"""
+
+import cv2
+import numpy
+import pytest
+
+from backend.core.config import FaceFusionSettings
+from backend.inference.face_check import evaluate_face_check, face_sharpness, measure_faces
+from backend.inference.mock_engine import MockFaceFusionEngine
+
+CONFIG = FaceFusionSettings(
+    face_check_min_face_size=80,
+    face_check_min_sharpness=30.0,
+    face_check_secondary_face_ratio=0.25,
+)
+
+
+def checkerboard(size: int = 256, cell: int = 8) -> numpy.ndarray:
+    """선명한 (고주파) BGR 프레임"""
+    pattern = (numpy.indices((size, size)) // cell).sum(axis=0) % 2
+    return numpy.repeat((pattern * 255).astype(numpy.uint8)[:, :, None], 3, axis=2)
+
+
+def face(box, score=0.9):
+    return {"bounding_box": list(box), "score": score}
+
+
+def measurement(*faces, sharpness=120.0, **extra):
+    return {"faces": list(faces), "sharpness": sharpness if faces else None, "original_size": [640, 480], **extra}
+
+
+@pytest.mark.parametrize(
+    ("value", "reason"),
+    [
+        ({"faces": [], "unreadable": True}, "unreadable"),
+        (measurement(), "no_face"),
+        (measurement(face((0, 0, 200, 200)), face((300, 0, 480, 180))), "multiple_faces"),
+        (measurement(face((0, 0, 60, 200))), "face_too_small"),
+        (measurement(face((0, 0, 200, 200)), sharpness=5.0), "blurry"),
+    ],
+)
+def test_rejection_reasons(value, reason):
+    report = evaluate_face_check(value, CONFIG)
+
+    assert report["accepted"] is False
+    assert report["reason"] == reason
+
+
+def test_accepts_single_sharp_face_and_ignores_bystanders():
+    value = measurement(face((0, 0, 200, 200), score=0.8), face((400, 0, 440, 40)), sharpness=150.0)
+
+    report = evaluate_face_check(value, CONFIG)
+
+    assert report["accepted"] is True
+    assert report["reason"] is None
+    assert report["face_count"] == 1
+    assert report["bounding_box"] == [0, 0, 200, 200]
+    assert report["quality"] == pytest.approx(0.8 * 150.0 / 300.0, abs=1e-3)
+
+
+def test_unmeasured_sharpness_skips_blur_check():
+    value = measurement(face((0, 0, 200, 200), score=0.8))
+    value["sharpness"] = None
+
+    report = evaluate_face_check(value, CONFIG)
+
+    assert report["accepted"] is True
+    assert report["quality"] == 0.8
+
+
+def test_zero_min_sharpness_disables_blur_check():
+    config = FaceFusionSettings(face_check_min_sharpness=0.0, face_check_min_face_size=80)
+
+    report = evaluate_face_check(measurement(face((0, 0, 200, 200)), sharpness=0.0), config)
+
+    assert report["accepted"] is True
+
+
+def test_measure_faces_sorts_by_size_and_scales_to_original():
+    frame = checkerboard(256)
+    detections = [([0, 0, 20, 20], 0.5), ([10, 10, 110, 110], 0.95)]
+
+    result = measure_faces(frame, detections, scale=0.5, original_size=(512, 512))
+
+    assert [f["score"] for f in result["faces"]] == [0.95, 0.5]
+    assert result["faces"][0]["bounding_box"] == [20.0, 20.0, 220.0, 220.0]
+    assert result["decoded_size"] == [256, 256]
+    assert result["sharpness"] > CONFIG.face_check_min_sharpness
+
+
+def test_measure_faces_without_detections():
+    result = measure_faces(checkerboard(64), [], scale=1.0, original_size=(64, 64))
+
+    assert result["faces"] == []
+    assert result["sharpness"] is None
+
+
+def test_face_sharpness_separates_sharp_and_blurred_crops():
+    sharp = checkerboard(256)
+    blurred = cv2.GaussianBlur(sharp, (0, 0), 12)
+    box = (32, 32, 224, 224)
+
+    assert face_sharpness(sharp, box) > CONFIG.face_check_min_sharpness
+    assert face_sharpness(blurred, box) < CONFIG.face_check_min_sharpness
+    assert face_sharpness(sharp, (10, 10, 11, 11)) == 0.0
+
+
+def test_mock_engine_reports_unreadable_file(tmp_path):
+    path = tmp_path / "broken.jpg"
+    path.write_bytes(b"not an image")
+
+    result = MockFaceFusionEngine(FaceFusionSettings(mode="mock")).check_face(str(path))
+
+    assert evaluate_face_check(result, CONFIG)["reason"] == "unreadable"
+
+
+def test_mock_engine_treats_centre_as_face(tmp_path):
+    path = tmp_path / "sharp.png"
+    cv2.imwrite(str(path), checkerboard(400))
+
+    result = MockFaceFusionEngine(FaceFusionSettings(mode="mock")).check_face(str(path))
+
+    assert result["faces"][0]["bounding_box"] == [100.0, 100.0, 300.0, 300.0]
+    assert result["sharpness"] is None
+    assert evaluate_face_check(result, CONFIG)["accepted"] is True
+
+
+def test_mock_engine_does_not_reject_smooth_images_as_blurry(tmp_path):
+    path = tmp_path / "smooth.png"
+    cv2.imwrite(str(path), numpy.full((400, 400, 3), 128, numpy.uint8))
+
+    result = MockFaceFusionEngine(FaceFusionSettings(mode="mock")).check_face(str(path))
+    report = evaluate_face_check(result, CONFIG)
+
+    assert report["accepted"] is True
+    assert report["quality"] == 1.0
@@ -0,0 +1,167 @@
+"""
+업로드 저장 테스트
+
+청크 단위 수신, 크기 초과 시 조기 중단과 임시 파일 정리, 수신 중 계산한 해시,
+업로드 정규화(EXIF 방향 적용, 메타데이터 제거, 크기 제한)를 검증합니다.
+"""
+
+import hashlib
+import struct
+
+import cv2
+import numpy
+import pytest
+
+from backend.core.config import settings
+from backend.exceptions import FileSizeExceededException, FileUploadException, InvalidFileTypeException
+from backend.utils import file_handler as file_handler_module
+from backend.utils.content_store import StagedFile
+from backend.utils.file_handler import FileHandler
+
+CHUNK = file_handler_module.UPLOAD_CHUNK_SIZE
+
+
+class FakeUpload:
+    """UploadFile 대역 (읽은 횟수 기록, 지정한 청크에서 읽기 실패 가능)"""
+
+    def __init__(self, content: bytes, filename: str = "photo.jpg", size=None, fail_at=None):
+        self.content = content
+        self.filename = filename
+        self.size = size
+        self.fail_at = fail_at
+        self.reads = 0
+        self._offset = 0
+
+    async def read(self, size: int = -1) -> bytes:
+        self.reads += 1
+        if self.fail_at is not None and self.reads >= self.fail_at:
+            raise ConnectionResetError("client went away")
+        chunk = self.content[self._offset:self._offset + size]
+        self._offset += len(chunk)
+        return chunk
+
+
+@pytest.fixture
+def handler(monkeypatch, tmp_path):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(settings.storage, "upload_dir", "uploads")
+    monkeypatch.setattr(settings.storage, "output_dir", "output")
+    monkeypatch.setattr(settings.storage, "max_file_size", int(CHUNK * 1.5))
+    monkeypatch.setattr(settings.storage, "normalize_uploads", True)
+    monkeypatch.setattr(settings.storage, "upload_max_dimension", 64)
+    monkeypatch.setattr(settings.storage, "upload_jpeg_quality", 90)
+    return FileHandler()
+
+
+def staged_files(handler):
+    return sorted(path.name for path in handler.upload_store.staging_dir.iterdir())
+
+
+async def test_receive_streams_file_and_digest(handler):
+    content = bytes(range(256)) * (CHUNK // 256) + b"tail"
+    upload = FakeUpload(content)
+
+    staged = await handler.receive_upload_file(upload)
+
+    assert staged.path.parent == handler.upload_store.staging_dir
+    assert staged.path.read_bytes() == content
+    assert staged.digest == hashlib.sha256(content).hexdigest()
+    assert staged.size == len(content)
+    assert staged.extension == "jpg"
+
+    await handler.discard_staged_file(staged)
+    assert staged_files(handler) == []
+
+
+async def test_oversized_upload_aborts_early_and_removes_partial_file(handler):
+    upload = FakeUpload(b"x" * CHUNK * 10)
+
+    with pytest.raises(FileSizeExceededException) as exc_info:
+        await handler.receive_upload_file(upload)
+
+    # 제한(1.5청크)을 넘는 두 번째 청크에서 중단
+    assert upload.reads == 2
+    assert exc_info.value.details["file_size"] == CHUNK * 2
+    assert staged_files(handler) == []
+
+
+async def test_failed_read_removes_partial_file(handler):
+    upload = FakeUpload(b"x" * CHUNK, fail_at=2)
+
+    with pytest.raises(FileUploadException):
+        await handler.receive_upload_file(upload)
+
+    assert staged_files(handler) == []
+
+
+def test_validate_rejects_declared_size_and_extension(handler):
+    with pytest.raises(FileSizeExceededException):
+        handler.validate_file(FakeUpload(b"", size=CHUNK * 2))
+    with pytest.raises(InvalidFileTypeException):
+        handler.validate_file(FakeUpload(b"", filename="photo.gif"))
+
+    handler.validate_file(FakeUpload(b"", filename="photo.JPG", size=None))
+
+
+def jpeg_with_orientation(width: int, height: int, orientation: int) -> bytes:
+    """EXIF Orientation 태그가 붙은 JPEG"""
+    ok, buffer = cv2.imencode(".jpg", numpy.full((height, width, 3), 128, numpy.uint8))
+    assert ok
+    tiff = (
+        b"II" + struct.pack("<HI", 42, 8) + struct.pack("<H", 1)
+        + struct.pack("<HHIHH", 0x0112, 3, 1, orientation, 0) + struct.pack("<I", 0)
+    )
+    payload = b"Exif\x00\x00" + tiff
+    data = buffer.tobytes()
+    return data[:2] + b"\xff\xe1" + struct.pack(">H", len(payload) + 2) + payload + data[2:]
+
+
+def stage(handler, data: bytes, extension: str = "jpg") -> StagedFile:
+    path = handler.upload_store.staging_path(extension)
+    path.write_bytes(data)
+    return StagedFile(path=path, digest=hashlib.sha256(data).hexdigest(), size=len(data), extension=extension)
+
+
+async def test_normalize_applies_orientation_and_strips_metadata(handler):
+    staged = stage(handler, jpeg_with_orientation(40, 20, orientation=6))
+
+    normalized, size = await handler.normalize_upload_file(staged)
+
+    data = normalized.path.read_bytes()
+    assert size == (20, 40)
+    assert b"Exif" not in data
+    assert normalized.digest == hashlib.sha256(data).hexdigest()
+    assert normalized.size == len(data)
+    assert normalized.extension == "jpg"
+    assert not staged.path.exists()
+
+
+async def test_normalize_caps_long_side_and_is_deterministic(handler):
+    ok, png = cv2.imencode(".png", numpy.random.default_rng(0).integers(0, 255, (100, 200, 3), numpy.uint8))
+    assert ok
+
+    first, size = await handler.normalize_upload_file(stage(handler, png.tobytes(), "png"))
+    second, _ = await handler.normalize_upload_file(stage(handler, png.tobytes(), "png"))
+
+    assert size == (64, 32)
+    assert first.digest == second.digest
+    assert staged_files(handler) == sorted([first.path.name, second.path.name])
+
+
+async def test_normalize_disabled_keeps_received_file(handler, monkeypatch):
+    monkeypatch.setattr(settings.storage, "normalize_uploads", False)
+    staged = stage(handler, jpeg_with_orientation(400, 200, orientation=1))
+
+    normalized, size = await handler.normalize_upload_file(staged)
+
+    assert normalized is staged
+    assert size == (400, 200)
+
+
+async def test_normalize_unreadable_upload_keeps_staged_file(handler):
+    staged = stage(handler, b"not an image")
+
+    with pytest.raises(RuntimeError):
+        await handler.normalize_upload_file(staged)
+
+    assert staged.path.exists()
@@ -0,0 +1,65 @@
+"""ImageService 테스트 (생성 중 원본 사진이 바뀐 경우)"""
+
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import sessionmaker
+
+from backend.core.cancellation import CancelToken
+from backend.database import Base
+from backend.exceptions import GenerationCancelledException
+from backend.models import Participation
+from backend.repositories.participation_repo import ParticipationRepository
+from backend.services.image_service import ImageService
+
+
+@pytest.fixture
+async def session_factory(tmp_path, monkeypatch):
+    # FileHandler가 현재 디렉터리에 업로드/출력 디렉터리를 만듦
+    monkeypatch.chdir(tmp_path)
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'test.db'}")
+    async with engine.begin() as connection:
+        await connection.run_sync(Base.metadata.create_all)
+    yield sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    await engine.dispose()
+
+
+async def create_participation(session_factory, original_image_path: str) -> int:
+    async with session_factory() as session:
+        participation = Participation(original_image_path=original_image_path, gender="male")
+        session.add(participation)
+        await session.commit()
+        return participation.participation_id
+
+
+async def test_unchanged_source_keeps_result(session_factory):
+    participation_id = await create_participation(session_factory, "/uploads/old.jpg")
+
+    async with session_factory() as session:
+        participation = await ParticipationRepository(session).get_by_id(participation_id)
+        token = CancelToken(timeout_seconds=0)
+
+        await ImageService(session, facefusion=object())._check_source_unchanged(participation, token)
+
+    assert token.reason is None
+
+
+async def test_reuploaded_source_drops_result(session_factory):
+    participation_id = await create_participation(session_factory, "/uploads/old.jpg")
+
+    async with session_factory() as session:
+        participation = await ParticipationRepository(session).get_by_id(participation_id)
+
+        # 생성 중 다른 요청이 사진을 다시 올림
+        async with session_factory() as upload_session:
+            await ParticipationRepository(upload_session).update(
+                participation_id, {"original_image_path": "/uploads/new.jpg"}
+            )
+            await upload_session.commit()
+
+        token = CancelToken(timeout_seconds=0)
+        service = ImageService(session, facefusion=object())
+        with pytest.raises(GenerationCancelledException) as exc_info:
+            await service._check_source_unchanged(participation, token)
+
+    assert token.reason == "superseded"
+    assert exc_info.value.details == {"reason": "superseded", "stage": "save"}
@@ -0,0 +1,94 @@
+"""read_image_size / decode_bounded 테스트"""
+
+import struct
+
+import cv2
+import numpy
+import pytest
+
+from backend.utils.image_utils import decode_bounded, read_image_size
+
+
+def jpeg_bytes(width: int, height: int) -> bytes:
+    ok, buffer = cv2.imencode(".jpg", numpy.zeros((height, width, 3), numpy.uint8))
+    assert ok
+    return buffer.tobytes()
+
+
+def exif_segment(orientation: int, byte_order: str = "<") -> bytes:
+    """Orientation 태그 하나만 있는 APP1 EXIF 세그먼트"""
+    tiff = (
+        (b"II" if byte_order == "<" else b"MM")
+        + struct.pack(f"{byte_order}HI", 42, 8)
+        + struct.pack(f"{byte_order}H", 1)
+        + struct.pack(f"{byte_order}HHIHH", 0x0112, 3, 1, orientation, 0)
+        + struct.pack(f"{byte_order}I", 0)
+    )
+    payload = b"Exif\x00\x00" + tiff
+    return b"\xff\xe1" + struct.pack(">H", len(payload) + 2) + payload
+
+
+def write(tmp_path, name: str, data: bytes) -> str:
+    path = tmp_path / name
+    path.write_bytes(data)
+    return str(path)
+
+
+def test_jpeg_size(tmp_path):
+    assert read_image_size(write(tmp_path, "a.jpg", jpeg_bytes(50, 30))) == (50, 30)
+
+
+def test_png_size(tmp_path):
+    path = str(tmp_path / "a.png")
+    cv2.imwrite(path, numpy.zeros((20, 40, 3), numpy.uint8))
+    assert read_image_size(path) == (40, 20)
+
+
+@pytest.mark.parametrize(
+    ("orientation", "byte_order", "expected"),
+    [(1, "<", (50, 30)), (3, ">", (50, 30)), (6, "<", (30, 50)), (8, ">", (30, 50))],
+)
+def test_jpeg_size_applies_exif_rotation(tmp_path, orientation, byte_order, expected):
+    data = jpeg_bytes(50, 30)
+    path = write(tmp_path, "rotated.jpg", data[:2] + exif_segment(orientation, byte_order) + data[2:])
+
+    assert read_image_size(path) == expected
+    # OpenCV가 디코딩한 프레임과 같은 방향
+    frame, scale, original_size = decode_bounded(path, 0)
+    assert (frame.shape[1], frame.shape[0]) == expected
+    assert original_size == expected
+    assert scale == 1.0
+
+
+@pytest.mark.parametrize(
+    "data",
+    [
+        b"\xff\xd8\xff\xff",
+        b"\xff\xd8\xff",
+        b"\xff\xd8\xff\xe0\x00",
+        b"\xff\xd8\xff\xe0\x00\x01",
+        b"\xff\xd8\xff\xd9",
+        b"",
+        b"not an image",
+    ],
+)
+def test_truncated_or_unknown_header_returns_none(tmp_path, data):
+    assert read_image_size(write(tmp_path, "broken.jpg", data)) is None
+
+
+def test_header_cut_before_frame_returns_none(tmp_path):
+    assert read_image_size(write(tmp_path, "cut.jpg", jpeg_bytes(50, 30)[:40])) is None
+
+
+def test_missing_file_returns_none(tmp_path):
+    assert read_image_size(str(tmp_path / "missing.jpg")) is None
+
+
+def test_decode_bounded_downscales_long_side(tmp_path):
+    path = write(tmp_path, "large.jpg", jpeg_bytes(400, 200))
+
+    frame, scale, original_size = decode_bounded(path, 100)
+
+    assert max(frame.shape[:2]) == 100
+    assert original_size == (400, 200)
+    assert scale == pytest.approx(0.25)
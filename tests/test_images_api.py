@@ -0,0 +1,177 @@
+"""/images 캐시 헤더, ETag, Range 테스트"""
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from starlette.requests import Request
+
+from backend.api import images
+from backend.api.images import RangeNotSatisfiable, _etag_matches, _requested_range, _resolve
+from backend.core.config import settings
+from backend.exceptions import AppException, ImageNotFoundException
+from backend.middleware.error_handler import app_exception_handler
+from backend.utils.image_cache import CachedImage, ImageCache
+
+ETAG = '"abc123"'
+IMAGE = CachedImage(content=b"0123456789", etag=ETAG, media_type="image/jpeg", mtime_ns=0)
+
+
+def make_request(method: str = "GET", **headers: str) -> Request:
+    return Request({
+        "type": "http",
+        "method": method,
+        "path": "/images/a.jpg",
+        "headers": [(name.replace("_", "-").encode(), value.encode()) for name, value in headers.items()],
+    })
+
+
+@pytest.mark.parametrize(
+    ("header", "expected"),
+    [
+        (None, False),
+        ("", False),
+        (ETAG, True),
+        (f"W/{ETAG}", True),
+        (f'"other", {ETAG}', True),
+        ("*", True),
+        ('"other"', False),
+        ("abc123", False),
+    ],
+)
+def test_etag_matches(header, expected):
+    assert _etag_matches(header, ETAG) is expected
+
+
+@pytest.mark.parametrize(
+    ("header", "expected"),
+    [
+        ("bytes=0-3", (0, 3)),
+        ("bytes=4-", (4, 9)),
+        ("bytes=8-100", (8, 9)),
+        ("bytes=-3", (7, 9)),
+        ("bytes=-100", (0, 9)),
+        ("bytes=9-9", (9, 9)),
+    ],
+)
+def test_requested_range(header, expected):
+    assert _requested_range(make_request(range=header), IMAGE) == expected
+
+
+@pytest.mark.parametrize("header", ["bytes=10-", "bytes=5-4", "bytes=-0"])
+def test_requested_range_not_satisfiable(header):
+    with pytest.raises(RangeNotSatisfiable):
+        _requested_range(make_request(range=header), IMAGE)
+
+
+@pytest.mark.parametrize("header", ["bytes=-", "bytes=0-1,4-5", "items=0-1", "bytes=a-b"])
+def test_unsupported_range_returns_full_content(header):
+    assert _requested_range(make_request(range=header), IMAGE) is None
+
+
+@pytest.mark.parametrize("header", ["bytes=-1", "bytes=0-", "bytes=0-0"])
+def test_empty_file_range_not_satisfiable(header):
+    empty = CachedImage(content=b"", etag=ETAG, media_type="image/jpeg", mtime_ns=0)
+    with pytest.raises(RangeNotSatisfiable):
+        _requested_range(make_request(range=header), empty)
+
+
+def test_range_ignored_without_matching_if_range():
+    assert _requested_range(make_request(range="bytes=0-3", if_range='"old"'), IMAGE) is None
+    assert _requested_range(make_request(range="bytes=0-3", if_range=ETAG), IMAGE) == (0, 3)
+    assert _requested_range(make_request("HEAD", range="bytes=0-3"), IMAGE) is None
+
+
+@pytest.fixture
+def client(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings.storage, "output_dir", str(tmp_path))
+    (tmp_path / "ab").mkdir()
+    (tmp_path / "ab" / "image.jpg").write_bytes(b"0123456789")
+    (tmp_path / ".staging").mkdir()
+    (tmp_path / ".staging" / "partial.jpg").write_bytes(b"partial")
+
+    app = FastAPI()
+    app.add_exception_handler(AppException, app_exception_handler)
+    app.include_router(images.router)
+    return TestClient(app)
+
+
+def test_serves_image_with_immutable_caching(client):
+    response = client.get("/images/ab/image.jpg")
+
+    assert response.status_code == 200
+    assert response.content == b"0123456789"
+    assert "immutable" in response.headers["cache-control"]
+    assert response.headers["accept-ranges"] == "bytes"
+
+    etag = response.headers["etag"]
+    cached = client.get("/images/ab/image.jpg", headers={"If-None-Match": etag})
+    assert cached.status_code == 304
+    assert cached.content == b""
+
+
+def test_serves_partial_content(client):
+    response = client.get("/images/ab/image.jpg", headers={"Range": "bytes=2-5"})
+
+    assert response.status_code == 206
+    assert response.content == b"2345"
+    assert response.headers["content-range"] == "bytes 2-5/10"
+
+    response = client.get("/images/ab/image.jpg", headers={"Range": "bytes=20-"})
+    assert response.status_code == 416
+    assert response.headers["content-range"] == "bytes */10"
+
+
+def test_empty_file_suffix_range_returns_416(client, tmp_path):
+    (tmp_path / "ab" / "empty.jpg").write_bytes(b"")
+
+    response = client.get("/images/ab/empty.jpg", headers={"Range": "bytes=-5"})
+
+    assert response.status_code == 416
+    assert response.headers["content-range"] == "bytes */0"
+
+
+def test_head_returns_headers_only(client):
+    response = client.head("/images/ab/image.jpg")
+
+    assert response.status_code == 200
+    assert response.headers["content-length"] == "10"
+    assert response.content == b""
+
+
+@pytest.mark.parametrize("path", ["ab/missing.jpg", ".staging/partial.jpg", "ab"])
+def test_unservable_paths_are_not_found(client, path):
+    assert client.get(f"/images/{path}").status_code == 404
+
+
+@pytest.mark.parametrize("path", ["", "ab/../../etc/passwd", ".staging/partial.jpg", "ab\\image.jpg"])
+def test_resolve_rejects_hidden_and_parent_paths(path):
+    with pytest.raises(ImageNotFoundException):
+        _resolve(path)
+
+
+def test_cache_hit_does_not_touch_disk(tmp_path, monkeypatch):
+    path = tmp_path / "image.jpg"
+    path.write_bytes(b"0123456789")
+    cache = ImageCache(max_bytes=1024, max_file_bytes=1024)
+    cache.prime([str(path)])
+
+    def fail(*args, **kwargs):
+        raise AssertionError("disk access on cache hit")
+
+    monkeypatch.setattr("os.stat", fail)
+    monkeypatch.setattr("builtins.open", fail)
+    assert cache.get(str(path)).content == b"0123456789"
+
+
+def test_discarded_entry_is_reloaded(tmp_path):
+    path = tmp_path / "image.jpg"
+    path.write_bytes(b"0123456789")
+    cache = ImageCache(max_bytes=1024, max_file_bytes=1024)
+    cache.prime([str(path)])
+
+    path.unlink()
+    cache.discard([str(path)])
+
+    assert cache.get(str(path)) is None
+    with pytest.raises(FileNotFoundError):
+        cache.load(str(path))
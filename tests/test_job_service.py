@@ -0,0 +1,189 @@
+"""
+GenerationJobManager 테스트
+
+대기열 제출/중복 제거/용량 초과, 작업 조회, SSE 스트림 형식을 검증합니다.
+실제 생성 대신 _run_job을 가짜 구현으로 교체합니다.
+"""
+
+import asyncio
+import json
+
+import pytest
+
+from backend.core.config import settings
+from backend.exceptions import JobNotFoundException, JobQueueFullException
+from backend.inference.admission import Priority
+from backend.services.job_service import GenerationJob, GenerationJobManager, JobStatus
+
+
+def _parse_events(chunks):
+    return [
+        json.loads(chunk.split("data: ", 1)[1])
+        for chunk in chunks
+        if chunk.startswith("event: status")
+    ]
+
+
+async def test_submit_requires_start():
+    manager = GenerationJobManager(queue_size=2, concurrency=1, retention_seconds=60)
+
+    with pytest.raises(RuntimeError):
+        manager.submit(1, "profile")
+
+
+async def test_submit_returns_active_job_for_same_target():
+    manager = GenerationJobManager(queue_size=2, concurrency=1, retention_seconds=60)
+    manager._job_available = asyncio.Event()
+
+    first = manager.submit(1, "profile")
+
+    assert manager.submit(1, "profile") is first
+    assert manager.submit(1, "talent") is not first
+    assert manager.queued == 2
+
+
+async def test_submit_rejects_when_queue_is_full():
+    manager = GenerationJobManager(queue_size=1, concurrency=1, retention_seconds=60)
+    manager._job_available = asyncio.Event()
+    manager.submit(1, "profile")
+
+    with pytest.raises(JobQueueFullException) as exc_info:
+        manager.submit(2, "profile")
+
+    assert exc_info.value.status_code == 503
+    assert len(manager._jobs) == 1
+
+
+async def test_get_unknown_job_raises():
+    manager = GenerationJobManager(queue_size=1, concurrency=1, retention_seconds=60)
+
+    with pytest.raises(JobNotFoundException):
+        manager.get("missing")
+
+
+async def test_worker_runs_job_to_completion(monkeypatch):
+    manager = GenerationJobManager(queue_size=2, concurrency=1, retention_seconds=60)
+
+    async def fake_run_job(job):
+        job.set_status(JobStatus.RUNNING)
+        job.result = {"image_url": f"/images/{job.participation_id}.jpg"}
+        job.set_status(JobStatus.DONE)
+
+    monkeypatch.setattr(manager, "_run_job", fake_run_job)
+    manager.start()
+    try:
+        job = manager.submit(7, "profile")
+        await asyncio.wait_for(job.wait(), timeout=1)
+    finally:
+        await manager.stop()
+
+    data = manager.get(job.job_id).to_dict()
+    assert data["status"] == JobStatus.DONE
+    assert data["image_url"] == "/images/7.jpg"
+    assert data["started_at"] is not None and data["finished_at"] is not None
+
+
+async def test_finished_jobs_are_pruned_after_retention():
+    manager = GenerationJobManager(queue_size=2, concurrency=1, retention_seconds=60)
+    manager._job_available = asyncio.Event()
+    job = manager.submit(1, "profile")
+    job.set_status(JobStatus.FAILED)
+    job.finished_at -= 120
+
+    manager.submit(2, "profile")
+
+    with pytest.raises(JobNotFoundException):
+        manager.get(job.job_id)
+
+
+async def test_stream_events_follow_status_changes():
+    manager = GenerationJobManager(queue_size=1, concurrency=1, retention_seconds=60)
+    job = GenerationJob(participation_id=1, image_type="profile")
+
+    async def drive():
+        await asyncio.sleep(0.01)
+        job.set_status(JobStatus.RUNNING)
+        await asyncio.sleep(0.01)
+        job.result = {"image_url": "/images/1.jpg"}
+        job.set_status(JobStatus.DONE)
+
+    driver = asyncio.create_task(drive())
+    chunks = [chunk async for chunk in manager.stream_events(job)]
+    await driver
+
+    assert all(chunk.endswith("\n\n") for chunk in chunks)
+    events = _parse_events(chunks)
+    assert [event["status"] for event in events] == ["queued", "running", "done"]
+    assert events[-1]["image_url"] == "/images/1.jpg"
+
+
+async def test_stream_events_send_keep_alive_while_pending(monkeypatch):
+    monkeypatch.setattr(settings.job, "sse_keepalive_seconds", 0.01)
+    manager = GenerationJobManager(queue_size=1, concurrency=1, retention_seconds=60)
+    job = GenerationJob(participation_id=1, image_type="talent")
+
+    stream = manager.stream_events(job)
+    first = await stream.__anext__()
+    second = await stream.__anext__()
+    await stream.aclose()
+
+    assert first.startswith("event: status")
+    assert second == ": keep-alive\n\n"
+
+
+async def test_reupload_cancels_only_superseded_speculative_jobs():
+    manager = GenerationJobManager(queue_size=8, concurrency=1, retention_seconds=60)
+    manager._job_available = asyncio.Event()
+    stale = manager.submit(1, "profile", source_image_path="/uploads/old.jpg", speculative=True)
+    claimed = manager.submit(1, "talent", source_image_path="/uploads/old.jpg", speculative=True)
+    claimed.claimed = True
+    other = manager.submit(2, "profile", source_image_path="/uploads/old.jpg", speculative=True)
+
+    assert manager.cancel_superseded(1, "/uploads/new.jpg") == 1
+
+    assert stale.status == JobStatus.CANCELLED
+    assert stale.cancel_token.reason == "superseded"
+    assert claimed.status == JobStatus.QUEUED
+    assert other.status == JobStatus.QUEUED
+
+    fresh = manager.submit(1, "profile", source_image_path="/uploads/new.jpg", speculative=True)
+    assert fresh is not stale
+    assert manager.cancel_superseded(1, "/uploads/new.jpg") == 0
+
+
+async def test_submit_does_not_reuse_job_for_other_source():
+    manager = GenerationJobManager(queue_size=8, concurrency=1, retention_seconds=60)
+    manager._job_available = asyncio.Event()
+    old = manager.submit(1, "profile", source_image_path="/uploads/old.jpg")
+    old.set_status(JobStatus.RUNNING)
+    old.cancel_token.cancel("superseded")
+
+    new = manager.submit(1, "profile", source_image_path="/uploads/new.jpg")
+
+    assert new is not old
+    assert manager.submit(1, "profile", source_image_path="/uploads/new.jpg") is new
+    assert manager.find_active(1, "profile") is new
+
+
+class FakeFaceFusion:
+    def promote(self, token):
+        token.priority = Priority.INTERACTIVE
+
+
+async def test_claimed_speculative_job_moves_ahead_without_requeueing(monkeypatch):
+    monkeypatch.setattr("backend.facefusion_service.get_facefusion_service", FakeFaceFusion)
+    manager = GenerationJobManager(queue_size=3, concurrency=1, retention_seconds=60)
+    manager._job_available = asyncio.Event()
+    first = manager.submit(1, "profile", source_image_path="/uploads/1.jpg", speculative=True)
+    second = manager.submit(2, "profile", source_image_path="/uploads/2.jpg", speculative=True)
+
+    assert manager.claim(2, "profile", "/uploads/2.jpg") is second
+
+    # 올라간 작업은 한 번만 대기하므로 대기열 한도를 추가로 차지하지 않음
+    assert manager.queued == 2
+    third = manager.submit(3, "profile")
+    with pytest.raises(JobQueueFullException):
+        manager.submit(4, "profile")
+
+    assert [manager._dequeue() for _ in range(3)] == [second, third, first]
+    assert manager._dequeue() is None
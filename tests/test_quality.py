@@ -0,0 +1,114 @@
+"""QualityLadder 단계 결정 테스트"""
+
+import pytest
+
+from backend.core.config import FaceFusionSettings
+from backend.inference import quality
+from backend.inference.quality import QualityLadder, quality_levels
+
+
+class Clock:
+    """time.monotonic 대체 (테스트에서 시간을 직접 진행)"""
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(quality.time, "monotonic", clock)
+    return clock
+
+
+def make_ladder(slots: int = 4, **overrides) -> QualityLadder:
+    values = {
+        "quality_ladder_enabled": True,
+        "quality_ladder": [{"output_image_quality": 70}, {"output_image_quality": 60}],
+        "quality_degrade_load": 1.5,
+        "quality_recover_load": 0.5,
+        "quality_degrade_p95_seconds": 10.0,
+        "quality_recover_p95_seconds": 5.0,
+        "quality_hold_seconds": 15.0,
+        "quality_window_seconds": 60.0,
+    }
+    values.update(overrides)
+    return QualityLadder(FaceFusionSettings(**values), slots=slots)
+
+
+def test_load_thresholds_step_one_level_at_a_time(clock):
+    ladder = make_ladder(quality_hold_seconds=0)
+
+    assert ladder.select(in_flight=5) == 0  # load 1.25 < 1.5
+    assert ladder.select(in_flight=6) == 1  # load 1.5
+    assert ladder.select(in_flight=8) == 2
+    assert ladder.select(in_flight=12) == 2  # max_level
+    assert ladder.select(in_flight=3) == 2  # 0.5 < load < 1.5: 유지
+    assert ladder.select(in_flight=2) == 1  # load 0.5
+    assert ladder.select(in_flight=0) == 0
+
+
+def test_level_is_held_after_change(clock):
+    ladder = make_ladder()
+
+    assert ladder.select(in_flight=8) == 1
+    clock.now += 14
+    assert ladder.select(in_flight=8) == 1
+    clock.now += 1
+    assert ladder.select(in_flight=8) == 2
+    clock.now += 5
+    assert ladder.select(in_flight=0) == 2
+    clock.now += 10
+    assert ladder.select(in_flight=0) == 1
+
+
+def test_p95_latency_degrades_and_blocks_recovery(clock):
+    ladder = make_ladder(quality_hold_seconds=0)
+    for _ in range(19):
+        ladder.observe(2.0)
+    ladder.observe(12.0)
+
+    # 20건 중 1건만 느리면 p95는 빠른 값
+    assert ladder.p95_seconds() == 2.0
+    assert ladder.select(in_flight=0) == 0
+
+    ladder.observe(12.0)
+    assert ladder.p95_seconds() == 12.0
+    assert ladder.select(in_flight=0) == 1
+
+    # 단계가 바뀌면 이전 단계의 지연 시간은 버림
+    assert ladder.p95_seconds() is None
+    ladder.observe(7.0)
+    assert ladder.select(in_flight=0) == 1  # 5s < p95 < 10s: 유지
+    ladder.observe(4.0)
+    ladder.observe(4.0)
+    assert ladder.select(in_flight=0) == 1
+    clock.now += 61
+    ladder.observe(4.0)
+    assert ladder.select(in_flight=0) == 0  # 7s 기록은 window 밖
+
+
+def test_disabled_ladder_stays_at_level_zero(clock):
+    ladder = make_ladder(quality_ladder_enabled=False, quality_hold_seconds=0)
+
+    assert ladder.max_level == 0
+    assert ladder.select(in_flight=100) == 0
+    assert ladder.get_status()["load"] == 25.0
+
+
+def test_ladder_is_off_by_default(clock, monkeypatch):
+    monkeypatch.delenv("FACEFUSION_QUALITY_LADDER_ENABLED", raising=False)
+    ladder = QualityLadder(FaceFusionSettings(), slots=1)
+
+    assert ladder.enabled is False
+    assert ladder.select(in_flight=100) == 0
+
+
+def test_quality_levels_drop_unknown_settings():
+    config = FaceFusionSettings(
+        quality_ladder=[{"output_image_quality": 70, "face_enhancer_model": "gfpgan"}]
+    )
+    assert quality_levels(config) == [{}, {"output_image_quality": 70}]
@@ -0,0 +1,124 @@
+"""
+준비 상태(/ready) 테스트
+
+ReadinessService의 엔진/DB/디스크 판정과 최근 관측값 백분위수를 검증합니다.
+"""
+
+import asyncio
+from collections import namedtuple
+
+import pytest
+
+from backend.core.config import settings
+from backend.core.metrics import MetricsRegistry
+from backend.services import readiness_service
+from backend.services.readiness_service import ReadinessService
+
+DiskUsage = namedtuple("DiskUsage", "total used free")
+
+
+class FakeFaceFusion:
+    def __init__(self, **status):
+        self.status = {"state": "ready", "accepting": True, "saturated": False, **status}
+
+    def get_status(self) -> dict:
+        return dict(self.status)
+
+
+class FakeSession:
+    def __init__(self, error: Exception = None, delay: float = 0.0):
+        self.error = error
+        self.delay = delay
+        self.rolled_back = False
+
+    async def execute(self, statement):
+        await asyncio.sleep(self.delay)
+        if self.error:
+            raise self.error
+
+    async def rollback(self):
+        self.rolled_back = True
+
+
+@pytest.fixture
+def free_disk(monkeypatch, tmp_path):
+    """output_dir을 임시 디렉터리로 바꾸고 여유 공간(MB)을 지정"""
+    monkeypatch.setattr(settings.storage, "output_dir", str(tmp_path / "output"))
+    monkeypatch.setattr(settings.storage, "min_free_disk_mb", 100)
+
+    def set_free(free_mb: float) -> None:
+        free = int(free_mb * 1024 * 1024)
+        monkeypatch.setattr(
+            readiness_service.shutil, "disk_usage", lambda path: DiskUsage(free * 2, free, free)
+        )
+
+    set_free(1024)
+    return set_free
+
+
+async def test_ready_when_engine_db_and_disk_are_ok(free_disk):
+    report = await ReadinessService(FakeSession(), FakeFaceFusion()).check()
+
+    assert report["ready"] is True
+    assert report["database"]["reachable"] is True
+    assert report["disk"]["ok"] is True
+    assert report["disk"]["free_mb"] == 1024
+
+
+@pytest.mark.parametrize(
+    "status",
+    [
+        {"state": "warming", "accepting": False},
+        {"state": "degraded", "accepting": False},
+        {"saturated": True},
+    ],
+)
+async def test_not_ready_while_engine_cannot_accept(free_disk, status):
+    report = await ReadinessService(FakeSession(), FakeFaceFusion(**status)).check()
+
+    assert report["ready"] is False
+    assert report["engine"]["state"] == status.get("state", "ready")
+
+
+async def test_not_ready_when_database_fails(free_disk):
+    session = FakeSession(error=RuntimeError("database is locked"))
+
+    report = await ReadinessService(session, FakeFaceFusion()).check()
+
+    assert report["ready"] is False
+    assert report["database"] == {
+        "reachable": False,
+        "latency_ms": report["database"]["latency_ms"],
+        "error": "RuntimeError",
+    }
+    assert session.rolled_back
+
+
+async def test_not_ready_when_database_check_times_out(free_disk, monkeypatch):
+    monkeypatch.setattr(readiness_service, "DB_CHECK_TIMEOUT_SECONDS", 0.01)
+
+    report = await ReadinessService(FakeSession(delay=1), FakeFaceFusion()).check()
+
+    assert report["database"]["reachable"] is False
+    assert report["database"]["error"] == "TimeoutError"
+
+
+async def test_not_ready_when_disk_is_low(free_disk):
+    free_disk(50)
+
+    report = await ReadinessService(FakeSession(), FakeFaceFusion()).check()
+
+    assert report["ready"] is False
+    assert report["disk"]["ok"] is False
+    assert report["disk"]["min_free_mb"] == 100
+
+
+def test_percentiles_use_recent_window():
+    registry = MetricsRegistry(window=4)
+    assert registry.percentiles("latency") == {"count": 0, "p50": None, "p95": None}
+
+    for value in (100, 1, 2, 3, 4):
+        registry.observe("latency", value)
+
+    assert registry.percentiles("latency") == {"count": 4, "p50": 3, "p95": 4}
+    assert registry.snapshot()["recent"]["latency"]["count"] == 4
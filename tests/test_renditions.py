@@ -0,0 +1,75 @@
+"""rendition 인코딩 / set_jpeg_dpi 테스트"""
+
+import struct
+
+import cv2
+import numpy
+
+from backend.core.config import StorageSettings
+from backend.utils.renditions import RenditionSpec, encode_rendition, rendition_specs, set_jpeg_dpi
+
+
+def frame(width: int = 400, height: int = 200) -> numpy.ndarray:
+    image = numpy.zeros((height, width, 3), numpy.uint8)
+    cv2.circle(image, (width // 2, height // 2), min(width, height) // 3, (200, 180, 160), -1)
+    return image
+
+
+def jfif_density(data: bytes):
+    """APP0 JFIF의 (단위, X 해상도, Y 해상도)"""
+    assert data[2:4] == b"\xff\xe0" and data[6:11] == b"JFIF\x00"
+    return struct.unpack(">BHH", data[13:18])
+
+
+def test_set_jpeg_dpi_writes_jfif_density():
+    ok, buffer = cv2.imencode(".jpg", frame())
+    data = buffer.tobytes()
+
+    updated = set_jpeg_dpi(data, 300)
+
+    assert jfif_density(updated) == (1, 300, 300)
+    assert len(updated) == len(data)
+    assert updated[18:] == data[18:]
+    decoded = cv2.imdecode(numpy.frombuffer(updated, numpy.uint8), cv2.IMREAD_COLOR)
+    assert decoded.shape == (200, 400, 3)
+
+
+def test_set_jpeg_dpi_leaves_non_jfif_data_unchanged():
+    ok, buffer = cv2.imencode(".png", frame())
+    png = buffer.tobytes()
+    exif_first = b"\xff\xd8\xff\xe1\x00\x08Exif\x00\x00\xff\xd9"
+
+    assert set_jpeg_dpi(png, 300) == png
+    assert set_jpeg_dpi(exif_first, 300) == exif_first
+
+
+def test_encode_rendition_limits_long_side_and_sets_dpi():
+    spec = RenditionSpec(name="print", format="jpg", max_dimension=100, quality=90, dpi=300)
+
+    data = encode_rendition(frame(), spec)
+
+    decoded = cv2.imdecode(numpy.frombuffer(data, numpy.uint8), cv2.IMREAD_COLOR)
+    assert decoded.shape[:2] == (50, 100)
+    assert jfif_density(data) == (1, 300, 300)
+
+
+def test_encode_rendition_keeps_smaller_frame_size():
+    data = encode_rendition(frame(), RenditionSpec(name="webp", format="webp", max_dimension=1000))
+
+    decoded = cv2.imdecode(numpy.frombuffer(data, numpy.uint8), cv2.IMREAD_COLOR)
+    assert decoded.shape[:2] == (200, 400)
+
+
+def test_rendition_specs_skip_invalid_definitions():
+    config = StorageSettings(
+        renditions_enabled=True,
+        renditions={
+            "mobile": {"format": "jpg", "max_dimension": 1280},
+            "gif": {"format": "gif"},
+            "bad.name": {"format": "jpg"},
+            "unknown": {"format": "jpg", "sharpen": True},
+        },
+    )
+
+    assert [spec.name for spec in rendition_specs(config)] == ["mobile"]
+    assert rendition_specs(config.model_copy(update={"renditions_enabled": False})) == []
@@ -0,0 +1,72 @@
+"""ResultCache 용량 제한 / 무효화 테스트"""
+
+import os
+
+from backend.inference.result_cache import ResultCache
+
+
+def write(tmp_path, name: str, size: int) -> str:
+    path = tmp_path / name
+    path.write_bytes(b"x" * size)
+    return str(path)
+
+
+def test_evicts_least_recently_used_by_total_bytes(tmp_path):
+    cache = ResultCache(max_bytes=250, fingerprint="f")
+    keys = [cache.key(f"s{i}", "t", "inswapper_128", 0) for i in range(3)]
+    cache.store(keys[0], write(tmp_path, "0.jpg", 100))
+    cache.store(keys[1], write(tmp_path, "1.jpg", 100))
+    assert cache.lookup([keys[0]]) is not None
+
+    cache.store(keys[2], write(tmp_path, "2.jpg", 100))
+
+    assert len(cache) == 2
+    assert cache.total_bytes == 200
+    assert cache.lookup([keys[1]]) is None
+    assert cache.lookup([keys[0]]) is not None
+
+
+def test_output_larger_than_limit_is_not_cached(tmp_path):
+    cache = ResultCache(max_bytes=50, fingerprint="f")
+    key = cache.key("s", "t", "inswapper_128", 0)
+
+    cache.store(key, write(tmp_path, "large.jpg", 100))
+
+    assert len(cache) == 0
+    assert cache.total_bytes == 0
+
+
+def test_entry_limit_still_applies(tmp_path):
+    cache = ResultCache(max_bytes=1000, fingerprint="f", max_entries=1)
+    cache.store(cache.key("a", "t", "m", 0), write(tmp_path, "a.jpg", 10))
+    cache.store(cache.key("b", "t", "m", 0), write(tmp_path, "b.jpg", 10))
+
+    assert len(cache) == 1
+    assert cache.total_bytes == 10
+
+
+def test_changed_output_is_invalidated(tmp_path):
+    cache = ResultCache(max_bytes=1000, fingerprint="f")
+    higher, lower = cache.key("s", "t", "m", 0), cache.key("s", "t", "m", 1)
+    higher_path = write(tmp_path, "higher.jpg", 10)
+    cache.store(higher, higher_path)
+    cache.store(lower, write(tmp_path, "lower.jpg", 10))
+
+    os.remove(higher_path)
+    found = cache.lookup([higher, lower])
+
+    assert found is not None and found[0] == lower
+    assert len(cache) == 1
+    assert cache.total_bytes == 10
+
+
+def test_relocate_keeps_entry_valid(tmp_path):
+    cache = ResultCache(max_bytes=1000, fingerprint="f")
+    key = cache.key("s", "t", "m", 0)
+    old_path = write(tmp_path, "old.jpg", 10)
+    cache.store(key, old_path)
+    new_path = str(tmp_path / "new.jpg")
+    os.replace(old_path, new_path)
+
+    assert cache.relocate(old_path, new_path) == 1
+    assert cache.lookup([key])[1].output_path == new_path